@@ -0,0 +1,4 @@
+"""
+Benchmarks package for TravelLangGraph API.
+Contains a local DeepSeek stub server and performance benchmarks.
+"""
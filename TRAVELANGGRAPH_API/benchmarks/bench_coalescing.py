@@ -0,0 +1,50 @@
+"""
+Load test single-flight coalescing against the local stub upstream.
+
+Fires N identical concurrent completions and reports upstream hits.
+
+Usage:
+    python -m benchmarks.bench_coalescing --requests 100
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("DEEPSEEK_API_KEY", "bench-key")
+
+from benchmarks.stub_server import StubServer, create_stub_app
+from clients.deepseek_client import DeepSeekClient
+
+MESSAGES = [{"role": "user", "content": "Top sights in Lisbon?"}]
+
+
+async def fire(total: int) -> float:
+    """Send `total` identical concurrent requests and return elapsed seconds."""
+    client = DeepSeekClient()
+    start = time.perf_counter()
+    await asyncio.gather(*(client.chat_completion(MESSAGES) for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    print(f"coalescing: {client.health_check()['coalescing']}")
+    await client.aclose()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    args = parser.parse_args()
+    
+    with StubServer(create_stub_app(latency_ms=args.latency_ms)) as stub:
+        os.environ["DEEPSEEK_API_BASE_URL"] = stub.base_url
+        elapsed = asyncio.run(fire(args.requests))
+        hits = stub.app.state.request_count
+    
+    print(f"{args.requests} identical requests -> {hits} upstream hit(s) in {elapsed * 1000:.1f} ms")
+    assert hits == 1, f"expected 1 upstream hit, got {hits}"
+
+
+if __name__ == "__main__":
+    main()
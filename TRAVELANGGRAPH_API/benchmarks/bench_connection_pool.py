@@ -0,0 +1,79 @@
+"""
+Benchmark DeepSeekClient with a pooled HTTP client vs. a new client per request.
+
+Usage:
+    python -m benchmarks.bench_connection_pool --requests 500 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from typing import List
+import httpx
+
+os.environ.setdefault("DEEPSEEK_API_KEY", "bench-key")
+
+from benchmarks.stub_server import StubServer, create_stub_app
+from clients.deepseek_client import DeepSeekClient
+
+MESSAGES = [{"role": "user", "content": "Best time to visit Lisbon?"}]
+
+
+class UnpooledDeepSeekClient(DeepSeekClient):
+    """Baseline that opens a fresh httpx.AsyncClient for every request."""
+    
+    async def chat_completion(self, messages, **kwargs):
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                f"{self.base_url}/chat/completions",
+                headers=self.headers,
+                json={"model": "deepseek-chat", "messages": messages},
+                timeout=30.0
+            )
+            response.raise_for_status()
+            return response.json()
+
+
+async def run(client: DeepSeekClient, total: int, concurrency: int) -> dict:
+    """Fire `total` requests with bounded concurrency and collect latencies."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await client.chat_completion(MESSAGES)
+            latencies.append(time.perf_counter() - start)
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+    
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    
+    with StubServer(create_stub_app(latency_ms=args.latency_ms)) as stub:
+        os.environ["DEEPSEEK_API_BASE_URL"] = stub.base_url
+        for name, client_cls in (("unpooled", UnpooledDeepSeekClient), ("pooled", DeepSeekClient)):
+            result = asyncio.run(run(client_cls(), args.requests, args.concurrency))
+            print(f"{name:>9}: {result['rps']:8.1f} req/s  "
+                  f"p50 {result['p50_ms']:6.2f} ms  p95 {result['p95_ms']:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
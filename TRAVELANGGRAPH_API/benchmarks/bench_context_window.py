@@ -0,0 +1,103 @@
+"""
+Measure prompt tokens saved and latency gained by the context window budget.
+
+Replays each conversation in a corpus turn by turn through
+ChatService.chat_with_context against the stub upstream, once without a
+budget and once with it. The stub charges latency per prompt token to
+simulate prefill cost.
+
+The corpus is JSONL with one `{"messages": [...]}` conversation per line.
+Without `--corpus`, a deterministic synthetic trip-planning corpus is used.
+
+Usage:
+    python -m benchmarks.bench_context_window --budget 2000
+    python -m benchmarks.bench_context_window --corpus conversations.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Dict, List
+
+os.environ.setdefault("DEEPSEEK_API_KEY", "bench-key")
+
+from benchmarks.stub_server import StubServer, create_stub_app
+from clients.deepseek_client import DeepSeekClient
+from services.chat_service import ChatService
+from services.completion_cache import CompletionCache
+from services.context_window import ContextWindowManager
+
+CITIES = ["Lisbon", "Porto", "Kyoto", "Osaka", "Seville", "Granada", "Hanoi", "Hoi An"]
+TOPICS = ["hotels", "food", "day trips", "museums", "transport", "nightlife", "budget", "weather"]
+
+
+def synthetic_corpus(conversations: int, turns: int, seed: int = 7) -> List[List[Dict[str, str]]]:
+    """Generate deterministic long trip-planning conversations."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(conversations):
+        messages = [{"role": "system", "content": "You are a helpful travel planning assistant."}]
+        for _ in range(turns):
+            city, topic = rng.choice(CITIES), rng.choice(TOPICS)
+            messages.append({"role": "user", "content": f"What about {topic} in {city}? " * rng.randint(2, 6)})
+            messages.append({"role": "assistant", "content": f"For {topic} in {city}, consider the following. " * rng.randint(10, 30)})
+        corpus.append(messages)
+    return corpus
+
+
+def load_corpus(path: str) -> List[List[Dict[str, str]]]:
+    """Load a JSONL conversation corpus."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line)["messages"] for line in f if line.strip()]
+
+
+async def replay(corpus: List[List[Dict[str, str]]], budget: int) -> Dict[str, float]:
+    """Replay every user turn of every conversation and total tokens and time."""
+    chat_service = ChatService(
+        deepseek_client=DeepSeekClient(),
+        cache=CompletionCache(tiers=[]),
+        context_window=ContextWindowManager(max_prompt_tokens=budget)
+    )
+    prompt_tokens = 0
+    elapsed = 0.0
+    
+    for messages in corpus:
+        for end, message in enumerate(messages):
+            if message["role"] != "user":
+                continue
+            start = time.perf_counter()
+            result = await chat_service.chat_with_context(messages[:end + 1])
+            elapsed += time.perf_counter() - start
+            prompt_tokens += result["context"]["prompt_tokens"]
+    
+    await chat_service.deepseek_client.aclose()
+    return {"prompt_tokens": prompt_tokens, "seconds": elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", help="JSONL conversation corpus")
+    parser.add_argument("--conversations", type=int, default=5)
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--budget", type=int, default=2000)
+    parser.add_argument("--prompt-token-latency-us", type=float, default=50.0)
+    args = parser.parse_args()
+    
+    corpus = load_corpus(args.corpus) if args.corpus else synthetic_corpus(args.conversations, args.turns)
+    
+    with StubServer(create_stub_app(prompt_token_latency_us=args.prompt_token_latency_us)) as stub:
+        os.environ["DEEPSEEK_API_BASE_URL"] = stub.base_url
+        full = asyncio.run(replay(corpus, budget=0))
+        fitted = asyncio.run(replay(corpus, budget=args.budget))
+    
+    saved = 1 - fitted["prompt_tokens"] / full["prompt_tokens"]
+    print(f"  full history: {full['prompt_tokens']:9.0f} prompt tokens  {full['seconds']:7.2f} s")
+    print(f"budget {args.budget:6d}: {fitted['prompt_tokens']:9.0f} prompt tokens  {fitted['seconds']:7.2f} s")
+    print(f"         saved: {saved:9.1%} tokens  {1 - fitted['seconds'] / full['seconds']:7.1%} latency")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark per-request ChatService construction vs. the shared app-state instance.
+
+Usage:
+    python -m benchmarks.bench_dependency_overhead --requests 2000
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+import httpx
+
+os.environ.setdefault("DEEPSEEK_API_KEY", "bench-key")
+
+import dependencies
+from dependencies import get_chat_service
+from services.chat_service import ChatService
+from travelanggraph_api.main import app
+
+
+async def run(total: int) -> float:
+    """Hit /chat/status `total` times in-process and return requests/sec."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for _ in range(total):
+            response = await client.get("/chat/status")
+            response.raise_for_status()
+        return total / (time.perf_counter() - start)
+
+
+async def bench(total: int) -> None:
+    """Compare both wirings against the same app."""
+    await dependencies.startup(app)
+    try:
+        app.dependency_overrides[get_chat_service] = lambda: ChatService()
+        per_request = await run(total)
+        app.dependency_overrides.clear()
+        shared = await run(total)
+    finally:
+        await dependencies.shutdown(app)
+    
+    print(f"per-request: {per_request:8.1f} req/s  ({1e6 / per_request:7.1f} us/req)")
+    print(f"     shared: {shared:8.1f} req/s  ({1e6 / shared:7.1f} us/req)")
+    print(f"    removed: {1e6 / per_request - 1e6 / shared:7.1f} us/req")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    
+    # Per-request construction logs on every call, as it does in production
+    logging.basicConfig(level=logging.INFO, filename=os.devnull)
+    asyncio.run(bench(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark chat latency while health endpoints are polled at 10 Hz.
+
+Drives /chat/context at fixed concurrency through the in-process app while a
+second task polls /health/system. `--legacy` polls a handler that samples CPU
+with the old blocking `psutil.cpu_percent(interval=1)` for comparison.
+
+Usage:
+    python -m benchmarks.bench_health_polling --duration 5
+    python -m benchmarks.bench_health_polling --duration 5 --legacy
+"""
+
+import argparse
+import asyncio
+import os
+import time
+from typing import List
+import httpx
+import psutil
+
+os.environ.setdefault("DEEPSEEK_API_KEY", "bench-key")
+
+from benchmarks.reporting import percentile
+from benchmarks.stub_server import StubServer, create_stub_app
+
+CHAT_REQUEST = {"messages": [{"role": "user", "content": "Top sights in Lisbon?"}], "temperature": 0.7}
+
+
+async def run(duration: float, concurrency: int, poll_hz: float, legacy: bool) -> None:
+    """Drive chat traffic and health polling together."""
+    import dependencies
+    from travelanggraph_api.main import app
+    
+    if legacy:
+        @app.get("/bench/legacy-health")
+        async def legacy_health():
+            return {"cpu_percent": psutil.cpu_percent(interval=1)}
+    health_path = "/bench/legacy-health" if legacy else "/health/system"
+    
+    await dependencies.startup(app)
+    transport = httpx.ASGITransport(app=app)
+    latencies: List[float] = []
+    health_latencies: List[float] = []
+    deadline = time.perf_counter() + duration
+    
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def chat_worker() -> None:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.post("/chat/context", json=CHAT_REQUEST)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+        
+        async def health_poller() -> None:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                (await client.get(health_path)).raise_for_status()
+                health_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(1 / poll_hz)
+        
+        await asyncio.gather(health_poller(), *(chat_worker() for _ in range(concurrency)))
+    
+    await dependencies.shutdown(app)
+    
+    print(f"health endpoint: {health_path}")
+    print(f"  chat: {len(latencies)} requests  p50 {percentile(latencies, 50) * 1000:7.2f} ms  "
+          f"p99 {percentile(latencies, 99) * 1000:7.2f} ms")
+    print(f"health: {len(health_latencies)} polls  p50 {percentile(health_latencies, 50) * 1e6:9.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--poll-hz", type=float, default=10.0)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--legacy", action="store_true")
+    args = parser.parse_args()
+    
+    with StubServer(create_stub_app(latency_ms=args.latency_ms)) as stub:
+        os.environ["DEEPSEEK_API_BASE_URL"] = stub.base_url
+        asyncio.run(run(args.duration, args.concurrency, args.poll_hz, args.legacy))
+
+
+if __name__ == "__main__":
+    main()
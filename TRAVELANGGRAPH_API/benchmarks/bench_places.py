@@ -0,0 +1,125 @@
+"""
+Benchmark cold load time, memory and query latency of the places index.
+
+Builds synthetic datasets of airports, cities and countries with random
+names and coordinates. For each size it reports the time to parse the CSV
+and to memory-map a snapshot, the memory retained by the index compared
+with a list of dicts, and autocomplete and radius query latency.
+
+Usage:
+    python -m benchmarks.bench_places --sizes 10000,100000,1000000
+"""
+
+import argparse
+import csv
+import gc
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from services.place_index import KINDS, PlaceIndex
+
+SYLLABLES = ["ka", "lo", "mi", "ra", "sen", "to", "vi", "por", "lis", "ber", "dan", "qu", "an", "el", "ro", "su"]
+FIELDS = ["kind", "code", "name", "city", "country_code", "country", "latitude", "longitude", "population"]
+
+
+def synthetic_rows(size: int, seed: int = 0) -> List[Dict[str, str]]:
+    """`size` places: one airport per ten places, the rest cities, and 200 countries."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(size):
+        kind = "country" if i < 200 else ("airport" if i % 10 == 0 else "city")
+        name = " ".join("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))).capitalize() for _ in range(rng.randint(1, 2)))
+        rows.append({
+            "kind": kind,
+            "code": f"{i:06d}"[-3:] if kind == "airport" else "",
+            "name": name + (" Airport" if kind == "airport" else ""),
+            "city": name,
+            "country_code": f"C{i % 200:03d}",
+            "country": f"Country {i % 200}",
+            "latitude": f"{rng.uniform(-60, 70):.4f}",
+            "longitude": f"{rng.uniform(-180, 180):.4f}",
+            "population": str(int(rng.paretovariate(1.2) * 1000))
+        })
+    return rows
+
+
+def retained_bytes(build: Callable[[], object]) -> tuple:
+    """Build an object under tracemalloc; returns it, the (traced, so slower) seconds and the bytes it keeps allocated."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    value = build()
+    seconds = time.perf_counter() - start
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return value, seconds, size
+
+
+def latency_us(queries: List[Callable[[], object]]) -> tuple:
+    """p50 and p99 microseconds over the queries."""
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        query()
+        timings.append((time.perf_counter() - start) * 1e6)
+    timings.sort()
+    return statistics.median(timings), timings[int(len(timings) * 0.99)]
+
+
+def run(size: int, queries: int, directory: str) -> None:
+    rows = synthetic_rows(size)
+    csv_path = os.path.join(directory, f"places-{size}.csv")
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    
+    start = time.perf_counter()
+    index = PlaceIndex.from_csv(csv_path)
+    csv_seconds = time.perf_counter() - start
+    index, _, index_bytes = retained_bytes(lambda: PlaceIndex.from_csv(csv_path))
+    baseline = retained_bytes(lambda: [dict(row) for row in rows])[2]
+    snapshot_path = os.path.join(directory, f"places-{size}.bin")
+    index.save_snapshot(snapshot_path)
+    del index
+    start = time.perf_counter()
+    snapshot = PlaceIndex.load_snapshot(snapshot_path)
+    mmap_seconds = time.perf_counter() - start
+    snapshot, _, snapshot_bytes = retained_bytes(lambda: PlaceIndex.load_snapshot(snapshot_path))
+    
+    rng = random.Random(1)
+    names = [row["name"].lower() for row in rng.sample(rows, min(queries, size))]
+    print(f"\n{size} places: csv load {csv_seconds:.2f}s, snapshot load {mmap_seconds * 1000:.2f} ms "
+          f"({os.path.getsize(snapshot_path) / 1e6:.1f} MB file)")
+    print(f"  retained memory: index {index_bytes / 1e6:.1f} MB, mapped snapshot {snapshot_bytes / 1e6:.2f} MB, "
+          f"list of dicts {baseline / 1e6:.1f} MB")
+    
+    for length in (1, 2, 3, 5):
+        p50, p99 = latency_us([lambda name=name: snapshot.autocomplete(name[:length], limit=10) for name in names])
+        print(f"  autocomplete {length}-char prefix: p50 {p50:8.1f} us  p99 {p99:8.1f} us")
+    for radius in (50, 250):
+        points = [(rng.uniform(-60, 70), rng.uniform(-180, 180)) for _ in range(queries)]
+        p50, p99 = latency_us([lambda p=p: snapshot.nearby(p[0], p[1], radius, limit=10) for p in points])
+        print(f"  nearby {radius:>3} km:               p50 {p50:8.1f} us  p99 {p99:8.1f} us")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+    
+    print(f"kinds: {', '.join(KINDS)}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in (int(size) for size in args.sizes.split(",")):
+            run(size, args.queries, directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark wall-clock time of a travel plan run as a graph vs. a serial chain.
+
+Runs the travel planner in-process against the local stub upstream. The
+serial chain runs one step at a time, as a client chaining HTTP calls
+would; the graph runs research, flights and hotels concurrently before the
+itinerary. A last pass repeats the graph run with memoization, so every
+step is reused.
+
+Usage:
+    python -m benchmarks.bench_plan_graph --runs 5 --latency-ms 300
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("DEEPSEEK_API_KEY", "bench-key")
+
+from benchmarks.stub_server import StubServer, create_stub_app
+from clients.deepseek_client import DeepSeekClient
+from services.chat_service import ChatService
+from services.completion_cache import CompletionCache, LRUCache
+from services.travel_planner import TravelPlanner
+
+
+def inputs(run: int) -> dict:
+    """Distinct plan inputs per run so neither the cache nor coalescing hides upstream calls."""
+    return {
+        "destination": f"Lisbon {run}", "origin": "Berlin", "start_date": "2026-05-01", "days": 4,
+        "travelers": 2, "budget": None, "interests": ["food"]
+    }
+
+
+async def time_runs(planner: TravelPlanner, runs: int, offset: int = 0, repeat: bool = False) -> float:
+    """Median seconds per plan over `runs` runs, of distinct inputs unless `repeat` is set."""
+    timings = []
+    for run in range(runs):
+        start = time.perf_counter()
+        await planner.plan(inputs(offset if repeat else offset + run))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+async def compare(runs: int) -> None:
+    client = DeepSeekClient()
+    chat_service = ChatService(deepseek_client=client, cache=CompletionCache(tiers=[]))
+    try:
+        serial = await time_runs(TravelPlanner(chat_service, max_concurrency=1), runs)
+        graph = await time_runs(TravelPlanner(chat_service, max_concurrency=4), runs, offset=runs)
+        memoized_planner = TravelPlanner(chat_service, memo=LRUCache())
+        await memoized_planner.plan(inputs(0))
+        memoized = await time_runs(memoized_planner, runs, repeat=True)
+    finally:
+        await client.aclose()
+    
+    print(f"{'mode':>10} {'ms/plan':>10} {'speedup':>8}")
+    for name, seconds in (("serial", serial), ("graph", graph), ("memoized", memoized)):
+        print(f"{name:>10} {seconds * 1000:10.1f} {serial / seconds:7.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    args = parser.parse_args()
+    
+    with StubServer(create_stub_app(latency_ms=args.latency_ms)) as stub:
+        os.environ["DEEPSEEK_API_BASE_URL"] = stub.base_url
+        asyncio.run(compare(args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark prompt prefix stability and upstream payload encoding with prompt templates.
+
+Requests share a system prompt and a long static travel context, but
+clients send the system prompt with different line endings and trailing
+whitespace, and some requests carry a per-request reference note. An
+upstream prompt cache is simulated the way DeepSeek's works: prompts are
+cut into 64-token blocks, and a block is a hit when the same prefix up to
+and including it was sent before. Prompts built ad hoc from the raw
+messages, with the note after or before the static context, are compared
+with prompts built from a template.
+
+A second table times encoding the upstream payload with a plain canonical
+`dumps` and with the template's pre-encoded prefix spliced in.
+
+Usage:
+    python -m benchmarks.bench_prompt_templates --requests 500
+"""
+
+import argparse
+import hashlib
+import random
+import time
+from typing import Dict, List
+
+from serialization import dumps, dumps_spliced
+from services.context_window import estimate_tokens
+from services.prompt_templates import PromptLibrary, PromptTemplate
+
+SYSTEM_PROMPT = "You are a travel planning assistant. Answer concisely with concrete, practical recommendations."
+SYSTEM_VARIANTS = (SYSTEM_PROMPT, SYSTEM_PROMPT + "\n", SYSTEM_PROMPT + " ", SYSTEM_PROMPT.replace(". ", ".\r\n"))
+CITIES = ("Lisbon", "Porto", "Madrid", "Seville", "Rome", "Paris", "Berlin", "Vienna")
+
+# Simulated prompt cache granularity, in estimated tokens
+BLOCK_TOKENS = 64
+
+
+def travel_context(paragraphs: int) -> str:
+    """Static reference context shared by every request."""
+    return "\n\n".join(
+        f"{city}: getting around, neighbourhoods, seasonal weather, opening hours and typical prices. " * 6
+        for city in (CITIES * paragraphs)[:paragraphs]
+    )
+
+
+def adhoc_messages(system_prompt: str, context: str, note: str, message: str, note_first: bool = False) -> List[Dict[str, str]]:
+    """Messages assembled directly from what the caller sent."""
+    notes = [{"role": "system", "content": note}] if note else []
+    static = [{"role": "system", "content": context}]
+    middle = notes + static if note_first else static + notes
+    return [{"role": "system", "content": system_prompt}, *middle, {"role": "user", "content": message}]
+
+
+def prompt_blocks(messages: List[Dict[str, str]]) -> List[str]:
+    """Hashes of each cumulative prefix of the rendered prompt, one per full cache block."""
+    text = "".join(f"<|{m['role']}|>{m['content']}" for m in messages)
+    tokens = estimate_tokens(text)
+    # Cut on characters in proportion to the estimated token count
+    step = max(1, len(text) * BLOCK_TOKENS // max(tokens, 1))
+    return [hashlib.sha1(text[:end].encode()).hexdigest() for end in range(step, len(text) + 1, step)]
+
+
+def cache_hit_rate(prompts: List[List[Dict[str, str]]]) -> float:
+    """Fraction of full prompt blocks served from the simulated prefix cache."""
+    seen = set()
+    hits = total = 0
+    for messages in prompts:
+        blocks = prompt_blocks(messages)
+        for block in blocks:
+            if block not in seen:
+                break
+            hits += 1
+        seen.update(blocks)
+        total += len(blocks)
+    return hits / total if total else 0.0
+
+
+def run(requests: int, paragraphs: int) -> None:
+    """Print simulated prompt cache hit rates and encode timings."""
+    rng = random.Random(7)
+    context = travel_context(paragraphs)
+    library = PromptLibrary([PromptTemplate("planner", system=SYSTEM_PROMPT, context=[context])])
+    template = library.get("planner")
+    
+    adhoc, note_first, templated = [], [], []
+    for i in range(requests):
+        city = rng.choice(CITIES)
+        message = f"Plan {rng.randint(2, 7)} days in {city} for request {i}."
+        note = f"Reference data: {city[:3].upper()} = {city} airport" if rng.random() < 0.5 else ""
+        system_prompt = rng.choice(SYSTEM_VARIANTS)
+        adhoc.append(adhoc_messages(system_prompt, context, note, message))
+        note_first.append(adhoc_messages(system_prompt, context, note, message, note_first=True))
+        templated.append(template.render(message, notes=[note] if note else ()))
+    
+    print(f"static prefix: {estimate_tokens(SYSTEM_PROMPT + context)} tokens, {requests} requests")
+    print(f"{'prompts':>16} {'cache hit rate':>15}")
+    print(f"{'ad hoc':>16} {cache_hit_rate(adhoc):15.1%}")
+    print(f"{'ad hoc, note 1st':>16} {cache_hit_rate(note_first):15.1%}")
+    print(f"{'template':>16} {cache_hit_rate(templated):15.1%}")
+    
+    print(f"\n{'encoding':>10} {'us/payload':>11}")
+    for name, encode in (
+        ("plain", lambda payload: dumps(payload, sort_keys=True)),
+        ("spliced", lambda payload: dumps_spliced(payload, "messages"))
+    ):
+        payloads = [
+            {"model": "deepseek-chat", "messages": messages, "temperature": 0.7, "max_tokens": 1000, "stream": False}
+            for messages in templated
+        ]
+        start = time.perf_counter()
+        for payload in payloads:
+            encode(payload)
+        print(f"{name:>10} {(time.perf_counter() - start) / len(payloads) * 1e6:11.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--context-paragraphs", type=int, default=24, help="Size of the static travel context")
+    args = parser.parse_args()
+    run(args.requests, args.context_paragraphs)
+
+
+if __name__ == "__main__":
+    main()
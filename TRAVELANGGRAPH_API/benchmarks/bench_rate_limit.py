@@ -0,0 +1,101 @@
+"""
+Benchmark the per-request overhead of rate limiting.
+
+Times, per request, the admission check against the in-memory store, a
+trivial ASGI app called with and without `RateLimitMiddleware` in front of
+it, and the admission check against the local Redis-protocol stand-in,
+which adds a loopback round trip. Requests are spread over `--clients`
+API keys. Limits are set high enough that every request is admitted.
+
+Usage:
+    python -m benchmarks.bench_rate_limit --requests 20000 --clients 1000
+"""
+
+import argparse
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Callable, List
+
+from benchmarks.redis_stub import RedisStub
+from clients.resp_client import RespClient
+from rate_limit import RateLimiter, RateLimitMiddleware, RedisBucketStore
+
+LIMITS = (1e9, 1e9, 1e12)
+
+
+async def trivial_app(scope, receive, send) -> None:
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+async def receive() -> dict:
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def send(message: dict) -> None:
+    pass
+
+
+def scopes(app, requests: int, clients: int) -> List[dict]:
+    """ASGI scopes for chat requests from `clients` API keys, round robin."""
+    return [
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/chat/simple",
+            "headers": [(b"content-type", b"application/json"), (b"x-api-key", f"key-{i % clients}".encode())],
+            "app": app
+        }
+        for i in range(requests)
+    ]
+
+
+async def time_per_request(requests: int, call: Callable) -> float:
+    """Microseconds per awaited call."""
+    start = time.perf_counter()
+    for i in range(requests):
+        await call(i)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def run(requests: int, clients: int) -> None:
+    """Print per-request overhead for each configuration."""
+    keys = {f"key-{i}": {"name": f"client-{i}"} for i in range(clients)}
+    limiter = RateLimiter(default_limits=LIMITS, keys=keys)
+    quotas = [limiter.identify(f"key-{i}") for i in range(clients)]
+    app = SimpleNamespace(state=SimpleNamespace(rate_limiter=limiter))
+    requests_scopes = scopes(app, requests, clients)
+    middleware = RateLimitMiddleware(trivial_app)
+    
+    rows = []
+    rows.append(("admit, memory", await time_per_request(requests, lambda i: limiter.admit(quotas[i % clients]))))
+    baseline = await time_per_request(requests, lambda i: trivial_app(requests_scopes[i], receive, send))
+    limited = await time_per_request(requests, lambda i: middleware(requests_scopes[i], receive, send))
+    rows.append(("asgi, no limiter", baseline))
+    rows.append(("asgi, middleware", limited))
+    rows.append(("middleware cost", limited - baseline))
+    
+    with RedisStub() as stub:
+        shared = RateLimiter(RedisBucketStore(RespClient(stub.url)), default_limits=LIMITS, keys=keys)
+        shared_quotas = [shared.identify(f"key-{i}") for i in range(clients)]
+        rounds = max(1, requests // 10)
+        rows.append(("admit, redis stub", await time_per_request(rounds, lambda i: shared.admit(shared_quotas[i % clients]))))
+        await shared.aclose()
+    
+    print(f"{requests} requests from {clients} clients")
+    print(f"{'configuration':>18} {'us/request':>11}")
+    for name, micros in rows:
+        print(f"{name:>18} {micros:11.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.clients))
+
+
+if __name__ == "__main__":
+    main()
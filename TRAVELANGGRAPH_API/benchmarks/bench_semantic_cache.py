@@ -0,0 +1,136 @@
+"""
+Benchmark hit rate, false-hit rate and lookup latency of the semantic cache.
+
+The cache is filled with synthetic travel prompts built from templates,
+cities and months. Lookups are then made with rewordings of cached prompts,
+which should hit, and with prompts that change only the city, month or
+number of days of a cached prompt, which should miss; any hit among those is
+a false hit. Lookup latency is measured one prompt at a time and batched, at
+each cache size.
+
+Usage:
+    python -m benchmarks.bench_semantic_cache --sizes 10000,100000 --lookups 500
+"""
+
+import argparse
+import itertools
+import random
+import time
+from typing import List, Tuple
+
+from services.semantic_cache import HashedNgramEmbedder, SemanticCache, namespace_key
+
+TEMPLATES = [
+    "What should I do in {city} in {month} for {days} days?",
+    "Plan a {days} day trip to {city} in {month}",
+    "Is {city} worth visiting in {month} for {days} days?",
+    "Where should I stay in {city} for {days} nights in {month}?",
+    "Best food to try in {city} during {month} on a {days} day visit"
+]
+
+# A reworded form of each template; rewordings change case, punctuation and abbreviate the month
+REWORDINGS = [
+    "what should i do in {city} in {month_abbr} for {days} days",
+    "PLAN A {days} DAY TRIP TO {city} IN {month}!",
+    "is {city} worth visiting in {month_abbr} for {days} days",
+    "Where should I stay in {city} for {days} nights in {month_abbr}",
+    "best food to try in {city} during {month} on a {days} day visit?"
+]
+
+MONTHS = ["January", "February", "March", "April", "May", "June", "July", "August",
+          "September", "October", "November", "December"]
+
+# Cached prompts use the first half of the year so a month swap never lands on a cached prompt
+CACHED_MONTHS = MONTHS[:6]
+
+NAMESPACE = namespace_key("deepseek-chat", None, 1000)
+
+
+def cities(count: int) -> List[str]:
+    """Synthetic city names, distinct from each other."""
+    syllables = ["ka", "lo", "mi", "ra", "sen", "to", "vi", "por", "lis", "ber", "dan", "qu"]
+    names = ("".join(parts).capitalize() for parts in itertools.product(syllables, repeat=4))
+    return list(itertools.islice(names, count))
+
+
+def city_count(size: int) -> int:
+    """Cities needed for `size` cached prompts."""
+    return size // (len(TEMPLATES) * len(CACHED_MONTHS) * 3) + 1
+
+
+def prompts(size: int, seed: int = 0) -> List[Tuple[int, str, str, int]]:
+    """`size` distinct (template, city, month, days) combinations."""
+    combinations = itertools.product(
+        range(len(TEMPLATES)), cities(city_count(size)), CACHED_MONTHS, (3, 5, 7)
+    )
+    chosen = list(itertools.islice(combinations, size))
+    random.Random(seed).shuffle(chosen)
+    return chosen
+
+
+def render(template: str, city: str, month: str, days: int) -> str:
+    return template.format(city=city, month=month, month_abbr=month[:3], days=days)
+
+
+def fill(size: int, dim: int, threshold: float) -> Tuple[SemanticCache, List[Tuple[int, str, str, int]]]:
+    """A cache holding `size` prompts, and the prompts."""
+    cache = SemanticCache(
+        embedder=HashedNgramEmbedder(dim=dim), threshold=threshold, max_entries=size, initial_capacity=size
+    )
+    entries = prompts(size)
+    for start in range(0, size, 10000):
+        chunk = entries[start:start + 10000]
+        cache.set_many(
+            NAMESPACE,
+            [render(TEMPLATES[t], city, month, days) for t, city, month, days in chunk],
+            [{"ai_response": str(start + i)} for i in range(len(chunk))]
+        )
+    return cache, entries
+
+
+def run(size: int, lookups: int, batch: int, dim: int, threshold: float) -> None:
+    start = time.perf_counter()
+    cache, entries = fill(size, dim, threshold)
+    fill_seconds = time.perf_counter() - start
+    sample = random.Random(1).sample(entries, min(lookups, size))
+    
+    reworded = [render(REWORDINGS[t], city, month, days) for t, city, month, days in sample]
+    # Uncached cities, days and months, so every hit among these is a false hit
+    other_cities = cities(city_count(size) + len(sample))[city_count(size):]
+    changed = []
+    for (t, city, month, days), other_city in zip(sample, other_cities):
+        changed.append(render(TEMPLATES[t], city, month, days + 1))
+        changed.append(render(TEMPLATES[t], city, MONTHS[MONTHS.index(month) + 6], days))
+        changed.append(render(TEMPLATES[t], other_city, month, days))
+    
+    start = time.perf_counter()
+    hits = sum(cache.get(NAMESPACE, prompt) is not None for prompt in reworded)
+    single_us = (time.perf_counter() - start) / len(reworded) * 1e6
+    
+    start = time.perf_counter()
+    false_hits = 0
+    for offset in range(0, len(changed), batch):
+        false_hits += sum(result is not None for result in cache.get_many(NAMESPACE, changed[offset:offset + batch]))
+    batched_us = (time.perf_counter() - start) / len(changed) * 1e6
+    
+    print(f"{size:>9} {fill_seconds:8.2f} {hits / len(reworded):9.1%} {false_hits / len(changed):10.2%} "
+          f"{single_us:12.1f} {batched_us:13.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Cache sizes to measure")
+    parser.add_argument("--lookups", type=int, default=500, help="Reworded prompts looked up per size")
+    parser.add_argument("--batch", type=int, default=32, help="Prompts per batched lookup")
+    parser.add_argument("--dimensions", type=int, default=256)
+    parser.add_argument("--threshold", type=float, default=0.9)
+    args = parser.parse_args()
+    
+    print(f"{'entries':>9} {'fill s':>8} {'hit rate':>9} {'false hit':>10} "
+          f"{'single us':>12} {'batched us':>13}")
+    for size in (int(size) for size in args.sizes.split(",")):
+        run(size, args.lookups, args.batch, args.dimensions, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
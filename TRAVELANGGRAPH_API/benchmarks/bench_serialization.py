@@ -0,0 +1,117 @@
+"""
+Benchmark request-to-bytes overhead per chat endpoint and JSON encoder.
+
+Chat endpoints run in-process against a DeepSeek client whose HTTP transport
+answers instantly from memory, so the time per request is parsing,
+validation, context fitting, upstream payload encoding, response decoding
+and response rendering. Context requests are measured with growing
+conversation histories. A second table compares the stdlib `json` module
+with `serialization` on the same payloads.
+
+Usage:
+    python -m benchmarks.bench_serialization --requests 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Any, Dict, List
+import httpx
+
+os.environ.setdefault("DEEPSEEK_API_KEY", "bench-key")
+
+import serialization
+from clients.deepseek_client import DeepSeekClient
+from dependencies import get_chat_service
+from services.chat_service import ChatService
+from travelanggraph_api.main import app
+
+UPSTREAM_RESPONSE = {
+    "id": "bench",
+    "object": "chat.completion",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "Stub reply " * 40}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 1200, "completion_tokens": 80, "total_tokens": 1280}
+}
+
+
+def history(turns: int) -> List[Dict[str, str]]:
+    """A conversation of `turns` user/assistant messages."""
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"Turn {i}: what about the museums in Porto? " * 4}
+        for i in range(turns)
+    ]
+
+
+def endpoints(sizes: List[int]) -> Dict[str, Dict[str, Any]]:
+    """Request bodies per endpoint, including context requests of each history size."""
+    cases = {"simple": {"path": "/chat/simple", "json": {"message": "Top sights in Lisbon?"}}}
+    for size in sizes:
+        cases[f"context/{size}"] = {"path": "/chat/context", "json": {"messages": history(size)}}
+    cases["batch/10"] = {
+        "path": "/chat/batch",
+        "json": {"requests": [{"messages": history(20)} for _ in range(10)]}
+    }
+    return cases
+
+
+async def time_endpoints(total: int, sizes: List[int]) -> None:
+    """Print microseconds per request for each endpoint."""
+    encoded = serialization.dumps(UPSTREAM_RESPONSE)
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=encoded))
+    provider = DeepSeekClient(http_client=httpx.AsyncClient(transport=transport))
+    chat_service = ChatService(deepseek_client=provider)
+    app.dependency_overrides[get_chat_service] = lambda: chat_service
+    
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            print(f"{'endpoint':>14} {'us/req':>10} {'response bytes':>15}")
+            for name, case in endpoints(sizes).items():
+                for _ in range(min(total, 20)):
+                    await client.post(case["path"], json=case["json"])
+                start = time.perf_counter()
+                for _ in range(total):
+                    response = await client.post(case["path"], json=case["json"])
+                    response.raise_for_status()
+                elapsed = time.perf_counter() - start
+                print(f"{name:>14} {elapsed / total * 1e6:10.1f} {len(response.content):15d}")
+    finally:
+        app.dependency_overrides.clear()
+        await provider.http_client.aclose()
+
+
+def time_encoders(total: int, sizes: List[int]) -> None:
+    """Print encode and decode microseconds per payload for stdlib json and `serialization`."""
+    print(f"\n{'payload':>14} {'json enc':>10} {'fast enc':>10} {'json dec':>10} {'fast dec':>10}")
+    for size in sizes:
+        payload = {"model": "deepseek-chat", "messages": history(size), "temperature": 0.7, "max_tokens": 1000}
+        text = json.dumps(payload)
+        timings = []
+        for fn in (
+            lambda: json.dumps(payload, sort_keys=True, separators=(",", ":")).encode(),
+            lambda: serialization.dumps(payload, sort_keys=True),
+            lambda: json.loads(text),
+            lambda: serialization.loads(text)
+        ):
+            start = time.perf_counter()
+            for _ in range(total):
+                fn()
+            timings.append((time.perf_counter() - start) / total * 1e6)
+        print(f"{f'history/{size}':>14} " + " ".join(f"{t:10.1f}" for t in timings))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--sizes", default="10,100,1000", help="Conversation history sizes")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    
+    print(f"encoder: {'orjson' if serialization.orjson is not None else 'stdlib json'}")
+    asyncio.run(time_endpoints(args.requests, sizes))
+    time_encoders(args.requests, sizes)
+
+
+if __name__ == "__main__":
+    main()
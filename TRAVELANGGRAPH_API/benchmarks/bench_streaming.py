@@ -0,0 +1,61 @@
+"""
+Benchmark time-to-first-token of streamed vs. buffered chat completions.
+
+Usage:
+    python -m benchmarks.bench_streaming --requests 50 --chunk-interval-ms 50
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from contextlib import aclosing
+
+os.environ.setdefault("DEEPSEEK_API_KEY", "bench-key")
+
+from benchmarks.stub_server import StubServer, create_stub_app
+from services.chat_service import ChatService
+from clients.deepseek_client import DeepSeekClient
+
+MESSAGE = "Best time to visit Lisbon?"
+
+
+async def first_byte_latencies(total: int, streamed: bool) -> list:
+    """Measure seconds until the caller has the first piece of the reply."""
+    chat_service = ChatService(deepseek_client=DeepSeekClient())
+    latencies = []
+    
+    for _ in range(total):
+        start = time.perf_counter()
+        if streamed:
+            async with aclosing(chat_service.stream_message(MESSAGE)) as events:
+                async for event in events:
+                    if event["event"] == "token":
+                        latencies.append(time.perf_counter() - start)
+                        break
+        else:
+            await chat_service.send_message(MESSAGE)
+            latencies.append(time.perf_counter() - start)
+    
+    await chat_service.deepseek_client.aclose()
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--chunk-interval-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    
+    app = create_stub_app(latency_ms=args.latency_ms, chunk_interval_ms=args.chunk_interval_ms)
+    with StubServer(app) as stub:
+        os.environ["DEEPSEEK_API_BASE_URL"] = stub.base_url
+        for name, streamed in (("buffered", False), ("streamed", True)):
+            latencies = asyncio.run(first_byte_latencies(args.requests, streamed))
+            print(f"{name:>9}: first content p50 {statistics.median(latencies) * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark throughput of the production server with 1 vs. N worker processes.
+
+Starts the DeepSeek stub and `travelanggraph_api.server` as subprocesses,
+drives the server with the load generator at fixed concurrency, then sends
+SIGTERM and reports how long the server took to drain and exit.
+
+Usage:
+    python -m benchmarks.bench_workers --workers 4 --concurrency 64 --duration 10
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+import httpx
+
+from benchmarks.load_generator import parse_mix, run_load
+from benchmarks.stub_server import _free_port
+
+
+def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    """Poll `url` until it answers or the process exits."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{process.args} exited with {process.returncode}")
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError(f"{url} not ready after {timeout}s")
+
+
+def stop(process: subprocess.Popen) -> float:
+    """Send SIGTERM and return the seconds until the process exited."""
+    start = time.perf_counter()
+    process.send_signal(signal.SIGTERM)
+    process.wait(timeout=60)
+    return time.perf_counter() - start
+
+
+async def drive(base_url: str, args: argparse.Namespace) -> dict:
+    """Run the load generator against a running server."""
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits) as client:
+        return await run_load(client, parse_mix(args.mix), args.duration, concurrency=args.concurrency)
+
+
+def run_server(workers: int, stub_url: str, args: argparse.Namespace) -> None:
+    """Start the server with `workers` processes, load it and shut it down."""
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DEEPSEEK_API_KEY": "bench-key",
+        "DEEPSEEK_API_BASE_URL": stub_url,
+        "CACHE_ENABLED": "false",
+        "LIMITER_MAX_LIMIT": "1000"
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "travelanggraph_api.server", "--workers", str(workers),
+         "--host", "127.0.0.1", "--port", str(port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_ready(f"http://127.0.0.1:{port}/health/ping", server)
+        results = asyncio.run(drive(f"http://127.0.0.1:{port}", args))
+    finally:
+        shutdown_seconds = stop(server)
+    
+    overall = results["scenarios"]["all"]
+    print(f"{workers:>7} {overall['requests']:9d} {overall['errors']:7d} {overall['throughput_rps']:9.1f} "
+          f"{overall['p50_ms']:9.2f} {overall['p99_ms']:9.2f} {shutdown_seconds:11.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--mix", default="simple=4,context=4,health=2")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+    
+    stub_port = _free_port()
+    stub = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.stub_server", "--port", str(stub_port),
+         "--latency-ms", str(args.latency_ms), "--latency-distribution", "fixed"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    try:
+        wait_until_ready(stub_url, stub)
+        print(f"{'workers':>7} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'shutdown s':>11}")
+        for workers in sorted({1, args.workers}):
+            run_server(workers, stub_url, args)
+    finally:
+        stop(stub)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+"""
+Async load generator for the TravelLangGraph API.
+
+Drives /chat/simple, /chat/context and /health/ping at a fixed request rate
+(open loop) or a fixed concurrency (closed loop) and reports throughput,
+p50/p95/p99 latency per endpoint and event-loop lag. By default the app runs
+in-process against a local DeepSeek stub; `--target` drives a running server.
+Open-loop latencies are measured from each request's scheduled start, so a
+stalled server is not hidden by the generator slowing down.
+
+Usage:
+    python -m benchmarks.load_generator --concurrency 20 --duration 10
+    python -m benchmarks.load_generator --rps 200 --duration 10 --save baseline.json
+    python -m benchmarks.load_generator --rps 200 --duration 10 --baseline baseline.json
+    python -m benchmarks.load_generator --target http://localhost:8000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Any, Dict, List, Optional
+import httpx
+
+os.environ.setdefault("DEEPSEEK_API_KEY", "bench-key")
+
+from benchmarks.reporting import compare_results, save_results, summarize_latencies
+from benchmarks.stub_server import LATENCY_DISTRIBUTIONS, StubServer, create_stub_app
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "simple": {
+        "method": "POST",
+        "path": "/chat/simple",
+        "json": {"message": "Top sights in Lisbon?", "temperature": 0.7}
+    },
+    "context": {
+        "method": "POST",
+        "path": "/chat/context",
+        "json": {
+            "messages": [
+                {"role": "system", "content": "You are a travel assistant."},
+                {"role": "user", "content": "Plan a weekend in Porto."},
+                {"role": "assistant", "content": "Day one: Ribeira and the Douro. Day two: Livraria Lello."},
+                {"role": "user", "content": "Where should we eat?"}
+            ],
+            "temperature": 0.7
+        }
+    },
+    "health": {"method": "GET", "path": "/health/ping", "json": None}
+}
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """Parse `simple=4,context=4,health=2` into scenario weights."""
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario: {name}")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+class EventLoopLagMonitor:
+    """Measure how late the event loop wakes a task that sleeps on a fixed interval."""
+    
+    def __init__(self, interval_seconds: float = 0.01):
+        self.interval_seconds = interval_seconds
+        self.lags: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+    
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval_seconds)
+            self.lags.append(max(0.0, time.perf_counter() - start - self.interval_seconds))
+    
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+class LoadResult:
+    """Latencies and error counts per scenario."""
+    
+    def __init__(self, names: List[str]):
+        self.latencies: Dict[str, List[float]] = {name: [] for name in names}
+        self.errors: Dict[str, int] = {name: 0 for name in names}
+    
+    def record(self, name: str, latency: float, ok: bool) -> None:
+        self.latencies[name].append(latency)
+        self.errors[name] += not ok
+    
+    def summary(self, elapsed: float) -> Dict[str, Dict[str, Any]]:
+        scenarios = {}
+        all_latencies = []
+        for name, latencies in self.latencies.items():
+            all_latencies.extend(latencies)
+            scenarios[name] = {
+                "requests": len(latencies),
+                "errors": self.errors[name],
+                "throughput_rps": len(latencies) / elapsed,
+                **summarize_latencies(latencies)
+            }
+        scenarios["all"] = {
+            "requests": len(all_latencies),
+            "errors": sum(self.errors.values()),
+            "throughput_rps": len(all_latencies) / elapsed,
+            **summarize_latencies(all_latencies)
+        }
+        return scenarios
+
+
+async def send(client: httpx.AsyncClient, name: str) -> bool:
+    """Send one scenario request; returns whether it succeeded."""
+    scenario = SCENARIOS[name]
+    try:
+        response = await client.request(scenario["method"], scenario["path"], json=scenario["json"])
+        await response.aread()
+    except httpx.HTTPError:
+        return False
+    if response.status_code >= 400:
+        return False
+    # Chat endpoints report upstream failures in the body with a 200
+    return scenario["method"] != "POST" or response.json().get("status") != "error"
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    weights: Dict[str, float],
+    duration: float,
+    concurrency: Optional[int] = None,
+    rps: Optional[float] = None,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Drive the weighted scenario mix for `duration` seconds.
+    
+    Args:
+        client: HTTP client pointed at the API
+        weights: Scenario name to relative weight
+        duration: Seconds to generate load
+        concurrency: Closed loop with this many workers, each sending its
+            next request when the previous one finishes
+        rps: Open loop at this many request starts per second
+        seed: Seed for the scenario choice
+    
+    Returns:
+        Result dictionary with per-scenario and overall statistics and
+        event-loop lag
+    """
+    if (concurrency is None) == (rps is None):
+        raise ValueError("Set exactly one of concurrency or rps")
+    
+    rng = random.Random(seed)
+    names, cum_weights = list(weights), []
+    for weight in weights.values():
+        cum_weights.append((cum_weights[-1] if cum_weights else 0) + weight)
+    result = LoadResult(names)
+    monitor = EventLoopLagMonitor()
+    monitor.start()
+    start = time.perf_counter()
+    deadline = start + duration
+    
+    async def timed(name: str, scheduled: float) -> None:
+        ok = await send(client, name)
+        result.record(name, time.perf_counter() - scheduled, ok)
+    
+    if concurrency is not None:
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                await timed(rng.choices(names, cum_weights=cum_weights)[0], time.perf_counter())
+        
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    else:
+        tasks = []
+        interval = 1 / rps
+        scheduled = start
+        while scheduled < deadline:
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.ensure_future(timed(rng.choices(names, cum_weights=cum_weights)[0], scheduled)))
+            scheduled += interval
+        await asyncio.gather(*tasks)
+    
+    elapsed = time.perf_counter() - start
+    await monitor.stop()
+    
+    return {
+        "mode": f"concurrency={concurrency}" if concurrency is not None else f"rps={rps}",
+        "duration_seconds": elapsed,
+        "scenarios": result.summary(elapsed),
+        "event_loop_lag": summarize_latencies(monitor.lags)
+    }
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    """Print a results table."""
+    print(f"mode {results['mode']}, {results['duration_seconds']:.1f}s")
+    print(f"{'scenario':>10} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, s in results["scenarios"].items():
+        print(f"{name:>10} {s['requests']:9d} {s['errors']:7d} {s['throughput_rps']:9.1f} "
+              f"{s['p50_ms']:9.2f} {s['p95_ms']:9.2f} {s['p99_ms']:9.2f}")
+    lag = results["event_loop_lag"]
+    print(f"event-loop lag: p50 {lag['p50_ms']:.2f} ms  p99 {lag['p99_ms']:.2f} ms  max {lag['max_ms']:.2f} ms")
+
+
+async def run_in_process(args: argparse.Namespace, weights: Dict[str, float]) -> Dict[str, Any]:
+    """Run the app in this process against the local stub and drive it."""
+    import dependencies
+    from travelanggraph_api.main import app
+    
+    await dependencies.startup(app)
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            return await run_load(client, weights, args.duration, args.concurrency, args.rps, args.seed)
+    finally:
+        await dependencies.shutdown(app)
+
+
+async def run_remote(args: argparse.Namespace, weights: Dict[str, float]) -> Dict[str, Any]:
+    """Drive an API server that is already running."""
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=args.target, timeout=None, limits=limits) as client:
+        return await run_load(client, weights, args.duration, args.concurrency, args.rps, args.seed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--concurrency", type=int)
+    mode.add_argument("--rps", type=float)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--mix", default="simple=4,context=4,health=2")
+    parser.add_argument("--target", help="Base URL of a running server; omit to run in-process")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against results saved by an earlier run")
+    args = parser.parse_args()
+    if args.concurrency is None and args.rps is None:
+        args.concurrency = 10
+    weights = parse_mix(args.mix)
+    
+    if args.target:
+        results = asyncio.run(run_remote(args, weights))
+    else:
+        stub_app = create_stub_app(
+            latency_ms=args.latency_ms,
+            latency_distribution=args.latency_distribution,
+            error_rate=args.error_rate
+        )
+        with StubServer(stub_app) as stub:
+            os.environ["DEEPSEEK_API_BASE_URL"] = stub.base_url
+            results = asyncio.run(run_in_process(args, weights))
+    
+    results["config"] = {
+        "mix": weights,
+        "target": args.target or "in-process",
+        "stub_latency_ms": None if args.target else args.latency_ms,
+        "stub_latency_distribution": None if args.target else args.latency_distribution,
+        "stub_error_rate": None if args.target else args.error_rate
+    }
+    print_report(results)
+    
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        print(f"\ncompared with {args.baseline} (commit {baseline.get('commit')}):")
+        if baseline.get("mode") != results["mode"]:
+            print(f"warning: baseline ran with {baseline.get('mode')}, this run with {results['mode']}")
+        for line in compare_results(baseline, results):
+            print(line)
+    if args.save:
+        save_results(args.save, results)
+        print(f"\nsaved results to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Local Redis-protocol stand-in for rate limit tests and benchmarks.
+
+Speaks RESP2 and runs the rate limiter's Lua scripts with their Python
+twins, so several workers or limiter instances can share buckets without a
+Redis server. Only the commands the rate limiter uses are supported.
+
+Usage:
+    python -m benchmarks.redis_stub --port 6380
+    RATE_LIMIT_BACKEND=redis RATE_LIMIT_REDIS_URL=redis://127.0.0.1:6380/0 travelanggraph-api
+"""
+
+import argparse
+import asyncio
+import hashlib
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from rate_limit import ADMIT_SCRIPT, CHARGE_SCRIPT, ClientQuota, admit_buckets, charge_bucket
+
+
+def _sha(script: str) -> str:
+    return hashlib.sha1(script.encode("utf-8")).hexdigest()
+
+
+def encode_reply(value: Any) -> bytes:
+    """Encode a reply the way Redis converts Lua return values."""
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, Exception):
+        return f"-{value}\r\n".encode("utf-8")
+    if isinstance(value, bool):
+        return b":1\r\n" if value else b"$-1\r\n"
+    if isinstance(value, int):
+        return b":%d\r\n" % value
+    if isinstance(value, list):
+        return b"*%d\r\n" % len(value) + b"".join(encode_reply(item) for item in value)
+    data = str(value).encode("utf-8")
+    return b"$%d\r\n%s\r\n" % (len(data), data)
+
+
+class RedisStubState:
+    """Buckets and loaded scripts; commands run one at a time on the server's event loop, so scripts are atomic."""
+    
+    def __init__(self):
+        self.buckets: Dict[str, List[float]] = {}
+        self.expires: Dict[str, float] = {}
+        self.loaded = set()
+        self.commands = 0
+        self.scripts = {_sha(ADMIT_SCRIPT): self._admit, _sha(CHARGE_SCRIPT): self._charge}
+    
+    def _bucket(self, key: str, capacity: float, now: float) -> List[float]:
+        if key in self.expires and self.expires[key] <= time.time():
+            self.buckets.pop(key, None)
+        return self.buckets.setdefault(key, [capacity, now])
+    
+    def _expire(self, key: str, rate: float, capacity: float) -> None:
+        if rate > 0:
+            self.expires[key] = time.time() + (capacity - self.buckets[key][0]) / rate + 1
+    
+    def _admit(self, keys: List[str], args: List[str]) -> List[Any]:
+        now, cost, request_rate, request_capacity, token_rate, token_capacity = map(float, args)
+        quota = ClientQuota("stub", "stub", request_rate, request_capacity, token_capacity)
+        requests = self._bucket(keys[0], quota.burst, now)
+        tokens = self._bucket(keys[1], token_capacity, now)
+        status, retry_after, request_level, token_level = admit_buckets(requests, tokens, now, quota, cost)
+        self._expire(keys[0], request_rate, quota.burst)
+        self._expire(keys[1], token_rate, token_capacity)
+        return [status, repr(retry_after), repr(request_level), repr(token_level)]
+    
+    def _charge(self, keys: List[str], args: List[str]) -> str:
+        now, rate, capacity, amount = map(float, args)
+        quota = ClientQuota("stub", "stub", 0, 1, capacity)
+        level = charge_bucket(self._bucket(keys[0], capacity, now), now, quota, amount)
+        self._expire(keys[0], rate, capacity)
+        return repr(level)
+    
+    def execute(self, args: List[str]) -> Any:
+        self.commands += 1
+        command = args[0].upper()
+        if command == "PING":
+            return "PONG"
+        if command in ("AUTH", "SELECT"):
+            return "OK"
+        if command == "FLUSHALL":
+            self.buckets.clear()
+            self.expires.clear()
+            return "OK"
+        if command == "SCRIPT" and len(args) > 2 and args[1].upper() == "LOAD":
+            sha = _sha(args[2])
+            if sha not in self.scripts:
+                return Exception("ERR script not supported by the stub")
+            self.loaded.add(sha)
+            return sha
+        if command in ("EVAL", "EVALSHA"):
+            sha = _sha(args[1]) if command == "EVAL" else args[1]
+            if sha not in self.scripts:
+                return Exception("ERR script not supported by the stub")
+            if command == "EVALSHA" and sha not in self.loaded:
+                return Exception("NOSCRIPT No matching script. Please use EVAL.")
+            self.loaded.add(sha)
+            count = int(args[2])
+            return self.scripts[sha](args[3:3 + count], args[3 + count:])
+        return Exception(f"ERR unknown command '{args[0]}'")
+
+
+async def _read_command(reader: asyncio.StreamReader) -> Optional[List[str]]:
+    """Read one command sent as a RESP array of bulk strings; None when the client disconnects."""
+    line = await reader.readline()
+    if not line:
+        return None
+    count = int(line[1:-2])
+    args = []
+    for _ in range(count):
+        length = int((await reader.readline())[1:-2])
+        args.append((await reader.readexactly(length + 2))[:-2].decode("utf-8"))
+    return args
+
+
+def connection_handler(state: RedisStubState):
+    """Build an `asyncio.start_server` callback running commands against `state`."""
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while (args := await _read_command(reader)) is not None:
+                writer.write(encode_reply(state.execute(args)))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # Client went away, or the stand-in is shutting down
+            pass
+        finally:
+            writer.close()
+    
+    return handle
+
+
+def _free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class RedisStub:
+    """Run the stand-in on a background thread with its own event loop."""
+    
+    def __init__(self, port: Optional[int] = None):
+        self.port = port or _free_port()
+        self.state = RedisStubState()
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+    
+    @property
+    def url(self) -> str:
+        """URL to use as RATE_LIMIT_REDIS_URL."""
+        return f"redis://127.0.0.1:{self.port}/0"
+    
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(asyncio.start_server(connection_handler(self.state), "127.0.0.1", self.port))
+        self._started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            server.close()
+            # Cancel handlers of connections still open so they close before the loop does
+            tasks = asyncio.all_tasks(self._loop)
+            for task in tasks:
+                task.cancel()
+            self._loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            self._loop.close()
+    
+    def __enter__(self) -> "RedisStub":
+        self._thread.start()
+        self._started.wait()
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+async def serve(port: int) -> None:
+    server = await asyncio.start_server(connection_handler(RedisStubState()), "127.0.0.1", port)
+    print(f"Redis stub listening on redis://127.0.0.1:{port}/0; set RATE_LIMIT_REDIS_URL to it")
+    async with server:
+        await server.serve_forever()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the Redis-protocol stand-in on a fixed port.")
+    parser.add_argument("--port", type=int, default=6380)
+    args = parser.parse_args()
+    asyncio.run(serve(args.port))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Latency statistics and baseline results for benchmarks.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import time
+from typing import Any, Dict, List, Optional
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(0, int(round(pct / 100 * len(ordered))) - 1)]
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    """Summarize latencies in seconds as p50/p95/p99/max in milliseconds."""
+    if not latencies:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    return {
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": max(latencies) * 1000
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Current git commit, or None outside a repository."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save_results(path: str, results: Dict[str, Any]) -> None:
+    """Save results as JSON together with the commit and machine they came from."""
+    document = {
+        "commit": git_commit(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        **results
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float = 0.1) -> List[str]:
+    """
+    Compare per-scenario results against a baseline.
+    
+    Args:
+        baseline: Results saved by an earlier run
+        current: Results of this run
+        tolerance: Relative change counted as a regression
+    
+    Returns:
+        One line per compared metric, marked `REGRESSION` where throughput
+        dropped or latency rose by more than `tolerance`
+    """
+    lines = []
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        for metric in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms"):
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = change < -tolerance if metric == "throughput_rps" else change > tolerance
+            marker = "  REGRESSION" if worse else ""
+            lines.append(f"{name:>10} {metric:>15}: {old:10.2f} -> {new:10.2f} ({change:+.1%}){marker}")
+    return lines
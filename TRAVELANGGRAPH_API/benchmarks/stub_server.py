@@ -0,0 +1,199 @@
+"""
+Local stub of the DeepSeek chat completions API for benchmarks.
+
+Usage:
+    python -m benchmarks.stub_server --port 9000 --latency-ms 200 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import socket
+import threading
+import time
+from typing import Optional
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+import uvicorn
+
+STREAM_TOKENS = ["Stub", " reply", " streamed", " token", " by", " token."]
+
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "exponential", "lognormal")
+
+
+def sample_latency_ms(mean_ms: float, distribution: str = "fixed", sigma: float = 0.5) -> float:
+    """
+    Draw one latency with the given mean.
+    
+    Args:
+        mean_ms: Mean latency in milliseconds
+        distribution: `fixed`, `uniform` (0 to twice the mean), `exponential`
+            or `lognormal` (long tail controlled by `sigma`)
+        sigma: Shape of the lognormal distribution
+    
+    Returns:
+        Latency in milliseconds
+    """
+    if mean_ms <= 0 or distribution == "fixed":
+        return max(mean_ms, 0.0)
+    if distribution == "uniform":
+        return random.uniform(0, 2 * mean_ms)
+    if distribution == "exponential":
+        return random.expovariate(1 / mean_ms)
+    if distribution == "lognormal":
+        # Choose mu so the distribution's mean equals mean_ms
+        return random.lognormvariate(math.log(mean_ms) - sigma ** 2 / 2, sigma)
+    raise ValueError(f"Unknown latency distribution: {distribution}")
+
+
+def create_stub_app(
+    latency_ms: float = 0.0,
+    chunk_interval_ms: float = 0.0,
+    error_rate: float = 0.0,
+    fail_first: int = 0,
+    error_status: int = 503,
+    retry_after: Optional[float] = None,
+    prompt_token_latency_us: float = 0.0,
+    latency_distribution: str = "fixed",
+    latency_sigma: float = 0.5
+) -> FastAPI:
+    """
+    Create a FastAPI app that mimics the DeepSeek `/chat/completions` API.
+    
+    Args:
+        latency_ms: Mean artificial delay before the first byte of every completion
+        chunk_interval_ms: Delay between chunks of streamed completions
+        error_rate: Fraction of requests answered with `error_status`
+        fail_first: Number of initial requests answered with `error_status`
+        error_status: HTTP status used for injected faults
+        retry_after: Optional `Retry-After` seconds sent with injected faults
+        prompt_token_latency_us: Extra delay per prompt token (about 4 chars),
+            simulating prefill cost
+        latency_distribution: Distribution of the delay around `latency_ms`
+            (see `sample_latency_ms`)
+        latency_sigma: Shape of the `lognormal` distribution
+    
+    Returns:
+        Stub FastAPI application
+    """
+    app = FastAPI()
+    app.state.request_count = 0
+    
+    @app.post("/chat/completions")
+    async def chat_completions(payload: dict):
+        app.state.request_count += 1
+        prompt_chars = sum(len(m.get("content", "")) for m in payload.get("messages", []))
+        delay_ms = sample_latency_ms(latency_ms, latency_distribution, latency_sigma)
+        delay_ms += prompt_token_latency_us * prompt_chars / 4 / 1000
+        if delay_ms:
+            await asyncio.sleep(delay_ms / 1000)
+        
+        if app.state.request_count <= fail_first or random.random() < error_rate:
+            headers = {"Retry-After": str(retry_after)} if retry_after is not None else None
+            return JSONResponse({"error": {"message": "Injected fault"}}, status_code=error_status, headers=headers)
+        
+        if payload.get("stream"):
+            include_usage = (payload.get("stream_options") or {}).get("include_usage", False)
+            return StreamingResponse(stream_chunks(prompt_chars, include_usage), media_type="text/event-stream")
+        
+        if chunk_interval_ms:
+            await asyncio.sleep(chunk_interval_ms * len(STREAM_TOKENS) / 1000)
+        
+        return {
+            "id": f"stub-{app.state.request_count}",
+            "object": "chat.completion",
+            "model": payload.get("model", "deepseek-chat"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "Stub reply."},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": 3,
+                "total_tokens": prompt_chars // 4 + 3
+            }
+        }
+    
+    async def stream_chunks(prompt_chars: int, include_usage: bool):
+        for token in STREAM_TOKENS:
+            chunk = {"object": "chat.completion.chunk", "choices": [{"index": 0, "delta": {"content": token}}]}
+            yield f"data: {json.dumps(chunk)}\n\n"
+            if chunk_interval_ms:
+                await asyncio.sleep(chunk_interval_ms / 1000)
+        if include_usage:
+            # Sent last with no choices, as with `stream_options.include_usage`
+            usage = {
+                "prompt_tokens": prompt_chars // 4,
+                "completion_tokens": len(STREAM_TOKENS),
+                "total_tokens": prompt_chars // 4 + len(STREAM_TOKENS)
+            }
+            chunk = {"object": "chat.completion.chunk", "choices": [], "usage": usage}
+            yield f"data: {json.dumps(chunk)}\n\n"
+        yield "data: [DONE]\n\n"
+    
+    return app
+
+
+def _free_port() -> int:
+    """Find a free local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StubServer:
+    """Run the stub app with uvicorn on a background thread."""
+    
+    def __init__(self, app: Optional[FastAPI] = None, port: Optional[int] = None):
+        self.app = app or create_stub_app()
+        self.port = port or _free_port()
+        self._server = uvicorn.Server(uvicorn.Config(
+            self.app, host="127.0.0.1", port=self.port, log_level="warning"
+        ))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+    
+    @property
+    def base_url(self) -> str:
+        """Base URL to use as DEEPSEEK_API_BASE_URL."""
+        return f"http://127.0.0.1:{self.port}"
+    
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the DeepSeek stub on a fixed port.")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--latency-distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--chunk-interval-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    args = parser.parse_args()
+    
+    app = create_stub_app(
+        latency_ms=args.latency_ms,
+        chunk_interval_ms=args.chunk_interval_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        latency_distribution=args.latency_distribution,
+        latency_sigma=args.latency_sigma
+    )
+    print(f"DeepSeek stub listening on http://127.0.0.1:{args.port}; set DEEPSEEK_API_BASE_URL to it")
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
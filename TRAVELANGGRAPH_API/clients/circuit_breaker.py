@@ -0,0 +1,183 @@
+"""
+Circuit breaker for TravelLangGraph API clients.
+"""
+
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Tuple
+import time
+import httpx
+from clients.concurrency_limiter import UpstreamOverloadedError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitOpenError(UpstreamOverloadedError):
+    """Raised without calling the upstream while the circuit is open."""
+    
+    code = "circuit_open"
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """Check whether an error means the upstream itself is failing."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code == 429 or error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+class CircuitBreaker:
+    """
+    Circuit breaker driven by a rolling error-rate and slow-call window.
+    
+    While closed, outcomes of the last `window_seconds` are tracked. Once the
+    window holds at least `min_requests` calls and the failure or slow-call
+    rate crosses its threshold, the circuit opens and calls fail immediately
+    with `CircuitOpenError`. After `open_seconds` the circuit goes half-open
+    and lets `half_open_probes` calls through; a successful probe closes it
+    and a failed one opens it again.
+    """
+    
+    def __init__(
+        self,
+        window_seconds: float = 30.0,
+        min_requests: int = 10,
+        error_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 20.0,
+        slow_rate_threshold: float = 0.8,
+        open_seconds: float = 15.0,
+        half_open_probes: int = 1
+    ):
+        self.window_seconds = window_seconds
+        self.min_requests = min_requests
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_rate_threshold = slow_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._window: Deque[Tuple[float, bool, bool]] = deque()
+        self._failures = 0
+        self._slow_calls = 0
+        self.rejected = 0
+        self.times_opened = 0
+    
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the open period ends."""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_in_flight = 0
+        return self._state
+    
+    def _retry_after(self) -> float:
+        """Seconds until the circuit will allow a probe."""
+        return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+    
+    def before_call(self) -> None:
+        """
+        Admit a call or fail fast.
+        
+        Raises:
+            CircuitOpenError: If the circuit is open or half-open probes are taken
+        """
+        state = self.state
+        if state == CLOSED:
+            return
+        if state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+            self._probes_in_flight += 1
+            return
+        
+        self.rejected += 1
+        raise CircuitOpenError("DeepSeek circuit breaker is open", self._retry_after())
+    
+    def record(self, failed: bool, latency: float = 0.0) -> None:
+        """
+        Record the outcome of an admitted call.
+        
+        Args:
+            failed: Whether the upstream failed
+            latency: Call duration in seconds; 0 skips slow-call tracking
+        """
+        if self._state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+            if failed:
+                self._open()
+            else:
+                self._close()
+            return
+        
+        now = time.monotonic()
+        slow = latency > self.slow_call_seconds
+        self._window.append((now, failed, slow))
+        self._failures += failed
+        self._slow_calls += slow
+        self._prune(now)
+        
+        total = len(self._window)
+        if self._state == CLOSED and total >= self.min_requests and (
+            self._failures / total >= self.error_rate_threshold
+            or self._slow_calls / total >= self.slow_rate_threshold
+        ):
+            self._open()
+    
+    def record_ignored(self) -> None:
+        """Release an admitted call that ended without an upstream outcome."""
+        if self._state == HALF_OPEN:
+            self._probes_in_flight = max(0, self._probes_in_flight - 1)
+    
+    def _prune(self, now: float) -> None:
+        """Drop outcomes older than the rolling window."""
+        while self._window and now - self._window[0][0] > self.window_seconds:
+            _, failed, slow = self._window.popleft()
+            self._failures -= failed
+            self._slow_calls -= slow
+    
+    def _open(self) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+    
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._window.clear()
+        self._failures = 0
+        self._slow_calls = 0
+    
+    @asynccontextmanager
+    async def guard(self, measure_latency: bool = True) -> AsyncIterator[None]:
+        """
+        Admit a call and record its outcome when the block exits.
+        
+        Args:
+            measure_latency: Whether the block's duration counts toward
+                slow-call tracking. Disable for streams.
+        """
+        self.before_call()
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            if is_upstream_failure(e):
+                self.record(failed=True)
+            elif isinstance(e, httpx.HTTPStatusError):
+                # The upstream answered; a client error says nothing about its health
+                self.record(failed=False)
+            else:
+                self.record_ignored()
+            raise
+        self.record(failed=False, latency=time.perf_counter() - start if measure_latency else 0.0)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get breaker state and window counters."""
+        state = self.state
+        self._prune(time.monotonic())
+        return {
+            "state": state,
+            "window_requests": len(self._window),
+            "window_failures": self._failures,
+            "window_slow_calls": self._slow_calls,
+            "retry_after_seconds": round(self._retry_after(), 3) if state == OPEN else 0.0,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
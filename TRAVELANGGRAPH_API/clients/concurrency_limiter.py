@@ -0,0 +1,184 @@
+"""
+Adaptive concurrency limiter for TravelLangGraph API clients.
+"""
+
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+import asyncio
+import math
+import time
+import httpx
+
+class UpstreamOverloadedError(Exception):
+    """Raised when a request is shed because the upstream is saturated."""
+    
+    code = "upstream_overloaded"
+    
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+    
+    @property
+    def retry_after_header(self) -> str:
+        """`Retry-After` header value in whole seconds."""
+        return str(max(1, math.ceil(self.retry_after)))
+
+def is_overload_signal(error: BaseException) -> bool:
+    """Check whether an upstream error means the upstream is saturated."""
+    if isinstance(error, httpx.TimeoutException):
+        return True
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in (429, 503)
+    return False
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limiter with a bounded wait queue.
+    
+    The limit grows by roughly one slot per limit's worth of fast, successful
+    requests and shrinks multiplicatively when a request is slower than the
+    latency target or the upstream signals overload (429, 503, timeout).
+    Requests beyond the limit wait in a FIFO queue up to their deadline;
+    when the queue is full they are rejected immediately.
+    """
+    
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        max_queue: int = 100,
+        queue_timeout_seconds: float = 10.0,
+        latency_target_seconds: float = 20.0,
+        backoff_ratio: float = 0.9
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.latency_target_seconds = latency_target_seconds
+        self.backoff_ratio = backoff_ratio
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._avg_latency = 1.0
+        self.rejected = 0
+        self.timed_out = 0
+    
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return int(self._limit)
+    
+    @property
+    def in_flight(self) -> int:
+        """Requests currently holding a slot."""
+        return self._in_flight
+    
+    @property
+    def queue_depth(self) -> int:
+        """Requests waiting for a slot."""
+        return len(self._waiters)
+    
+    def _retry_after(self) -> float:
+        """Estimate seconds until a queued request would get a slot."""
+        return (self.queue_depth + 1) / max(self.limit, 1) * self._avg_latency
+    
+    async def acquire(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for a slot.
+        
+        Args:
+            timeout: Maximum seconds to wait in the queue. Defaults to
+                `queue_timeout_seconds`.
+            
+        Raises:
+            UpstreamOverloadedError: If the queue is full or the deadline passes
+        """
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+        
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise UpstreamOverloadedError("Upstream concurrency limit reached; queue is full", self._retry_after())
+        
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout if timeout is not None else self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise UpstreamOverloadedError("Timed out waiting for an upstream slot", self._retry_after())
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled
+                self._release_slot()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+    
+    def release(self, latency: Optional[float] = None, error: Optional[BaseException] = None) -> None:
+        """
+        Return a slot and adapt the limit.
+        
+        Args:
+            latency: Observed request latency, or None to skip latency feedback
+            error: Exception raised by the request, if any
+        """
+        if error is not None and is_overload_signal(error):
+            self._decrease()
+        elif latency is not None and error is None:
+            self._avg_latency = 0.9 * self._avg_latency + 0.1 * latency
+            if latency > self.latency_target_seconds:
+                self._decrease()
+            else:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+        
+        self._release_slot()
+    
+    def _decrease(self) -> None:
+        """Shrink the limit multiplicatively."""
+        self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+    
+    def _release_slot(self) -> None:
+        """Free a slot and hand free slots to queued waiters in FIFO order."""
+        self._in_flight -= 1
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+    
+    @asynccontextmanager
+    async def slot(self, timeout: Optional[float] = None, measure_latency: bool = True) -> AsyncIterator[None]:
+        """
+        Hold a slot for the duration of the block.
+        
+        Args:
+            timeout: Maximum seconds to wait in the queue
+            measure_latency: Whether the block's duration feeds the limit.
+                Disable for streams, whose duration reflects output length.
+        """
+        await self.acquire(timeout)
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            self.release(error=e)
+            raise
+        self.release(latency=time.perf_counter() - start if measure_latency else None)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get limiter state and counters."""
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "average_latency_seconds": self._avg_latency,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out
+        }
@@ -3,20 +3,94 @@ DeepSeek API client for TravelLangGraph API.
 """
 
 import os
+import asyncio
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
 import httpx
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any
 from datetime import datetime
 import logging
+from config import settings
+from clients.single_flight import SingleFlight
+from clients.concurrency_limiter import AdaptiveConcurrencyLimiter, UpstreamOverloadedError
+from clients.retry_policy import RetryBudget, RetryPolicy
+from clients.circuit_breaker import OPEN, HALF_OPEN, CircuitBreaker
+from clients.provider import ChatProvider
+from metrics import UPSTREAM_DURATION, UPSTREAM_REQUESTS, UPSTREAM_RETRIES, UPSTREAM_TTFB
+from tracing import HttpcoreSpans, current_trace, propagation_headers, record_span, span
+from serialization import dumps_spliced, loads
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
-class DeepSeekClient:
+
+def upstream_outcome(error: Optional[BaseException]) -> str:
+    """Label an upstream attempt as `success`, `shed` or `error` for metrics."""
+    if error is None:
+        return "success"
+    return "shed" if isinstance(error, UpstreamOverloadedError) else "error"
+
+def build_http_client() -> httpx.AsyncClient:
+    """
+    Build a pooled async HTTP client for the DeepSeek API.
+    
+    Pool limits, keep-alive and per-phase timeouts come from settings.
+    HTTP/2 is used when enabled and the `h2` package is installed.
+    
+    Returns:
+        Configured httpx.AsyncClient
+    """
+    http2 = settings.DEEPSEEK_HTTP2 and HTTP2_AVAILABLE
+    if settings.DEEPSEEK_HTTP2 and not HTTP2_AVAILABLE:
+        logger.warning("HTTP/2 requested but 'h2' is not installed; falling back to HTTP/1.1")
+    
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.DEEPSEEK_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.DEEPSEEK_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.DEEPSEEK_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.DEEPSEEK_CONNECT_TIMEOUT,
+            read=settings.DEEPSEEK_READ_TIMEOUT,
+            write=settings.DEEPSEEK_WRITE_TIMEOUT,
+            pool=settings.DEEPSEEK_POOL_TIMEOUT
+        )
+    )
+
+class DeepSeekClient(ChatProvider):
     """Client for interacting with DeepSeek API."""
     
-    def __init__(self):
-        """Initialize DeepSeek client with API key from environment."""
-        self.api_key = os.getenv("DEEPSEEK_API_KEY")
-        self.base_url = os.getenv("DEEPSEEK_API_BASE_URL", "https://api.deepseek.com/v1")
+    name = "deepseek"
+    
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        model: Optional[str] = None
+    ):
+        """
+        Initialize DeepSeek client with API key from environment.
+        
+        Args:
+            http_client: Optional pre-built async HTTP client. When omitted, a
+                pooled client is created on first use and owned by this instance.
+            api_key: Optional API key. Read from `DEEPSEEK_API_KEY` when omitted.
+            base_url: Optional API base URL. Read from `DEEPSEEK_API_BASE_URL`
+                when omitted.
+            model: Optional model served by this endpoint. When set, it
+                replaces the model named in each request.
+        """
+        self.api_key = api_key if api_key is not None else os.getenv("DEEPSEEK_API_KEY")
+        self.base_url = base_url or os.getenv("DEEPSEEK_API_BASE_URL", "https://api.deepseek.com/v1")
+        self.model = model
         
         if not self.api_key:
             raise ValueError("DEEPSEEK_API_KEY environment variable is required")
@@ -26,7 +100,77 @@ class DeepSeekClient:
             "Content-Type": "application/json"
         }
         
-        logger.info("DeepSeek client initialized successfully")
+        self._http_client = http_client
+        self._owns_http_client = http_client is None
+        self._single_flight = SingleFlight() if settings.DEEPSEEK_COALESCE_REQUESTS else None
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=settings.LIMITER_INITIAL_LIMIT,
+            min_limit=settings.LIMITER_MIN_LIMIT,
+            max_limit=settings.LIMITER_MAX_LIMIT,
+            max_queue=settings.LIMITER_MAX_QUEUE,
+            queue_timeout_seconds=settings.LIMITER_QUEUE_TIMEOUT_SECONDS,
+            latency_target_seconds=settings.LIMITER_LATENCY_TARGET_SECONDS
+        ) if settings.LIMITER_ENABLED else None
+        self.breaker = CircuitBreaker(
+            window_seconds=settings.BREAKER_WINDOW_SECONDS,
+            min_requests=settings.BREAKER_MIN_REQUESTS,
+            error_rate_threshold=settings.BREAKER_ERROR_RATE_THRESHOLD,
+            slow_call_seconds=settings.BREAKER_SLOW_CALL_SECONDS,
+            slow_rate_threshold=settings.BREAKER_SLOW_RATE_THRESHOLD,
+            open_seconds=settings.BREAKER_OPEN_SECONDS,
+            half_open_probes=settings.BREAKER_HALF_OPEN_PROBES
+        ) if settings.BREAKER_ENABLED else None
+        self.retry_policy = RetryPolicy(
+            max_attempts=settings.RETRY_MAX_ATTEMPTS,
+            base_delay_seconds=settings.RETRY_BASE_DELAY_SECONDS,
+            max_delay_seconds=settings.RETRY_MAX_DELAY_SECONDS,
+            max_retry_after_seconds=settings.RETRY_MAX_RETRY_AFTER_SECONDS,
+            budget=RetryBudget(
+                ratio=settings.RETRY_BUDGET_RATIO,
+                min_per_second=settings.RETRY_BUDGET_MIN_PER_SECOND
+            )
+        )
+        
+        logger.info(f"Chat provider '{self.name}' initialized successfully")
+    
+    @property
+    def available(self) -> bool:
+        """Whether the circuit breaker currently lets requests through."""
+        return self.breaker is None or self.breaker.state != OPEN
+    
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        """Get the shared pooled HTTP client, creating it on first use."""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = build_http_client()
+            self._owns_http_client = True
+        return self._http_client
+    
+    async def start(self) -> None:
+        """
+        Open the connection pool ahead of the first request.
+        
+        With `DEEPSEEK_WARM_CONNECTIONS` set, that many concurrent `GET /models`
+        requests are sent so connection setup and TLS handshakes are done
+        before the instance reports ready. Warmup failures are logged only.
+        """
+        client = self.http_client
+        count = settings.DEEPSEEK_WARM_CONNECTIONS
+        if count <= 0:
+            return
+        results = await asyncio.gather(
+            *(client.get(f"{self.base_url}/models", headers=self.headers) for _ in range(count)),
+            return_exceptions=True
+        )
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            logger.warning(f"Chat provider '{self.name}' warmup: {len(failures)} of {count} requests failed: {failures[0]!r}")
+    
+    async def aclose(self) -> None:
+        """Close the connection pool if this client owns it."""
+        if self._http_client is not None and self._owns_http_client:
+            await self._http_client.aclose()
+        self._http_client = None
     
     async def chat_completion(
         self,
@@ -44,61 +188,272 @@ class DeepSeekClient:
             model: Model to use for completion
             temperature: Sampling temperature (0.0 to 2.0)
             max_tokens: Maximum tokens to generate
-            stream: Whether to stream the response
+            stream: Whether to stream the response; use
+                `stream_chat_completion` to consume streamed chunks
+            
+        Returns:
+            API response dictionary. Concurrent identical requests share one
+            upstream call and receive the same dictionary, so treat it as
+            read-only.
+            
+        Raises:
+            UpstreamOverloadedError: If the concurrency limiter sheds the request
+        """
+        if stream:
+            raise ValueError("Use stream_chat_completion for streamed responses")
+        
+        payload = {
+            "model": self.model or model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": stream
+        }
+        
+        # Encoded once, canonically, as both the request body and the coalescing key;
+        # a prompt template's static prefix is spliced in pre-encoded
+        with span("upstream.encode"):
+            body = dumps_spliced(payload, "messages")
+        if self._single_flight is None:
+            return await self._post_completion(body)
+        
+        return await self._single_flight.do(body, lambda: self._post_completion(body))
+    
+    async def _post_completion(self, body: bytes) -> Dict[str, Any]:
+        """
+        Post a chat completion payload to DeepSeek API, retrying transient failures.
+        
+        Each attempt is logged and recorded in metrics with its duration and
+        outcome. Backoff sleeps happen outside the concurrency limiter so
+        they do not hold a slot.
+        
+        Args:
+            body: Encoded request body for `/chat/completions`
+            
+        Returns:
+            API response dictionary
+        """
+        policy = self.retry_policy
+        policy.budget.deposit()
+        attempt = 0
+        
+        while True:
+            attempt += 1
+            policy.attempts += 1
+            start = time.perf_counter()
+            try:
+                with span("upstream.attempt", provider=self.name, attempt=attempt):
+                    response = await self._post_completion_attempt(body)
+            except Exception as e:
+                duration = time.perf_counter() - start
+                UPSTREAM_REQUESTS.inc(self.name, upstream_outcome(e))
+                UPSTREAM_DURATION.observe(duration, self.name, upstream_outcome(e))
+                delay = policy.next_delay(attempt, e)
+                if delay is None:
+                    if policy.is_retryable(e):
+                        policy.gave_up += 1
+                    logger.warning(f"DeepSeek attempt {attempt} failed after {duration:.3f}s: {e!r}; giving up")
+                    raise
+                
+                policy.retries += 1
+                UPSTREAM_RETRIES.inc(self.name)
+                logger.warning(f"DeepSeek attempt {attempt} failed after {duration:.3f}s: {e!r}; retrying in {delay:.3f}s")
+                with span("upstream.backoff", attempt=attempt):
+                    await asyncio.sleep(delay)
+                continue
+            
+            duration = time.perf_counter() - start
+            UPSTREAM_REQUESTS.inc(self.name, "success")
+            UPSTREAM_DURATION.observe(duration, self.name, "success")
+            if attempt > 1:
+                logger.info(f"DeepSeek attempt {attempt} succeeded after {duration:.3f}s")
+            return response
+    
+    async def _post_completion_attempt(self, body: bytes) -> Dict[str, Any]:
+        """
+        Make one chat completion attempt through the circuit breaker and concurrency limiter.
+        
+        Args:
+            body: Encoded request body for `/chat/completions`
+            
+        Returns:
+            API response dictionary
+        """
+        async with self._upstream_slot():
+            return await self._send_completion(body)
+    
+    async def _send_completion(self, body: bytes) -> Dict[str, Any]:
+        """
+        Send a chat completion payload to DeepSeek API.
+        
+        The response is opened as a stream so time to first byte can be
+        recorded before the body is read. Within a traced request, request
+        building, pool wait, connection phases and decoding are recorded as
+        spans and the trace context is sent upstream.
+        
+        Args:
+            body: Encoded request body for `/chat/completions`
             
         Returns:
             API response dictionary
         """
         try:
-            payload = {
-                "model": model,
-                "messages": messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens,
-                "stream": stream
-            }
+            connection_spans = HttpcoreSpans() if current_trace() is not None else None
+            start = time.perf_counter()
+            request = self.http_client.build_request(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                headers={**self.headers, **propagation_headers()} if connection_spans else self.headers,
+                content=body,
+                extensions={"trace": connection_spans} if connection_spans else None
+            )
+            if connection_spans:
+                record_span("upstream.build_request", start)
+                connection_spans.mark_sent()
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=self.headers,
-                    json=payload,
-                    timeout=30.0
-                )
+            sent = time.perf_counter()
+            response = await self.http_client.send(request, stream=True)
+            UPSTREAM_TTFB.observe(time.perf_counter() - sent, self.name, "false")
+            try:
+                await response.aread()
+            finally:
+                await response.aclose()
+            
+            response.raise_for_status()
+            with span("upstream.decode"):
+                return loads(response.content)
                 
+        except httpx.HTTPStatusError as e:
+            logger.error(f"DeepSeek API HTTP error: {e.response.status_code} - {e.response.text}")
+            raise
+        except httpx.RequestError as e:
+            logger.error(f"DeepSeek API request error: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"DeepSeek API unexpected error: {e}")
+            raise
+    
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "deepseek-chat",
+        temperature: float = 0.7,
+        max_tokens: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a chat completion from DeepSeek API as parsed SSE chunks.
+        
+        Chunks are read from the socket only as the caller consumes them, so
+        a slow consumer applies backpressure to the upstream connection.
+        Closing or cancelling the generator closes the upstream response.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            model: Model to use for completion
+            temperature: Sampling temperature (0.0 to 2.0)
+            max_tokens: Maximum tokens to generate
+            
+        Yields:
+            Parsed `chat.completion.chunk` dictionaries
+        """
+        payload = {
+            "model": self.model or model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+            "stream_options": {"include_usage": True}
+        }
+        
+        traced = current_trace() is not None
+        start = time.perf_counter()
+        outcome_error: Optional[BaseException] = None
+        try:
+            async with self._upstream_slot(measure_latency=False), self.http_client.stream(
+                "POST",
+                f"{self.base_url}/chat/completions",
+                headers={**self.headers, **propagation_headers()} if traced else self.headers,
+                content=dumps_spliced(payload, "messages"),
+                extensions={"trace": HttpcoreSpans()} if traced else None
+            ) as response:
+                UPSTREAM_TTFB.observe(time.perf_counter() - start, self.name, "true")
+                if response.is_error:
+                    await response.aread()
                 response.raise_for_status()
-                return response.json()
                 
+                async for line in response.aiter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        break
+                    yield loads(data)
+                    
         except httpx.HTTPStatusError as e:
+            outcome_error = e
             logger.error(f"DeepSeek API HTTP error: {e.response.status_code} - {e.response.text}")
             raise
         except httpx.RequestError as e:
+            outcome_error = e
             logger.error(f"DeepSeek API request error: {e}")
             raise
         except Exception as e:
-            logger.error(f"DeepSeek API unexpected error: {e}")
+            outcome_error = e
             raise
+        finally:
+            # Stream duration reflects output length, so only the outcome is counted
+            UPSTREAM_REQUESTS.inc(self.name, upstream_outcome(outcome_error))
+    
+    @asynccontextmanager
+    async def _upstream_slot(self, measure_latency: bool = True) -> AsyncIterator[None]:
+        """
+        Pass the circuit breaker, then hold a concurrency limiter slot.
+        
+        Args:
+            measure_latency: Whether the call duration feeds the breaker and
+                limiter. Disabled for streams, whose duration reflects output length.
+        """
+        async with AsyncExitStack() as stack:
+            if self.breaker is not None:
+                await stack.enter_async_context(self.breaker.guard(measure_latency=measure_latency))
+            if self.limiter is not None:
+                wait_start = time.perf_counter()
+                await stack.enter_async_context(self.limiter.slot(measure_latency=measure_latency))
+                record_span("upstream.limiter_wait", wait_start)
+            yield
     
-    async def simple_chat(self, message: str, system_prompt: Optional[str] = None) -> str:
+    async def simple_chat(
+        self,
+        message: str,
+        system_prompt: Optional[str] = None,
+        model: str = "deepseek-chat",
+        temperature: float = 0.7,
+        max_tokens: int = 1000
+    ) -> str:
         """
         Simple chat method for basic conversations.
         
         Args:
             message: User message
             system_prompt: Optional system prompt
+            model: Model to use
+            temperature: Sampling temperature (0.0 to 2.0)
+            max_tokens: Maximum tokens to generate
             
         Returns:
             AI response text
         """
-        messages = []
-        
-        if system_prompt:
-            messages.append({"role": "system", "content": system_prompt})
-        
-        messages.append({"role": "user", "content": message})
+        # Imported here because services import this module at startup
+        from services.prompt_templates import compile_prompt
+        messages = compile_prompt((system_prompt,) if system_prompt else ()).render(message)
         
         try:
-            response = await self.chat_completion(messages)
+            response = await self.chat_completion(
+                messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
             return response["choices"][0]["message"]["content"]
         except Exception as e:
             logger.error(f"Error in simple chat: {e}")
@@ -111,9 +466,37 @@ class DeepSeekClient:
         Returns:
             Health status dictionary
         """
+        breaker_state = self.breaker.state if self.breaker else None
+        if not self.api_key or breaker_state == OPEN:
+            status = "unhealthy"
+        elif breaker_state == HALF_OPEN:
+            status = "degraded"
+        else:
+            status = "healthy"
+        
         return {
-            "status": "healthy" if self.api_key else "unhealthy",
+            "status": status,
+            "name": self.name,
             "api_key_configured": bool(self.api_key),
             "base_url": self.base_url,
+            "connection_pool": {
+                "open": self._http_client is not None and not self._http_client.is_closed,
+                "http2": settings.DEEPSEEK_HTTP2 and HTTP2_AVAILABLE,
+                "max_connections": settings.DEEPSEEK_MAX_CONNECTIONS,
+                "max_keepalive_connections": settings.DEEPSEEK_MAX_KEEPALIVE_CONNECTIONS
+            },
+            "circuit_breaker": {
+                "enabled": self.breaker is not None,
+                **(self.breaker.stats() if self.breaker else {})
+            },
+            "concurrency_limiter": {
+                "enabled": self.limiter is not None,
+                **(self.limiter.stats() if self.limiter else {})
+            },
+            "retries": self.retry_policy.stats(),
+            "coalescing": {
+                "enabled": self._single_flight is not None,
+                **(self._single_flight.stats() if self._single_flight else {})
+            },
             "timestamp": datetime.utcnow().isoformat()
         }
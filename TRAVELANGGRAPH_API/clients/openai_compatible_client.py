@@ -0,0 +1,43 @@
+"""
+OpenAI-compatible chat completions client for TravelLangGraph API.
+"""
+
+from typing import Optional
+import httpx
+from clients.deepseek_client import DeepSeekClient
+
+class OpenAICompatibleClient(DeepSeekClient):
+    """
+    Client for any endpoint that serves the OpenAI chat completions API.
+    
+    Shares the DeepSeek client's connection pooling, retries, circuit
+    breaker and concurrency limiter, but is configured explicitly instead
+    of from the `DEEPSEEK_*` environment variables.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        api_key: Optional[str],
+        model: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None
+    ):
+        """
+        Initialize an OpenAI-compatible client.
+        
+        Args:
+            name: Unique provider name used in logs and health reports
+            base_url: API base URL, e.g. `https://eu.example.com/v1`
+            api_key: API key sent as a bearer token
+            model: Optional model served by this endpoint. When set, it
+                replaces the model named in each request.
+            http_client: Optional pre-built async HTTP client
+            
+        Raises:
+            ValueError: If `api_key` is empty
+        """
+        if not api_key:
+            raise ValueError(f"API key for chat provider '{name}' is required")
+        self.name = name
+        super().__init__(http_client=http_client, api_key=api_key, base_url=base_url, model=model)
@@ -0,0 +1,80 @@
+"""
+Chat provider interface for TravelLangGraph API.
+"""
+
+from typing import Any, AsyncIterator, Dict, List
+
+
+class ChatProvider:
+    """
+    Base class for chat completions backends.
+    
+    Implementations speak the OpenAI chat completions format, so responses
+    and stream chunks have the same shape whichever backend served them.
+    """
+    
+    name: str = "provider"
+    
+    @property
+    def available(self) -> bool:
+        """Whether the backend is currently accepting requests."""
+        return True
+    
+    async def start(self) -> None:
+        """Open connections ahead of the first request."""
+    
+    async def aclose(self) -> None:
+        """Release connections held by the backend."""
+    
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "deepseek-chat",
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get a chat completion.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            model: Model to use for completion
+            temperature: Sampling temperature (0.0 to 2.0)
+            max_tokens: Maximum tokens to generate
+            stream: Must be False; use `stream_chat_completion` instead
+        
+        Returns:
+            Chat completion response dictionary
+        """
+        raise NotImplementedError
+    
+    def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "deepseek-chat",
+        temperature: float = 0.7,
+        max_tokens: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a chat completion as parsed `chat.completion.chunk` dictionaries.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            model: Model to use for completion
+            temperature: Sampling temperature (0.0 to 2.0)
+            max_tokens: Maximum tokens to generate
+        
+        Returns:
+            Async iterator of chunk dictionaries
+        """
+        raise NotImplementedError
+    
+    def health_check(self) -> Dict[str, Any]:
+        """
+        Get the backend's health.
+        
+        Returns:
+            Health status dictionary with at least a `status` key
+        """
+        raise NotImplementedError
@@ -0,0 +1,365 @@
+"""
+Latency-aware chat provider pool for TravelLangGraph API.
+"""
+
+from collections import deque
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+from datetime import datetime
+import asyncio
+import json
+import logging
+import os
+import time
+from config import settings
+from clients.provider import ChatProvider
+from clients.deepseek_client import DeepSeekClient
+from clients.openai_compatible_client import OpenAICompatibleClient
+from clients.concurrency_limiter import UpstreamOverloadedError
+from clients.circuit_breaker import is_upstream_failure
+
+logger = logging.getLogger(__name__)
+
+def should_fail_over(error: BaseException) -> bool:
+    """Check whether an error means another provider should be tried."""
+    return isinstance(error, UpstreamOverloadedError) or is_upstream_failure(error)
+
+class _ProviderStats:
+    """EWMA latency and error rate observed for one provider."""
+    
+    __slots__ = ("latency", "error_rate", "requests", "errors")
+    
+    def __init__(self):
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.errors = 0
+    
+    def record(self, alpha: float, latency: Optional[float], error: bool) -> None:
+        self.requests += 1
+        self.errors += error
+        self.error_rate += alpha * (error - self.error_rate)
+        if latency is not None:
+            self.latency = latency if self.latency is None else self.latency + alpha * (latency - self.latency)
+    
+    def score(self, error_penalty_seconds: float) -> float:
+        # Untried providers score zero so each one gets probed
+        return (self.latency or 0.0) + self.error_rate * error_penalty_seconds
+
+class ProviderPool(ChatProvider):
+    """
+    Route chat completions across several providers.
+    
+    Providers are ranked by an EWMA of their latency plus a penalty
+    proportional to their EWMA error rate; providers whose circuit is open
+    go last. A request goes to the best-ranked provider and fails over to
+    the next one on upstream failures and shed requests. Client errors are
+    raised without failover.
+    
+    With hedging enabled, a non-streamed request that has not answered
+    within the pool's recent latency percentile is also sent to the next
+    provider, and the first successful response wins. Streams fail over
+    only until their first chunk arrives.
+    """
+    
+    name = "pool"
+    
+    def __init__(
+        self,
+        providers: List[ChatProvider],
+        ewma_alpha: float = 0.3,
+        error_penalty_seconds: float = 5.0,
+        hedge: bool = False,
+        hedge_percentile: float = 95.0,
+        hedge_min_samples: int = 20,
+        hedge_min_delay_seconds: float = 0.05,
+        hedge_initial_delay_seconds: float = 2.0,
+        latency_window: int = 200
+    ):
+        if not providers:
+            raise ValueError("At least one chat provider is required")
+        names = [provider.name for provider in providers]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Chat provider names must be unique: {names}")
+        
+        self.providers = providers
+        self.ewma_alpha = ewma_alpha
+        self.error_penalty_seconds = error_penalty_seconds
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_min_delay_seconds = hedge_min_delay_seconds
+        self.hedge_initial_delay_seconds = hedge_initial_delay_seconds
+        self._stats: Dict[str, _ProviderStats] = {provider.name: _ProviderStats() for provider in providers}
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+        self.failovers = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+    
+    @classmethod
+    def from_settings(cls, providers: List[ChatProvider]) -> "ProviderPool":
+        """Build a pool over `providers` with selection and hedging settings."""
+        return cls(
+            providers,
+            ewma_alpha=settings.PROVIDER_EWMA_ALPHA,
+            error_penalty_seconds=settings.PROVIDER_ERROR_PENALTY_SECONDS,
+            hedge=settings.HEDGE_ENABLED,
+            hedge_percentile=settings.HEDGE_PERCENTILE,
+            hedge_min_samples=settings.HEDGE_MIN_SAMPLES,
+            hedge_min_delay_seconds=settings.HEDGE_MIN_DELAY_SECONDS,
+            hedge_initial_delay_seconds=settings.HEDGE_INITIAL_DELAY_SECONDS
+        )
+    
+    @property
+    def available(self) -> bool:
+        """Whether any provider is accepting requests."""
+        return any(provider.available for provider in self.providers)
+    
+    def ranked(self) -> List[ChatProvider]:
+        """Providers in the order requests should try them."""
+        return sorted(
+            self.providers,
+            key=lambda p: (not p.available, self._stats[p.name].score(self.error_penalty_seconds))
+        )
+    
+    def hedge_delay(self) -> float:
+        """Seconds to wait for the first provider before hedging."""
+        if len(self._latencies) < self.hedge_min_samples:
+            return self.hedge_initial_delay_seconds
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile / 100))
+        return max(self.hedge_min_delay_seconds, ordered[index])
+    
+    def _record(self, provider: ChatProvider, latency: Optional[float], error: Optional[BaseException] = None) -> None:
+        """Feed one outcome into the provider's EWMAs and the pool latency window."""
+        failed = error is not None and should_fail_over(error)
+        self._stats[provider.name].record(self.ewma_alpha, None if failed else latency, failed)
+        if latency is not None and error is None:
+            self._latencies.append(latency)
+    
+    async def start(self) -> None:
+        """Open every provider's connections."""
+        for provider in self.providers:
+            await provider.start()
+    
+    async def aclose(self) -> None:
+        """Release every provider's connections."""
+        for provider in self.providers:
+            await provider.aclose()
+    
+    async def chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "deepseek-chat",
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+        stream: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get a chat completion from the best provider, failing over and hedging as configured.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            model: Model to use for completion
+            temperature: Sampling temperature (0.0 to 2.0)
+            max_tokens: Maximum tokens to generate
+            stream: Must be False; use `stream_chat_completion` instead
+        
+        Returns:
+            API response dictionary from the provider that answered first
+        
+        Raises:
+            The last provider's error if every provider failed, or a client
+            error from the provider that raised it
+        """
+        if stream:
+            raise ValueError("Use stream_chat_completion for streamed responses")
+        
+        ranked = self.ranked()
+        kwargs = {"messages": messages, "model": model, "temperature": temperature, "max_tokens": max_tokens}
+        pending: Dict["asyncio.Task[Dict[str, Any]]", ChatProvider] = {}
+        next_index = 0
+        hedged = not self.hedge
+        hedge_provider: Optional[ChatProvider] = None
+        last_error: Optional[BaseException] = None
+        
+        def launch() -> None:
+            nonlocal next_index
+            provider = ranked[next_index]
+            next_index += 1
+            pending[asyncio.ensure_future(self._complete_with(provider, kwargs))] = provider
+        
+        launch()
+        try:
+            while pending:
+                timeout = None if hedged or next_index >= len(ranked) else self.hedge_delay()
+                done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                
+                if not done:
+                    hedged = True
+                    hedge_provider = ranked[next_index]
+                    self.hedges_sent += 1
+                    logger.info(f"Hedging request to chat provider '{hedge_provider.name}' after {timeout:.3f}s")
+                    launch()
+                    continue
+                
+                for task in done:
+                    provider = pending.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        if provider is hedge_provider:
+                            self.hedges_won += 1
+                        return task.result()
+                    if not should_fail_over(error):
+                        raise error
+                    last_error = error
+                    logger.warning(f"Chat provider '{provider.name}' failed: {error!r}")
+                    if next_index < len(ranked):
+                        self.failovers += 1
+                        launch()
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        raise last_error
+    
+    async def _complete_with(self, provider: ChatProvider, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Get a completion from one provider and record its outcome."""
+        start = time.perf_counter()
+        try:
+            response = await provider.chat_completion(**kwargs)
+        except Exception as e:
+            self._record(provider, time.perf_counter() - start, e)
+            raise
+        self._record(provider, time.perf_counter() - start)
+        return response
+    
+    async def stream_chat_completion(
+        self,
+        messages: List[Dict[str, str]],
+        model: str = "deepseek-chat",
+        temperature: float = 0.7,
+        max_tokens: int = 1000
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a chat completion from the best provider.
+        
+        Failures before the first chunk fail over to the next provider;
+        once a chunk has been yielded the stream is committed to its provider.
+        Time to first chunk is the latency fed into provider selection.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            model: Model to use for completion
+            temperature: Sampling temperature (0.0 to 2.0)
+            max_tokens: Maximum tokens to generate
+        
+        Yields:
+            Parsed `chat.completion.chunk` dictionaries
+        """
+        ranked = self.ranked()
+        last_error: Optional[BaseException] = None
+        
+        for index, provider in enumerate(ranked):
+            start = time.perf_counter()
+            started = False
+            try:
+                chunks = provider.stream_chat_completion(
+                    messages=messages,
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+                async with aclosing(chunks):
+                    async for chunk in chunks:
+                        if not started:
+                            started = True
+                            self._record(provider, time.perf_counter() - start)
+                        yield chunk
+                return
+            except Exception as e:
+                if not started:
+                    self._record(provider, time.perf_counter() - start, e)
+                if started or not should_fail_over(e):
+                    raise
+                last_error = e
+                logger.warning(f"Chat provider '{provider.name}' failed before streaming: {e!r}")
+                if index + 1 < len(ranked):
+                    self.failovers += 1
+        
+        raise last_error
+    
+    def health_check(self) -> Dict[str, Any]:
+        """
+        Get the health of every provider and the pool's selection state.
+        
+        The pool is healthy when every provider is, unhealthy when none is
+        usable, and degraded otherwise.
+        
+        Returns:
+            Health status dictionary
+        """
+        providers = []
+        for provider in self.ranked():
+            stats = self._stats[provider.name]
+            providers.append({
+                **provider.health_check(),
+                "selection": {
+                    "score": stats.score(self.error_penalty_seconds),
+                    "ewma_latency_seconds": stats.latency,
+                    "ewma_error_rate": stats.error_rate,
+                    "requests": stats.requests,
+                    "errors": stats.errors
+                }
+            })
+        
+        statuses = [p["status"] for p in providers]
+        if all(s == "healthy" for s in statuses):
+            status = "healthy"
+        elif all(s == "unhealthy" for s in statuses):
+            status = "unhealthy"
+        else:
+            status = "degraded"
+        
+        return {
+            "status": status,
+            "name": self.name,
+            "providers": providers,
+            "failovers": self.failovers,
+            "hedging": {
+                "enabled": self.hedge,
+                "delay_seconds": self.hedge_delay(),
+                "sent": self.hedges_sent,
+                "won": self.hedges_won
+            },
+            "timestamp": datetime.utcnow().isoformat()
+        }
+
+def build_chat_provider() -> ChatProvider:
+    """
+    Build the chat provider from settings.
+    
+    The DeepSeek client is always the first provider. When `CHAT_PROVIDERS`
+    lists additional OpenAI-compatible endpoints, all of them are wrapped in
+    a `ProviderPool`; otherwise the DeepSeek client is returned directly.
+    
+    Returns:
+        Chat provider for `ChatService`
+    
+    Raises:
+        ValueError: If a provider is missing its API key
+    """
+    providers: List[ChatProvider] = [DeepSeekClient()]
+    if settings.CHAT_PROVIDERS:
+        for config in json.loads(settings.CHAT_PROVIDERS):
+            api_key = config.get("api_key") or os.getenv(config.get("api_key_env", ""), "")
+            providers.append(OpenAICompatibleClient(
+                name=config["name"],
+                base_url=config["base_url"],
+                api_key=api_key,
+                model=config.get("model")
+            ))
+    
+    if len(providers) == 1:
+        return providers[0]
+    return ProviderPool.from_settings(providers)
@@ -0,0 +1,185 @@
+"""
+Minimal Redis protocol client for TravelLangGraph API.
+Speaks RESP2 over asyncio streams, enough to run commands and Lua scripts on a shared store.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+import asyncio
+import hashlib
+import time
+
+class RespError(Exception):
+    """An error reply from the server, e.g. `NOSCRIPT` or `WRONGTYPE`."""
+
+def encode_command(*args: Any) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """
+    Read one RESP reply.
+    
+    Simple strings and bulk strings are returned as str, integers as int,
+    arrays as lists and nil as None.
+    
+    Raises:
+        RespError: For error replies
+        ConnectionError: If the connection closes mid-reply
+    """
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise ConnectionError("Connection closed by the server")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode("utf-8")
+    if kind == b"-":
+        raise RespError(payload.decode("utf-8"))
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2].decode("utf-8")
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise ConnectionError(f"Unexpected reply type: {kind!r}")
+
+class RespClient:
+    """
+    Async client for a Redis-protocol server with a small connection pool.
+    
+    Connections belong to the event loop they were opened on; the pool is
+    reset when used from another loop. A connection that fails mid-command
+    is closed rather than returned to the pool. At most `max_connections`
+    commands run at once; the rest wait for a connection within the timeout.
+    After a connection failure or timeout, commands fail immediately with
+    `ConnectionError` for `failure_backoff_seconds`, so an unreachable server
+    costs one timeout per back-off period rather than one per command.
+    
+    Args:
+        url: `redis://[:password@]host[:port][/db]`
+        max_idle: Idle connections kept open
+        timeout_seconds: Connect and per-command timeout
+        max_connections: Connections open at once, idle or in use
+        failure_backoff_seconds: Time commands fail fast after a failure
+    """
+    
+    def __init__(
+        self,
+        url: str = "redis://localhost:6379/0",
+        max_idle: int = 8,
+        timeout_seconds: float = 1.0,
+        max_connections: int = 32,
+        failure_backoff_seconds: float = 1.0
+    ):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.max_idle = min(max_idle, max_connections)
+        self.timeout_seconds = timeout_seconds
+        self.max_connections = max_connections
+        self.failure_backoff_seconds = failure_backoff_seconds
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._scripts: Dict[str, str] = {}
+        self._failed_until = 0.0
+    
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        for command in setup:
+            writer.write(encode_command(*command))
+            await writer.drain()
+            await read_reply(reader)
+        return reader, writer
+    
+    async def execute(self, *args: Any) -> Any:
+        """
+        Run one command and return its reply.
+        
+        Raises:
+            RespError: For error replies
+            ConnectionError: While backing off after a failure
+            OSError: If the server cannot be reached
+            asyncio.TimeoutError: If the server does not reply in time, or no
+                connection frees up in time
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._idle.clear()
+            self._slots = asyncio.Semaphore(self.max_connections)
+            self._loop = loop
+        
+        remaining = self._failed_until - time.monotonic()
+        if remaining > 0:
+            raise ConnectionError(f"{self.host}:{self.port} failed recently; retrying in {remaining:.1f}s")
+        
+        await asyncio.wait_for(self._slots.acquire(), self.timeout_seconds)
+        try:
+            return await self._execute(args)
+        finally:
+            self._slots.release()
+    
+    async def _execute(self, args: Tuple[Any, ...]) -> Any:
+        """Run one command on a pooled connection; call holding a connection slot."""
+        try:
+            connection = self._idle.pop() if self._idle else await asyncio.wait_for(self._connect(), self.timeout_seconds)
+        except (OSError, asyncio.TimeoutError):
+            self._failed_until = time.monotonic() + self.failure_backoff_seconds
+            raise
+        reader, writer = connection
+        try:
+            writer.write(encode_command(*args))
+            await writer.drain()
+            reply = await asyncio.wait_for(read_reply(reader), self.timeout_seconds)
+        except RespError:
+            self._release(connection)
+            raise
+        except BaseException as e:
+            writer.close()
+            if isinstance(e, (OSError, asyncio.TimeoutError)):
+                self._failed_until = time.monotonic() + self.failure_backoff_seconds
+            raise
+        self._release(connection)
+        return reply
+    
+    def _release(self, connection: Tuple[asyncio.StreamReader, asyncio.StreamWriter]) -> None:
+        if len(self._idle) < self.max_idle:
+            self._idle.append(connection)
+        else:
+            connection[1].close()
+    
+    async def eval_script(self, script: str, keys: List[str], args: List[Any]) -> Any:
+        """Run a Lua script by its SHA1, loading it once if the server does not have it cached."""
+        sha = self._scripts.get(script)
+        if sha is None:
+            sha = self._scripts[script] = hashlib.sha1(script.encode("utf-8")).hexdigest()
+        try:
+            return await self.execute("EVALSHA", sha, len(keys), *keys, *args)
+        except RespError as e:
+            if not str(e).startswith("NOSCRIPT"):
+                raise
+        return await self.execute("EVAL", script, len(keys), *keys, *args)
+    
+    async def aclose(self) -> None:
+        """Close idle connections."""
+        for _, writer in self._idle:
+            writer.close()
+        self._idle.clear()
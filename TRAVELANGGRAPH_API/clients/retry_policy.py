@@ -0,0 +1,162 @@
+"""
+Retry policy for TravelLangGraph API clients.
+"""
+
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+import random
+import time
+import httpx
+
+# Status codes where the upstream did not process the request
+RETRYABLE_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+# Transport errors raised before the request reached the upstream, or on a
+# stale keep-alive connection the server had already closed
+RETRYABLE_ERRORS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+    httpx.RemoteProtocolError,
+)
+
+def parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """
+    Parse a `Retry-After` header in seconds or HTTP-date form.
+    
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class RetryBudget:
+    """
+    Token bucket bounding retries to a fraction of request volume.
+    
+    Every request deposits `ratio` tokens and every retry spends one, so
+    retries stay below roughly `ratio` of traffic. A small per-second
+    refill keeps low-traffic clients able to retry. The budget is shared
+    by all requests of a client, which prevents retry storms when the
+    upstream is failing for everyone.
+    """
+    
+    def __init__(self, ratio: float = 0.2, min_per_second: float = 1.0, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._updated = time.monotonic()
+        self.exhausted = 0
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._updated) * self.min_per_second)
+        self._updated = now
+    
+    def deposit(self) -> None:
+        """Credit the budget for one request."""
+        self._refill()
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+    
+    def try_withdraw(self) -> bool:
+        """Spend one token for a retry, if available."""
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        self.exhausted += 1
+        return False
+    
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        self._refill()
+        return self._tokens
+
+class RetryPolicy:
+    """
+    Bounded retries with exponential backoff and full jitter.
+    
+    Only failures where the upstream did not process the request are
+    retried. An upstream `Retry-After` replaces the backoff delay; a
+    `Retry-After` longer than `max_retry_after_seconds` is not waited out.
+    """
+    
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay_seconds: float = 0.25,
+        max_delay_seconds: float = 4.0,
+        max_retry_after_seconds: float = 10.0,
+        budget: Optional[RetryBudget] = None
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.max_retry_after_seconds = max_retry_after_seconds
+        self.budget = budget or RetryBudget()
+        self.attempts = 0
+        self.retries = 0
+        self.gave_up = 0
+    
+    @staticmethod
+    def is_retryable(error: BaseException) -> bool:
+        """Check whether an error belongs to a retryable failure class."""
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in RETRYABLE_STATUS_CODES
+        return isinstance(error, RETRYABLE_ERRORS)
+    
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter backoff delay before retry number `attempt` (1-based)."""
+        return random.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2 ** (attempt - 1)))
+    
+    def next_delay(self, attempt: int, error: BaseException) -> Optional[float]:
+        """
+        Decide whether to retry after a failed attempt.
+        
+        Args:
+            attempt: Number of the attempt that just failed (1-based)
+            error: Exception raised by that attempt
+            
+        Returns:
+            Seconds to wait before retrying, or None to give up
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return None
+        
+        delay = self.backoff(attempt)
+        if isinstance(error, httpx.HTTPStatusError):
+            retry_after = parse_retry_after(error.response)
+            if retry_after is not None:
+                if retry_after > self.max_retry_after_seconds:
+                    return None
+                delay = retry_after
+        
+        if not self.budget.try_withdraw():
+            return None
+        return delay
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get retry counters and budget state."""
+        return {
+            "max_attempts": self.max_attempts,
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "gave_up": self.gave_up,
+            "budget_tokens": round(self.budget.tokens, 2),
+            "budget_exhausted": self.budget.exhausted
+        }
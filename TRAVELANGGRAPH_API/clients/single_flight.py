@@ -0,0 +1,74 @@
+"""
+Single-flight request coalescing for TravelLangGraph API clients.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class _Call:
+    """An in-flight call shared by every caller with the same key."""
+    
+    def __init__(self, task: "asyncio.Task[Any]"):
+        self.task = task
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into one execution.
+    
+    The first caller for a key starts the call; callers that arrive while
+    it is in flight await the same result. Errors propagate to every
+    waiter. A cancelled waiter only stops waiting; the shared call is
+    cancelled once every waiter has gone.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executed = 0
+        self.collapsed = 0
+    
+    @property
+    def in_flight(self) -> int:
+        """Number of distinct calls currently executing."""
+        return len(self._calls)
+    
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run `fn` for `key`, or join the call already in flight for it.
+        
+        Args:
+            key: Identity of the call; equal keys share one execution
+            fn: Zero-argument coroutine function performing the call
+            
+        Returns:
+            The result of the shared call
+        """
+        call = self._calls.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._calls[key] = call
+            call.task.add_done_callback(lambda _: self._forget(key, call))
+            self.executed += 1
+        else:
+            self.collapsed += 1
+        
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                call.task.cancel()
+    
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        """Drop a finished call so later callers start a fresh one."""
+        if self._calls.get(key) is call:
+            del self._calls[key]
+    
+    def stats(self) -> Dict[str, int]:
+        """Get coalescing counters."""
+        return {
+            "in_flight": self.in_flight,
+            "upstream_calls": self.executed,
+            "collapsed_calls": self.collapsed
+        }
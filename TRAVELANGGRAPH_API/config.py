@@ -17,11 +17,159 @@ class Settings:
     DEEPSEEK_API_KEY: str = os.getenv("DEEPSEEK_API_KEY", "")
     DEEPSEEK_API_BASE_URL: str = os.getenv("DEEPSEEK_API_BASE_URL", "https://api.deepseek.com/v1")
     
+    # DeepSeek HTTP connection pool
+    DEEPSEEK_HTTP2: bool = os.getenv("DEEPSEEK_HTTP2", "true").lower() == "true"
+    DEEPSEEK_MAX_CONNECTIONS: int = int(os.getenv("DEEPSEEK_MAX_CONNECTIONS", "100"))
+    DEEPSEEK_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("DEEPSEEK_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    DEEPSEEK_KEEPALIVE_EXPIRY: float = float(os.getenv("DEEPSEEK_KEEPALIVE_EXPIRY", "30.0"))
+    DEEPSEEK_CONNECT_TIMEOUT: float = float(os.getenv("DEEPSEEK_CONNECT_TIMEOUT", "5.0"))
+    DEEPSEEK_READ_TIMEOUT: float = float(os.getenv("DEEPSEEK_READ_TIMEOUT", "30.0"))
+    DEEPSEEK_WRITE_TIMEOUT: float = float(os.getenv("DEEPSEEK_WRITE_TIMEOUT", "10.0"))
+    DEEPSEEK_POOL_TIMEOUT: float = float(os.getenv("DEEPSEEK_POOL_TIMEOUT", "5.0"))
+    # Connections to open at startup, before the instance reports ready
+    DEEPSEEK_WARM_CONNECTIONS: int = int(os.getenv("DEEPSEEK_WARM_CONNECTIONS", "0"))
+    
+    # Collapse concurrent identical DeepSeek requests into one upstream call
+    DEEPSEEK_COALESCE_REQUESTS: bool = os.getenv("DEEPSEEK_COALESCE_REQUESTS", "true").lower() == "true"
+    
+    # Additional OpenAI-compatible chat providers: JSON list of
+    # {"name", "base_url", "api_key_env" or "api_key", "model"}
+    CHAT_PROVIDERS: str = os.getenv("CHAT_PROVIDERS", "")
+    
+    # Latency-aware provider selection and hedged requests
+    PROVIDER_EWMA_ALPHA: float = float(os.getenv("PROVIDER_EWMA_ALPHA", "0.3"))
+    PROVIDER_ERROR_PENALTY_SECONDS: float = float(os.getenv("PROVIDER_ERROR_PENALTY_SECONDS", "5.0"))
+    HEDGE_ENABLED: bool = os.getenv("HEDGE_ENABLED", "false").lower() == "true"
+    HEDGE_PERCENTILE: float = float(os.getenv("HEDGE_PERCENTILE", "95"))
+    HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+    HEDGE_MIN_DELAY_SECONDS: float = float(os.getenv("HEDGE_MIN_DELAY_SECONDS", "0.05"))
+    HEDGE_INITIAL_DELAY_SECONDS: float = float(os.getenv("HEDGE_INITIAL_DELAY_SECONDS", "2.0"))
+    
+    # Upstream retries
+    RETRY_MAX_ATTEMPTS: int = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+    RETRY_BASE_DELAY_SECONDS: float = float(os.getenv("RETRY_BASE_DELAY_SECONDS", "0.25"))
+    RETRY_MAX_DELAY_SECONDS: float = float(os.getenv("RETRY_MAX_DELAY_SECONDS", "4.0"))
+    RETRY_MAX_RETRY_AFTER_SECONDS: float = float(os.getenv("RETRY_MAX_RETRY_AFTER_SECONDS", "10.0"))
+    RETRY_BUDGET_RATIO: float = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))
+    RETRY_BUDGET_MIN_PER_SECOND: float = float(os.getenv("RETRY_BUDGET_MIN_PER_SECOND", "1.0"))
+    
+    # Upstream circuit breaker
+    BREAKER_ENABLED: bool = os.getenv("BREAKER_ENABLED", "true").lower() == "true"
+    BREAKER_WINDOW_SECONDS: float = float(os.getenv("BREAKER_WINDOW_SECONDS", "30.0"))
+    BREAKER_MIN_REQUESTS: int = int(os.getenv("BREAKER_MIN_REQUESTS", "10"))
+    BREAKER_ERROR_RATE_THRESHOLD: float = float(os.getenv("BREAKER_ERROR_RATE_THRESHOLD", "0.5"))
+    BREAKER_SLOW_CALL_SECONDS: float = float(os.getenv("BREAKER_SLOW_CALL_SECONDS", "20.0"))
+    BREAKER_SLOW_RATE_THRESHOLD: float = float(os.getenv("BREAKER_SLOW_RATE_THRESHOLD", "0.8"))
+    BREAKER_OPEN_SECONDS: float = float(os.getenv("BREAKER_OPEN_SECONDS", "15.0"))
+    BREAKER_HALF_OPEN_PROBES: int = int(os.getenv("BREAKER_HALF_OPEN_PROBES", "1"))
+    
+    # Adaptive upstream concurrency limiter
+    LIMITER_ENABLED: bool = os.getenv("LIMITER_ENABLED", "true").lower() == "true"
+    LIMITER_INITIAL_LIMIT: int = int(os.getenv("LIMITER_INITIAL_LIMIT", "20"))
+    LIMITER_MIN_LIMIT: int = int(os.getenv("LIMITER_MIN_LIMIT", "1"))
+    LIMITER_MAX_LIMIT: int = int(os.getenv("LIMITER_MAX_LIMIT", "100"))
+    LIMITER_MAX_QUEUE: int = int(os.getenv("LIMITER_MAX_QUEUE", "100"))
+    LIMITER_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("LIMITER_QUEUE_TIMEOUT_SECONDS", "10.0"))
+    LIMITER_LATENCY_TARGET_SECONDS: float = float(os.getenv("LIMITER_LATENCY_TARGET_SECONDS", "20.0"))
+    
+    # Completion cache
+    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    CACHE_ALL_TEMPERATURES: bool = os.getenv("CACHE_ALL_TEMPERATURES", "false").lower() == "true"
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "3600"))
+    CACHE_SQLITE_PATH: str = os.getenv("CACHE_SQLITE_PATH", "")
+    CACHE_SQLITE_MAX_ENTRIES: int = int(os.getenv("CACHE_SQLITE_MAX_ENTRIES", "100000"))
+    CACHE_SQLITE_TTL_SECONDS: float = float(os.getenv("CACHE_SQLITE_TTL_SECONDS", "86400"))
+    
+    # Semantic cache for reworded single prompts (needs numpy); max entries is per namespace
+    SEMANTIC_CACHE_ENABLED: bool = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.9"))
+    SEMANTIC_CACHE_DIMENSIONS: int = int(os.getenv("SEMANTIC_CACHE_DIMENSIONS", "256"))
+    SEMANTIC_CACHE_MAX_ENTRIES: int = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "10000"))
+    SEMANTIC_CACHE_MAX_NAMESPACES: int = int(os.getenv("SEMANTIC_CACHE_MAX_NAMESPACES", "64"))
+    SEMANTIC_CACHE_TTL_SECONDS: float = float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "3600"))
+    
+    # Travel planning graph; memoized step outputs and run checkpoints are kept in process
+    PLAN_MAX_CONCURRENCY: int = int(os.getenv("PLAN_MAX_CONCURRENCY", "4"))
+    PLAN_MEMO_MAX_ENTRIES: int = int(os.getenv("PLAN_MEMO_MAX_ENTRIES", "1000"))
+    PLAN_MEMO_TTL_SECONDS: float = float(os.getenv("PLAN_MEMO_TTL_SECONDS", "3600"))
+    PLAN_CHECKPOINT_MAX_RUNS: int = int(os.getenv("PLAN_CHECKPOINT_MAX_RUNS", "1000"))
+    PLAN_CHECKPOINT_TTL_SECONDS: float = float(os.getenv("PLAN_CHECKPOINT_TTL_SECONDS", "86400"))
+    
+    # Travel reference data; PLACES_DATA_PATH defaults to the bundled CSV
+    PLACES_ENABLED: bool = os.getenv("PLACES_ENABLED", "true").lower() == "true"
+    PLACES_DATA_PATH: str = os.getenv("PLACES_DATA_PATH", "")
+    PLACES_SNAPSHOT_PATH: str = os.getenv("PLACES_SNAPSHOT_PATH", "")
+    PLACES_GRID_DEGREES: float = float(os.getenv("PLACES_GRID_DEGREES", "1.0"))
+    PLACES_CHAT_ANSWERS: bool = os.getenv("PLACES_CHAT_ANSWERS", "true").lower() == "true"
+    PLACES_GROUNDING: bool = os.getenv("PLACES_GROUNDING", "true").lower() == "true"
+    PLACES_NEARBY_RADIUS_KM: float = float(os.getenv("PLACES_NEARBY_RADIUS_KM", "150"))
+    
+    # Conversation sessions
+    SESSION_STORE: str = os.getenv("SESSION_STORE", "memory")
+    SESSION_SQLITE_PATH: str = os.getenv("SESSION_SQLITE_PATH", "sessions.db")
+    SESSION_MAX_SESSIONS: int = int(os.getenv("SESSION_MAX_SESSIONS", "10000"))
+    SESSION_TTL_SECONDS: float = float(os.getenv("SESSION_TTL_SECONDS", "86400"))
+    
+    # Per-client rate limits, keyed by API key. RATE_LIMIT_API_KEYS is a JSON object of
+    # key -> {"name", "requests_per_second", "burst", "tokens_per_minute"}; the backend is
+    # "memory" (per worker) or "redis" (shared by all workers)
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "false").lower() == "true"
+    RATE_LIMIT_HEADER: str = os.getenv("RATE_LIMIT_HEADER", "X-API-Key")
+    RATE_LIMIT_API_KEYS: str = os.getenv("RATE_LIMIT_API_KEYS", "")
+    RATE_LIMIT_REQUIRE_KEY: bool = os.getenv("RATE_LIMIT_REQUIRE_KEY", "false").lower() == "true"
+    RATE_LIMIT_PER_KEY_BUCKETS: bool = os.getenv("RATE_LIMIT_PER_KEY_BUCKETS", "false").lower() == "true"
+    RATE_LIMIT_REQUESTS_PER_SECOND: float = float(os.getenv("RATE_LIMIT_REQUESTS_PER_SECOND", "5"))
+    RATE_LIMIT_BURST: float = float(os.getenv("RATE_LIMIT_BURST", "10"))
+    RATE_LIMIT_TOKENS_PER_MINUTE: float = float(os.getenv("RATE_LIMIT_TOKENS_PER_MINUTE", "100000"))
+    RATE_LIMIT_PATHS: str = os.getenv("RATE_LIMIT_PATHS", "/chat,/plan")
+    RATE_LIMIT_BACKEND: str = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_REDIS_URL: str = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+    RATE_LIMIT_MAX_CLIENTS: int = int(os.getenv("RATE_LIMIT_MAX_CLIENTS", "10000"))
+    
+    # Model routing: JSON object of route name -> {"model", "temperature", "max_tokens"}
+    MODEL_ROUTES: str = os.getenv("MODEL_ROUTES", "")
+    SHORT_FACTUAL_MAX_TOKENS: int = int(os.getenv("SHORT_FACTUAL_MAX_TOKENS", "40"))
+    
+    # Context window budget (0 disables trimming)
+    CONTEXT_MAX_PROMPT_TOKENS: int = int(os.getenv("CONTEXT_MAX_PROMPT_TOKENS", "6000"))
+    CONTEXT_KEEP_RECENT_MESSAGES: int = int(os.getenv("CONTEXT_KEEP_RECENT_MESSAGES", "4"))
+    CONTEXT_SUMMARIZE: bool = os.getenv("CONTEXT_SUMMARIZE", "false").lower() == "true"
+    CONTEXT_SUMMARY_REFRESH_MESSAGES: int = int(os.getenv("CONTEXT_SUMMARY_REFRESH_MESSAGES", "4"))
+    CONTEXT_SUMMARY_MAX_TOKENS: int = int(os.getenv("CONTEXT_SUMMARY_MAX_TOKENS", "300"))
+    
+    # Batch chat
+    BATCH_MAX_ITEMS: int = int(os.getenv("BATCH_MAX_ITEMS", "100"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "10"))
+    
+    # Metrics: set a shared directory to aggregate /metrics across workers; the production
+    # server empties it of worker snapshots on start
+    METRICS_MULTIPROC_DIR: str = os.getenv("METRICS_MULTIPROC_DIR", "")
+    METRICS_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("METRICS_FLUSH_INTERVAL_SECONDS", "5.0"))
+    
+    # Request tracing: exporter is "none", "memory" or "file" (OTLP/JSON lines)
+    TRACING_ENABLED: bool = os.getenv("TRACING_ENABLED", "true").lower() == "true"
+    TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "none")
+    TRACING_FILE_PATH: str = os.getenv("TRACING_FILE_PATH", "traces.jsonl")
+    TRACING_MEMORY_MAX_TRACES: int = int(os.getenv("TRACING_MEMORY_MAX_TRACES", "1000"))
+    
+    # Health sampling
+    HEALTH_SAMPLE_INTERVAL_SECONDS: float = float(os.getenv("HEALTH_SAMPLE_INTERVAL_SECONDS", "1.0"))
+    
     # API Configuration
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
     API_PORT: int = int(os.getenv("API_PORT", "8000"))
     DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
     
+    # Production server (travelanggraph-api-server): worker count is a number or "auto"
+    # for one per CPU core; keep-alive should outlast the load balancer's idle timeout
+    API_WORKERS: str = os.getenv("API_WORKERS", "auto")
+    SERVER_BACKLOG: int = int(os.getenv("SERVER_BACKLOG", "2048"))
+    SERVER_KEEPALIVE_SECONDS: int = int(os.getenv("SERVER_KEEPALIVE_SECONDS", "75"))
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = int(os.getenv("SERVER_GRACEFUL_SHUTDOWN_SECONDS", "30"))
+    SERVER_LIMIT_CONCURRENCY: int = int(os.getenv("SERVER_LIMIT_CONCURRENCY", "0"))
+    SERVER_ACCESS_LOG: bool = os.getenv("SERVER_ACCESS_LOG", "false").lower() == "true"
+    
     # Validation
     def validate(self) -> bool:
         """Validate that required environment variables are set."""
@@ -30,8 +178,5 @@ class Settings:
             return False
         return True
 
-# Create global settings instance
+# Create global settings instance; validated by the application startup
 settings = Settings()
-
-# Validate settings on import
-settings.validate()
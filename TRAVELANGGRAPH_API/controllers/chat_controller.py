@@ -3,11 +3,20 @@ Chat controller for TravelLangGraph API.
 Contains chat-related API endpoints.
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 from datetime import datetime
+import time
+from config import settings
 from services.chat_service import ChatService
+from clients.concurrency_limiter import UpstreamOverloadedError
+from dependencies import get_chat_service
+from rate_limit import admit_more, rejection_detail, retry_after_header
+from tracing import record_since_request_start
+from serialization import FastJSONResponse, dumps, pick
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
@@ -21,16 +30,28 @@ class SimpleChatRequest(BaseModel):
     """Simple chat request model."""
     message: str = Field(..., description="User message to send")
     system_prompt: Optional[str] = Field(None, description="Optional system prompt")
-    model: str = Field("deepseek-chat", description="Model to use for chat")
-    temperature: float = Field(0.7, ge=0.0, le=2.0, description="Sampling temperature")
-    max_tokens: int = Field(1000, ge=1, le=4000, description="Maximum tokens to generate")
+    model: Optional[str] = Field(None, description="Model to use for chat; chosen by the route when omitted")
+    temperature: Optional[float] = Field(None, ge=0.0, le=2.0, description="Sampling temperature; chosen by the route when omitted")
+    max_tokens: Optional[int] = Field(None, ge=1, le=4000, description="Maximum tokens to generate; chosen by the route when omitted")
+    route: Optional[str] = Field(None, description="Model route, e.g. short_factual or itinerary; classified when omitted")
 
 class ContextChatRequest(BaseModel):
     """Context chat request model."""
     messages: List[ChatMessage] = Field(..., description="List of conversation messages")
-    model: str = Field("deepseek-chat", description="Model to use for chat")
-    temperature: float = Field(0.7, ge=0.0, le=2.0, description="Sampling temperature")
-    max_tokens: int = Field(1000, ge=1, le=4000, description="Maximum tokens to generate")
+    model: Optional[str] = Field(None, description="Model to use for chat; chosen by the route when omitted")
+    temperature: Optional[float] = Field(None, ge=0.0, le=2.0, description="Sampling temperature; chosen by the route when omitted")
+    max_tokens: Optional[int] = Field(None, ge=1, le=4000, description="Maximum tokens to generate; chosen by the route when omitted")
+    route: Optional[str] = Field(None, description="Model route, e.g. short_factual or itinerary; classified when omitted")
+
+class BatchChatRequest(BaseModel):
+    """Batch chat request model."""
+    requests: List[Union[SimpleChatRequest, ContextChatRequest]] = Field(
+        ..., min_length=1, max_length=settings.BATCH_MAX_ITEMS, description="Independent chat requests to run"
+    )
+    max_concurrency: Optional[int] = Field(
+        None, ge=1, le=settings.BATCH_MAX_CONCURRENCY, description="Maximum requests in flight at once"
+    )
+    stream: bool = Field(False, description="Stream results as NDJSON in completion order")
 
 class ChatResponse(BaseModel):
     """Chat response model."""
@@ -40,12 +61,43 @@ class ChatResponse(BaseModel):
     processing_time_seconds: Optional[float] = None
     timestamp: str
     model: Optional[str] = None
+    route: Optional[str] = None
     usage: Optional[dict] = None
+    cached: Optional[bool] = None
+    context: Optional[dict] = None
+
+class BatchChatItemResponse(ChatResponse):
+    """Batch chat item response model."""
+    index: int
+
+class BatchChatResponse(BaseModel):
+    """Batch chat response model."""
+    status: str
+    results: List[BatchChatItemResponse]
+    processing_time_seconds: float
+    timestamp: str
 
-# Dependency to get chat service
-def get_chat_service() -> ChatService:
-    """Get chat service instance."""
-    return ChatService()
+# Chat endpoints select these fields from service results and encode them
+# directly; the models above document the response schema
+CHAT_RESPONSE_FIELDS = tuple(ChatResponse.model_fields)
+BATCH_ITEM_FIELDS = tuple(BatchChatItemResponse.model_fields)
+
+def overloaded_exception(error: UpstreamOverloadedError) -> HTTPException:
+    """Build a 503 response for a request shed by the limiter or circuit breaker."""
+    return HTTPException(
+        status_code=503,
+        detail={
+            "error": error.code,
+            "message": str(error),
+            "retry_after_seconds": error.retry_after
+        },
+        headers={"Retry-After": error.retry_after_header}
+    )
+
+def check_route(chat_service: ChatService, route: Optional[str]) -> None:
+    """Reject a request naming a route that is not configured."""
+    if route is not None and route not in chat_service.model_router.routes:
+        raise HTTPException(status_code=400, detail=f"Unknown route: {route}")
 
 @router.post("/simple", response_model=ChatResponse)
 async def simple_chat(
@@ -55,24 +107,23 @@ async def simple_chat(
     """
     Send a simple message and get AI response.
     """
+    record_since_request_start("request.parse")
+    check_route(chat_service, request.route)
+    
     try:
         result = await chat_service.send_message(
             message=request.message,
             system_prompt=request.system_prompt,
             model=request.model,
             temperature=request.temperature,
-            max_tokens=request.max_tokens
-        )
-        
-        return ChatResponse(
-            status=result["status"],
-            ai_response=result.get("ai_response"),
-            error=result.get("error"),
-            processing_time_seconds=result.get("processing_time_seconds"),
-            timestamp=result["timestamp"],
-            model=result.get("model")
+            max_tokens=request.max_tokens,
+            route=request.route
         )
         
+        return FastJSONResponse(pick(result, CHAT_RESPONSE_FIELDS))
+    
+    except UpstreamOverloadedError as e:
+        raise overloaded_exception(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat service error: {str(e)}")
 
@@ -84,6 +135,9 @@ async def context_chat(
     """
     Send multiple messages with context and get AI response.
     """
+    record_since_request_start("request.parse")
+    check_route(chat_service, request.route)
+    
     try:
         # Convert Pydantic models to dictionaries
         messages = [{"role": msg.role, "content": msg.content} for msg in request.messages]
@@ -92,29 +146,155 @@ async def context_chat(
             messages=messages,
             model=request.model,
             temperature=request.temperature,
-            max_tokens=request.max_tokens
+            max_tokens=request.max_tokens,
+            route=request.route
         )
         
-        return ChatResponse(
-            status=result["status"],
-            ai_response=result.get("ai_response"),
-            error=result.get("error"),
-            processing_time_seconds=result.get("processing_time_seconds"),
-            timestamp=result["timestamp"],
-            model=result.get("model"),
-            usage=result.get("usage")
+        return FastJSONResponse(pick(result, CHAT_RESPONSE_FIELDS))
+    
+    except UpstreamOverloadedError as e:
+        raise overloaded_exception(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chat service error: {str(e)}")
+
+@router.post("/batch", response_model=BatchChatResponse)
+async def batch_chat(
+    request: BatchChatRequest,
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """
+    Run independent chat requests concurrently.
+    
+    Returns all results in request order, or with `stream` set, streams each
+    result as an NDJSON line as soon as it completes. A failed item is
+    reported in its own result and does not fail the batch. Each item counts
+    as one request against the caller's rate limit.
+    """
+    record_since_request_start("request.parse")
+    requests = [item.model_dump() for item in request.requests]
+    
+    # The rate limit middleware already took one request for the batch itself
+    rejected = await admit_more(len(requests) - 1)
+    if rejected is not None:
+        quota, admission = rejected
+        raise HTTPException(
+            status_code=429,
+            detail=rejection_detail(quota, admission),
+            headers={"Retry-After": retry_after_header(admission)}
         )
+    
+    if request.stream:
+        async def ndjson_lines() -> AsyncIterator[bytes]:
+            async with aclosing(chat_service.iter_batch(requests, request.max_concurrency)) as results:
+                async for result in results:
+                    yield dumps(pick(result, BATCH_ITEM_FIELDS)) + b"\n"
+        
+        return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+    
+    try:
+        start = time.perf_counter()
+        results = await chat_service.send_batch(requests, request.max_concurrency)
+        processing_time = time.perf_counter() - start
+        
+        failed = sum(1 for result in results if result["status"] != "success")
+        if failed == 0:
+            status = "success"
+        elif failed == len(results):
+            status = "error"
+        else:
+            status = "partial"
         
+        return FastJSONResponse({
+            "status": status,
+            "results": [pick(result, BATCH_ITEM_FIELDS) for result in results],
+            "processing_time_seconds": processing_time,
+            "timestamp": datetime.utcnow().isoformat()
+        })
+    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat service error: {str(e)}")
 
+async def sse_events(
+    request: Request,
+    events: AsyncIterator[Dict[str, Any]]
+) -> AsyncIterator[bytes]:
+    """
+    Format stream events as Server-Sent Events.
+    
+    Stops and closes the upstream stream as soon as the client disconnects.
+    """
+    try:
+        async for event in events:
+            if await request.is_disconnected():
+                break
+            yield b"event: " + event["event"].encode() + b"\ndata: " + dumps(event) + b"\n\n"
+    finally:
+        await events.aclose()
+
+def sse_response(request: Request, events: AsyncIterator[Dict[str, Any]]) -> StreamingResponse:
+    """Wrap stream events in an unbuffered `text/event-stream` response."""
+    return StreamingResponse(
+        sse_events(request, events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/simple/stream")
+async def simple_chat_stream(
+    request: Request,
+    chat_request: SimpleChatRequest,
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """
+    Send a simple message and stream the AI response as Server-Sent Events.
+    """
+    record_since_request_start("request.parse")
+    check_route(chat_service, chat_request.route)
+    
+    return sse_response(request, chat_service.stream_message(
+        message=chat_request.message,
+        system_prompt=chat_request.system_prompt,
+        model=chat_request.model,
+        temperature=chat_request.temperature,
+        max_tokens=chat_request.max_tokens,
+        route=chat_request.route
+    ))
+
+@router.post("/context/stream")
+async def context_chat_stream(
+    request: Request,
+    chat_request: ContextChatRequest,
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """
+    Send multiple messages with context and stream the AI response as Server-Sent Events.
+    """
+    record_since_request_start("request.parse")
+    check_route(chat_service, chat_request.route)
+    
+    messages = [{"role": msg.role, "content": msg.content} for msg in chat_request.messages]
+    
+    return sse_response(request, chat_service.stream_with_context(
+        messages=messages,
+        model=chat_request.model,
+        temperature=chat_request.temperature,
+        max_tokens=chat_request.max_tokens,
+        route=chat_request.route
+    ))
+
 @router.get("/status")
 async def chat_status(chat_service: ChatService = Depends(get_chat_service)):
     """
     Get chat service status and DeepSeek client health.
+    
+    Responds with 503 while the service is unhealthy (e.g. the DeepSeek
+    circuit breaker is open) so load balancers can drain traffic.
     """
     try:
-        return chat_service.get_service_status()
+        status = chat_service.get_service_status()
+        if status["status"] == "unhealthy":
+            return JSONResponse(status_code=503, content=status)
+        return status
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Status check error: {str(e)}")
 
@@ -127,5 +307,8 @@ async def chat_health():
         "status": "healthy",
         "service": "Chat API",
         "timestamp": datetime.utcnow().isoformat(),
-        "endpoints": ["/chat/simple", "/chat/context", "/chat/status", "/chat/health"]
+        "endpoints": [
+            "/chat/simple", "/chat/context", "/chat/simple/stream",
+            "/chat/context/stream", "/chat/batch", "/chat/status", "/chat/health"
+        ]
     }
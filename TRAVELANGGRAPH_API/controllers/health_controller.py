@@ -2,9 +2,11 @@
 Health check controller for TravelLangGraph API.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
 from datetime import datetime
-from models.schemas import HealthResponse
+from models.schemas import HealthResponse, SystemHealthResponse
+from services.health_service import HealthService
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -21,3 +23,33 @@ async def health_check():
 async def ping():
     """Simple ping endpoint."""
     return {"message": "pong", "timestamp": datetime.utcnow().isoformat()}
+
+@router.get("/ready")
+async def readiness(request: Request):
+    """
+    Readiness probe.
+    
+    Answers 200 once startup has built the connection pool and shared
+    services, and 503 before that, during shutdown and when the chat
+    service could not be built, e.g. without `DEEPSEEK_API_KEY`. Use
+    `/health/ping` for liveness.
+    """
+    timings = getattr(request.app.state, "startup_timings", None)
+    ready = getattr(request.app.state, "ready", False)
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "status": "ready" if ready else "not_ready",
+            "chat_service": getattr(request.app.state, "chat_service", None) is not None,
+            "startup": timings.to_dict() if timings is not None else None,
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    )
+
+@router.get("/system", response_model=SystemHealthResponse)
+async def system_health():
+    """System and process health from the latest background sample."""
+    health = HealthService.get_system_health()
+    if not HealthService.is_healthy():
+        health["status"] = "degraded"
+    return SystemHealthResponse(**health)
@@ -0,0 +1,21 @@
+"""
+Metrics controller for TravelLangGraph API.
+"""
+
+import asyncio
+from fastapi import APIRouter
+from fastapi.responses import Response
+from metrics import CONTENT_TYPE, registry
+
+router = APIRouter(tags=["metrics"])
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Metrics in Prometheus text exposition format, summed across workers when configured."""
+    snapshot = registry.snapshot()
+    if registry.multiproc_dir:
+        # Reading every worker's snapshot file is blocking I/O
+        body = await asyncio.to_thread(registry.render, snapshot)
+    else:
+        body = registry.render(snapshot)
+    return Response(content=body, media_type=CONTENT_TYPE)
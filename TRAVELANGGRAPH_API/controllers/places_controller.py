@@ -0,0 +1,75 @@
+"""
+Places controller for TravelLangGraph API.
+Contains airport, city and country reference data endpoints.
+"""
+
+from fastapi import APIRouter, HTTPException, Depends, Query
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+from dependencies import get_place_index
+from services.place_index import PlaceIndex
+
+router = APIRouter(prefix="/places", tags=["places"])
+
+PlaceKind = Literal["airport", "city", "country"]
+
+# Response Models
+class Place(BaseModel):
+    """Place model."""
+    kind: str
+    code: Optional[str] = None
+    name: str
+    city: Optional[str] = None
+    country_code: Optional[str] = None
+    country: Optional[str] = None
+    latitude: float
+    longitude: float
+    population: Optional[int] = None
+    distance_km: Optional[float] = None
+
+class PlacesResponse(BaseModel):
+    """Places response model."""
+    results: List[Place]
+
+@router.get("/autocomplete", response_model=PlacesResponse)
+async def autocomplete(
+    q: str = Query(..., min_length=1, description="Text typed so far"),
+    limit: int = Query(10, ge=1, le=50),
+    kind: Optional[List[PlaceKind]] = Query(None, description="Kinds to keep; all when omitted"),
+    places: PlaceIndex = Depends(get_place_index)
+):
+    """
+    Suggest places whose name, name word or code starts with `q`.
+    """
+    return {"results": places.autocomplete(q, limit=limit, kinds=kind)}
+
+@router.get("/nearby", response_model=PlacesResponse)
+async def nearby(
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius_km: float = Query(100.0, gt=0, le=2000),
+    limit: int = Query(10, ge=1, le=100),
+    kind: Optional[List[PlaceKind]] = Query(None, description="Kinds to keep; all when omitted"),
+    places: PlaceIndex = Depends(get_place_index)
+):
+    """
+    Find places within `radius_km` of a point, nearest first.
+    """
+    return {"results": places.nearby(lat, lon, radius_km, limit=limit, kinds=kind)}
+
+@router.get("/status")
+async def places_status(places: PlaceIndex = Depends(get_place_index)):
+    """
+    Get place counts, index sizes and the data source.
+    """
+    return places.stats()
+
+@router.get("/{code}", response_model=Place)
+async def get_place(code: str, kind: Optional[PlaceKind] = None, places: PlaceIndex = Depends(get_place_index)):
+    """
+    Look up a place by IATA airport code or ISO country code.
+    """
+    place = places.lookup(code, kind=kind)
+    if place is None:
+        raise HTTPException(status_code=404, detail=f"Place not found: {code}")
+    return place
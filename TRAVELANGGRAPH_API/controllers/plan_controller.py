@@ -0,0 +1,109 @@
+"""
+Plan controller for TravelLangGraph API.
+Contains travel planning endpoints backed by the planning graph.
+"""
+
+from fastapi import APIRouter, HTTPException, Depends
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from datetime import date
+from clients.concurrency_limiter import UpstreamOverloadedError
+from controllers.chat_controller import overloaded_exception
+from dependencies import get_travel_planner
+from services.plan_graph import NodeFailedError
+from services.travel_planner import TravelPlanner
+from serialization import FastJSONResponse
+
+router = APIRouter(prefix="/plan", tags=["plan"])
+
+# Request/Response Models
+class PlanRequest(BaseModel):
+    """Travel plan request model."""
+    destination: str = Field(..., min_length=1, description="Destination city or region")
+    origin: Optional[str] = Field(None, description="City the travellers fly from")
+    start_date: Optional[date] = Field(None, description="First day of the trip")
+    days: int = Field(3, ge=1, le=30, description="Length of the trip in days")
+    travelers: int = Field(1, ge=1, le=20, description="Number of travellers")
+    budget: Optional[str] = Field(None, description="Budget level, e.g. budget, mid-range or luxury")
+    interests: List[str] = Field(default_factory=list, description="Interests to plan around")
+
+class PlanStepInfo(BaseModel):
+    """Timing of one plan step."""
+    source: str = Field(..., description="executed, memoized or checkpoint")
+    duration_ms: float
+
+class PlanResponse(BaseModel):
+    """Travel plan response model."""
+    run_id: str
+    status: str
+    plan: Dict[str, Any]
+    steps: Dict[str, PlanStepInfo]
+    error: Optional[Dict[str, str]] = None
+    total_ms: Optional[float] = None
+    created_at: str
+
+def plan_response(run: Dict[str, Any]) -> FastJSONResponse:
+    """Encode a run checkpoint as a plan response."""
+    return FastJSONResponse({
+        "run_id": run["run_id"],
+        "status": run["status"],
+        "plan": run["outputs"],
+        "steps": run["nodes"],
+        "error": run["error"],
+        "total_ms": run.get("total_ms"),
+        "created_at": run["created_at"]
+    })
+
+def failed_exception(error: NodeFailedError) -> HTTPException:
+    """Build an error response that carries the run ID to resume from."""
+    if isinstance(error.error, UpstreamOverloadedError):
+        exception = overloaded_exception(error.error)
+    else:
+        exception = HTTPException(
+            status_code=502,
+            detail={"error": "plan_step_failed", "message": str(error)}
+        )
+    exception.detail.update(run_id=error.run_id, node=error.node)
+    return exception
+
+@router.post("", response_model=PlanResponse)
+async def create_plan(request: PlanRequest, planner: TravelPlanner = Depends(get_travel_planner)):
+    """
+    Plan a trip: destination research, flights and hotels run concurrently, then the itinerary.
+    
+    If a step fails the response carries the `run_id`; resume it with
+    `POST /plan/{run_id}/resume` to re-run only the steps that did not complete.
+    """
+    try:
+        return plan_response(await planner.plan(request.model_dump(mode="json")))
+    except NodeFailedError as e:
+        raise failed_exception(e)
+
+@router.get("/status")
+async def plan_status(planner: TravelPlanner = Depends(get_travel_planner)):
+    """
+    Get the planning graph's steps, memo counters and checkpoint store size.
+    """
+    return planner.get_status()
+
+@router.get("/{run_id}", response_model=PlanResponse)
+async def get_plan(run_id: str, planner: TravelPlanner = Depends(get_travel_planner)):
+    """
+    Get a plan run with the outputs of its completed steps.
+    """
+    run = planner.get_run(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Plan run not found: {run_id}")
+    return plan_response(run)
+
+@router.post("/{run_id}/resume", response_model=PlanResponse)
+async def resume_plan(run_id: str, planner: TravelPlanner = Depends(get_travel_planner)):
+    """
+    Resume a failed plan run from its last completed steps.
+    """
+    try:
+        return plan_response(await planner.resume(run_id))
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Plan run not found: {run_id}")
+    except NodeFailedError as e:
+        raise failed_exception(e)
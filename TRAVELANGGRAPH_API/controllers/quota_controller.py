@@ -0,0 +1,49 @@
+"""
+Quota controller for TravelLangGraph API.
+Contains endpoints reporting per-client rate limits and usage.
+"""
+
+import math
+from fastapi import APIRouter, HTTPException, Depends, Request
+from typing import Optional
+from dependencies import get_rate_limiter
+from rate_limit import RateLimiter
+
+router = APIRouter(prefix="/quota", tags=["quota"])
+
+def _level(value: float) -> Optional[float]:
+    return None if math.isinf(value) else round(value, 3)
+
+@router.get("")
+async def get_quota(request: Request, limiter: Optional[RateLimiter] = Depends(get_rate_limiter)):
+    """
+    Get the calling API key's limits, the requests and tokens left in its
+    buckets and this worker's totals for it.
+    
+    Reading the quota does not use any of it.
+    """
+    if limiter is None:
+        return {"enabled": False}
+    quota = limiter.identify(limiter.api_key(request.scope["headers"]))
+    if quota is None:
+        raise HTTPException(
+            status_code=401,
+            detail={"error": "invalid_api_key", "message": "A valid API key is required"}
+        )
+    levels = await limiter.admit(quota, cost=0)
+    return {
+        "enabled": True,
+        **quota.to_dict(),
+        "requests_remaining": _level(levels.requests_remaining),
+        "tokens_remaining": _level(levels.tokens_remaining),
+        "usage": limiter.usage(quota.label)
+    }
+
+@router.get("/status")
+async def quota_status(limiter: Optional[RateLimiter] = Depends(get_rate_limiter)):
+    """
+    Get the rate limit store and this worker's totals over all clients, without client names.
+    """
+    if limiter is None:
+        return {"enabled": False}
+    return {"enabled": True, **limiter.stats()}
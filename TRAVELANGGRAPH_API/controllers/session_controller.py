@@ -0,0 +1,109 @@
+"""
+Session controller for TravelLangGraph API.
+Contains server-side conversation session endpoints.
+"""
+
+from fastapi import APIRouter, HTTPException, Depends
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from services.chat_service import ChatService
+from clients.concurrency_limiter import UpstreamOverloadedError
+from controllers.chat_controller import ChatMessage, ChatResponse, check_route, overloaded_exception
+from dependencies import get_chat_service
+from serialization import FastJSONResponse, pick
+
+router = APIRouter(prefix="/chat/sessions", tags=["sessions"])
+
+# Request/Response Models
+class CreateSessionRequest(BaseModel):
+    """Create session request model."""
+    system_prompt: Optional[str] = Field(None, description="System prompt sent ahead of every turn")
+    messages: List[ChatMessage] = Field(default_factory=list, description="Optional initial history")
+
+class SessionResponse(BaseModel):
+    """Session response model."""
+    session_id: str
+    system_prompt: Optional[str] = None
+    created_at: str
+    messages: Optional[List[ChatMessage]] = None
+
+class SessionMessageRequest(BaseModel):
+    """Session message request model."""
+    message: str = Field(..., description="New user message")
+    model: Optional[str] = Field(None, description="Model to use for chat; chosen by the route when omitted")
+    temperature: Optional[float] = Field(None, ge=0.0, le=2.0, description="Sampling temperature; chosen by the route when omitted")
+    max_tokens: Optional[int] = Field(None, ge=1, le=4000, description="Maximum tokens to generate; chosen by the route when omitted")
+    route: Optional[str] = Field(None, description="Model route, e.g. short_factual or itinerary; classified when omitted")
+
+class SessionMessageResponse(ChatResponse):
+    """Session message response model carrying only the new reply."""
+    session_id: str
+    history_length: int
+
+SESSION_MESSAGE_FIELDS = tuple(SessionMessageResponse.model_fields)
+
+@router.post("", response_model=SessionResponse, status_code=201)
+async def create_session(
+    request: CreateSessionRequest,
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """
+    Create a conversation session whose history is kept on the server.
+    """
+    session = chat_service.create_session(
+        system_prompt=request.system_prompt,
+        messages=[{"role": msg.role, "content": msg.content} for msg in request.messages]
+    )
+    return SessionResponse(
+        session_id=session["session_id"],
+        system_prompt=session["system_prompt"],
+        created_at=session["created_at"]
+    )
+
+@router.get("/{session_id}", response_model=SessionResponse)
+async def get_session(session_id: str, chat_service: ChatService = Depends(get_chat_service)):
+    """
+    Get a session with its full history.
+    """
+    session = chat_service.get_session(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
+    return SessionResponse(**session)
+
+@router.delete("/{session_id}", status_code=204)
+async def delete_session(session_id: str, chat_service: ChatService = Depends(get_chat_service)):
+    """
+    Delete a session and its history.
+    """
+    if not chat_service.delete_session(session_id):
+        raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
+
+@router.post("/{session_id}/messages", response_model=SessionMessageResponse)
+async def send_session_message(
+    session_id: str,
+    request: SessionMessageRequest,
+    chat_service: ChatService = Depends(get_chat_service)
+):
+    """
+    Send the next user turn of a session and get only the new AI response.
+    """
+    check_route(chat_service, request.route)
+    
+    try:
+        result = await chat_service.send_session_message(
+            session_id=session_id,
+            message=request.message,
+            model=request.model,
+            temperature=request.temperature,
+            max_tokens=request.max_tokens,
+            route=request.route
+        )
+        
+        return FastJSONResponse(pick(result, SESSION_MESSAGE_FIELDS))
+    
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Session not found: {session_id}")
+    except UpstreamOverloadedError as e:
+        raise overloaded_exception(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chat service error: {str(e)}")
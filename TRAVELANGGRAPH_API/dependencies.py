@@ -0,0 +1,143 @@
+"""
+Dependency wiring for TravelLangGraph API.
+Builds shared services once at startup and exposes them to controllers.
+"""
+
+from typing import Optional
+import logging
+from fastapi import Depends, FastAPI, HTTPException, Request
+from config import settings
+from clients.provider_pool import build_chat_provider
+from services.chat_service import ChatService
+from services.health_service import health_sampler
+from services.place_answers import PlaceAnswerer
+from services.place_index import PlaceIndex, load_place_index
+from services.travel_planner import TravelPlanner
+from metrics import metrics_exporter
+from rate_limit import RateLimiter, rate_limiter_for
+from startup_profile import StartupTimings
+
+logger = logging.getLogger(__name__)
+
+async def startup(app: FastAPI) -> None:
+    """
+    Build shared clients and services and store them on `app.state`.
+    
+    Each worker process runs this once, so every worker owns its own
+    connection pool and service instances. Each step is timed, and
+    `app.state.ready` is set once everything is built.
+    """
+    app.state.ready = False
+    timings = StartupTimings()
+    settings.validate()
+    
+    with timings.step("background_tasks"):
+        health_sampler.start()
+        metrics_exporter.start()
+    
+    with timings.step("rate_limiter"):
+        app.state.rate_limiter = RateLimiter.from_settings()
+    
+    # Reference data needs no API key, so it loads even if the chat service cannot start
+    with timings.step("places"):
+        app.state.places = load_place_index()
+    
+    try:
+        with timings.step("chat_provider"):
+            deepseek_client = build_chat_provider()
+        with timings.step("connection_pool"):
+            await deepseek_client.start()
+        app.state.deepseek_client = deepseek_client
+        with timings.step("chat_service"):
+            app.state.chat_service = ChatService(
+                deepseek_client=deepseek_client,
+                place_answers=build_place_answerer(app.state.places)
+            )
+        with timings.step("travel_planner"):
+            app.state.travel_planner = TravelPlanner.from_settings(app.state.chat_service)
+    except ValueError as e:
+        logger.warning(f"Chat service not started: {e}")
+        app.state.deepseek_client = None
+        app.state.chat_service = None
+        app.state.travel_planner = None
+    
+    timings.finish()
+    app.state.startup_timings = timings
+    # Stay unready if the chat service could not be built, so traffic is not routed here
+    app.state.ready = app.state.chat_service is not None
+    logger.info(f"Startup complete: {timings.to_dict()}")
+
+async def shutdown(app: FastAPI) -> None:
+    """Release resources held by shared clients."""
+    app.state.ready = False
+    await health_sampler.stop()
+    await metrics_exporter.stop()
+    
+    deepseek_client = getattr(app.state, "deepseek_client", None)
+    if deepseek_client is not None:
+        await deepseek_client.aclose()
+    app.state.deepseek_client = None
+    app.state.chat_service = None
+    app.state.travel_planner = None
+    app.state.places = None
+    
+    rate_limiter = getattr(app.state, "rate_limiter", None)
+    if rate_limiter is not None:
+        await rate_limiter.aclose()
+    # Rebuilt from settings if the app serves requests again
+    if hasattr(app.state, "rate_limiter"):
+        del app.state.rate_limiter
+
+def build_place_answerer(places: Optional[PlaceIndex]) -> Optional[PlaceAnswerer]:
+    """Wrap the places index for the chat service, if it is loaded."""
+    if places is None:
+        return None
+    return PlaceAnswerer(places, nearby_radius_km=settings.PLACES_NEARBY_RADIUS_KM)
+
+def get_place_index(request: Request) -> PlaceIndex:
+    """
+    Get the shared places index.
+    
+    Loaded at startup; if the app was started without the lifespan it is
+    loaded on first use.
+    """
+    places = getattr(request.app.state, "places", None)
+    if places is None:
+        places = request.app.state.places = load_place_index()
+    if places is None:
+        raise HTTPException(status_code=503, detail="Places index unavailable")
+    return places
+
+def get_rate_limiter(request: Request) -> Optional[RateLimiter]:
+    """Get the shared rate limiter, or None when rate limiting is disabled."""
+    return rate_limiter_for(request.app)
+
+def get_chat_service(request: Request) -> ChatService:
+    """
+    Get the shared chat service instance.
+    
+    The service is built at startup; if the app was started without the
+    lifespan (e.g. a bare test client) it is built on first use and cached.
+    Tests can replace it per request with `app.dependency_overrides`.
+    """
+    chat_service = getattr(request.app.state, "chat_service", None)
+    if chat_service is None:
+        try:
+            chat_service = ChatService(place_answers=build_place_answerer(getattr(request.app.state, "places", None)))
+        except ValueError as e:
+            raise HTTPException(status_code=503, detail=f"Chat service unavailable: {str(e)}")
+        request.app.state.chat_service = chat_service
+    return chat_service
+
+def get_travel_planner(request: Request, chat_service: ChatService = Depends(get_chat_service)) -> TravelPlanner:
+    """
+    Get the shared travel planner.
+    
+    The planner keeps memoized step outputs and run checkpoints, so it is
+    built once per chat service and reused across requests.
+    """
+    planner = getattr(request.app.state, "travel_planner", None)
+    if planner is None or planner.chat_service is not chat_service:
+        planner = TravelPlanner.from_settings(chat_service)
+        request.app.state.travel_planner = planner
+    return planner
@@ -0,0 +1,396 @@
+"""
+Prometheus-compatible metrics for TravelLangGraph API.
+Counters and latency histograms with text exposition and multi-worker aggregation.
+"""
+
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import glob
+import json
+import logging
+import math
+import os
+import time
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+class Counter:
+    """
+    Monotonic counter keyed by label values.
+    
+    Updates happen on the event loop thread, so a plain dictionary update is
+    enough and no lock is taken on the request path.
+    """
+    
+    type = "counter"
+    
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+    
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Add `amount` to the series for `labels`, given in `labelnames` order."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+    
+    def value(self, *labels: str) -> float:
+        """Current value of one series."""
+        return self._values.get(labels, 0.0)
+    
+    def samples(self) -> List[List[Any]]:
+        """Series as `[labels, value]` pairs."""
+        return [[list(labels), value] for labels, value in self._values.items()]
+
+class Histogram:
+    """
+    Histogram of observations keyed by label values.
+    
+    Each series keeps per-bucket counts plus a sum; counts are made
+    cumulative only when rendered.
+    """
+    
+    type = "histogram"
+    
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+    
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation for `labels`, given in `labelnames` order."""
+        series = self._series.get(labels)
+        if series is None:
+            # Bucket counts, then the +Inf bucket, then the sum
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+    
+    def count(self, *labels: str) -> int:
+        """Number of observations in one series."""
+        series = self._series.get(labels)
+        return int(sum(series[:-1])) if series else 0
+    
+    def samples(self) -> List[List[Any]]:
+        """Series as `[labels, bucket counts + sum]` pairs."""
+        return [[list(labels), list(series)] for labels, series in self._series.items()]
+
+class MetricsRegistry:
+    """
+    Collection of metrics with snapshot, merge and text exposition.
+    
+    With `multiproc_dir` set, every worker writes its snapshot to
+    `<multiproc_dir>/<pid>.json` and a scrape of any worker renders the sum
+    of all snapshots in the directory.
+    """
+    
+    def __init__(self, multiproc_dir: str = ""):
+        self.multiproc_dir = multiproc_dir
+        self._metrics: Dict[str, Any] = {}
+    
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        """Register a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+    
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """Register a histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+    
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Get a JSON-serializable copy of every metric."""
+        return {
+            name: {
+                "type": metric.type,
+                "help": metric.documentation,
+                "labelnames": list(metric.labelnames),
+                "buckets": list(getattr(metric, "buckets", ())),
+                "samples": metric.samples()
+            }
+            for name, metric in self._metrics.items()
+        }
+    
+    @property
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.multiproc_dir, f"{os.getpid()}.json")
+    
+    def write_snapshot(self, snapshot: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        """
+        Write this worker's snapshot to the multi-worker directory.
+        
+        Args:
+            snapshot: Snapshot taken on the event loop thread; taken here when
+                omitted. Pass one when writing from another thread.
+        """
+        if not self.multiproc_dir:
+            return
+        os.makedirs(self.multiproc_dir, exist_ok=True)
+        temporary_path = f"{self._snapshot_path}.tmp"
+        with open(temporary_path, "w") as f:
+            json.dump(snapshot if snapshot is not None else self.snapshot(), f, separators=(",", ":"))
+        os.replace(temporary_path, self._snapshot_path)
+    
+    def collect(self, snapshot: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the snapshot to expose.
+        
+        Args:
+            snapshot: This worker's snapshot; taken here when omitted
+        
+        Returns:
+            This worker's snapshot, or the sum over every worker's snapshot
+            file when a multi-worker directory is configured
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+        if not self.multiproc_dir:
+            return snapshot
+        
+        self.write_snapshot(snapshot)
+        snapshots = []
+        for path in glob.glob(os.path.join(self.multiproc_dir, "*.json")):
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable metrics snapshot {path}: {e}")
+        return merge_snapshots(snapshots)
+    
+    def render(self, snapshot: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+        """Render the collected metrics in Prometheus text exposition format."""
+        return render_snapshot(self.collect(snapshot))
+
+def clear_multiproc_dir(multiproc_dir: str) -> int:
+    """
+    Remove worker snapshots left by an earlier run; returns how many were removed.
+    
+    Snapshots are never removed while workers run, so call this before
+    starting them. Stale files would otherwise be summed into every scrape,
+    and a reused PID would overwrite an old worker's totals with smaller
+    ones, which Prometheus reads as a counter reset.
+    """
+    removed = 0
+    for pattern in ("*.json", "*.json.tmp"):
+        for path in glob.glob(os.path.join(multiproc_dir, pattern)):
+            os.remove(path)
+            removed += 1
+    return removed
+
+def merge_snapshots(snapshots: Iterable[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Sum the series of several worker snapshots."""
+    merged: Dict[str, Dict[str, Any]] = {}
+    totals: Dict[str, Dict[Tuple[str, ...], Any]] = {}
+    
+    for snapshot in snapshots:
+        for name, metric in snapshot.items():
+            if name not in merged:
+                merged[name] = {**metric, "samples": []}
+                totals[name] = {}
+            series = totals[name]
+            for labels, value in metric["samples"]:
+                key = tuple(labels)
+                if key not in series:
+                    series[key] = list(value) if isinstance(value, list) else value
+                elif isinstance(value, list):
+                    series[key] = [a + b for a, b in zip(series[key], value)]
+                else:
+                    series[key] += value
+    
+    for name, series in totals.items():
+        merged[name]["samples"] = [[list(labels), value] for labels, value in series.items()]
+    return merged
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+def render_snapshot(snapshot: Dict[str, Dict[str, Any]]) -> str:
+    """Render a snapshot in Prometheus text exposition format."""
+    lines = []
+    for name, metric in sorted(snapshot.items()):
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        labelnames = metric["labelnames"]
+        
+        for labels, value in sorted(metric["samples"]):
+            if metric["type"] != "histogram":
+                lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+                continue
+            
+            cumulative = 0
+            for bound, count in zip(list(metric["buckets"]) + [math.inf], value[:-1]):
+                cumulative += count
+                le = ("le", "+Inf" if bound == math.inf else repr(float(bound)))
+                lines.append(f"{name}_bucket{_format_labels(labelnames, labels, le)} {int(cumulative)}")
+            lines.append(f"{name}_sum{_format_labels(labelnames, labels)} {repr(float(value[-1]))}")
+            lines.append(f"{name}_count{_format_labels(labelnames, labels)} {int(cumulative)}")
+    return "\n".join(lines) + "\n"
+
+class MetricsExporter:
+    """
+    Background task that flushes this worker's metrics snapshot to disk.
+    
+    Only needed with a multi-worker directory, so that a scrape served by
+    one worker also sees recent counts from the others.
+    """
+    
+    def __init__(self, registry: MetricsRegistry, interval_seconds: float = 5.0):
+        self.registry = registry
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+    
+    async def _run(self) -> None:
+        """Flush the snapshot until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await asyncio.to_thread(self.registry.write_snapshot, self.registry.snapshot())
+            except Exception as e:
+                logger.error(f"Metrics snapshot flush failed: {e}")
+    
+    def start(self) -> None:
+        """Start flushing on the running event loop when a directory is configured."""
+        if self.registry.multiproc_dir and self._task is None:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop flushing and write a final snapshot."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.registry.multiproc_dir:
+            self.registry.write_snapshot()
+
+# Shared registry and the application's metrics
+registry = MetricsRegistry(multiproc_dir=settings.METRICS_MULTIPROC_DIR)
+metrics_exporter = MetricsExporter(registry, interval_seconds=settings.METRICS_FLUSH_INTERVAL_SECONDS)
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "HTTP requests by method, route and status", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method, route and status", ("method", "route", "status")
+)
+UPSTREAM_REQUESTS = registry.counter(
+    "upstream_requests_total", "Upstream chat completion attempts by provider and outcome", ("provider", "outcome")
+)
+UPSTREAM_DURATION = registry.histogram(
+    "upstream_request_duration_seconds", "Upstream chat completion attempt latency", ("provider", "outcome")
+)
+UPSTREAM_TTFB = registry.histogram(
+    "upstream_time_to_first_byte_seconds", "Time until upstream response headers arrive", ("provider", "stream")
+)
+UPSTREAM_RETRIES = registry.counter(
+    "upstream_retries_total", "Upstream chat completion retries", ("provider",)
+)
+CACHE_LOOKUPS = registry.counter(
+    "completion_cache_lookups_total", "Completion cache lookups by result", ("result",)
+)
+SEMANTIC_CACHE_LOOKUPS = registry.counter(
+    "semantic_cache_lookups_total", "Semantic cache lookups by result", ("result",)
+)
+SEMANTIC_CACHE_LOOKUP_DURATION = registry.histogram(
+    "semantic_cache_lookup_duration_seconds", "Semantic cache lookup latency, embedding included", (),
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)
+)
+PLACE_ANSWERS = registry.counter(
+    "place_answers_total", "Chat messages answered or grounded from reference data", ("outcome",)
+)
+PLAN_RUNS = registry.counter(
+    "plan_runs_total", "Planning graph runs by final status", ("status",)
+)
+PLAN_NODE_DURATION = registry.histogram(
+    "plan_node_duration_seconds", "Planning graph step latency by step and source", ("node", "source")
+)
+RATE_LIMIT_DECISIONS = registry.counter(
+    "rate_limit_decisions_total", "Rate limiter decisions by client and outcome", ("client", "outcome")
+)
+RATE_LIMIT_TOKENS = registry.counter(
+    "rate_limit_tokens_total", "LLM tokens charged to client quotas", ("client",)
+)
+PROMPT_CACHE_TOKENS = registry.counter(
+    "prompt_cache_tokens_total", "Prompt tokens served from or missing the upstream prompt cache, by template", ("template", "result")
+)
+TOKENS = registry.counter(
+    "llm_tokens_total", "Tokens reported by upstream usage, by model and kind", ("model", "kind")
+)
+
+def record_usage(model: str, usage: Optional[Dict[str, Any]]) -> None:
+    """Count prompt, completion and prompt cache hit and miss tokens from an upstream `usage` dictionary."""
+    if not usage:
+        return
+    for kind in ("prompt_tokens", "completion_tokens", "prompt_cache_hit_tokens", "prompt_cache_miss_tokens"):
+        if usage.get(kind):
+            TOKENS.inc(model, kind[:-len("_tokens")], amount=usage[kind])
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request count and latency per route and status.
+    
+    Requests are labelled with the matched route's path template rather than
+    the raw path, so path parameters do not create new series. Latency runs
+    from the first byte in to the last byte out, including streamed bodies.
+    """
+    
+    def __init__(self, app, exclude_paths: Tuple[str, ...] = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = exclude_paths
+    
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        
+        status = "500"
+        
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+        
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            labels = (scope["method"], getattr(route, "path", "unmatched"), status)
+            HTTP_REQUESTS.inc(*labels)
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - start, *labels)
@@ -3,6 +3,6 @@ Models package for TravelLangGraph API.
 Contains Pydantic models for request/response schemas.
 """
 
-from .schemas import HealthResponse, HelloResponse, RootResponse
+from .schemas import HealthResponse, SystemHealthResponse, HelloResponse, RootResponse
 
-__all__ = ["HealthResponse", "HelloResponse", "RootResponse"]
+__all__ = ["HealthResponse", "SystemHealthResponse", "HelloResponse", "RootResponse"]
@@ -3,7 +3,7 @@ Pydantic schemas for TravelLangGraph API.
 """
 
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, Optional
 from datetime import datetime
 
 class HealthResponse(BaseModel):
@@ -12,6 +12,15 @@ class HealthResponse(BaseModel):
     service: str
     timestamp: Optional[datetime] = None
 
+class SystemHealthResponse(BaseModel):
+    """System health response model."""
+    status: str
+    service: str
+    timestamp: Optional[datetime] = None
+    system: Dict[str, Any]
+    process: Dict[str, Any]
+    sampled_at: Optional[datetime] = None
+
 class HelloResponse(BaseModel):
     """Hello world response model."""
     message: str
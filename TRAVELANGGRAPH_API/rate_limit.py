@@ -0,0 +1,553 @@
+"""
+Per-client rate limiting for TravelLangGraph API.
+Token buckets on requests per second and LLM tokens per minute, keyed by API key.
+"""
+
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import logging
+import math
+import time
+from clients.resp_client import RespClient
+from config import settings
+from metrics import RATE_LIMIT_DECISIONS, RATE_LIMIT_TOKENS
+from serialization import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+# Admission statuses, shared with the Lua script
+ADMITTED, REQUEST_LIMITED, TOKEN_LIMITED = 1, 0, -1
+
+# Last path segments of routes that are never limited, e.g. `/chat/status`
+UNLIMITED_ROUTES = frozenset({"status", "health"})
+
+class ClientQuota:
+    """
+    Limits for one client.
+    
+    Args:
+        client_id: Bucket key for the client
+        label: Metrics label: the configured name, `anonymous` or `unregistered`
+        requests_per_second: Sustained request rate; 0 disables the request limit
+        burst: Requests allowed at once on top of the sustained rate
+        tokens_per_minute: LLM tokens per minute; 0 disables the token limit
+    """
+    
+    __slots__ = ("client_id", "label", "requests_per_second", "burst", "tokens_per_minute")
+    
+    def __init__(self, client_id: str, label: str, requests_per_second: float, burst: float, tokens_per_minute: float):
+        self.client_id = client_id
+        self.label = label
+        self.requests_per_second = requests_per_second
+        self.burst = max(burst, 1.0)
+        self.tokens_per_minute = tokens_per_minute
+    
+    @property
+    def token_rate(self) -> float:
+        """Tokens refilled per second."""
+        return self.tokens_per_minute / 60.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "client": self.label,
+            "requests_per_second": self.requests_per_second,
+            "burst": self.burst,
+            "tokens_per_minute": self.tokens_per_minute
+        }
+
+class Admission:
+    """Outcome of an admission check, with the levels left in each bucket."""
+    
+    __slots__ = ("status", "retry_after", "requests_remaining", "tokens_remaining")
+    
+    def __init__(self, status: int, retry_after: float = 0.0, requests_remaining: float = math.inf, tokens_remaining: float = math.inf):
+        self.status = status
+        self.retry_after = retry_after
+        self.requests_remaining = requests_remaining
+        self.tokens_remaining = tokens_remaining
+    
+    @property
+    def allowed(self) -> bool:
+        return self.status == ADMITTED
+    
+    @property
+    def limit(self) -> Optional[str]:
+        """The exhausted limit, `requests` or `tokens`, or None when admitted."""
+        return {REQUEST_LIMITED: "requests", TOKEN_LIMITED: "tokens"}.get(self.status)
+
+def refill(bucket: List[float], now: float, rate: float, capacity: float) -> float:
+    """Top up a `[level, updated]` bucket for the time elapsed since it was updated; returns the level."""
+    level = min(capacity, bucket[0] + max(0.0, now - bucket[1]) * rate)
+    bucket[0], bucket[1] = level, now
+    return level
+
+def admit_buckets(
+    requests: List[float],
+    tokens: List[float],
+    now: float,
+    quota: ClientQuota,
+    cost: float = 1.0
+) -> Tuple[int, float, float, float]:
+    """
+    Take `cost` requests from a client's buckets if both limits allow it.
+    
+    The request bucket must hold `cost` requests and the token bucket at
+    least one token; token usage is charged after the response, so the
+    token bucket can go into debt. A `cost` of 0 only reads the levels.
+    
+    Returns:
+        Tuple of the status, seconds until a retry can succeed, and the
+        request and token levels left (infinite for disabled limits)
+    """
+    request_level = refill(requests, now, quota.requests_per_second, quota.burst) if quota.requests_per_second > 0 else math.inf
+    token_level = refill(tokens, now, quota.token_rate, quota.tokens_per_minute) if quota.tokens_per_minute > 0 else math.inf
+    if cost > 0:
+        if request_level < cost:
+            return REQUEST_LIMITED, (cost - request_level) / quota.requests_per_second, request_level, token_level
+        if token_level < 1:
+            return TOKEN_LIMITED, (1 - token_level) / quota.token_rate, request_level, token_level
+        if quota.requests_per_second > 0:
+            requests[0] = request_level = request_level - cost
+    return ADMITTED, 0.0, request_level, token_level
+
+def charge_bucket(tokens: List[float], now: float, quota: ClientQuota, amount: float) -> float:
+    """Charge used tokens to a client's token bucket; returns the level left, which may be negative."""
+    if quota.tokens_per_minute <= 0:
+        return math.inf
+    tokens[0] = refill(tokens, now, quota.token_rate, quota.tokens_per_minute) - amount
+    return tokens[0]
+
+# Redis twins of `admit_buckets` and `charge_bucket`. Buckets are hashes of
+# level and update time that expire once they would have refilled.
+ADMIT_SCRIPT = """
+local now, cost = tonumber(ARGV[1]), tonumber(ARGV[2])
+local request_rate, request_capacity = tonumber(ARGV[3]), tonumber(ARGV[4])
+local token_rate, token_capacity = tonumber(ARGV[5]), tonumber(ARGV[6])
+local function refill(key, rate, capacity)
+    if rate <= 0 then return math.huge end
+    local state = redis.call('HMGET', key, 'level', 'updated')
+    local level = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    return math.min(capacity, level + math.max(0, now - updated) * rate)
+end
+local function save(key, level, rate, capacity)
+    if rate <= 0 then return end
+    redis.call('HSET', key, 'level', tostring(level), 'updated', tostring(now))
+    redis.call('PEXPIRE', key, math.ceil((capacity - level) / rate * 1000) + 1000)
+end
+local requests = refill(KEYS[1], request_rate, request_capacity)
+local tokens = refill(KEYS[2], token_rate, token_capacity)
+local status, retry_after = 1, 0
+if cost > 0 then
+    if requests < cost then
+        status, retry_after = 0, (cost - requests) / request_rate
+    elseif tokens < 1 then
+        status, retry_after = -1, (1 - tokens) / token_rate
+    elseif request_rate > 0 then
+        requests = requests - cost
+    end
+end
+save(KEYS[1], requests, request_rate, request_capacity)
+save(KEYS[2], tokens, token_rate, token_capacity)
+return {status, tostring(retry_after), tostring(requests), tostring(tokens)}
+"""
+
+CHARGE_SCRIPT = """
+local now, rate, capacity, amount = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'level', 'updated')
+local level = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+level = math.min(capacity, level + math.max(0, now - updated) * rate) - amount
+redis.call('HSET', KEYS[1], 'level', tostring(level), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - level) / rate * 1000) + 1000)
+return tostring(level)
+"""
+
+class BucketStore:
+    """Base class for rate limit bucket stores."""
+    
+    name = "store"
+    
+    async def admit(self, quota: ClientQuota, cost: float = 1.0) -> Admission:
+        """Take `cost` requests from a client's buckets if its limits allow it (see `admit_buckets`)."""
+        raise NotImplementedError
+    
+    async def charge(self, quota: ClientQuota, tokens: float) -> float:
+        """Charge used tokens to a client; returns the tokens left."""
+        raise NotImplementedError
+    
+    async def aclose(self) -> None:
+        """Release connections held by the store."""
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+class InMemoryBucketStore(BucketStore):
+    """
+    In-process buckets, limiting each worker separately.
+    
+    At most `max_clients` clients are tracked; the least recently seen
+    are dropped and start again with full buckets.
+    """
+    
+    name = "memory"
+    
+    def __init__(self, max_clients: int = 10000):
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[List[float], List[float]]]" = OrderedDict()
+    
+    def _buckets_for(self, quota: ClientQuota, now: float) -> Tuple[List[float], List[float]]:
+        buckets = self._buckets.get(quota.client_id)
+        if buckets is None:
+            buckets = self._buckets[quota.client_id] = ([quota.burst, now], [quota.tokens_per_minute, now])
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(quota.client_id)
+        return buckets
+    
+    async def admit(self, quota: ClientQuota, cost: float = 1.0) -> Admission:
+        now = time.monotonic()
+        requests, tokens = self._buckets_for(quota, now)
+        return Admission(*admit_buckets(requests, tokens, now, quota, cost))
+    
+    async def charge(self, quota: ClientQuota, tokens: float) -> float:
+        now = time.monotonic()
+        return charge_bucket(self._buckets_for(quota, now)[1], now, quota, tokens)
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "clients": len(self._buckets), "max_clients": self.max_clients}
+
+class RedisBucketStore(BucketStore):
+    """
+    Buckets in a Redis-protocol store shared by every worker and instance.
+    
+    Each check is one Lua script call, so concurrent workers cannot both
+    take the last request. Workers use wall-clock time, so their clocks
+    should be synchronized.
+    """
+    
+    name = "redis"
+    
+    def __init__(self, client: RespClient, prefix: str = "tlg:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+    
+    def _keys(self, quota: ClientQuota) -> List[str]:
+        return [f"{self.prefix}{quota.client_id}:requests", f"{self.prefix}{quota.client_id}:tokens"]
+    
+    async def admit(self, quota: ClientQuota, cost: float = 1.0) -> Admission:
+        status, retry_after, requests, tokens = await self.client.eval_script(
+            ADMIT_SCRIPT,
+            self._keys(quota),
+            [repr(time.time()), cost, quota.requests_per_second, quota.burst, quota.token_rate, quota.tokens_per_minute]
+        )
+        return Admission(int(status), float(retry_after), float(requests), float(tokens))
+    
+    async def charge(self, quota: ClientQuota, tokens: float) -> float:
+        if quota.tokens_per_minute <= 0:
+            return math.inf
+        level = await self.client.eval_script(
+            CHARGE_SCRIPT,
+            self._keys(quota)[1:],
+            [repr(time.time()), quota.token_rate, quota.tokens_per_minute, tokens]
+        )
+        return float(level)
+    
+    async def aclose(self) -> None:
+        await self.client.aclose()
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "host": self.client.host, "port": self.client.port}
+
+class RateLimiter:
+    """
+    Identify clients by API key and enforce their request and token limits.
+    
+    Clients listed in `keys` get their own limits. Requests with a missing
+    or unlisted key are treated alike: they are refused when `require_key`
+    is set, and otherwise share the `anonymous` quota, since a caller could
+    dodge its limits by sending a new key on every request.
+    `per_key_buckets` gives each unlisted key its own bucket instead.
+    Token usage reported by the upstream is charged after each completion.
+    If the store fails, requests are let through.
+    
+    Args:
+        store: Bucket store
+        default_limits: `(requests_per_second, burst, tokens_per_minute)` for
+            clients without configured limits
+        keys: API key -> `{"name", "requests_per_second", "burst", "tokens_per_minute"}`
+        require_key: Reject requests without a listed API key
+        per_key_buckets: Give each unlisted key its own buckets
+        header: Header carrying the API key
+        paths: Paths limited along with everything below them, e.g. `/chat`
+            covers `/chat/simple` but not `/chatty`; status and health
+            routes are never limited
+    """
+    
+    def __init__(
+        self,
+        store: Optional[BucketStore] = None,
+        default_limits: Tuple[float, float, float] = (5.0, 10.0, 100000.0),
+        keys: Optional[Dict[str, Dict[str, Any]]] = None,
+        require_key: bool = False,
+        per_key_buckets: bool = False,
+        header: str = "X-API-Key",
+        paths: Sequence[str] = ("/chat", "/plan")
+    ):
+        self.store = store or InMemoryBucketStore()
+        self.default_limits = default_limits
+        self.require_key = require_key
+        self.per_key_buckets = per_key_buckets
+        self.header = header.lower().encode("latin-1")
+        self.paths = tuple(path.rstrip("/") for path in paths)
+        self._subpaths = tuple(path + "/" for path in self.paths)
+        self.keys: Dict[str, ClientQuota] = {}
+        for key, config in (keys or {}).items():
+            requests_per_second, burst, tokens_per_minute = default_limits
+            self.keys[key] = ClientQuota(
+                config["name"], config["name"],
+                float(config.get("requests_per_second", requests_per_second)),
+                float(config.get("burst", burst)),
+                float(config.get("tokens_per_minute", tokens_per_minute))
+            )
+        self.anonymous = ClientQuota("anonymous", "anonymous", *default_limits)
+        self._usage: Dict[str, Dict[str, int]] = {}
+    
+    @classmethod
+    def from_settings(cls) -> Optional["RateLimiter"]:
+        """Build the limiter configured by settings, or None when rate limiting is disabled."""
+        if not settings.RATE_LIMIT_ENABLED:
+            return None
+        if settings.RATE_LIMIT_BACKEND == "redis":
+            store = RedisBucketStore(RespClient(settings.RATE_LIMIT_REDIS_URL))
+        else:
+            store = InMemoryBucketStore(max_clients=settings.RATE_LIMIT_MAX_CLIENTS)
+        return cls(
+            store,
+            default_limits=(
+                settings.RATE_LIMIT_REQUESTS_PER_SECOND,
+                settings.RATE_LIMIT_BURST,
+                settings.RATE_LIMIT_TOKENS_PER_MINUTE
+            ),
+            keys=json.loads(settings.RATE_LIMIT_API_KEYS) if settings.RATE_LIMIT_API_KEYS else None,
+            require_key=settings.RATE_LIMIT_REQUIRE_KEY,
+            per_key_buckets=settings.RATE_LIMIT_PER_KEY_BUCKETS,
+            header=settings.RATE_LIMIT_HEADER,
+            paths=[path.strip() for path in settings.RATE_LIMIT_PATHS.split(",") if path.strip()]
+        )
+    
+    def applies(self, method: str, path: str) -> bool:
+        """Whether a request is limited; CORS preflights and status and health routes never are."""
+        if method == "OPTIONS" or not (path in self.paths or path.startswith(self._subpaths)):
+            return False
+        return path.rstrip("/").rsplit("/", 1)[-1] not in UNLIMITED_ROUTES
+    
+    def api_key(self, headers: Sequence[Tuple[bytes, bytes]]) -> Optional[str]:
+        """The API key in raw ASGI headers, if any."""
+        for name, value in headers:
+            if name == self.header:
+                return value.decode("latin-1")
+        return None
+    
+    def identify(self, api_key: Optional[str]) -> Optional[ClientQuota]:
+        """The quota for an API key, or None if a listed key is required and this one is missing or unlisted."""
+        quota = self.keys.get(api_key) if api_key else None
+        if quota is not None:
+            return quota
+        if self.require_key:
+            return None
+        if not api_key or not self.per_key_buckets:
+            return self.anonymous
+        # Opted in: each key is its own client, stored under a hash of the key
+        client_id = "key-" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+        return ClientQuota(client_id, "unregistered", *self.default_limits)
+    
+    async def admit(self, quota: ClientQuota, cost: float = 1.0) -> Admission:
+        """Take `cost` requests from a client's buckets; lets the request through if the store fails."""
+        try:
+            admission = await self.store.admit(quota, cost)
+        except Exception as e:
+            logger.warning(f"Rate limit store '{self.store.name}' failed, letting the request through: {e}")
+            RATE_LIMIT_DECISIONS.inc(quota.label, "store_error")
+            return Admission(ADMITTED)
+        if cost > 0:
+            RATE_LIMIT_DECISIONS.inc(quota.label, "admitted" if admission.allowed else f"rejected_{admission.limit}")
+            if admission.allowed:
+                self._count(quota.label, "requests", int(cost))
+            else:
+                self._count(quota.label, "rejected")
+        return admission
+    
+    async def charge(self, quota: ClientQuota, usage: Optional[Dict[str, Any]]) -> None:
+        """Charge the tokens of an upstream `usage` dictionary to a client."""
+        if not usage:
+            return
+        tokens = usage.get("total_tokens") or (usage.get("prompt_tokens") or 0) + (usage.get("completion_tokens") or 0)
+        if not tokens:
+            return
+        RATE_LIMIT_TOKENS.inc(quota.label, amount=tokens)
+        self._count(quota.label, "tokens", tokens)
+        try:
+            await self.store.charge(quota, tokens)
+        except Exception as e:
+            logger.warning(f"Rate limit store '{self.store.name}' failed to charge {tokens} tokens: {e}")
+    
+    def _count(self, label: str, field: str, amount: int = 1) -> None:
+        counters = self._usage.setdefault(label, {"requests": 0, "rejected": 0, "tokens": 0})
+        counters[field] += amount
+    
+    async def aclose(self) -> None:
+        await self.store.aclose()
+    
+    def usage(self, label: str) -> Dict[str, int]:
+        """Get this worker's request, rejection and token totals for one client."""
+        return dict(self._usage.get(label, {"requests": 0, "rejected": 0, "tokens": 0}))
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the store, the number of configured clients and this worker's totals over all clients.
+        
+        Client names and per-client totals are left out, since anyone can read them;
+        each client sees its own on `/quota`.
+        """
+        totals = {"requests": 0, "rejected": 0, "tokens": 0}
+        for counters in self._usage.values():
+            for field, value in counters.items():
+                totals[field] += value
+        return {
+            "store": self.store.stats(),
+            "clients": len(self.keys),
+            "require_key": self.require_key,
+            "per_key_buckets": self.per_key_buckets,
+            "usage": totals
+        }
+
+_current_quota: ContextVar[Optional[Tuple[RateLimiter, ClientQuota]]] = ContextVar("current_quota", default=None)
+
+def current_client() -> Optional[Tuple[RateLimiter, ClientQuota]]:
+    """The limiter and quota of the current request, or None if it is not rate limited."""
+    return _current_quota.get()
+
+async def charge_usage(
+    usage: Optional[Dict[str, Any]],
+    client: Optional[Tuple[RateLimiter, ClientQuota]] = None
+) -> None:
+    """
+    Charge upstream token usage to a rate limited client.
+    
+    Args:
+        usage: Upstream usage dictionary
+        client: Limiter and quota captured with `current_client()`; defaults
+            to the client of the current request
+    """
+    current = client or _current_quota.get()
+    if current is not None:
+        limiter, quota = current
+        await limiter.charge(quota, usage)
+
+async def admit_more(cost: float) -> Optional[Tuple[ClientQuota, Admission]]:
+    """
+    Take `cost` more requests from the current request's client, for
+    endpoints that fan one request out into several completions.
+    
+    Returns:
+        The client's quota and the rejected admission if its limits do not
+        allow it, otherwise None
+    """
+    current = _current_quota.get()
+    if current is None or cost <= 0:
+        return None
+    limiter, quota = current
+    admission = await limiter.admit(quota, cost)
+    return None if admission.allowed else (quota, admission)
+
+def rejection_detail(quota: ClientQuota, admission: Admission) -> Dict[str, Any]:
+    """Build the detail of a 429 response for a rejected admission."""
+    return {
+        "error": "rate_limited",
+        "limit": admission.limit,
+        "message": f"Rate limit exceeded for client '{quota.label}': {admission.limit}",
+        "retry_after_seconds": round(admission.retry_after, 3)
+    }
+
+def retry_after_header(admission: Admission) -> str:
+    """Whole seconds for the `Retry-After` header of a rejected admission."""
+    return str(max(1, math.ceil(admission.retry_after)))
+
+_UNSET = object()
+
+def rate_limiter_for(app) -> Optional[RateLimiter]:
+    """
+    Get the app's shared rate limiter.
+    
+    Built at startup; if the app was started without the lifespan it is
+    built from settings on first use. None when rate limiting is disabled.
+    """
+    limiter = getattr(app.state, "rate_limiter", _UNSET)
+    if limiter is _UNSET:
+        limiter = app.state.rate_limiter = RateLimiter.from_settings()
+    return limiter
+
+def _remaining(level: float) -> Optional[bytes]:
+    return None if math.isinf(level) else str(max(0, math.floor(level))).encode("latin-1")
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing per-client limits before the request is parsed.
+    
+    When `require_key` is set, a missing or unlisted API key gets a 401;
+    otherwise such requests share the anonymous quota (see
+    `RateLimiter.identify`). Exhausted limits get a 429 with `Retry-After`. Admitted responses carry
+    `X-RateLimit-Remaining-Requests` and `X-RateLimit-Remaining-Tokens`.
+    """
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send) -> None:
+        limiter = rate_limiter_for(scope["app"]) if scope["type"] == "http" else None
+        if limiter is None or not limiter.applies(scope["method"], scope["path"]):
+            await self.app(scope, receive, send)
+            return
+        
+        quota = limiter.identify(limiter.api_key(scope["headers"]))
+        if quota is None:
+            RATE_LIMIT_DECISIONS.inc("unknown", "unauthorized")
+            response = FastJSONResponse(
+                {"detail": {"error": "invalid_api_key", "message": "A valid API key is required"}},
+                status_code=401
+            )
+            await response(scope, receive, send)
+            return
+        
+        admission = await limiter.admit(quota)
+        if not admission.allowed:
+            response = FastJSONResponse(
+                {"detail": rejection_detail(quota, admission)},
+                status_code=429,
+                headers={"Retry-After": retry_after_header(admission)}
+            )
+            await response(scope, receive, send)
+            return
+        
+        headers = [
+            (name, value) for name, value in (
+                (b"x-ratelimit-remaining-requests", _remaining(admission.requests_remaining)),
+                (b"x-ratelimit-remaining-tokens", _remaining(admission.tokens_remaining))
+            ) if value is not None
+        ]
+        
+        async def send_with_headers(message) -> None:
+            if message["type"] == "http.response.start" and headers:
+                message = {**message, "headers": list(message.get("headers", [])) + headers}
+            await send(message)
+        
+        token = _current_quota.set((limiter, quota))
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current_quota.reset(token)
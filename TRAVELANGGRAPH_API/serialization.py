@@ -0,0 +1,103 @@
+"""
+JSON encoding for TravelLangGraph API.
+Uses orjson when it is installed and falls back to the standard library.
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Sequence, Union
+import json
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(value: Any) -> Any:
+    """Encode the non-JSON types that responses may carry."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(value: Any, sort_keys: bool = False) -> bytes:
+    """
+    Encode a value as compact UTF-8 JSON.
+    
+    Args:
+        value: Value to encode; pydantic models and datetimes are supported
+        sort_keys: Sort object keys, for canonical encodings used as keys
+    
+    Returns:
+        JSON bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(
+        value, default=_default, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False, allow_nan=False
+    ).encode("utf-8")
+
+class EncodedPrefixList(list):
+    """
+    A list whose leading items were encoded ahead of time.
+    
+    It behaves as a plain list. `dumps_spliced` reuses `prefix_json`, the
+    canonical encoding of `prefix`, instead of encoding those items again,
+    as long as the list still starts with the same objects. Slices and
+    copies are plain lists.
+    """
+    
+    def __init__(self, items: Iterable[Any], prefix: Sequence[Any], prefix_json: bytes):
+        super().__init__(items)
+        self.prefix = tuple(prefix)
+        self.prefix_json = prefix_json
+    
+    def prefix_intact(self) -> bool:
+        """Whether the list still starts with the pre-encoded items."""
+        return len(self) >= len(self.prefix) and all(item is expected for item, expected in zip(self, self.prefix))
+
+# Stands in for a pre-encoded list while the rest of a value is encoded
+_SPLICE_MARKER = "\x00encoded-prefix\x00"
+_SPLICE_MARKER_JSON = dumps(_SPLICE_MARKER)
+
+def dumps_spliced(value: Dict[str, Any], key: str) -> bytes:
+    """
+    Encode a dictionary canonically, reusing the pre-encoded prefix of `value[key]`.
+    
+    The output is byte-identical to `dumps(value, sort_keys=True)`; when
+    `value[key]` is not an intact `EncodedPrefixList` it is exactly that.
+    """
+    items = value.get(key)
+    if not isinstance(items, EncodedPrefixList) or not items.prefix or not items.prefix_intact():
+        return dumps(value, sort_keys=True)
+    
+    rest = dumps(items[len(items.prefix):], sort_keys=True)
+    encoded = items.prefix_json if rest == b"[]" else items.prefix_json[:-1] + b"," + rest[1:]
+    body = dumps({**value, key: _SPLICE_MARKER}, sort_keys=True)
+    if body.count(_SPLICE_MARKER_JSON) != 1:
+        return dumps(value, sort_keys=True)
+    return body.replace(_SPLICE_MARKER_JSON, encoded)
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON from bytes or text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def pick(result: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    """
+    Select response fields from a service result, with None for missing ones.
+    
+    Endpoints that return pre-encoded responses use this instead of building
+    their response model, so the output has the model's fields without a
+    validation and re-encoding pass.
+    """
+    return {field: result.get(field) for field in fields}
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson when it is installed."""
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,22 +1,84 @@
 """
 Chat service for TravelLangGraph API.
-Contains business logic for chat operations using DeepSeek.
+Contains business logic for chat operations using the configured chat provider.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any, Tuple
+from contextlib import aclosing
 from datetime import datetime
+import asyncio
 import logging
-from clients.deepseek_client import DeepSeekClient
+import time
+import weakref
+from clients.provider import ChatProvider
+from clients.provider_pool import build_chat_provider
+from clients.concurrency_limiter import UpstreamOverloadedError
+from services.completion_cache import CompletionCache, make_cache_key
+from services.session_store import SessionStore, build_session_store
+from services.context_window import ContextWindowManager, estimate_usage
+from services.model_router import ModelRouter
+from services.place_answers import PlaceAnswerer
+from services.prompt_templates import PromptLibrary, PromptTemplate
+from config import settings
+from rate_limit import charge_usage, current_client
+from metrics import CACHE_LOOKUPS, PLACE_ANSWERS, SEMANTIC_CACHE_LOOKUPS, SEMANTIC_CACHE_LOOKUP_DURATION, record_usage
+from tracing import span
 
 logger = logging.getLogger(__name__)
 
+SUMMARY_TEMPLATE = PromptTemplate(
+    "summary",
+    system="Summarize this travel-planning conversation in a few sentences. "
+           "Keep destinations, dates, budgets, preferences and decisions."
+)
+
 class ChatService:
     """Service class for chat-related operations."""
     
-    def __init__(self):
-        """Initialize chat service with DeepSeek client."""
+    def __init__(
+        self,
+        deepseek_client: Optional[ChatProvider] = None,
+        cache: Optional[CompletionCache] = None,
+        session_store: Optional[SessionStore] = None,
+        context_window: Optional[ContextWindowManager] = None,
+        model_router: Optional[ModelRouter] = None,
+        place_answers: Optional[PlaceAnswerer] = None,
+        prompts: Optional[PromptLibrary] = None
+    ):
+        """
+        Initialize chat service with a chat provider.
+        
+        Args:
+            deepseek_client: Optional shared chat provider, e.g. a
+                `DeepSeekClient` or a `ProviderPool`. Built from settings
+                when omitted.
+            cache: Optional completion cache. Built from settings when omitted.
+            session_store: Optional conversation session store. Built from
+                settings when omitted.
+            context_window: Optional prompt budget manager. Built from
+                settings when omitted.
+            model_router: Optional model router. Built from settings when omitted.
+            place_answers: Optional reference-data answerer over the shared
+                places index; reference questions are not answered locally
+                when omitted.
+            prompts: Optional prompt template library. A library with only
+                the summary template is built when omitted.
+        """
         try:
-            self.deepseek_client = DeepSeekClient()
+            self.deepseek_client = deepseek_client or build_chat_provider()
+            self.cache = cache or CompletionCache.from_settings()
+            self.session_store = session_store or build_session_store()
+            self._session_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+            self.model_router = model_router or ModelRouter.from_settings()
+            self.place_answers = place_answers
+            self.prompts = prompts or PromptLibrary()
+            self.prompts.register(SUMMARY_TEMPLATE)
+            self.context_window = context_window or ContextWindowManager(
+                max_prompt_tokens=settings.CONTEXT_MAX_PROMPT_TOKENS,
+                keep_recent_messages=settings.CONTEXT_KEEP_RECENT_MESSAGES,
+                summarizer=self._summarize if settings.CONTEXT_SUMMARIZE else None,
+                summary_refresh_messages=settings.CONTEXT_SUMMARY_REFRESH_MESSAGES
+            )
             logger.info("Chat service initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize chat service: {e}")
@@ -26,45 +88,84 @@ class ChatService:
         self,
         message: str,
         system_prompt: Optional[str] = None,
-        model: str = "deepseek-chat",
-        temperature: float = 0.7,
-        max_tokens: int = 1000
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        route: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Send a message and get AI response.
         
+        Reference questions such as "which airport is LIS" are answered from
+        the places index without calling the model, unless a route or model
+        is requested. Airport codes in other messages are grounded with a
+        reference note, placed after the system prompt so the prompt prefix
+        stays the same across messages.
+        
         Args:
             message: User message
             system_prompt: Optional system prompt
-            model: Model to use
-            temperature: Sampling temperature
-            max_tokens: Maximum tokens to generate
-            
+            model: Model to use; chosen by the route when omitted
+            temperature: Sampling temperature; chosen by the route when omitted
+            max_tokens: Maximum tokens to generate; chosen by the route when omitted
+            route: Optional route name; classified from the message when omitted
+        
         Returns:
             Response dictionary with AI reply and metadata
+        
+        Raises:
+            ValueError: If `route` is not configured
+            UpstreamOverloadedError: If the upstream concurrency limiter sheds the request
         """
+        start = time.perf_counter()
+        if self.place_answers is not None and settings.PLACES_CHAT_ANSWERS and route is None and model is None:
+            answer = self.place_answers.answer(message)
+            if answer is not None:
+                PLACE_ANSWERS.inc("answered")
+                return {
+                    "user_message": message,
+                    "ai_response": answer,
+                    "system_prompt": system_prompt,
+                    "model": "places",
+                    "route": "places",
+                    "processing_time_seconds": time.perf_counter() - start,
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "status": "success",
+                    "usage": {},
+                    "cached": False
+                }
+        
+        notes = []
+        if self.place_answers is not None and settings.PLACES_GROUNDING:
+            note = self.place_answers.ground(message)
+            if note is not None:
+                PLACE_ANSWERS.inc("grounded")
+                notes.append(note)
+        messages = self.prompts.for_system_prompt(system_prompt).render(message, notes=notes)
+        params = self.model_router.resolve(messages, route, model, temperature, max_tokens)
+        
         try:
-            start_time = datetime.utcnow()
-            
-            # Get AI response
-            ai_response = await self.deepseek_client.simple_chat(
-                message=message,
-                system_prompt=system_prompt
-            )
+            ai_response, usage, cached = await self._complete(messages, params, prompt=message)
             
+            processing_time = time.perf_counter() - start
             end_time = datetime.utcnow()
-            processing_time = (end_time - start_time).total_seconds()
             
             return {
                 "user_message": message,
                 "ai_response": ai_response,
                 "system_prompt": system_prompt,
-                "model": model,
+                "model": params["model"],
+                "route": params["route"],
                 "processing_time_seconds": processing_time,
                 "timestamp": end_time.isoformat(),
-                "status": "success"
+                "status": "success",
+                "usage": usage,
+                "cached": cached
             }
-            
+        
+        except UpstreamOverloadedError:
+            # Shed requests are surfaced to the caller as 503s, not as replies
+            raise
         except Exception as e:
             logger.error(f"Error in send_message: {e}")
             return {
@@ -78,48 +179,64 @@ class ChatService:
     async def chat_with_context(
         self,
         messages: List[Dict[str, str]],
-        model: str = "deepseek-chat",
-        temperature: float = 0.7,
-        max_tokens: int = 1000
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        conversation_key: Optional[str] = None,
+        route: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Send multiple messages with context and get AI response.
         
+        Leading system messages are normalized onto a prompt template, so
+        they are byte-identical from turn to turn, and the history is then
+        fitted into the prompt token budget.
+        
         Args:
             messages: List of message dictionaries with 'role' and 'content'
-            model: Model to use
-            temperature: Sampling temperature
-            max_tokens: Maximum tokens to generate
-            
+            model: Model to use; chosen by the route when omitted
+            temperature: Sampling temperature; chosen by the route when omitted
+            max_tokens: Maximum tokens to generate; chosen by the route when omitted
+            conversation_key: Optional conversation identity, e.g. a session
+                ID, used to cache summaries of older turns
+            route: Optional route name; classified from the messages when omitted
+        
         Returns:
             Response dictionary with AI reply and metadata
+        
+        Raises:
+            ValueError: If `route` is not configured
+            UpstreamOverloadedError: If the upstream concurrency limiter sheds the request
         """
+        params = self.model_router.resolve(messages, route, model, temperature, max_tokens)
+        
         try:
-            start_time = datetime.utcnow()
+            start = time.perf_counter()
             
-            # Get AI response with context
-            response = await self.deepseek_client.chat_completion(
-                messages=messages,
-                model=model,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
+            templated = self.prompts.adopt(messages)
+            with span("context_window.fit", messages=len(messages)):
+                prompt_messages, context_stats = await self.context_window.fit(templated, conversation_key)
+            ai_message, usage, cached = await self._complete(prompt_messages, params, template=templated.template)
             
+            processing_time = time.perf_counter() - start
             end_time = datetime.utcnow()
-            processing_time = (end_time - start_time).total_seconds()
-            
-            ai_message = response["choices"][0]["message"]["content"]
             
             return {
                 "conversation_history": messages,
                 "ai_response": ai_message,
-                "model": model,
+                "model": params["model"],
+                "route": params["route"],
                 "processing_time_seconds": processing_time,
                 "timestamp": end_time.isoformat(),
                 "status": "success",
-                "usage": response.get("usage", {})
+                "usage": usage,
+                "cached": cached,
+                "context": context_stats
             }
-            
+        
+        except UpstreamOverloadedError:
+            # Shed requests are surfaced to the caller as 503s, not as replies
+            raise
         except Exception as e:
             logger.error(f"Error in chat_with_context: {e}")
             return {
@@ -130,9 +247,423 @@ class ChatService:
                 "status": "error"
             }
     
+    async def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any],
+        prompt: Optional[str] = None,
+        template: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any], bool]:
+        """
+        Get a completion from the cache or the upstream.
+        
+        Upstream calls are accounted to their route and model, cache lookups,
+        token usage and prompt cache usage per template are recorded in
+        metrics, and upstream usage is charged to the caller's rate limit.
+        Single prompts that may be cached are also looked up in the semantic
+        cache, when enabled, after an exact miss; its lookups and inserts run
+        off the event loop.
+        
+        Args:
+            messages: Messages to send
+            params: Resolved route, model, temperature and max_tokens
+            prompt: The user prompt when `messages` is a single turn, which
+                makes the request eligible for the semantic cache
+            template: Prompt template the messages were built from; taken
+                from `messages` when they are `PromptMessages`
+        
+        Returns:
+            Tuple of the reply text, usage dictionary and whether it was cached
+        """
+        model, temperature, max_tokens = params["model"], params["temperature"], params["max_tokens"]
+        
+        cache_key = None
+        if self.cache.should_cache(temperature):
+            with span("cache.lookup"):
+                cache_key = make_cache_key(model, messages, temperature, max_tokens)
+                cached = await self.cache.aget(cache_key)
+            CACHE_LOOKUPS.inc("miss" if cached is None else "hit")
+            if cached is not None:
+                return cached["ai_response"], cached.get("usage", {}), True
+        
+        semantic = None
+        if prompt is not None and (temperature == 0 or self.cache.cache_all_temperatures):
+            semantic = self.cache.semantic
+        if semantic is not None:
+            from services.semantic_cache import namespace_key
+            system_prompt = next((m["content"] for m in messages if m["role"] == "system"), None)
+            namespace = namespace_key(model, system_prompt, max_tokens)
+            start = time.perf_counter()
+            with span("semantic_cache.lookup"):
+                match = await asyncio.to_thread(semantic.get, namespace, prompt)
+            SEMANTIC_CACHE_LOOKUP_DURATION.observe(time.perf_counter() - start)
+            SEMANTIC_CACHE_LOOKUPS.inc("miss" if match is None else "hit")
+            if match is not None:
+                return match[0]["ai_response"], match[0].get("usage", {}), True
+        
+        start = time.perf_counter()
+        try:
+            with span("chat_service.complete", route=params["route"], model=model):
+                response = await self.deepseek_client.chat_completion(
+                    messages=messages,
+                    model=model,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+        except Exception:
+            self.model_router.record(params["route"], model, time.perf_counter() - start, error=True)
+            raise
+        
+        ai_message = response["choices"][0]["message"]["content"]
+        usage = response.get("usage", {})
+        self.model_router.record(params["route"], model, time.perf_counter() - start, usage)
+        record_usage(model, usage)
+        self.prompts.record(template or getattr(messages, "template", None), usage)
+        await charge_usage(usage)
+        
+        if cache_key is not None:
+            await self.cache.aset(cache_key, {"ai_response": ai_message, "usage": usage})
+        if semantic is not None:
+            # Embedding the prompt is pure Python; keep it off the event loop like the lookup
+            await asyncio.to_thread(semantic.set, namespace, prompt, {"ai_response": ai_message, "usage": usage})
+        return ai_message, usage, False
+    
+    def create_session(
+        self,
+        system_prompt: Optional[str] = None,
+        messages: Optional[List[Dict[str, str]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Create a server-side conversation session.
+        
+        Args:
+            system_prompt: Optional system prompt sent ahead of every turn
+            messages: Optional initial history
+        
+        Returns:
+            Session dictionary
+        """
+        return self.session_store.create(system_prompt=system_prompt, messages=messages)
+    
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get a session with its full history, or None if it does not exist."""
+        return self.session_store.get(session_id)
+    
+    def delete_session(self, session_id: str) -> bool:
+        """Delete a session; returns whether it existed."""
+        return self.session_store.delete(session_id)
+    
+    async def send_session_message(
+        self,
+        session_id: str,
+        message: str,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        route: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Send the next user turn of a session and get the AI response.
+        
+        The stored history is sent upstream with the new turn, and both the
+        user message and the reply are appended on success. Turns in the
+        same session are serialized so history stays consistent.
+        
+        Args:
+            session_id: Session to continue
+            message: New user message
+            model: Model to use; chosen by the route when omitted
+            temperature: Sampling temperature; chosen by the route when omitted
+            max_tokens: Maximum tokens to generate; chosen by the route when omitted
+            route: Optional route name; classified from the messages when omitted
+        
+        Returns:
+            Response dictionary with only the new reply and its metadata
+        
+        Raises:
+            KeyError: If the session does not exist
+        """
+        lock = self._session_locks.get(session_id)
+        if lock is None:
+            lock = self._session_locks[session_id] = asyncio.Lock()
+        
+        async with lock:
+            session = self.session_store.get(session_id)
+            if session is None:
+                raise KeyError(session_id)
+            
+            user_turn = {"role": "user", "content": message}
+            history_length = len(session["messages"])
+            messages = list(session["messages"])
+            if session["system_prompt"]:
+                messages.insert(0, {"role": "system", "content": session["system_prompt"]})
+            messages.append(user_turn)
+            
+            result = await self.chat_with_context(
+                messages=messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens,
+                conversation_key=session_id,
+                route=route
+            )
+            result.pop("conversation_history", None)
+            
+            if result["status"] == "success":
+                self.session_store.append(
+                    session_id,
+                    [user_turn, {"role": "assistant", "content": result["ai_response"]}]
+                )
+                history_length += 2
+            
+            return {
+                "session_id": session_id,
+                "history_length": history_length,
+                **result
+            }
+    
+    async def _summarize(
+        self,
+        messages: List[Dict[str, str]],
+        previous_summary: Optional[str] = None
+    ) -> str:
+        """
+        Summarize older conversation turns for the context window.
+        
+        Args:
+            messages: Turns to fold into the summary
+            previous_summary: Summary of the turns before `messages`, if any
+        
+        Returns:
+            Updated summary text
+        """
+        transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+        if previous_summary:
+            transcript = f"Earlier summary: {previous_summary}\n\n{transcript}"
+        
+        response = await self.deepseek_client.chat_completion(
+            messages=SUMMARY_TEMPLATE.render(transcript),
+            temperature=0.0,
+            max_tokens=settings.CONTEXT_SUMMARY_MAX_TOKENS
+        )
+        self.prompts.record(SUMMARY_TEMPLATE.name, response.get("usage"))
+        await charge_usage(response.get("usage"))
+        return response["choices"][0]["message"]["content"]
+    
+    async def send_batch(
+        self,
+        requests: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run independent chat requests concurrently and return results in order.
+        
+        Args:
+            requests: Request dictionaries. Items with a `messages` key are sent
+                with context; other items are sent as simple messages.
+            max_concurrency: Maximum requests in flight at once. Defaults to
+                `BATCH_MAX_CONCURRENCY`.
+        
+        Returns:
+            Response dictionaries in request order, each with its `index`
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+        async with aclosing(self.iter_batch(requests, max_concurrency)) as completed:
+            async for result in completed:
+                results[result["index"]] = result
+        return results
+    
+    async def iter_batch(
+        self,
+        requests: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run independent chat requests concurrently, yielding results as they complete.
+        
+        A failing item yields an error result without affecting the others.
+        Closing the generator cancels the items still running.
+        
+        Args:
+            requests: Request dictionaries (see `send_batch`)
+            max_concurrency: Maximum requests in flight at once
+        
+        Yields:
+            Response dictionaries, each with its `index` in `requests`
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or settings.BATCH_MAX_CONCURRENCY)
+        
+        async def run(index: int, request: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    result = await self._send_batch_item(request)
+                except Exception as e:
+                    logger.error(f"Error in batch item {index}: {e}")
+                    result = {
+                        "ai_response": None,
+                        "error": str(e),
+                        "timestamp": datetime.utcnow().isoformat(),
+                        "status": "error"
+                    }
+            return {"index": index, **result}
+        
+        tasks = [asyncio.ensure_future(run(index, request)) for index, request in enumerate(requests)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    async def _send_batch_item(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Dispatch one batch item to the matching chat method."""
+        options = {key: request.get(key) for key in ("model", "temperature", "max_tokens", "route")}
+        if "messages" in request:
+            return await self.chat_with_context(messages=request["messages"], **options)
+        return await self.send_message(
+            message=request["message"],
+            system_prompt=request.get("system_prompt"),
+            **options
+        )
+    
+    async def stream_message(
+        self,
+        message: str,
+        system_prompt: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        route: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Send a message and stream the AI response as it is generated.
+        
+        Args:
+            message: User message
+            system_prompt: Optional system prompt
+            model: Model to use; chosen by the route when omitted
+            temperature: Sampling temperature; chosen by the route when omitted
+            max_tokens: Maximum tokens to generate; chosen by the route when omitted
+            route: Optional route name; classified from the messages when omitted
+        
+        Yields:
+            Stream event dictionaries (see `_stream_completion`)
+        """
+        messages = self.prompts.for_system_prompt(system_prompt).render(message)
+        params = self.model_router.resolve(messages, route, model, temperature, max_tokens)
+        
+        async with aclosing(self._stream_completion(messages, params)) as events:
+            async for event in events:
+                yield event
+    
+    async def stream_with_context(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        conversation_key: Optional[str] = None,
+        route: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Send multiple messages with context and stream the AI response.
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            model: Model to use; chosen by the route when omitted
+            temperature: Sampling temperature; chosen by the route when omitted
+            max_tokens: Maximum tokens to generate; chosen by the route when omitted
+            conversation_key: Optional conversation identity, e.g. a session
+                ID, used to cache summaries of older turns
+            route: Optional route name; classified from the messages when omitted
+        
+        Yields:
+            Stream event dictionaries (see `_stream_completion`)
+        """
+        params = self.model_router.resolve(messages, route, model, temperature, max_tokens)
+        
+        templated = self.prompts.adopt(messages)
+        with span("context_window.fit", messages=len(messages)):
+            prompt_messages, _ = await self.context_window.fit(templated, conversation_key)
+        
+        async with aclosing(self._stream_completion(prompt_messages, params, templated.template)) as events:
+            async for event in events:
+                yield event
+    
+    async def _stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        params: Dict[str, Any],
+        template: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a completion as token events followed by a final event.
+        
+        Yields `{"event": "token", "content": ...}` for each content delta,
+        then either `{"event": "done", ...}` with timing and usage, or
+        `{"event": "error", ...}` if the upstream call fails. Usage is charged
+        to the caller's token quota however the stream ends, estimated
+        locally when the provider did not report it.
+        """
+        model = params["model"]
+        start = time.perf_counter()
+        time_to_first_token = None
+        usage: Dict[str, Any] = {}
+        parts: List[str] = []
+        # Captured now: a stream closed after the client disconnects may be finalized outside the request
+        client = current_client()
+        
+        try:
+            chunks = self.deepseek_client.stream_chat_completion(
+                messages=messages,
+                model=model,
+                temperature=params["temperature"],
+                max_tokens=params["max_tokens"]
+            )
+            async with aclosing(chunks):
+                async for chunk in chunks:
+                    if chunk.get("usage"):
+                        usage = chunk["usage"]
+                    
+                    for choice in chunk.get("choices", []):
+                        content = choice.get("delta", {}).get("content")
+                        if not content:
+                            continue
+                        if time_to_first_token is None:
+                            time_to_first_token = time.perf_counter() - start
+                        parts.append(content)
+                        yield {"event": "token", "content": content}
+            
+            self.model_router.record(params["route"], model, time.perf_counter() - start, usage)
+            record_usage(model, usage)
+            self.prompts.record(template or getattr(messages, "template", None), usage)
+            yield {
+                "event": "done",
+                "model": model,
+                "route": params["route"],
+                "time_to_first_token_seconds": time_to_first_token,
+                "processing_time_seconds": time.perf_counter() - start,
+                "timestamp": datetime.utcnow().isoformat(),
+                "usage": usage
+            }
+        
+        except Exception as e:
+            logger.error(f"Error in streamed completion: {e}")
+            self.model_router.record(params["route"], model, time.perf_counter() - start, error=True)
+            yield {
+                "event": "error",
+                "error": str(e),
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        
+        finally:
+            if not usage and parts:
+                usage = estimate_usage(messages, "".join(parts))
+            await charge_usage(usage, client)
+    
     def get_service_status(self) -> Dict[str, Any]:
         """
-        Get chat service status and DeepSeek client health.
+        Get chat service status and chat provider health.
         
         Returns:
             Service status dictionary
@@ -142,8 +673,13 @@ class ChatService:
             
             return {
                 "service": "ChatService",
-                "status": "healthy",
+                "status": deepseek_health["status"],
                 "deepseek_client": deepseek_health,
+                "cache": self.cache.stats(),
+                "sessions": self.session_store.stats(),
+                "context_window": self.context_window.stats(),
+                "routing": self.model_router.stats(),
+                "prompts": self.prompts.stats(),
                 "timestamp": datetime.utcnow().isoformat()
             }
         except Exception as e:
@@ -0,0 +1,341 @@
+"""
+Completion cache for TravelLangGraph API.
+Caches chat completion results keyed on a canonical hash of the request.
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+def make_cache_key(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    max_tokens: int
+) -> str:
+    """
+    Build a canonical cache key for a completion request.
+    
+    Args:
+        model: Model used for the completion
+        messages: List of message dictionaries with 'role' and 'content'
+        temperature: Sampling temperature
+        max_tokens: Maximum tokens to generate
+    
+    Returns:
+        Hex SHA-256 digest of the canonical JSON encoding of the request
+    """
+    canonical = json.dumps(
+        {
+            "model": model,
+            "messages": [{"role": m["role"], "content": m["content"]} for m in messages],
+            "temperature": float(temperature),
+            "max_tokens": int(max_tokens)
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class CacheBackend:
+    """Base class for completion cache tiers."""
+    
+    name = "backend"
+    # Tiers doing I/O are called from a worker thread by `CompletionCache.aget` and `aset`
+    blocking = False
+    
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached value, or None on a miss."""
+        raise NotImplementedError
+    
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a value."""
+        raise NotImplementedError
+    
+    def clear(self) -> None:
+        """Remove all cached values."""
+        raise NotImplementedError
+    
+    def __len__(self) -> int:
+        raise NotImplementedError
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get hit, miss and eviction counters for this tier."""
+        return {
+            "backend": self.name,
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+class LRUCache(CacheBackend):
+    """In-process LRU cache with a size bound and per-entry TTL."""
+    
+    name = "memory"
+    
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 3600.0):
+        super().__init__()
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+    
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def clear(self) -> None:
+        self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SQLiteCache(CacheBackend):
+    """
+    SQLite-backed cache tier that survives restarts.
+    
+    Like the memory tier, it drops entries past their TTL and the least
+    recently used beyond `max_entries`. Besides expiring on read, expired
+    and excess rows are swept on every `sweep_every` inserts, so several
+    workers sharing the file can briefly hold a few more entries than the
+    bound between sweeps.
+    """
+    
+    name = "sqlite"
+    blocking = True
+    
+    def __init__(self, path: str, max_entries: int = 100000, ttl_seconds: float = 86400.0, sweep_every: Optional[int] = None):
+        super().__init__()
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.sweep_every = sweep_every or max(1, max_entries // 100)
+        self._sets_since_sweep = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS completions "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(completions)")}
+        if "accessed_at" not in columns:
+            # Files written before the size bound; their entries count as least recently used
+            self._conn.execute("ALTER TABLE completions ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS completions_expires_at ON completions (expires_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS completions_accessed_at ON completions (accessed_at)")
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        # Wall-clock time, since entries must stay valid across restarts
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] < now:
+                self._conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                self.evictions += 1
+                row = None
+            
+            if row is None:
+                self.misses += 1
+                return None
+            
+            self._conn.execute("UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return json.loads(row[0])
+    
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO completions (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now + self.ttl_seconds, now)
+            )
+            self._sets_since_sweep += 1
+            if self._sets_since_sweep >= self.sweep_every:
+                self._sweep(now)
+    
+    def _sweep(self, now: float) -> None:
+        """Delete expired entries, then the least recently used beyond `max_entries`; call with the lock held."""
+        self._sets_since_sweep = 0
+        expired = self._conn.execute("DELETE FROM completions WHERE expires_at < ?", (now,)).rowcount
+        excess = self._conn.execute(
+            "DELETE FROM completions WHERE rowid IN "
+            "(SELECT rowid FROM completions ORDER BY accessed_at DESC, rowid DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        ).rowcount
+        self.evictions += expired + excess
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM completions")
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+    
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "max_entries": self.max_entries}
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+class CompletionCache:
+    """
+    Tiered completion cache.
+    
+    Lookups try each tier in order and backfill faster tiers on a hit in a
+    slower one. Only deterministic requests (temperature 0) are cached
+    unless `cache_all_temperatures` is set.
+    
+    An optional semantic tier matches single prompts by meaning; it is
+    looked up by the chat service after an exact miss.
+    """
+    
+    def __init__(self, tiers: List[CacheBackend], cache_all_temperatures: bool = False, semantic=None):
+        self.tiers = tiers
+        self.cache_all_temperatures = cache_all_temperatures
+        self.semantic = semantic
+    
+    @classmethod
+    def from_settings(cls) -> "CompletionCache":
+        """Build the cache configured by environment settings."""
+        if not settings.CACHE_ENABLED:
+            return cls(tiers=[])
+        
+        tiers: List[CacheBackend] = [
+            LRUCache(max_entries=settings.CACHE_MAX_ENTRIES, ttl_seconds=settings.CACHE_TTL_SECONDS)
+        ]
+        if settings.CACHE_SQLITE_PATH:
+            try:
+                tiers.append(SQLiteCache(
+                    settings.CACHE_SQLITE_PATH,
+                    max_entries=settings.CACHE_SQLITE_MAX_ENTRIES,
+                    ttl_seconds=settings.CACHE_SQLITE_TTL_SECONDS
+                ))
+            except sqlite3.Error as e:
+                logger.warning(f"SQLite cache tier disabled: {e}")
+        
+        return cls(
+            tiers=tiers,
+            cache_all_temperatures=settings.CACHE_ALL_TEMPERATURES,
+            semantic=build_semantic_cache() if settings.SEMANTIC_CACHE_ENABLED else None
+        )
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether any cache tier is configured."""
+        return bool(self.tiers)
+    
+    def should_cache(self, temperature: float) -> bool:
+        """Check whether a request with this temperature may be cached."""
+        return self.enabled and (temperature == 0 or self.cache_all_temperatures)
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached value from the first tier that has it."""
+        for index, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for faster_tier in self.tiers[:index]:
+                    faster_tier.set(key, value)
+                return value
+        return None
+    
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a value in every tier."""
+        for tier in self.tiers:
+            tier.set(key, value)
+    
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """Like `get`, calling blocking tiers from a worker thread so disk I/O does not stall the event loop."""
+        for index, tier in enumerate(self.tiers):
+            value = await _call(tier, tier.get, key)
+            if value is not None:
+                for faster_tier in self.tiers[:index]:
+                    await _call(faster_tier, faster_tier.set, key, value)
+                return value
+        return None
+    
+    async def aset(self, key: str, value: Dict[str, Any]) -> None:
+        """Like `set`, calling blocking tiers from a worker thread."""
+        for tier in self.tiers:
+            await _call(tier, tier.set, key, value)
+    
+    def clear(self) -> None:
+        """Remove all values from every tier."""
+        for tier in self.tiers:
+            tier.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get cache configuration and per-tier counters."""
+        return {
+            "enabled": self.enabled,
+            "cache_all_temperatures": self.cache_all_temperatures,
+            "tiers": [tier.stats() for tier in self.tiers],
+            "semantic": self.semantic.stats() if self.semantic is not None else None
+        }
+
+async def _call(tier: CacheBackend, method, *args):
+    """Call a tier method, from a worker thread if the tier blocks."""
+    if tier.blocking:
+        return await asyncio.to_thread(method, *args)
+    return method(*args)
+
+def build_semantic_cache():
+    """
+    Build the semantic cache tier from settings.
+    
+    numpy is imported only here, so it is needed only when the tier is enabled.
+    
+    Returns:
+        A `SemanticCache`, or None if numpy is not installed
+    """
+    try:
+        from services.semantic_cache import HashedNgramEmbedder, SemanticCache
+    except ImportError as e:
+        logger.warning(f"Semantic cache disabled: {e}")
+        return None
+    return SemanticCache(
+        embedder=HashedNgramEmbedder(dim=settings.SEMANTIC_CACHE_DIMENSIONS),
+        threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+        max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+        max_namespaces=settings.SEMANTIC_CACHE_MAX_NAMESPACES,
+        ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS
+    )
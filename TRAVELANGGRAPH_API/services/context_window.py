@@ -0,0 +1,186 @@
+"""
+Context window management for TravelLangGraph API.
+Fits conversation history into a prompt token budget.
+"""
+
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import hashlib
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Word runs and single punctuation marks; long words cost one token per 4 chars
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Per-message overhead for role and separators in chat formats
+MESSAGE_OVERHEAD_TOKENS = 4
+
+Summarizer = Callable[[List[Dict[str, str]], Optional[str]], Awaitable[str]]
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a text without a tokenizer.
+    
+    Counts word runs and punctuation marks, charging long words one token
+    per four characters. This tracks BPE tokenizers closely enough for
+    budgeting English and other space-separated text.
+    """
+    return sum((len(piece) + 3) // 4 for piece in _TOKEN_PATTERN.findall(text))
+
+def estimate_message_tokens(messages: List[Dict[str, str]]) -> int:
+    """Estimate the prompt tokens of a message list."""
+    return sum(estimate_tokens(m["content"]) + MESSAGE_OVERHEAD_TOKENS for m in messages)
+
+def estimate_usage(messages: List[Dict[str, str]], completion: str) -> Dict[str, int]:
+    """Estimate an upstream usage dictionary for a completion the provider reported no usage for."""
+    prompt_tokens = estimate_message_tokens(messages)
+    completion_tokens = estimate_tokens(completion)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens
+    }
+
+def _hash_messages(messages: List[Dict[str, str]]) -> str:
+    return hashlib.sha256(json.dumps(messages, sort_keys=True).encode("utf-8")).hexdigest()
+
+class ContextWindowManager:
+    """
+    Fit chat history into a prompt token budget.
+    
+    System messages and the most recent `keep_recent_messages` messages are
+    always kept. Older messages are kept newest-first while they fit. With a
+    summarizer, dropped messages are replaced by a rolling summary that is
+    cached per conversation and only refreshed once enough new messages
+    have been dropped.
+    """
+    
+    def __init__(
+        self,
+        max_prompt_tokens: int = 6000,
+        keep_recent_messages: int = 4,
+        summarizer: Optional[Summarizer] = None,
+        summary_refresh_messages: int = 4,
+        max_cached_summaries: int = 1024
+    ):
+        self.max_prompt_tokens = max_prompt_tokens
+        self.keep_recent_messages = keep_recent_messages
+        self.summarizer = summarizer
+        self.summary_refresh_messages = summary_refresh_messages
+        self.max_cached_summaries = max_cached_summaries
+        # conversation key -> (hash of summarized prefix, summarized count, summary)
+        self._summaries: "OrderedDict[str, Tuple[str, int, str]]" = OrderedDict()
+        self.tokens_saved = 0
+        self.summaries_generated = 0
+    
+    @property
+    def enabled(self) -> bool:
+        """Whether a budget is configured."""
+        return self.max_prompt_tokens > 0
+    
+    async def fit(
+        self,
+        messages: List[Dict[str, str]],
+        conversation_key: Optional[str] = None
+    ) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+        """
+        Fit messages into the token budget.
+        
+        Args:
+            messages: Full conversation, optionally starting with system messages
+            conversation_key: Stable identity of the conversation for summary
+                caching, e.g. a session ID. Derived from the opening messages
+                when omitted.
+        
+        Returns:
+            Tuple of the messages to send and a stats dictionary
+        """
+        original_tokens = estimate_message_tokens(messages)
+        stats = {
+            "original_tokens": original_tokens,
+            "prompt_tokens": original_tokens,
+            "dropped_messages": 0,
+            "summarized": False
+        }
+        if not self.enabled or original_tokens <= self.max_prompt_tokens:
+            return messages, stats
+        
+        split = 0
+        while split < len(messages) and messages[split]["role"] == "system":
+            split += 1
+        system, history = messages[:split], messages[split:]
+        
+        recent_start = max(0, len(history) - self.keep_recent_messages)
+        kept_start = recent_start
+        used = estimate_message_tokens(system) + estimate_message_tokens(history[recent_start:])
+        while kept_start > 0:
+            cost = estimate_tokens(history[kept_start - 1]["content"]) + MESSAGE_OVERHEAD_TOKENS
+            if used + cost > self.max_prompt_tokens:
+                break
+            used += cost
+            kept_start -= 1
+        
+        dropped, kept = history[:kept_start], history[kept_start:]
+        fitted = system + kept
+        
+        if dropped and self.summarizer is not None:
+            key = conversation_key or _hash_messages(messages[:split + 1])
+            summary = await self._summary_for(key, dropped)
+            if summary:
+                summary_message = {"role": "system", "content": f"Summary of the earlier conversation: {summary}"}
+                fitted = system + [summary_message] + kept
+                stats["summarized"] = True
+                # Make room for the summary by dropping the oldest kept messages
+                while (
+                    estimate_message_tokens(fitted) > self.max_prompt_tokens
+                    and len(kept) > self.keep_recent_messages
+                ):
+                    kept = kept[1:]
+                    dropped = history[:len(history) - len(kept)]
+                    fitted = system + [summary_message] + kept
+        
+        stats["prompt_tokens"] = estimate_message_tokens(fitted)
+        stats["dropped_messages"] = len(dropped)
+        self.tokens_saved += original_tokens - stats["prompt_tokens"]
+        return fitted, stats
+    
+    async def _summary_for(self, key: str, dropped: List[Dict[str, str]]) -> Optional[str]:
+        """Get the cached rolling summary for `dropped`, refreshing it when stale."""
+        cached = self._summaries.get(key)
+        previous_summary = None
+        covered = 0
+        if cached is not None:
+            prefix_hash, count, summary = cached
+            if count <= len(dropped) and prefix_hash == _hash_messages(dropped[:count]):
+                previous_summary, covered = summary, count
+                self._summaries.move_to_end(key)
+                if len(dropped) - covered < self.summary_refresh_messages:
+                    return summary
+        
+        try:
+            summary = await self.summarizer(dropped[covered:], previous_summary)
+        except Exception as e:
+            logger.warning(f"Context summarization failed: {e}")
+            return previous_summary
+        
+        self.summaries_generated += 1
+        self._summaries[key] = (_hash_messages(dropped), len(dropped), summary)
+        self._summaries.move_to_end(key)
+        while len(self._summaries) > self.max_cached_summaries:
+            self._summaries.popitem(last=False)
+        return summary
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get budget configuration and savings counters."""
+        return {
+            "enabled": self.enabled,
+            "max_prompt_tokens": self.max_prompt_tokens,
+            "keep_recent_messages": self.keep_recent_messages,
+            "summarization": self.summarizer is not None,
+            "tokens_saved": self.tokens_saved,
+            "summaries_generated": self.summaries_generated,
+            "cached_summaries": len(self._summaries)
+        }
@@ -4,28 +4,110 @@ Contains business logic for health-related operations.
 """
 
 from datetime import datetime
-import psutil
+from typing import Any, Dict, Optional
+import asyncio
+import logging
 import os
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class HealthSampler:
+    """
+    Background sampler for system and process statistics.
+    
+    A task refreshes CPU, memory, disk and process stats on a fixed interval
+    and publishes them as an immutable snapshot. Readers take the current
+    snapshot with a single attribute read, so no lock is needed and health
+    checks never wait on psutil.
+    
+    psutil is imported on the first sample, which the background task takes
+    off the startup path.
+    """
+    
+    def __init__(self, interval_seconds: float = 1.0):
+        self.interval_seconds = interval_seconds
+        self._process = None
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    def sample(self) -> Dict[str, Any]:
+        """
+        Collect and publish one snapshot.
+        
+        `cpu_percent` is measured since the previous call rather than by
+        sleeping, so this returns immediately.
+        """
+        import psutil
+        
+        if self._process is None:
+            self._process = psutil.Process()
+        snapshot = {
+            "system": {
+                "cpu_percent": psutil.cpu_percent(interval=None),
+                "memory_percent": psutil.virtual_memory().percent,
+                "disk_percent": psutil.disk_usage('/').percent
+            },
+            "process": {
+                "pid": os.getpid(),
+                "cpu_percent": self._process.cpu_percent(interval=None),
+                "memory_info": self._process.memory_info()._asdict()
+            },
+            "sampled_at": datetime.utcnow()
+        }
+        self._snapshot = snapshot
+        return snapshot
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the latest snapshot, sampling once if none exists yet."""
+        return self._snapshot or self.sample()
+    
+    @property
+    def running(self) -> bool:
+        """Whether the background task is running."""
+        return self._task is not None and not self._task.done()
+    
+    async def _run(self) -> None:
+        """Refresh the snapshot until cancelled."""
+        while True:
+            try:
+                await asyncio.to_thread(self.sample)
+            except Exception as e:
+                logger.error(f"Health sampling failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+    
+    def start(self) -> None:
+        """Start the background sampling task on the running event loop."""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the background sampling task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+# Shared sampler, started and stopped by the application lifespan
+health_sampler = HealthSampler(interval_seconds=settings.HEALTH_SAMPLE_INTERVAL_SECONDS)
 
 class HealthService:
     """Service class for health-related operations."""
     
     @staticmethod
     def get_system_health() -> dict:
-        """Get comprehensive system health information."""
+        """Get comprehensive system health information from the latest snapshot."""
+        snapshot = health_sampler.snapshot()
         return {
             "status": "healthy",
             "service": "TravelLangGraph API",
             "timestamp": datetime.utcnow(),
-            "system": {
-                "cpu_percent": psutil.cpu_percent(interval=1),
-                "memory_percent": psutil.virtual_memory().percent,
-                "disk_percent": psutil.disk_usage('/').percent
-            },
-            "process": {
-                "pid": os.getpid(),
-                "memory_info": psutil.Process().memory_info()._asdict()
-            }
+            "system": snapshot["system"],
+            "process": snapshot["process"],
+            "sampled_at": snapshot["sampled_at"]
         }
     
     @staticmethod
@@ -33,15 +115,16 @@ class HealthService:
         """Check if the service is healthy."""
         try:
             # Basic health checks
-            cpu_usage = psutil.cpu_percent(interval=1)
-            memory_usage = psutil.virtual_memory().percent
+            system = health_sampler.snapshot()["system"]
             
             # Consider healthy if CPU < 90% and memory < 90%
-            return cpu_usage < 90 and memory_usage < 90
+            return system["cpu_percent"] < 90 and system["memory_percent"] < 90
         except Exception:
             return False
     
     @staticmethod
     def get_uptime() -> float:
         """Get system uptime in seconds."""
+        import psutil
+        
         return psutil.boot_time()
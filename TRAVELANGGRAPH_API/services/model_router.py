@@ -0,0 +1,148 @@
+"""
+Model routing for TravelLangGraph API.
+Maps request classes to configured models and generation budgets.
+"""
+
+from typing import Any, Dict, List, Optional
+import json
+import re
+from config import settings
+from services.context_window import estimate_tokens
+
+DEFAULT_ROUTE = "default"
+
+# Every route keeps the API's long-standing 0.7 temperature; set another one per route in MODEL_ROUTES
+DEFAULT_ROUTES: Dict[str, Dict[str, Any]] = {
+    "default": {"model": "deepseek-chat", "temperature": 0.7, "max_tokens": 1000},
+    "short_factual": {"model": "deepseek-chat", "temperature": 0.7, "max_tokens": 400},
+    "itinerary": {"model": "deepseek-chat", "temperature": 0.7, "max_tokens": 3000},
+}
+
+_ITINERARY_PATTERN = re.compile(
+    r"\b(itinerar(y|ies)|day[- ]by[- ]day|\d+[- ]days?\b|plan (a|my|our) trip|schedule for)",
+    re.IGNORECASE
+)
+
+class _Counters:
+    """Request, latency and token totals for one route or model."""
+    
+    __slots__ = ("requests", "errors", "latency_total", "latency_max", "prompt_tokens", "completion_tokens")
+    
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+    
+    def record(self, latency: float, usage: Optional[Dict[str, Any]], error: bool) -> None:
+        self.requests += 1
+        self.errors += error
+        self.latency_total += latency
+        self.latency_max = max(self.latency_max, latency)
+        if usage:
+            self.prompt_tokens += usage.get("prompt_tokens", 0)
+            self.completion_tokens += usage.get("completion_tokens", 0)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_latency_seconds": self.latency_total / self.requests if self.requests else 0.0,
+            "max_latency_seconds": self.latency_max,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens
+        }
+
+class ModelRouter:
+    """
+    Choose model, temperature and max tokens for a chat request.
+    
+    Requests name a route explicitly or are classified from their last user
+    message. Parameters set by the caller always override the route's
+    defaults. Latency and token usage are accounted per route and per model.
+    """
+    
+    def __init__(self, routes: Optional[Dict[str, Dict[str, Any]]] = None, short_factual_max_tokens: int = 40):
+        self.routes = routes or DEFAULT_ROUTES
+        self.short_factual_max_tokens = short_factual_max_tokens
+        self._by_route: Dict[str, _Counters] = {}
+        self._by_model: Dict[str, _Counters] = {}
+    
+    @classmethod
+    def from_settings(cls) -> "ModelRouter":
+        """Build the router from defaults merged with `MODEL_ROUTES`."""
+        routes = {name: dict(route) for name, route in DEFAULT_ROUTES.items()}
+        if settings.MODEL_ROUTES:
+            for name, route in json.loads(settings.MODEL_ROUTES).items():
+                routes.setdefault(name, dict(DEFAULT_ROUTES[DEFAULT_ROUTE])).update(route)
+        return cls(routes=routes, short_factual_max_tokens=settings.SHORT_FACTUAL_MAX_TOKENS)
+    
+    def classify(self, messages: List[Dict[str, str]]) -> str:
+        """
+        Classify a conversation into a route.
+        
+        Itinerary requests are detected by keywords; single short questions
+        are short factual; everything else takes the default route.
+        """
+        turns = [m for m in messages if m["role"] != "system"]
+        if not turns:
+            return DEFAULT_ROUTE
+        
+        last = turns[-1]["content"]
+        if "itinerary" in self.routes and _ITINERARY_PATTERN.search(last):
+            return "itinerary"
+        if "short_factual" in self.routes and len(turns) == 1 and estimate_tokens(last) <= self.short_factual_max_tokens:
+            return "short_factual"
+        return DEFAULT_ROUTE
+    
+    def resolve(
+        self,
+        messages: List[Dict[str, str]],
+        route: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Resolve the route and generation parameters for a request.
+        
+        Args:
+            messages: Conversation to send
+            route: Optional route name; classified from `messages` when omitted
+            model: Caller-chosen model, overriding the route
+            temperature: Caller-chosen temperature, overriding the route
+            max_tokens: Caller-chosen generation cap, overriding the route
+            
+        Returns:
+            Dictionary with `route`, `model`, `temperature` and `max_tokens`
+            
+        Raises:
+            ValueError: If `route` is not configured
+        """
+        if route is None:
+            route = self.classify(messages)
+        elif route not in self.routes:
+            raise ValueError(f"Unknown route: {route}")
+        
+        config = self.routes[route]
+        return {
+            "route": route,
+            "model": model if model is not None else config["model"],
+            "temperature": temperature if temperature is not None else config["temperature"],
+            "max_tokens": max_tokens if max_tokens is not None else config["max_tokens"]
+        }
+    
+    def record(self, route: str, model: str, latency: float, usage: Optional[Dict[str, Any]] = None, error: bool = False) -> None:
+        """Account one completed request to its route and model."""
+        self._by_route.setdefault(route, _Counters()).record(latency, usage, error)
+        self._by_model.setdefault(model, _Counters()).record(latency, usage, error)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get route configuration and per-route and per-model accounting."""
+        return {
+            "routes": self.routes,
+            "by_route": {name: counters.as_dict() for name, counters in self._by_route.items()},
+            "by_model": {name: counters.as_dict() for name, counters in self._by_model.items()}
+        }
@@ -0,0 +1,107 @@
+"""
+Reference-data answers for TravelLangGraph API.
+Answers simple airport and nearby-place questions from the places index without calling the model.
+"""
+
+from typing import Any, Dict, List, Optional
+import re
+from services.place_index import PlaceIndex
+
+_AIRPORT_CODE = re.compile(
+    r"^\s*(?:which|what)\s+airport\s+is\s+([a-z]{3})\s*\??\s*$"
+    r"|^\s*what\s+is\s+(?:the\s+)?([a-z]{3})\s+airport\s*\??\s*$",
+    re.IGNORECASE
+)
+_AIRPORTS_FOR = re.compile(
+    r"^\s*(?:which|what)\s+airports?\s+(?:serves?|serving|(?:is|are)\s+(?:in|for))\s+(.+?)\s*\??\s*$"
+    r"|^\s*(?:what\s+is\s+the\s+)?airport\s+codes?\s+(?:for|of)\s+(.+?)\s*\??\s*$",
+    re.IGNORECASE
+)
+_NEARBY = re.compile(
+    r"^\s*(?:(?:which|what)\s+)?(cities|towns|airports|places)\s+(?:are\s+)?(?:near|around|close\s+to)\s+(.+?)\s*\??\s*$",
+    re.IGNORECASE
+)
+_CODE_MENTION = re.compile(r"\b[A-Z]{3}\b")
+
+_NEARBY_KINDS = {"cities": ("city",), "towns": ("city",), "airports": ("airport",), "places": ("city", "airport")}
+
+def describe(place: Dict[str, Any], with_code: bool = True) -> str:
+    """One-line description of a place, e.g. "Lisbon Humberto Delgado Airport (LIS) in Lisbon, Portugal"."""
+    with_code = with_code and place["code"] and place["kind"] == "airport"
+    name = f"{place['name']} ({place['code']})" if with_code else place["name"]
+    if place["kind"] == "country":
+        return name
+    where = ", ".join(part for part in (place["city"] if place["city"] != place["name"] else None, place["country"]) if part)
+    return f"{name} in {where}" if where else name
+
+class PlaceAnswerer:
+    """
+    Answer or ground travel questions from the places index.
+    
+    Questions that are pure reference lookups, such as "which airport is
+    LIS" or "cities near Porto", are answered directly. For other messages,
+    airport codes mentioned in the text are resolved into a short reference
+    note the model can rely on.
+    """
+    
+    def __init__(self, index: PlaceIndex, nearby_radius_km: float = 150.0, nearby_limit: int = 8):
+        self.index = index
+        self.nearby_radius_km = nearby_radius_km
+        self.nearby_limit = nearby_limit
+    
+    def answer(self, message: str) -> Optional[str]:
+        """Answer a reference question, or None if the message is not one or the place is unknown."""
+        match = _AIRPORT_CODE.match(message)
+        if match:
+            airport = self.index.lookup(match.group(1) or match.group(2), kind="airport")
+            return f"{airport['code']} is {describe(airport, with_code=False)}." if airport else None
+        
+        match = _AIRPORTS_FOR.match(message)
+        if match:
+            return self._airports_for(match.group(1) or match.group(2))
+        
+        match = _NEARBY.match(message)
+        if match:
+            return self._nearby(match.group(1).lower(), match.group(2))
+        return None
+    
+    def _airports_for(self, name: str) -> Optional[str]:
+        city = self.index.find(name, kinds=("city",))
+        if city is None:
+            return None
+        airports = [
+            place for place in self.index.nearby(city["latitude"], city["longitude"], 100, limit=20, kinds=("airport",))
+            if place["city"] == city["name"] and place["country_code"] == city["country_code"]
+        ]
+        if not airports:
+            return None
+        listed = ", ".join(f"{place['code']} ({place['name']}, {place['distance_km']:g} km)" for place in airports)
+        return f"{city['name']}, {city['country']} is served by {listed}."
+    
+    def _nearby(self, noun: str, name: str) -> Optional[str]:
+        center = self.index.find(name, kinds=("city", "airport"))
+        if center is None:
+            return None
+        places = [
+            place for place in self.index.nearby(
+                center["latitude"], center["longitude"], self.nearby_radius_km,
+                limit=self.nearby_limit + 1, kinds=_NEARBY_KINDS[noun]
+            )
+            if place["name"] != center["name"]
+        ][:self.nearby_limit]
+        radius = f"{self.nearby_radius_km:g} km"
+        if not places:
+            return f"No {noun} within {radius} of {center['name']} in the reference data."
+        listed = ", ".join(f"{place['name']} ({place['distance_km']:g} km)" for place in places)
+        return f"{noun.capitalize()} within {radius} of {center['name']}: {listed}."
+    
+    def ground(self, message: str) -> Optional[str]:
+        """A reference note for the airport codes mentioned in a message, or None if there are none."""
+        facts: List[str] = []
+        for code in dict.fromkeys(_CODE_MENTION.findall(message)):
+            airport = self.index.lookup(code, kind="airport")
+            if airport is not None:
+                facts.append(f"{code} = {describe(airport)}")
+        if not facts:
+            return None
+        return "Reference data: " + "; ".join(facts) + "."
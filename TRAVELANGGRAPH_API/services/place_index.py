@@ -0,0 +1,589 @@
+"""
+Travel reference data for TravelLangGraph API.
+Airports, cities and countries in array-backed columns with prefix and radius search.
+
+Usage:
+    python -m services.place_index --csv data/places.csv --snapshot places.bin
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import argparse
+import csv
+import heapq
+import json
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+import unicodedata
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "places.csv")
+
+KINDS = ("airport", "city", "country")
+STRING_FIELDS = ("code", "name", "city", "country_code", "country")
+EARTH_RADIUS_KM = 6371.0088
+
+# Words too common in place names to be useful as autocomplete entry points
+SKIP_WORDS = frozenset({"airport", "international", "the", "of", "de", "do", "da", "del"})
+
+# Prefixes matching more keys than this get a precomputed ranking of their best places
+HEAVY_PREFIX_KEYS = 256
+HEAVY_PREFIX_TOP = 64
+HEAVY_PREFIX_MAX_LENGTH = 6
+
+_SNAPSHOT_MAGIC = b"TLGPLACES1"
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+def normalize(text: str) -> str:
+    """Fold accents and case and keep only letters and digits, e.g. "Sá Carneiro" -> "sa carneiro"."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+    return _NON_WORD.sub(" ", folded).strip()
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+class StringColumn:
+    """
+    Strings packed into one UTF-8 buffer with an array of offsets.
+    
+    Costs a few bytes per string instead of a Python object each, and works
+    the same over an in-memory buffer or a memory-mapped snapshot.
+    """
+    
+    def __init__(self, data: Any, offsets: Sequence[int]):
+        self.data = data
+        self.offsets = offsets
+    
+    @classmethod
+    def from_strings(cls, strings: Iterable[str]) -> "StringColumn":
+        parts = []
+        offsets = array("Q", [0])
+        for string in strings:
+            encoded = string.encode("utf-8")
+            parts.append(encoded)
+            offsets.append(offsets[-1] + len(encoded))
+        return cls(b"".join(parts), offsets)
+    
+    def raw(self, index: int) -> bytes:
+        """The UTF-8 bytes of one string."""
+        return bytes(self.data[self.offsets[index]:self.offsets[index + 1]])
+    
+    def __getitem__(self, index: int) -> str:
+        return self.raw(index).decode("utf-8")
+    
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+    
+    def bisect_left(self, key: bytes) -> int:
+        """First index whose string is not less than `key`; the column must be sorted."""
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.raw(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    @property
+    def nbytes(self) -> int:
+        return len(self.data) + len(self.offsets) * 8
+
+class PlaceIndex:
+    """
+    Read-only index of airports, cities and countries.
+    
+    Fields are stored column-wise in `array` and packed string buffers, so
+    a million places take tens of megabytes and can be saved as one
+    snapshot that is memory-mapped on load instead of parsed.
+    
+    Autocomplete uses a flattened prefix trie: the normalized name, each
+    word-start suffix of the name and the code of every place, sorted in
+    one column. All keys with a prefix form a contiguous range found by two
+    binary searches. Prefixes with large ranges, such as one or two letters,
+    also store their best `HEAVY_PREFIX_TOP` places, so a query does not
+    rank the whole range. Radius queries use a grid of `grid_degrees` cells:
+    place IDs are sorted by cell, so a query scans only the cells
+    overlapping its bounding box.
+    """
+    
+    def __init__(self, buffers: Dict[str, Any], grid_degrees: float = 1.0, source: str = "", snapshot: Any = None):
+        self.buffers = buffers
+        self.grid_degrees = grid_degrees
+        self.source = source
+        self._snapshot = snapshot
+        self.kinds = buffers["kind"]
+        self.latitude = buffers["latitude"]
+        self.longitude = buffers["longitude"]
+        self.population = buffers["population"]
+        self.strings = {
+            field: StringColumn(buffers[f"{field}.data"], buffers[f"{field}.offsets"]) for field in STRING_FIELDS
+        }
+        self.keys = StringColumn(buffers["keys.data"], buffers["keys.offsets"])
+        self.key_ids = buffers["key_ids"]
+        self.key_primary = buffers["key_primary"]
+        self.heavy_prefixes = StringColumn(buffers["heavy.data"], buffers["heavy.offsets"])
+        self.heavy_starts = buffers["heavy_starts"]
+        self.heavy_ids = buffers["heavy_ids"]
+        self.heavy_primary = buffers["heavy_primary"]
+        self.cell_keys = buffers["cell_keys"]
+        self.cell_starts = buffers["cell_starts"]
+        self.cell_ids = buffers["cell_ids"]
+        self._grid_rows = int(math.ceil(180 / grid_degrees))
+        self._grid_cols = int(math.ceil(360 / grid_degrees))
+    
+    def __len__(self) -> int:
+        return len(self.kinds)
+    
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]], grid_degrees: float = 1.0, source: str = "") -> "PlaceIndex":
+        """
+        Build an index from rows with `kind`, `code`, `name`, `city`,
+        `country_code`, `country`, `latitude`, `longitude` and `population`.
+        
+        Airports without a population rank by their city's population.
+        
+        Raises:
+            ValueError: If a row has an unknown kind or invalid coordinates
+        """
+        kinds = array("B")
+        latitude = array("d")
+        longitude = array("d")
+        population = array("q")
+        strings: Dict[str, List[str]] = {field: [] for field in STRING_FIELDS}
+        city_population: Dict[Tuple[str, str], int] = {}
+        
+        for row in rows:
+            kind = row["kind"]
+            if kind not in KINDS:
+                raise ValueError(f"Unknown place kind: {kind!r}")
+            lat, lon = float(row["latitude"]), float(row["longitude"])
+            if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+                raise ValueError(f"Invalid coordinates for {row['name']!r}: {lat}, {lon}")
+            kinds.append(KINDS.index(kind))
+            latitude.append(lat)
+            longitude.append(lon)
+            population.append(int(float(row.get("population") or 0)))
+            for field in STRING_FIELDS:
+                strings[field].append((row.get(field) or "").strip())
+            if kind == "city":
+                city_population[(normalize(row["name"]), row["country_code"])] = population[-1]
+        
+        for i, kind in enumerate(kinds):
+            if KINDS[kind] == "airport" and not population[i]:
+                population[i] = city_population.get((normalize(strings["city"][i]), strings["country_code"][i]), 0)
+        
+        entries = sorted(
+            (key, i, primary) for i in range(len(kinds))
+            for key, primary in cls._place_keys(strings["name"][i], strings["code"][i], strings["city"][i], KINDS[kinds[i]]).items()
+        )
+        keys = StringColumn.from_strings(key for key, _, _ in entries)
+        heavy = cls._heavy_prefixes(entries, population)
+        heavy_prefixes = StringColumn.from_strings(prefix for prefix, _ in heavy)
+        heavy_starts = array("Q", [0])
+        for _, top in heavy:
+            heavy_starts.append(heavy_starts[-1] + len(top))
+        
+        cells = sorted((cls._cell(latitude[i], longitude[i], grid_degrees), i) for i in range(len(kinds)))
+        cell_keys, cell_starts = array("q"), array("Q")
+        for position, (cell, _) in enumerate(cells):
+            if not cell_keys or cell_keys[-1] != cell:
+                cell_keys.append(cell)
+                cell_starts.append(position)
+        cell_starts.append(len(cells))
+        
+        buffers: Dict[str, Any] = {
+            "kind": kinds,
+            "latitude": latitude,
+            "longitude": longitude,
+            "population": population,
+            "keys.data": keys.data,
+            "keys.offsets": keys.offsets,
+            "key_ids": array("I", (i for _, i, _ in entries)),
+            "key_primary": array("B", (primary for _, _, primary in entries)),
+            "heavy.data": heavy_prefixes.data,
+            "heavy.offsets": heavy_prefixes.offsets,
+            "heavy_starts": heavy_starts,
+            "heavy_ids": array("I", (i for _, top in heavy for i, _ in top)),
+            "heavy_primary": array("B", (primary for _, top in heavy for _, primary in top)),
+            "cell_keys": cell_keys,
+            "cell_starts": cell_starts,
+            "cell_ids": array("I", (i for _, i in cells))
+        }
+        for field in STRING_FIELDS:
+            column = StringColumn.from_strings(strings[field])
+            buffers[f"{field}.data"] = column.data
+            buffers[f"{field}.offsets"] = column.offsets
+        return cls(buffers, grid_degrees=grid_degrees, source=source)
+    
+    @classmethod
+    def from_csv(cls, path: str, grid_degrees: float = 1.0) -> "PlaceIndex":
+        """Build an index from a CSV file with the columns of `from_rows`."""
+        with open(path, newline="", encoding="utf-8") as f:
+            return cls.from_rows(csv.DictReader(f), grid_degrees=grid_degrees, source=path)
+    
+    @staticmethod
+    def _heavy_prefixes(entries: List[Tuple[str, int, bool]], population: Sequence[int]) -> List[Tuple[str, list]]:
+        """
+        Best places of each prefix that matches more than `HEAVY_PREFIX_KEYS` keys.
+        
+        Returns:
+            Sorted `(prefix, [(place_id, primary), ...])` pairs, best place first
+        """
+        keys = [key for key, _, _ in entries]
+        heavy = []
+        for length in range(1, HEAVY_PREFIX_MAX_LENGTH + 1):
+            start = 0
+            while start < len(keys):
+                # A shorter key sorts before the longer keys it prefixes; skip just that key
+                if len(keys[start]) < length:
+                    start += 1
+                    continue
+                prefix = keys[start][:length]
+                end = bisect_left(keys, prefix + "\uffff", start)
+                if end - start > HEAVY_PREFIX_KEYS:
+                    best: Dict[int, bool] = {}
+                    for _, i, primary in entries[start:end]:
+                        best[i] = best.get(i, False) or primary
+                    top = heapq.nlargest(HEAVY_PREFIX_TOP, best, key=lambda i: (best[i], population[i], -i))
+                    heavy.append((prefix, [(i, best[i]) for i in top]))
+                start = end
+        heavy.sort()
+        return heavy
+    
+    @staticmethod
+    def _place_keys(name: str, code: str, city: str, kind: str) -> Dict[str, bool]:
+        """
+        Autocomplete keys of a place: its name, word-start suffixes of the
+        name, its code and an airport's city. Suffixes are secondary keys,
+        ranked below matches on the start of a name or a code.
+        """
+        words = normalize(name).split()
+        keys = {" ".join(words[start:]): False for start in range(1, len(words)) if words[start] not in SKIP_WORDS}
+        for key in (" ".join(words), normalize(code), normalize(city) if kind == "airport" else ""):
+            if key:
+                keys[key] = True
+        return keys
+    
+    @staticmethod
+    def _cell(lat: float, lon: float, grid_degrees: float) -> int:
+        rows = int(math.ceil(180 / grid_degrees))
+        cols = int(math.ceil(360 / grid_degrees))
+        row = min(int((lat + 90) // grid_degrees), rows - 1)
+        col = int((lon + 180) // grid_degrees) % cols
+        return row * cols + col
+    
+    def place(self, index: int) -> Dict[str, Any]:
+        """One place as a dictionary; empty strings become None."""
+        place = {"kind": KINDS[self.kinds[index]]}
+        for field in STRING_FIELDS:
+            place[field] = self.strings[field][index] or None
+        place.update(
+            latitude=self.latitude[index],
+            longitude=self.longitude[index],
+            population=self.population[index] or None
+        )
+        return place
+    
+    def _key_range(self, prefix: str) -> Tuple[int, int]:
+        """Range of keys starting with a normalized prefix; UTF-8 never contains 0xff, so it bounds the range."""
+        encoded = prefix.encode("utf-8")
+        return self.keys.bisect_left(encoded), self.keys.bisect_left(encoded + b"\xff")
+    
+    def autocomplete(self, prefix: str, limit: int = 10, kinds: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Places with a name, name word or code starting with `prefix`.
+        
+        Exact name or code matches rank first, then matches on the start of
+        a name or a code, then larger populations.
+        
+        Args:
+            prefix: Text typed so far; case and accents are ignored
+            limit: Maximum places to return
+            kinds: Optional kinds to keep, e.g. ("airport",)
+        
+        Returns:
+            Matching places, best first
+        """
+        normalized = normalize(prefix)
+        if not normalized or limit < 1:
+            return []
+        allowed = frozenset(KINDS.index(kind) for kind in kinds) if kinds else None
+        encoded = normalized.encode("utf-8")
+        lo, hi = self._key_range(normalized)
+        
+        matches = self._heavy_matches(encoded, lo, hi, limit, allowed)
+        if matches is None:
+            matches = {}
+            for position in range(lo, hi):
+                self._add_match(matches, position, encoded, allowed)
+        best = heapq.nlargest(limit, matches, key=lambda i: (matches[i], self.population[i], -i))
+        return [self.place(i) for i in best]
+    
+    def _add_match(self, matches: Dict[int, Tuple[bool, bool]], position: int, encoded: bytes, allowed) -> None:
+        """Rank the place of one key: (exact match, primary key), keeping its best key."""
+        i = self.key_ids[position]
+        if allowed is not None and self.kinds[i] not in allowed:
+            return
+        primary = bool(self.key_primary[position])
+        match = (primary and self.keys.raw(position) == encoded, primary)
+        matches[i] = max(matches.get(i, match), match)
+    
+    def _heavy_matches(
+        self,
+        encoded: bytes,
+        lo: int,
+        hi: int,
+        limit: int,
+        allowed
+    ) -> Optional[Dict[int, Tuple[bool, bool]]]:
+        """
+        Candidates for a heavy prefix from its precomputed ranking plus its exact key matches.
+        
+        Returns None, to rank the whole range instead, if the prefix is not
+        heavy or the ranking has too few places of the allowed kinds.
+        """
+        position = self.heavy_prefixes.bisect_left(encoded)
+        if position == len(self.heavy_prefixes) or self.heavy_prefixes.raw(position) != encoded:
+            return None
+        
+        matches: Dict[int, Tuple[bool, bool]] = {}
+        for j in range(self.heavy_starts[position], self.heavy_starts[position + 1]):
+            i = self.heavy_ids[j]
+            if allowed is None or self.kinds[i] in allowed:
+                matches[i] = (False, bool(self.heavy_primary[j]))
+        if len(matches) < limit and len(matches) < hi - lo:
+            return None
+        # Keys equal to the prefix sort first in its range
+        position = lo
+        while position < hi and self.keys.raw(position) == encoded:
+            self._add_match(matches, position, encoded, allowed)
+            position += 1
+        return matches
+    
+    def lookup(self, code: str, kind: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Find a place by exact code, e.g. an IATA airport code or ISO country code."""
+        normalized = normalize(code)
+        if not normalized:
+            return None
+        lo, hi = self._key_range(normalized)
+        for position in range(lo, hi):
+            i = self.key_ids[position]
+            if normalize(self.strings["code"][i]) == normalized and (kind is None or KINDS[self.kinds[i]] == kind):
+                return self.place(i)
+        return None
+    
+    def find(self, name: str, kinds: Optional[Sequence[str]] = None) -> Optional[Dict[str, Any]]:
+        """Find the most populous place named exactly `name`, or None."""
+        normalized = normalize(name)
+        best = None
+        for place in self.autocomplete(normalized, limit=10, kinds=kinds):
+            if normalize(place["name"]) == normalized or normalize(place["code"] or "") == normalized:
+                if best is None or (place["population"] or 0) > (best["population"] or 0):
+                    best = place
+        return best
+    
+    def nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        limit: int = 10,
+        kinds: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Places within `radius_km` of a point, nearest first.
+        
+        Args:
+            latitude: Latitude of the point
+            longitude: Longitude of the point
+            radius_km: Search radius in kilometres
+            limit: Maximum places to return
+            kinds: Optional kinds to keep
+        
+        Returns:
+            Places with a `distance_km` field
+        """
+        allowed = frozenset(KINDS.index(kind) for kind in kinds) if kinds else None
+        found = []
+        for cell in self._cells_within(latitude, longitude, radius_km):
+            position = self._cell_position(cell)
+            if position is None:
+                continue
+            for j in range(self.cell_starts[position], self.cell_starts[position + 1]):
+                i = self.cell_ids[j]
+                if allowed is not None and self.kinds[i] not in allowed:
+                    continue
+                distance = haversine_km(latitude, longitude, self.latitude[i], self.longitude[i])
+                if distance <= radius_km:
+                    found.append((distance, i))
+        
+        results = []
+        for distance, i in heapq.nsmallest(limit, found):
+            place = self.place(i)
+            place["distance_km"] = round(distance, 1)
+            results.append(place)
+        return results
+    
+    def _cells_within(self, latitude: float, longitude: float, radius_km: float) -> Iterable[int]:
+        """Grid cells overlapping the bounding box of a circle."""
+        d = self.grid_degrees
+        delta_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+        row_lo = max(int((latitude - delta_lat + 90) // d), 0)
+        row_hi = min(int((latitude + delta_lat + 90) // d), self._grid_rows - 1)
+        
+        max_lat = min(abs(latitude) + delta_lat, 90.0)
+        if max_lat >= 89.0:
+            delta_lon = 180.0
+        else:
+            delta_lon = delta_lat / math.cos(math.radians(max_lat))
+        if delta_lon >= 180.0:
+            cols = range(self._grid_cols)
+        else:
+            col_lo = int((longitude - delta_lon + 180) // d)
+            col_hi = int((longitude + delta_lon + 180) // d)
+            cols = sorted({col % self._grid_cols for col in range(col_lo, col_hi + 1)})
+        
+        for row in range(row_lo, row_hi + 1):
+            for col in cols:
+                yield row * self._grid_cols + col
+    
+    def _cell_position(self, cell: int) -> Optional[int]:
+        """Position of a cell in `cell_keys`, or None if it holds no places."""
+        lo, hi = 0, len(self.cell_keys)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.cell_keys[mid] < cell:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < len(self.cell_keys) and self.cell_keys[lo] == cell else None
+    
+    def save_snapshot(self, path: str) -> None:
+        """
+        Write the index as a binary snapshot for `load_snapshot`.
+        
+        The file is a magic string, a JSON header listing each buffer's
+        type, offset and length, and the raw buffers aligned to 8 bytes.
+        """
+        layout = {}
+        offset = 0
+        for name, buffer in self.buffers.items():
+            view = memoryview(buffer)
+            typecode = "bytes" if name.endswith(".data") else view.format
+            layout[name] = {"typecode": typecode, "offset": offset, "length": view.nbytes}
+            offset += view.nbytes + (-view.nbytes % 8)
+        header = json.dumps({
+            "count": len(self),
+            "grid_degrees": self.grid_degrees,
+            "byteorder": sys.byteorder,
+            "buffers": layout
+        }).encode("utf-8")
+        header += b" " * (-(len(_SNAPSHOT_MAGIC) + 8 + len(header)) % 8)
+        
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_SNAPSHOT_MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            for buffer in self.buffers.values():
+                data = memoryview(buffer).cast("B")
+                f.write(data)
+                f.write(b"\0" * (-data.nbytes % 8))
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load_snapshot(cls, path: str) -> "PlaceIndex":
+        """
+        Memory-map a snapshot written by `save_snapshot`.
+        
+        Buffers are views of the mapped file, so loading does no parsing and
+        pages are shared between worker processes.
+        
+        Raises:
+            ValueError: If the file is not a snapshot or was written on a
+                machine with a different byte order
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapped)
+        if bytes(view[:len(_SNAPSHOT_MAGIC)]) != _SNAPSHOT_MAGIC:
+            raise ValueError(f"Not a places snapshot: {path}")
+        header_start = len(_SNAPSHOT_MAGIC) + 8
+        (header_length,) = struct.unpack("<Q", view[len(_SNAPSHOT_MAGIC):header_start])
+        header = json.loads(bytes(view[header_start:header_start + header_length]))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"Places snapshot byte order {header['byteorder']} does not match {sys.byteorder}")
+        
+        data_start = header_start + header_length
+        buffers = {}
+        for name, entry in header["buffers"].items():
+            start = data_start + entry["offset"]
+            chunk = view[start:start + entry["length"]]
+            buffers[name] = chunk if entry["typecode"] == "bytes" else chunk.cast(entry["typecode"])
+        return cls(buffers, grid_degrees=header["grid_degrees"], source=path, snapshot=mapped)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get place counts per kind, index sizes and the data source."""
+        counts = {kind: 0 for kind in KINDS}
+        for kind in self.kinds:
+            counts[KINDS[kind]] += 1
+        return {
+            "source": self.source,
+            "memory_mapped": self._snapshot is not None,
+            "places": len(self),
+            "by_kind": counts,
+            "autocomplete_keys": len(self.keys),
+            "grid_cells": len(self.cell_keys),
+            "grid_degrees": self.grid_degrees,
+            "buffer_bytes": sum(memoryview(buffer).nbytes for buffer in self.buffers.values())
+        }
+
+def load_place_index() -> Optional[PlaceIndex]:
+    """
+    Load the places index from settings.
+    
+    Uses `PLACES_SNAPSHOT_PATH` when it exists, otherwise parses
+    `PLACES_DATA_PATH` or the bundled CSV.
+    
+    Returns:
+        The index, or None if it is disabled or cannot be loaded
+    """
+    if not settings.PLACES_ENABLED:
+        return None
+    try:
+        if settings.PLACES_SNAPSHOT_PATH and os.path.exists(settings.PLACES_SNAPSHOT_PATH):
+            return PlaceIndex.load_snapshot(settings.PLACES_SNAPSHOT_PATH)
+        return PlaceIndex.from_csv(settings.PLACES_DATA_PATH or DEFAULT_DATA_PATH, grid_degrees=settings.PLACES_GRID_DEGREES)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Places index disabled: {e}")
+        return None
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build a memory-mappable places snapshot from a CSV file.")
+    parser.add_argument("--csv", default=DEFAULT_DATA_PATH)
+    parser.add_argument("--snapshot", required=True)
+    parser.add_argument("--grid-degrees", type=float, default=settings.PLACES_GRID_DEGREES)
+    args = parser.parse_args()
+    
+    start = time.perf_counter()
+    index = PlaceIndex.from_csv(args.csv, grid_degrees=args.grid_degrees)
+    index.save_snapshot(args.snapshot)
+    print(f"{len(index)} places -> {args.snapshot} in {time.perf_counter() - start:.2f}s")
+
+if __name__ == "__main__":
+    main()
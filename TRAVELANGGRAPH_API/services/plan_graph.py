@@ -0,0 +1,307 @@
+"""
+Planning graph execution for TravelLangGraph API.
+Runs steps as a dependency graph with concurrent branches, memoized outputs and resumable runs.
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import asyncio
+import hashlib
+import inspect
+import logging
+import time
+import uuid
+from metrics import PLAN_NODE_DURATION, PLAN_RUNS
+from serialization import dumps
+from services.completion_cache import CacheBackend
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+# A step gets the run inputs it reads and the outputs of the steps it depends on
+NodeFunction = Callable[[Dict[str, Any], Dict[str, Any]], Union[Any, Awaitable[Any]]]
+
+class GraphNode:
+    """
+    One step of a planning graph.
+    
+    Args:
+        name: Step name, unique in the graph; its output is passed on under this name
+        fn: Sync or async function of `(inputs, upstream)` returning a JSON-serializable output
+        depends_on: Steps whose outputs this step needs
+        input_keys: Run inputs this step reads; all of them when None
+        memoize: Reuse the output of an earlier run with the same inputs and upstream outputs
+        version: Bump to invalidate memoized outputs when the step changes
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        fn: NodeFunction,
+        depends_on: Sequence[str] = (),
+        input_keys: Optional[Sequence[str]] = None,
+        memoize: bool = True,
+        version: str = "1"
+    ):
+        self.name = name
+        self.fn = fn
+        self.depends_on = tuple(depends_on)
+        self.input_keys = tuple(input_keys) if input_keys is not None else None
+        self.memoize = memoize
+        self.version = version
+    
+    def select_inputs(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """The run inputs this step reads."""
+        if self.input_keys is None:
+            return dict(inputs)
+        return {key: inputs.get(key) for key in self.input_keys}
+
+class NodeFailedError(Exception):
+    """A step failed; the run's completed steps are checkpointed under `run_id`."""
+    
+    def __init__(self, run_id: str, node: str, error: BaseException):
+        super().__init__(f"Plan step '{node}' failed: {error}")
+        self.run_id = run_id
+        self.node = node
+        self.error = error
+
+class PlanCheckpointStore:
+    """
+    In-process store of run checkpoints with LRU eviction and a TTL.
+    
+    A checkpoint holds a run's inputs, status and the outputs of every
+    completed step, and is saved after each step completes.
+    """
+    
+    def __init__(self, max_runs: int = 1000, ttl_seconds: float = 86400.0):
+        self.max_runs = max_runs
+        self.ttl_seconds = ttl_seconds
+        self._runs: "OrderedDict[str, tuple]" = OrderedDict()
+        self.evictions = 0
+    
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Get a run's checkpoint, or None if it does not exist or has expired."""
+        entry = self._runs.get(run_id)
+        if entry is None:
+            return None
+        
+        saved_at, checkpoint = entry
+        if time.monotonic() - saved_at > self.ttl_seconds:
+            del self._runs[run_id]
+            self.evictions += 1
+            return None
+        return checkpoint
+    
+    def save(self, checkpoint: Dict[str, Any]) -> None:
+        """Save a run's checkpoint under its `run_id`."""
+        run_id = checkpoint["run_id"]
+        self._runs[run_id] = (time.monotonic(), checkpoint)
+        self._runs.move_to_end(run_id)
+        while len(self._runs) > self.max_runs:
+            self._runs.popitem(last=False)
+            self.evictions += 1
+    
+    def stats(self) -> Dict[str, Any]:
+        return {"runs": len(self._runs), "max_runs": self.max_runs, "evictions": self.evictions}
+
+class PlanGraph:
+    """
+    Run a directed acyclic graph of steps on the event loop.
+    
+    A step starts as soon as every step it depends on has completed, so
+    independent branches run concurrently, up to `max_concurrency` at once.
+    Step outputs are memoized in `memo` keyed on a hash of the step, its
+    inputs and its upstream outputs. Each run is checkpointed in
+    `checkpoints` after every completed step; if a step fails, running
+    siblings are allowed to finish and `resume` later re-runs only the
+    steps that did not complete.
+    """
+    
+    def __init__(
+        self,
+        nodes: Iterable[GraphNode],
+        max_concurrency: int = 4,
+        memo: Optional[CacheBackend] = None,
+        checkpoints: Optional[PlanCheckpointStore] = None
+    ):
+        self.nodes: Dict[str, GraphNode] = {}
+        for node in nodes:
+            if node.name in self.nodes:
+                raise ValueError(f"Duplicate plan step: {node.name}")
+            self.nodes[node.name] = node
+        self.order = self._topological_order()
+        self.max_concurrency = max(1, max_concurrency)
+        self.memo = memo
+        self.checkpoints = checkpoints or PlanCheckpointStore()
+    
+    def _topological_order(self) -> List[str]:
+        """Step names with every step after its dependencies; raises ValueError on unknown steps or cycles."""
+        remaining = {}
+        for node in self.nodes.values():
+            for dependency in node.depends_on:
+                if dependency not in self.nodes:
+                    raise ValueError(f"Plan step '{node.name}' depends on unknown step '{dependency}'")
+            remaining[node.name] = set(node.depends_on)
+        
+        order = []
+        while remaining:
+            ready = [name for name, dependencies in remaining.items() if not dependencies]
+            if not ready:
+                raise ValueError(f"Plan steps form a cycle: {', '.join(sorted(remaining))}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for dependencies in remaining.values():
+                dependencies.difference_update(ready)
+        return order
+    
+    @staticmethod
+    def memo_key(node: GraphNode, inputs: Dict[str, Any], upstream: Dict[str, Any]) -> str:
+        """Hash of a step, its version, its inputs and its upstream outputs."""
+        canonical = dumps([node.name, node.version, inputs, upstream], sort_keys=True)
+        return hashlib.sha256(canonical).hexdigest()
+    
+    async def run(self, inputs: Dict[str, Any], run_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run every step of the graph.
+        
+        Args:
+            inputs: JSON-serializable run inputs
+            run_id: Optional ID for the run's checkpoint; generated when omitted
+        
+        Returns:
+            The run's checkpoint: `run_id`, `status`, `inputs`, step `outputs`
+            and per-step `nodes` timings and sources
+        
+        Raises:
+            NodeFailedError: If a step fails
+        """
+        checkpoint = {
+            "run_id": run_id or uuid.uuid4().hex,
+            "status": "running",
+            "inputs": inputs,
+            "outputs": {},
+            "nodes": {},
+            "error": None,
+            "created_at": datetime.utcnow().isoformat()
+        }
+        return await self._execute(checkpoint)
+    
+    async def resume(self, run_id: str) -> Dict[str, Any]:
+        """
+        Resume a run, re-running only the steps that have not completed.
+        
+        Raises:
+            KeyError: If the run has no checkpoint
+            NodeFailedError: If a step fails again
+        """
+        checkpoint = self.checkpoints.get(run_id)
+        if checkpoint is None:
+            raise KeyError(run_id)
+        if checkpoint["status"] == "completed":
+            return checkpoint
+        
+        checkpoint = {**checkpoint, "status": "running", "error": None, "outputs": dict(checkpoint["outputs"])}
+        checkpoint["nodes"] = {
+            name: {**info, "source": "checkpoint"} for name, info in checkpoint["nodes"].items()
+            if name in checkpoint["outputs"]
+        }
+        return await self._execute(checkpoint)
+    
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Get a run's checkpoint, or None if it does not exist."""
+        return self.checkpoints.get(run_id)
+    
+    async def _execute(self, checkpoint: Dict[str, Any]) -> Dict[str, Any]:
+        """Schedule the steps missing from `checkpoint` until all complete or one fails."""
+        outputs = checkpoint["outputs"]
+        pending = [name for name in self.order if name not in outputs]
+        running: Dict[asyncio.Task, str] = {}
+        failure: Optional[Tuple[str, BaseException]] = None
+        start = time.perf_counter()
+        self.checkpoints.save(checkpoint)
+        
+        with span("plan.run", run_id=checkpoint["run_id"]):
+            try:
+                while pending or running:
+                    # Stop starting steps after a failure, but let running siblings finish
+                    if failure is None:
+                        for name in list(pending):
+                            if len(running) >= self.max_concurrency:
+                                break
+                            if all(dependency in outputs for dependency in self.nodes[name].depends_on):
+                                pending.remove(name)
+                                running[asyncio.create_task(self._run_node(self.nodes[name], checkpoint))] = name
+                    if not running:
+                        break
+                    
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        name = running.pop(task)
+                        try:
+                            output, info = task.result()
+                        except Exception as e:
+                            logger.warning(f"Plan step '{name}' failed in run {checkpoint['run_id']}: {e}")
+                            failure = failure or (name, e)
+                            continue
+                        outputs[name] = output
+                        checkpoint["nodes"][name] = info
+                        self.checkpoints.save(checkpoint)
+            finally:
+                for task in running:
+                    task.cancel()
+        
+        checkpoint["total_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        if failure is not None:
+            name, error = failure
+            checkpoint.update(status="failed", error={"node": name, "message": str(error)})
+            self.checkpoints.save(checkpoint)
+            PLAN_RUNS.inc("failed")
+            raise NodeFailedError(checkpoint["run_id"], name, error) from error
+        
+        checkpoint["status"] = "completed"
+        self.checkpoints.save(checkpoint)
+        PLAN_RUNS.inc("completed")
+        return checkpoint
+    
+    async def _run_node(self, node: GraphNode, checkpoint: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+        """Run one step, or reuse its memoized output; returns the output and its timing."""
+        inputs = node.select_inputs(checkpoint["inputs"])
+        upstream = {dependency: checkpoint["outputs"][dependency] for dependency in node.depends_on}
+        start = time.perf_counter()
+        
+        key = self.memo_key(node, inputs, upstream) if node.memoize and self.memo is not None else None
+        if key is not None:
+            memoized = self.memo.get(key)
+            if memoized is not None:
+                return memoized["output"], self._record(node, "memoized", start)
+        
+        with span(f"plan.{node.name}"):
+            try:
+                output = node.fn(inputs, upstream)
+                if inspect.isawaitable(output):
+                    output = await output
+            except Exception:
+                self._record(node, "error", start)
+                raise
+        
+        if key is not None:
+            self.memo.set(key, {"output": output})
+        return output, self._record(node, "executed", start)
+    
+    @staticmethod
+    def _record(node: GraphNode, source: str, start: float) -> Dict[str, Any]:
+        """Record a step's duration in metrics and return its timing info."""
+        duration = time.perf_counter() - start
+        PLAN_NODE_DURATION.observe(duration, node.name, source)
+        return {"source": source, "duration_ms": round(duration * 1000, 2)}
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get graph shape, memo counters and checkpoint store size."""
+        return {
+            "steps": self.order,
+            "max_concurrency": self.max_concurrency,
+            "memo": self.memo.stats() if self.memo is not None else None,
+            "checkpoints": self.checkpoints.stats()
+        }
@@ -0,0 +1,184 @@
+"""
+Prompt templates for TravelLangGraph API.
+Builds message lists with a canonical, byte-stable prefix so upstream prompt caches can reuse it.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import string
+from metrics import PROMPT_CACHE_TOKENS
+from serialization import EncodedPrefixList, dumps
+
+def canonical_text(text: str) -> str:
+    """Normalize line endings and surrounding whitespace so equal prompts are byte-identical."""
+    lines = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+class PromptMessages(EncodedPrefixList):
+    """Messages rendered from a template; `template` names it in prompt cache metrics."""
+    
+    def __init__(self, items: Iterable[Dict[str, str]], template: "PromptTemplate"):
+        super().__init__(items, template.prefix, template.prefix_json)
+        self.template = template.name
+
+class PromptTemplate:
+    """
+    A compiled prompt template.
+    
+    The static prefix, a system prompt followed by static context blocks,
+    is normalized, built into message dictionaries and encoded once.
+    Rendering puts everything that varies after it, so every request from
+    the template starts with the same bytes and the upstream can serve the
+    prefix from its prompt cache. Prefix messages are shared between
+    renders and must not be modified.
+    
+    Args:
+        name: Template name, used to label prompt cache metrics
+        system: System prompt
+        context: Static context blocks, sent as system messages after the system prompt
+        user: Optional format string for the user turn, e.g. "Plan {days} days in {destination}"
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        system: Optional[str] = None,
+        context: Sequence[str] = (),
+        user: Optional[str] = None
+    ):
+        self.name = name
+        texts = [text for text in (canonical_text(block) for block in (system, *context) if block) if text]
+        self.prefix = tuple({"role": "system", "content": text} for text in texts)
+        self.prefix_json = dumps(list(self.prefix), sort_keys=True)
+        self.user = user
+        self.fields = tuple(field for _, field, _, _ in string.Formatter().parse(user) if field) if user else ()
+    
+    @property
+    def system_texts(self) -> tuple:
+        """The prefix message contents, in order."""
+        return tuple(message["content"] for message in self.prefix)
+    
+    def render(
+        self,
+        message: Optional[str] = None,
+        history: Sequence[Dict[str, str]] = (),
+        notes: Sequence[str] = (),
+        **variables: Any
+    ) -> PromptMessages:
+        """
+        Build a message list: the static prefix, then `history`, then `notes`, then the user turn.
+        
+        Per-request notes, such as reference data for this message, go just
+        before the user turn so they never displace cached history.
+        
+        Args:
+            message: User turn; formatted from the `user` format string with
+                `variables` when omitted
+            history: Earlier conversation turns
+            notes: Per-request context, sent as system messages
+        
+        Raises:
+            KeyError: If a field of the `user` format string is missing from `variables`
+            ValueError: If neither `message` nor a `user` format string is given
+        """
+        if message is None:
+            if self.user is None:
+                raise ValueError(f"Prompt template '{self.name}' needs a message")
+            missing = [field for field in self.fields if field not in variables]
+            if missing:
+                raise KeyError(f"Prompt template '{self.name}' is missing {', '.join(missing)}")
+            message = self.user.format_map(variables)
+        
+        messages = list(self.prefix)
+        messages.extend(history)
+        messages.extend({"role": "system", "content": note} for note in notes)
+        messages.append({"role": "user", "content": message})
+        return PromptMessages(messages, self)
+
+@lru_cache(maxsize=256)
+def compile_prompt(system_texts: tuple = ()) -> PromptTemplate:
+    """
+    Compile a template for ad hoc system messages, reusing it for repeats.
+    
+    Templates are labelled `chat` without system messages and `custom` with
+    them, so caller-supplied prompts do not create new metric series.
+    """
+    name = "custom" if any(canonical_text(text) for text in system_texts) else "chat"
+    return PromptTemplate(name, system=system_texts[0] if system_texts else None, context=system_texts[1:])
+
+class PromptLibrary:
+    """
+    Named prompt templates and per-template prompt cache accounting.
+    
+    Requests whose system prompt matches a registered template are built
+    from it; others get a compiled template for their system prompt. The
+    `prompt_cache_hit_tokens` and `prompt_cache_miss_tokens` that DeepSeek
+    reports in `usage` are counted per template.
+    """
+    
+    def __init__(self, templates: Iterable[PromptTemplate] = ()):
+        self._templates: Dict[str, PromptTemplate] = {}
+        self._by_prefix: Dict[tuple, PromptTemplate] = {}
+        self._usage: Dict[str, Dict[str, int]] = {}
+        for template in templates:
+            self.register(template)
+    
+    def register(self, template: PromptTemplate) -> PromptTemplate:
+        """Register a template under its name; returns it."""
+        self._templates[template.name] = template
+        if template.prefix:
+            self._by_prefix[template.system_texts] = template
+        return template
+    
+    def get(self, name: str) -> PromptTemplate:
+        """
+        Get a registered template.
+        
+        Raises:
+            KeyError: If no template has that name
+        """
+        return self._templates[name]
+    
+    def for_system_prompt(self, system_prompt: Optional[str]) -> PromptTemplate:
+        """The template for a single-turn request with an optional system prompt."""
+        text = canonical_text(system_prompt) if system_prompt else ""
+        texts = (text,) if text else ()
+        return self._by_prefix.get(texts) or compile_prompt(texts)
+    
+    def adopt(self, messages: List[Dict[str, str]]) -> PromptMessages:
+        """
+        Rebuild a conversation on the template for its leading system messages.
+        
+        The leading system messages are normalized and replaced by the
+        template's shared prefix; the rest are kept as they are.
+        """
+        split = 0
+        while split < len(messages) and messages[split]["role"] == "system":
+            split += 1
+        texts = tuple(text for text in (canonical_text(m["content"]) for m in messages[:split]) if text)
+        template = self._by_prefix.get(texts) or compile_prompt(texts)
+        return PromptMessages([*template.prefix, *messages[split:]], template)
+    
+    def record(self, template: Optional[str], usage: Optional[Dict[str, Any]]) -> None:
+        """Count the prompt cache hit and miss tokens reported for a template's request."""
+        if not usage or template is None:
+            return
+        counters = self._usage.setdefault(template, {"requests": 0, "prompt_cache_hit_tokens": 0, "prompt_cache_miss_tokens": 0})
+        counters["requests"] += 1
+        for kind in ("prompt_cache_hit_tokens", "prompt_cache_miss_tokens"):
+            tokens = usage.get(kind) or 0
+            counters[kind] += tokens
+            if tokens:
+                PROMPT_CACHE_TOKENS.inc(template, kind[len("prompt_cache_"):-len("_tokens")], amount=tokens)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get registered templates and prompt cache hit rates per template."""
+        usage = {}
+        for name, counters in self._usage.items():
+            total = counters["prompt_cache_hit_tokens"] + counters["prompt_cache_miss_tokens"]
+            usage[name] = {**counters, "hit_rate": round(counters["prompt_cache_hit_tokens"] / total, 4) if total else None}
+        return {
+            "templates": sorted(self._templates),
+            "compiled": compile_prompt.cache_info().currsize,
+            "usage": usage
+        }
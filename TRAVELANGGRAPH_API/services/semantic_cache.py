@@ -0,0 +1,305 @@
+"""
+Semantic completion cache for TravelLangGraph API.
+Matches reworded prompts by cosine similarity of hashed n-gram embeddings.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+import zlib
+import numpy as np
+
+_WORD = re.compile(r"\w+")
+
+# Words that carry no travel intent; left out so short prompts are compared on content
+STOPWORDS = frozenset(
+    "a an the is are was be am do does i me my we you your it its this that of in on at to for "
+    "with and or should would could can will what which how there".split()
+)
+
+# Month abbreviations are common in travel questions ("Kyoto in Nov")
+ABBREVIATIONS = {
+    "jan": "january", "feb": "february", "mar": "march", "apr": "april", "jun": "june", "jul": "july",
+    "aug": "august", "sep": "september", "sept": "september", "oct": "october", "nov": "november",
+    "dec": "december"
+}
+
+def normalize_prompt(text: str) -> str:
+    """Lowercase a prompt, fold Unicode forms, expand month abbreviations and keep only its words."""
+    words = _WORD.findall(unicodedata.normalize("NFKC", text).lower())
+    return " ".join(ABBREVIATIONS.get(word, word) for word in words)
+
+_MONTHS = frozenset(ABBREVIATIONS.values()) | {"may"}
+
+def guard_terms(text: str) -> Tuple[str, ...]:
+    """
+    Terms that must match exactly for two prompts to share an answer.
+    
+    Numbers and months change the answer ("3 days" / "4 days", "Kyoto in
+    November" / "in December") but move the embedding only a little, so a
+    match must carry the same ones.
+    """
+    return tuple(sorted({word for word in normalize_prompt(text).split() if word.isdigit() or word in _MONTHS}))
+
+def namespace_key(model: str, system_prompt: Optional[str], max_tokens: int) -> str:
+    """Namespace for prompts answered by `model` under `system_prompt` with the same token limit."""
+    return hashlib.sha256(f"{model}\0{max_tokens}\0{system_prompt or ''}".encode("utf-8")).hexdigest()[:32]
+
+class HashedNgramEmbedder:
+    """
+    Embed text as a signed, hashed bag of words and character n-grams.
+    
+    Needs no model download and takes microseconds per prompt. Words carry
+    the meaning; n-grams of each word tolerate abbreviations, inflections and
+    typos ("nov" / "november"). Rows are L2-normalized, so a dot product is
+    the cosine similarity.
+    """
+    
+    def __init__(self, dim: int = 256, ngram_sizes: Sequence[int] = (3, 4), word_weight: float = 2.0):
+        self.dim = dim
+        self.ngram_sizes = tuple(ngram_sizes)
+        self.word_weight = word_weight
+    
+    def features(self, text: str) -> List[Tuple[str, float]]:
+        """Weighted features of a prompt: its content words and their character n-grams."""
+        features = []
+        for word in normalize_prompt(text).split():
+            if word in STOPWORDS:
+                continue
+            features.append((word, self.word_weight))
+            padded = f"<{word}>"
+            for size in self.ngram_sizes:
+                for i in range(len(padded) - size + 1):
+                    features.append((f"#{padded[i:i + size]}", 1.0))
+        return features
+    
+    def embed_many(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Embed several prompts at once.
+        
+        Args:
+            texts: Prompts to embed
+        
+        Returns:
+            `float32` matrix with one L2-normalized row per prompt
+        """
+        rows, cols, weights = [], [], []
+        for row, text in enumerate(texts):
+            for feature, weight in self.features(text):
+                h = zlib.crc32(feature.encode("utf-8"))
+                rows.append(row)
+                cols.append(h % self.dim)
+                # The top hash bit picks the sign so collisions tend to cancel
+                weights.append(weight if h & 0x80000000 else -weight)
+        
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        np.add.at(vectors, (np.asarray(rows, dtype=np.intp), np.asarray(cols, dtype=np.intp)), weights)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
+    
+    def embed(self, text: str) -> np.ndarray:
+        """Embed one prompt as an L2-normalized `float32` vector."""
+        return self.embed_many([text])[0]
+
+class _Namespace:
+    """Vectors and values cached under one model and system prompt."""
+    
+    __slots__ = ("vectors", "values", "guards", "expires_at", "last_used", "size")
+    
+    def __init__(self, dim: int, capacity: int):
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.values: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self.guards: List[Tuple[str, ...]] = [()] * capacity
+        self.expires_at = np.zeros(capacity, dtype=np.float64)
+        self.last_used = np.zeros(capacity, dtype=np.float64)
+        self.size = 0
+    
+    @property
+    def capacity(self) -> int:
+        return len(self.values)
+    
+    def grow(self, capacity: int) -> None:
+        """Reallocate the arrays with room for `capacity` entries."""
+        vectors = np.zeros((capacity, self.vectors.shape[1]), dtype=np.float32)
+        vectors[:self.size] = self.vectors[:self.size]
+        self.vectors = vectors
+        self.guards.extend([()] * (capacity - len(self.values)))
+        self.values.extend([None] * (capacity - len(self.values)))
+        self.expires_at = np.resize(self.expires_at, capacity)
+        self.last_used = np.resize(self.last_used, capacity)
+
+class SemanticCache:
+    """
+    Cache completions of single prompts by meaning rather than exact text.
+    
+    Prompts are embedded and their vectors kept in one contiguous matrix per
+    namespace, so a lookup is a single matrix-vector product over every
+    cached entry. The best match is a hit when its cosine similarity reaches
+    `threshold`, it has not expired and it has the same numbers and months
+    as the prompt. Namespaces separate prompts answered under different
+    system prompts or models.
+    
+    Each namespace holds up to `max_entries`; when full, an expired or else
+    the least recently used entry is replaced. Beyond `max_namespaces`, the
+    least recently used namespace is dropped. Methods are thread-safe so
+    lookups can run off the event loop.
+    """
+    
+    name = "semantic"
+    
+    def __init__(
+        self,
+        embedder: Optional[HashedNgramEmbedder] = None,
+        threshold: float = 0.9,
+        max_entries: int = 10000,
+        max_namespaces: int = 64,
+        ttl_seconds: float = 3600.0,
+        initial_capacity: int = 1024,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.embedder = embedder or HashedNgramEmbedder()
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_namespaces = max_namespaces
+        self.ttl_seconds = ttl_seconds
+        self.initial_capacity = initial_capacity
+        self._clock = clock
+        self._namespaces: "OrderedDict[str, _Namespace]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, namespace: str, prompt: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Find the cached value for the closest prompt in a namespace.
+        
+        Args:
+            namespace: Namespace from `namespace_key`
+            prompt: User prompt
+        
+        Returns:
+            The cached value and its similarity, or None on a miss
+        """
+        return self.get_many(namespace, [prompt])[0]
+    
+    def get_many(self, namespace: str, prompts: Sequence[str]) -> List[Optional[Tuple[Dict[str, Any], float]]]:
+        """
+        Look up several prompts with one matrix product.
+        
+        Args:
+            namespace: Namespace from `namespace_key`
+            prompts: User prompts
+        
+        Returns:
+            One `(value, similarity)` or None per prompt, in order
+        """
+        queries = self.embedder.embed_many(prompts)
+        with self._lock:
+            entries = self._namespaces.get(namespace)
+            if entries is None or entries.size == 0:
+                self.misses += len(prompts)
+                return [None] * len(prompts)
+            self._namespaces.move_to_end(namespace)
+            
+            size = entries.size
+            similarities = entries.vectors[:size] @ queries.T
+            now = self._clock()
+            similarities[entries.expires_at[:size] < now] = -1.0
+            
+            results: List[Optional[Tuple[Dict[str, Any], float]]] = []
+            for column, prompt in enumerate(prompts):
+                match = self._best_match(entries, similarities[:, column], guard_terms(prompt))
+                if match is None:
+                    self.misses += 1
+                    results.append(None)
+                    continue
+                index, similarity = match
+                entries.last_used[index] = now
+                self.hits += 1
+                results.append((entries.values[index], similarity))
+            return results
+    
+    def _best_match(
+        self,
+        entries: _Namespace,
+        similarities: np.ndarray,
+        guard: Tuple[str, ...]
+    ) -> Optional[Tuple[int, float]]:
+        """The most similar entry above the threshold whose guard terms match, if any."""
+        candidates = np.flatnonzero(similarities >= self.threshold)
+        for index in candidates[np.argsort(similarities[candidates])[::-1]]:
+            if entries.guards[index] == guard:
+                return int(index), float(similarities[index])
+        return None
+    
+    def set(self, namespace: str, prompt: str, value: Dict[str, Any]) -> None:
+        """Cache a value for a prompt in a namespace."""
+        self.set_many(namespace, [prompt], [value])
+    
+    def set_many(self, namespace: str, prompts: Sequence[str], values: Sequence[Dict[str, Any]]) -> None:
+        """Cache values for several prompts in a namespace."""
+        vectors = self.embedder.embed_many(prompts)
+        with self._lock:
+            entries = self._namespace(namespace)
+            now = self._clock()
+            for prompt, vector, value in zip(prompts, vectors, values):
+                index = self._free_slot(entries, now)
+                entries.vectors[index] = vector
+                entries.values[index] = value
+                entries.guards[index] = guard_terms(prompt)
+                entries.expires_at[index] = now + self.ttl_seconds
+                entries.last_used[index] = now
+    
+    def _namespace(self, namespace: str) -> _Namespace:
+        """Get or create a namespace, evicting the least recently used one beyond the limit."""
+        entries = self._namespaces.get(namespace)
+        if entries is None:
+            capacity = min(self.initial_capacity, self.max_entries)
+            entries = self._namespaces[namespace] = _Namespace(self.embedder.dim, capacity)
+            while len(self._namespaces) > self.max_namespaces:
+                _, dropped = self._namespaces.popitem(last=False)
+                self.evictions += dropped.size
+        self._namespaces.move_to_end(namespace)
+        return entries
+    
+    def _free_slot(self, entries: _Namespace, now: float) -> int:
+        """Index for a new entry: the next free row, growing the arrays, or an evicted row."""
+        if entries.size == entries.capacity and entries.capacity < self.max_entries:
+            entries.grow(min(entries.capacity * 2, self.max_entries))
+        if entries.size < entries.capacity:
+            entries.size += 1
+            return entries.size - 1
+        
+        self.evictions += 1
+        age = np.where(entries.expires_at < now, -np.inf, entries.last_used)
+        return int(np.argmin(age))
+    
+    def clear(self) -> None:
+        """Remove every namespace."""
+        with self._lock:
+            self._namespaces.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(entries.size for entries in self._namespaces.values())
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get configuration, size and hit, miss and eviction counters."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "threshold": self.threshold,
+            "dimensions": self.embedder.dim,
+            "namespaces": len(self._namespaces),
+            "entries": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions
+        }
@@ -0,0 +1,243 @@
+"""
+Conversation session stores for TravelLangGraph API.
+Keep chat history server-side so clients only send the new turn.
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class SessionStore:
+    """Base class for conversation session stores."""
+    
+    name = "store"
+    
+    def create(self, system_prompt: Optional[str] = None, messages: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
+        """
+        Create a session.
+        
+        Args:
+            system_prompt: Optional system prompt sent ahead of every turn
+            messages: Optional initial history
+        
+        Returns:
+            Session dictionary
+        """
+        raise NotImplementedError
+    
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get a session with its full history, or None if it does not exist."""
+        raise NotImplementedError
+    
+    def append(self, session_id: str, messages: List[Dict[str, str]]) -> None:
+        """Append messages to a session's history."""
+        raise NotImplementedError
+    
+    def delete(self, session_id: str) -> bool:
+        """Delete a session; returns whether it existed."""
+        raise NotImplementedError
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        raise NotImplementedError
+    
+    @staticmethod
+    def _new_session(system_prompt: Optional[str], messages: Optional[List[Dict[str, str]]]) -> Dict[str, Any]:
+        return {
+            "session_id": uuid.uuid4().hex,
+            "system_prompt": system_prompt,
+            "messages": [{"role": m["role"], "content": m["content"]} for m in messages or []],
+            "created_at": datetime.utcnow().isoformat()
+        }
+
+class InMemorySessionStore(SessionStore):
+    """In-process session store with LRU eviction and an idle TTL."""
+    
+    name = "memory"
+    
+    def __init__(self, max_sessions: int = 10000, ttl_seconds: float = 86400.0):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self.evictions = 0
+    
+    def create(self, system_prompt: Optional[str] = None, messages: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
+        session = self._new_session(system_prompt, messages)
+        self._sessions[session["session_id"]] = (time.monotonic(), session)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+        return session
+    
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        
+        touched_at, session = entry
+        if time.monotonic() - touched_at > self.ttl_seconds:
+            del self._sessions[session_id]
+            self.evictions += 1
+            return None
+        
+        self._sessions[session_id] = (time.monotonic(), session)
+        self._sessions.move_to_end(session_id)
+        return session
+    
+    def append(self, session_id: str, messages: List[Dict[str, str]]) -> None:
+        session = self.get(session_id)
+        if session is None:
+            raise KeyError(session_id)
+        session["messages"].extend({"role": m["role"], "content": m["content"]} for m in messages)
+    
+    def delete(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "evictions": self.evictions
+        }
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite-backed session store that survives restarts.
+    
+    Like the in-memory store, it drops sessions idle past the TTL and the
+    least recently used beyond `max_sessions`. Besides expiring on read,
+    expired and excess rows are swept on every `sweep_every` creates, so
+    several workers sharing the file can briefly hold a few more sessions
+    than the bound between sweeps.
+    """
+    
+    name = "sqlite"
+    
+    def __init__(self, path: str, max_sessions: int = 10000, ttl_seconds: float = 86400.0, sweep_every: Optional[int] = None):
+        self.path = path
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.sweep_every = sweep_every or max(1, max_sessions // 100)
+        self._creates_since_sweep = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions "
+            "(session_id TEXT PRIMARY KEY, system_prompt TEXT, created_at TEXT NOT NULL, touched_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS session_messages "
+            "(session_id TEXT NOT NULL REFERENCES sessions(session_id) ON DELETE CASCADE, "
+            "seq INTEGER NOT NULL, role TEXT NOT NULL, content TEXT NOT NULL, "
+            "PRIMARY KEY (session_id, seq))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS sessions_touched_at ON sessions (touched_at)")
+        self.evictions = 0
+    
+    def create(self, system_prompt: Optional[str] = None, messages: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
+        session = self._new_session(system_prompt, messages)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "INSERT INTO sessions (session_id, system_prompt, created_at, touched_at) VALUES (?, ?, ?, ?)",
+                (session["session_id"], system_prompt, session["created_at"], time.time())
+            )
+            self._insert_messages(session["session_id"], 0, session["messages"])
+            self._conn.execute("COMMIT")
+            self._creates_since_sweep += 1
+            if self._creates_since_sweep >= self.sweep_every:
+                self._sweep()
+        return session
+    
+    def _sweep(self) -> None:
+        """Delete expired sessions, then the least recently used beyond `max_sessions`; call with the lock held."""
+        self._creates_since_sweep = 0
+        expired = self._conn.execute(
+            "DELETE FROM sessions WHERE touched_at < ?", (time.time() - self.ttl_seconds,)
+        ).rowcount
+        excess = self._conn.execute(
+            "DELETE FROM sessions WHERE rowid IN "
+            "(SELECT rowid FROM sessions ORDER BY touched_at DESC, rowid DESC LIMIT -1 OFFSET ?)",
+            (self.max_sessions,)
+        ).rowcount
+        self.evictions += expired + excess
+    
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT system_prompt, created_at, touched_at FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            if time.time() - row[2] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                self.evictions += 1
+                return None
+            
+            self._conn.execute("UPDATE sessions SET touched_at = ? WHERE session_id = ?", (time.time(), session_id))
+            messages = self._conn.execute(
+                "SELECT role, content FROM session_messages WHERE session_id = ? ORDER BY seq", (session_id,)
+            ).fetchall()
+        
+        return {
+            "session_id": session_id,
+            "system_prompt": row[0],
+            "messages": [{"role": role, "content": content} for role, content in messages],
+            "created_at": row[1]
+        }
+    
+    def append(self, session_id: str, messages: List[Dict[str, str]]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            row = self._conn.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0), "
+                "EXISTS (SELECT 1 FROM sessions WHERE session_id = ?) "
+                "FROM session_messages WHERE session_id = ?",
+                (session_id, session_id)
+            ).fetchone()
+            if not row[1]:
+                self._conn.execute("ROLLBACK")
+                raise KeyError(session_id)
+            self._insert_messages(session_id, row[0], messages)
+            self._conn.execute("UPDATE sessions SET touched_at = ? WHERE session_id = ?", (time.time(), session_id))
+            self._conn.execute("COMMIT")
+    
+    def _insert_messages(self, session_id: str, start_seq: int, messages: List[Dict[str, str]]) -> None:
+        self._conn.executemany(
+            "INSERT INTO session_messages (session_id, seq, role, content) VALUES (?, ?, ?, ?)",
+            [(session_id, start_seq + i, m["role"], m["content"]) for i, m in enumerate(messages)]
+        )
+    
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,)).rowcount > 0
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        return {"backend": self.name, "sessions": count, "max_sessions": self.max_sessions, "evictions": self.evictions}
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        self._conn.close()
+
+def build_session_store() -> SessionStore:
+    """Build the session store configured by environment settings."""
+    if settings.SESSION_STORE == "sqlite":
+        return SQLiteSessionStore(
+            settings.SESSION_SQLITE_PATH,
+            max_sessions=settings.SESSION_MAX_SESSIONS,
+            ttl_seconds=settings.SESSION_TTL_SECONDS
+        )
+    return InMemorySessionStore(max_sessions=settings.SESSION_MAX_SESSIONS, ttl_seconds=settings.SESSION_TTL_SECONDS)
@@ -0,0 +1,174 @@
+"""
+Travel planner for TravelLangGraph API.
+Plans a trip as a graph of research, flight, hotel and itinerary steps.
+"""
+
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional
+import logging
+from config import settings
+from services.chat_service import ChatService
+from services.completion_cache import LRUCache
+from services.plan_graph import GraphNode, PlanCheckpointStore, PlanGraph
+from services.prompt_templates import PromptTemplate
+
+logger = logging.getLogger(__name__)
+
+PLANNER_SYSTEM_PROMPT = (
+    "You are a travel planning assistant. Answer concisely with concrete, practical recommendations."
+)
+PLANNER_TEMPLATE = PromptTemplate("planner", system=PLANNER_SYSTEM_PROMPT)
+
+def trip_details(inputs: Dict[str, Any], upstream: Dict[str, Any]) -> Dict[str, Any]:
+    """Derive the trip's dates, nights and month from its start date and length."""
+    days = inputs["days"]
+    start = date.fromisoformat(inputs["start_date"]) if inputs.get("start_date") else None
+    return {
+        "days": days,
+        "nights": max(days - 1, 1),
+        "start_date": start.isoformat() if start else None,
+        "end_date": (start + timedelta(days=days - 1)).isoformat() if start else None,
+        "month": start.strftime("%B") if start else None
+    }
+
+def _when(trip: Dict[str, Any]) -> str:
+    if trip["start_date"]:
+        return f"from {trip['start_date']} to {trip['end_date']}"
+    return f"for {trip['days']} days"
+
+def research_prompt(inputs: Dict[str, Any], upstream: Dict[str, Any]) -> str:
+    trip = upstream["trip"]
+    interests = ", ".join(inputs["interests"]) or "general sightseeing"
+    season = f" in {trip['month']}" if trip["month"] else ""
+    return (
+        f"Give a short overview of {inputs['destination']} for a visitor{season} interested in {interests}: "
+        "neighbourhoods, weather, local customs and must-see sights."
+    )
+
+def flights_prompt(inputs: Dict[str, Any], upstream: Dict[str, Any]) -> str:
+    origin = inputs["origin"] or "the traveller's home city"
+    return (
+        f"Suggest how {inputs['travelers']} traveller(s) should fly from {origin} to {inputs['destination']} "
+        f"{_when(upstream['trip'])}: airports, typical routes and connections, and booking tips."
+    )
+
+def hotels_prompt(inputs: Dict[str, Any], upstream: Dict[str, Any]) -> str:
+    budget = inputs["budget"] or "mid-range"
+    return (
+        f"Recommend areas and three {budget} hotels in {inputs['destination']} for {inputs['travelers']} "
+        f"traveller(s) staying {upstream['trip']['nights']} nights."
+    )
+
+def itinerary_prompt(inputs: Dict[str, Any], upstream: Dict[str, Any]) -> str:
+    trip = upstream["trip"]
+    return (
+        f"Write a day-by-day itinerary for {trip['days']} days in {inputs['destination']} {_when(trip)}.\n\n"
+        f"Destination notes:\n{upstream['research']}\n\n"
+        f"Flights:\n{upstream['flights']}\n\n"
+        f"Hotels:\n{upstream['hotels']}"
+    )
+
+class TravelPlanner:
+    """
+    Plan a trip with a graph of steps instead of serial client calls.
+    
+    The `trip` step derives dates in Python. Research, flights and hotels
+    depend only on it, so they call the model concurrently. The itinerary
+    step then combines their answers. Each model step reads only the inputs
+    its prompt uses, so changing e.g. interests re-runs research and the
+    itinerary but reuses memoized flights and hotels.
+    """
+    
+    def __init__(
+        self,
+        chat_service: ChatService,
+        max_concurrency: int = 4,
+        memo: Optional[LRUCache] = None,
+        checkpoints: Optional[PlanCheckpointStore] = None
+    ):
+        self.chat_service = chat_service
+        # Every step shares this system prompt, so its prefix is cached upstream across steps and trips
+        chat_service.prompts.register(PLANNER_TEMPLATE)
+        self.graph = PlanGraph(self.build_nodes(), max_concurrency=max_concurrency, memo=memo, checkpoints=checkpoints)
+    
+    @classmethod
+    def from_settings(cls, chat_service: ChatService) -> "TravelPlanner":
+        """Build the planner with memo and checkpoint limits from settings."""
+        return cls(
+            chat_service,
+            max_concurrency=settings.PLAN_MAX_CONCURRENCY,
+            memo=LRUCache(max_entries=settings.PLAN_MEMO_MAX_ENTRIES, ttl_seconds=settings.PLAN_MEMO_TTL_SECONDS),
+            checkpoints=PlanCheckpointStore(
+                max_runs=settings.PLAN_CHECKPOINT_MAX_RUNS,
+                ttl_seconds=settings.PLAN_CHECKPOINT_TTL_SECONDS
+            )
+        )
+    
+    def build_nodes(self) -> List[GraphNode]:
+        """The planning steps and their dependencies."""
+        return [
+            GraphNode("trip", trip_details, input_keys=("start_date", "days")),
+            GraphNode(
+                "research", self._model_step(research_prompt, "default"),
+                depends_on=("trip",), input_keys=("destination", "interests")
+            ),
+            GraphNode(
+                "flights", self._model_step(flights_prompt, "default"),
+                depends_on=("trip",), input_keys=("origin", "destination", "travelers")
+            ),
+            GraphNode(
+                "hotels", self._model_step(hotels_prompt, "default"),
+                depends_on=("trip",), input_keys=("destination", "travelers", "budget")
+            ),
+            GraphNode(
+                "itinerary", self._model_step(itinerary_prompt, "itinerary"),
+                depends_on=("trip", "research", "flights", "hotels"), input_keys=("destination",)
+            )
+        ]
+    
+    def _model_step(self, prompt: Callable[[Dict[str, Any], Dict[str, Any]], str], route: str):
+        """A step that sends its prompt through the chat service on `route` and returns the reply."""
+        async def step(inputs: Dict[str, Any], upstream: Dict[str, Any]) -> str:
+            result = await self.chat_service.send_message(
+                prompt(inputs, upstream),
+                system_prompt=PLANNER_SYSTEM_PROMPT,
+                route=route
+            )
+            if result["status"] != "success":
+                raise RuntimeError(result.get("error") or "empty response")
+            return result["ai_response"]
+        return step
+    
+    async def plan(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Plan a trip.
+        
+        Args:
+            inputs: `destination`, `origin`, `start_date` (ISO date or None),
+                `days`, `travelers`, `budget` and `interests`
+        
+        Returns:
+            The run's checkpoint with every step's output
+        
+        Raises:
+            NodeFailedError: If a step fails; resume the run with `resume`
+        """
+        return await self.graph.run(inputs)
+    
+    async def resume(self, run_id: str) -> Dict[str, Any]:
+        """
+        Resume a failed run from its last completed steps.
+        
+        Raises:
+            KeyError: If the run does not exist
+            NodeFailedError: If a step fails again
+        """
+        return await self.graph.resume(run_id)
+    
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Get a run's checkpoint, or None if it does not exist."""
+        return self.graph.get_run(run_id)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Get graph shape, memo counters and checkpoint store size."""
+        return self.graph.stats()
@@ -30,6 +30,9 @@ setup(
         "uvicorn[standard]>=0.24.0",
         "pydantic>=2.0.0",
         "psutil>=5.9.0",
+        "httpx[http2]>=0.25.0",
+        "python-dotenv>=1.0.0",
+        "orjson>=3.9.0",
     ],
     extras_require={
         "dev": [
@@ -39,10 +42,14 @@ setup(
             "flake8>=6.0.0",
             "mypy>=1.0.0",
         ],
+        "semantic": [
+            "numpy>=1.24.0",
+        ],
     },
     entry_points={
         "console_scripts": [
             "travelanggraph-api=travelanggraph_api.main:main",
+            "travelanggraph-api-server=travelanggraph_api.server:main",
         ],
     },
 )
@@ -0,0 +1,120 @@
+"""
+Cold start profiling for TravelLangGraph API.
+Import-time and initialization-time breakdowns of application startup.
+
+Usage:
+    python -m startup_profile
+    python -m startup_profile --top 30
+"""
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+import argparse
+import asyncio
+import os
+import re
+import subprocess
+import sys
+import time
+
+_IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+\d+ \|\s*(\S+)")
+
+class StartupTimings:
+    """Durations of the named steps of application startup, in order."""
+    
+    def __init__(self):
+        self.steps: Dict[str, float] = {}
+        self._start = time.perf_counter()
+        self.total: Optional[float] = None
+    
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one startup step."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps[name] = time.perf_counter() - start
+    
+    def finish(self) -> None:
+        """Record the total startup time."""
+        self.total = time.perf_counter() - self._start
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Timings in milliseconds for health responses and logs."""
+        return {
+            "total_ms": round((self.total or 0.0) * 1000, 2),
+            "steps_ms": {name: round(seconds * 1000, 2) for name, seconds in self.steps.items()}
+        }
+
+def import_breakdown(module: str = "travelanggraph_api.main") -> Dict[str, float]:
+    """
+    Import `module` in a fresh interpreter and total import time per top-level package.
+    
+    Uses `python -X importtime`, so times are each module's own import time,
+    not including the modules it imports.
+    
+    Args:
+        module: Module to import
+    
+    Returns:
+        Seconds per top-level package, largest first
+    
+    Raises:
+        RuntimeError: If the import fails
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    
+    totals: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if match:
+            package = match.group(2).split(".")[0]
+            totals[package] = totals.get(package, 0.0) + int(match.group(1)) / 1e6
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+async def profile_startup() -> Dict[str, Any]:
+    """
+    Import the app and run its startup and shutdown in this process.
+    
+    Returns:
+        `import_seconds` for importing the app and `startup` timings
+    """
+    start = time.perf_counter()
+    import dependencies
+    from travelanggraph_api.main import app
+    import_seconds = time.perf_counter() - start
+    
+    await dependencies.startup(app)
+    timings = app.state.startup_timings
+    await dependencies.shutdown(app)
+    return {"import_seconds": import_seconds, "startup": timings}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15, help="Packages to list in the import breakdown")
+    args = parser.parse_args()
+    
+    breakdown = import_breakdown()
+    print("import time by package (fresh interpreter):")
+    for package, seconds in list(breakdown.items())[:args.top]:
+        print(f"  {package:<28} {seconds * 1000:8.2f} ms")
+    print(f"  {'total':<28} {sum(breakdown.values()) * 1000:8.2f} ms")
+    
+    profile = asyncio.run(profile_startup())
+    timings: StartupTimings = profile["startup"]
+    print(f"\napp import: {profile['import_seconds'] * 1000:.2f} ms")
+    print("startup steps:")
+    for name, seconds in timings.steps.items():
+        print(f"  {name:<28} {seconds * 1000:8.2f} ms")
+    print(f"  {'total':<28} {(timings.total or 0.0) * 1000:8.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Integration tests for provider failover and hedging against local DeepSeek stubs.
+"""
+
+import pytest
+from benchmarks.stub_server import StubServer, create_stub_app
+from clients.openai_compatible_client import OpenAICompatibleClient
+from clients.provider_pool import ProviderPool
+
+MESSAGES = [{"role": "user", "content": "Hi"}]
+
+def stub_provider(name: str, stub: StubServer) -> OpenAICompatibleClient:
+    """Build a provider for a stub backend without retries, so failover is exercised."""
+    provider = OpenAICompatibleClient(name=name, base_url=stub.base_url, api_key="test-key")
+    provider.retry_policy.max_attempts = 1
+    return provider
+
+@pytest.fixture
+def backends():
+    """Run a failing, a slow and a fast stub backend."""
+    with StubServer(create_stub_app(error_rate=1.0, error_status=503)) as failing, \
+            StubServer(create_stub_app(latency_ms=500)) as slow, \
+            StubServer(create_stub_app(latency_ms=5)) as fast:
+        yield {"failing": failing, "slow": slow, "fast": fast}
+
+@pytest.mark.asyncio
+async def test_failing_backend_fails_over(backends):
+    """Test that requests to a failing backend are answered by the next one."""
+    pool = ProviderPool([stub_provider("failing", backends["failing"]), stub_provider("fast", backends["fast"])])
+    
+    for _ in range(3):
+        response = await pool.chat_completion(MESSAGES)
+        assert response["choices"][0]["message"]["content"] == "Stub reply."
+    await pool.aclose()
+    
+    assert backends["failing"].app.state.request_count == 1
+    assert backends["fast"].app.state.request_count == 3
+
+@pytest.mark.asyncio
+async def test_slow_backend_is_hedged(backends):
+    """Test that a hedge to a fast backend beats a slow primary."""
+    pool = ProviderPool(
+        [stub_provider("slow", backends["slow"]), stub_provider("fast", backends["fast"])],
+        hedge=True,
+        hedge_initial_delay_seconds=0.05
+    )
+    
+    response = await pool.chat_completion(MESSAGES)
+    health = pool.health_check()
+    await pool.aclose()
+    
+    assert response["choices"][0]["message"]["content"] == "Stub reply."
+    assert health["hedging"] == {**health["hedging"], "sent": 1, "won": 1}
@@ -0,0 +1,97 @@
+"""
+Integration tests for rate limits shared between workers through the local Redis stand-in.
+"""
+
+import asyncio
+import time
+import pytest
+from benchmarks.redis_stub import RedisStub
+from clients.resp_client import RespClient
+from rate_limit import RateLimiter, RedisBucketStore
+
+KEYS = {"key-alpha": {"name": "alpha", "requests_per_second": 0.5, "burst": 3, "tokens_per_minute": 600}}
+
+@pytest.fixture
+def redis_stub():
+    with RedisStub() as stub:
+        yield stub
+
+def worker_limiter(url: str) -> RateLimiter:
+    """A limiter with its own connections, as one API worker would have."""
+    return RateLimiter(RedisBucketStore(RespClient(url)), keys=KEYS)
+
+@pytest.mark.asyncio
+async def test_workers_share_one_burst(redis_stub):
+    """Test that concurrent requests through two workers are admitted no more than the burst allows."""
+    workers = [worker_limiter(redis_stub.url), worker_limiter(redis_stub.url)]
+    quota = workers[0].identify("key-alpha")
+    
+    admissions = await asyncio.gather(*(workers[i % 2].admit(quota) for i in range(8)))
+    
+    assert sum(admission.allowed for admission in admissions) == 3
+    rejected = [admission for admission in admissions if not admission.allowed]
+    assert all(admission.limit == "requests" and admission.retry_after > 1 for admission in rejected)
+    for worker in workers:
+        await worker.aclose()
+
+@pytest.mark.asyncio
+async def test_tokens_charged_by_one_worker_limit_the_other(redis_stub):
+    """Test that token usage charged on one worker is enforced on another."""
+    first, second = worker_limiter(redis_stub.url), worker_limiter(redis_stub.url)
+    quota = first.identify("key-alpha")
+    
+    await first.charge(quota, {"total_tokens": 700})
+    admission = await second.admit(quota)
+    
+    assert admission.limit == "tokens"
+    assert admission.tokens_remaining == pytest.approx(-100, abs=1)
+    # Scripts were loaded on demand after NOSCRIPT and then run by SHA
+    assert len(redis_stub.state.loaded) == 2
+    await first.aclose()
+    await second.aclose()
+
+@pytest.mark.asyncio
+async def test_unreachable_store_fails_open():
+    """Test that requests are admitted when the shared store cannot be reached."""
+    with RedisStub() as stub:
+        url = stub.url
+    limiter = RateLimiter(RedisBucketStore(RespClient(url, timeout_seconds=0.2)), keys=KEYS)
+    
+    admission = await limiter.admit(limiter.identify("key-alpha"))
+    
+    assert admission.allowed
+
+@pytest.mark.asyncio
+async def test_unresponsive_store_is_skipped_after_a_failure():
+    """Test that after one timeout the limiter stops waiting on a store that accepts connections but never replies."""
+    server = await asyncio.start_server(lambda reader, writer: None, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    client = RespClient(f"redis://127.0.0.1:{port}/0", timeout_seconds=0.2, failure_backoff_seconds=30)
+    limiter = RateLimiter(RedisBucketStore(client), keys=KEYS)
+    quota = limiter.identify("key-alpha")
+    
+    assert (await limiter.admit(quota)).allowed
+    start = time.perf_counter()
+    admissions = [await limiter.admit(quota) for _ in range(5)]
+    
+    assert all(admission.allowed for admission in admissions)
+    assert time.perf_counter() - start < 0.1
+    server.close()
+
+@pytest.mark.asyncio
+async def test_connections_are_capped(redis_stub):
+    """Test that concurrent commands share at most `max_connections` connections."""
+    client = RespClient(redis_stub.url, max_connections=2)
+    connect = client._connect
+    connects = []
+    
+    async def counting_connect():
+        connects.append(1)
+        return await connect()
+    
+    client._connect = counting_connect
+    replies = await asyncio.gather(*(client.execute("PING") for _ in range(20)))
+    
+    assert replies == ["PONG"] * 20
+    assert len(connects) == 2
+    await client.aclose()
@@ -0,0 +1,41 @@
+"""
+Integration tests for upstream fault handling against the local DeepSeek stub.
+"""
+
+import pytest
+import httpx
+from benchmarks.stub_server import StubServer, create_stub_app
+from clients.deepseek_client import DeepSeekClient
+
+@pytest.fixture
+def fault_stub(monkeypatch):
+    """Run a stub upstream that fails its first two requests with 503."""
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test-key")
+    with StubServer(create_stub_app(fail_first=2, error_status=503, retry_after=0)) as stub:
+        monkeypatch.setenv("DEEPSEEK_API_BASE_URL", stub.base_url)
+        yield stub
+
+@pytest.mark.asyncio
+async def test_retries_recover_from_injected_faults(fault_stub):
+    """Test that transient stub faults are retried until a success."""
+    client = DeepSeekClient()
+    
+    response = await client.chat_completion([{"role": "user", "content": "Hi"}])
+    await client.aclose()
+    
+    assert response["choices"][0]["message"]["content"] == "Stub reply."
+    assert fault_stub.app.state.request_count == 3
+    assert client.retry_policy.stats()["retries"] == 2
+
+@pytest.mark.asyncio
+async def test_exhausted_attempts_surface_the_upstream_error(fault_stub):
+    """Test that the last upstream error is raised once attempts run out."""
+    client = DeepSeekClient()
+    client.retry_policy.max_attempts = 2
+    
+    with pytest.raises(httpx.HTTPStatusError) as exc_info:
+        await client.chat_completion([{"role": "user", "content": "Hi"}])
+    await client.aclose()
+    
+    assert exc_info.value.response.status_code == 503
+    assert client.retry_policy.stats()["gave_up"] == 1
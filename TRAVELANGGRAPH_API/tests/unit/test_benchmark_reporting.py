@@ -0,0 +1,25 @@
+"""
+Unit tests for benchmark reporting.
+"""
+
+from benchmarks.reporting import compare_results, percentile, summarize_latencies
+
+def test_percentiles_use_nearest_rank():
+    """Test that percentiles pick the nearest-rank sample."""
+    latencies = [i / 1000 for i in range(1, 101)]
+    
+    assert percentile(latencies, 50) == 0.05
+    assert percentile(latencies, 99) == 0.099
+    assert summarize_latencies(latencies)["p95_ms"] == 95.0
+    assert summarize_latencies([])["p99_ms"] == 0.0
+
+def test_comparison_flags_regressions_beyond_tolerance():
+    """Test that lower throughput or higher latency beyond tolerance is marked."""
+    baseline = {"scenarios": {"simple": {"throughput_rps": 100.0, "p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 30.0}}}
+    current = {"scenarios": {"simple": {"throughput_rps": 80.0, "p50_ms": 10.5, "p95_ms": 20.0, "p99_ms": 40.0}}}
+    
+    lines = {line.split(":")[0].split()[-1]: line for line in compare_results(baseline, current, tolerance=0.1)}
+    
+    assert "REGRESSION" in lines["throughput_rps"]
+    assert "REGRESSION" not in lines["p50_ms"]
+    assert "REGRESSION" in lines["p99_ms"]
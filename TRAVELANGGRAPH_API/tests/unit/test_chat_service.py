@@ -0,0 +1,142 @@
+"""
+Unit tests for chat service.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from services.chat_service import ChatService
+from services.completion_cache import CompletionCache, LRUCache
+from services.context_window import ContextWindowManager, estimate_message_tokens
+
+def make_service(deepseek_client) -> ChatService:
+    """Create a chat service around a stubbed DeepSeek client."""
+    return ChatService(deepseek_client=deepseek_client)
+
+@pytest.mark.asyncio
+async def test_stream_message_yields_tokens_then_done():
+    """Test that streamed content deltas become token events with timing."""
+    async def stream_chat_completion(**kwargs):
+        yield {"choices": [{"delta": {"content": "Lis"}}]}
+        yield {"choices": [{"delta": {"content": "bon"}}], "usage": {"total_tokens": 9}}
+    
+    deepseek_client = MagicMock()
+    deepseek_client.stream_chat_completion = stream_chat_completion
+    
+    events = [event async for event in make_service(deepseek_client).stream_message("Where?")]
+    
+    assert [e["content"] for e in events if e["event"] == "token"] == ["Lis", "bon"]
+    assert events[-1]["event"] == "done"
+    assert events[-1]["time_to_first_token_seconds"] is not None
+    assert events[-1]["usage"] == {"total_tokens": 9}
+
+@pytest.mark.asyncio
+async def test_stream_message_reports_upstream_error():
+    """Test that upstream failures end the stream with an error event."""
+    async def stream_chat_completion(**kwargs):
+        raise RuntimeError("upstream down")
+        yield
+    
+    deepseek_client = MagicMock()
+    deepseek_client.stream_chat_completion = stream_chat_completion
+    
+    events = [event async for event in make_service(deepseek_client).stream_message("Where?")]
+    
+    assert events == [{"event": "error", "error": "upstream down", "timestamp": events[0]["timestamp"]}]
+
+@pytest.mark.asyncio
+async def test_stream_with_context_fits_the_context_window():
+    """Test that streamed conversations are trimmed to the prompt budget like unstreamed ones."""
+    sent = []
+    
+    async def stream_chat_completion(**kwargs):
+        sent.append(kwargs["messages"])
+        yield {"choices": [{"delta": {"content": "Lisbon"}}]}
+    
+    deepseek_client = MagicMock()
+    deepseek_client.stream_chat_completion = stream_chat_completion
+    chat_service = ChatService(
+        deepseek_client=deepseek_client,
+        context_window=ContextWindowManager(max_prompt_tokens=300, keep_recent_messages=2)
+    )
+    messages = [{"role": "system", "content": "You plan trips."}] + [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": f"Turn {i} about Lisbon trams and viewpoints. " * 5}
+        for i in range(20)
+    ]
+    
+    events = [event async for event in chat_service.stream_with_context(messages)]
+    
+    assert events[-1]["event"] == "done"
+    assert sent[0][-2:] == messages[-2:]
+    assert len(sent[0]) < len(messages)
+    assert estimate_message_tokens(sent[0]) <= 300
+
+@pytest.mark.asyncio
+async def test_chat_with_context_caches_deterministic_requests():
+    """Test that a repeated temperature 0 request is served from cache."""
+    deepseek_client = MagicMock()
+    deepseek_client.chat_completion = AsyncMock(return_value={
+        "choices": [{"message": {"content": "Spring or autumn."}}],
+        "usage": {"total_tokens": 12}
+    })
+    chat_service = ChatService(deepseek_client=deepseek_client, cache=CompletionCache(tiers=[LRUCache()]))
+    messages = [{"role": "user", "content": "Best time to visit Lisbon?"}]
+    
+    first = await chat_service.chat_with_context(messages, temperature=0)
+    second = await chat_service.chat_with_context(messages, temperature=0)
+    
+    assert deepseek_client.chat_completion.await_count == 1
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["ai_response"] == "Spring or autumn."
+    assert chat_service.get_service_status()["cache"]["tiers"][0]["hits"] == 1
+
+@pytest.mark.asyncio
+async def test_send_batch_returns_ordered_results_with_isolated_errors():
+    """Test that batch results keep request order and failures stay per item."""
+    in_flight = 0
+    peak_in_flight = 0
+    
+    async def chat_completion(messages, **kwargs):
+        nonlocal in_flight, peak_in_flight
+        in_flight += 1
+        peak_in_flight = max(peak_in_flight, in_flight)
+        content = messages[-1]["content"]
+        # Later items finish first to exercise ordering
+        await asyncio.sleep(0.01 * (5 - int(content[-1])))
+        in_flight -= 1
+        if content == "city 3":
+            raise RuntimeError("upstream down")
+        return {"choices": [{"message": {"content": f"About {content}"}}]}
+    
+    deepseek_client = MagicMock()
+    deepseek_client.chat_completion = chat_completion
+    chat_service = make_service(deepseek_client)
+    requests = [{"messages": [{"role": "user", "content": f"city {i}"}]} for i in range(5)]
+    
+    results = await chat_service.send_batch(requests, max_concurrency=2)
+    
+    assert [r["index"] for r in results] == [0, 1, 2, 3, 4]
+    assert results[0]["ai_response"] == "About city 0"
+    assert results[3]["status"] == "error"
+    assert all(r["status"] == "success" for i, r in enumerate(results) if i != 3)
+    assert peak_in_flight == 2
+
+@pytest.mark.asyncio
+async def test_send_message_honors_request_parameters():
+    """Test that model, temperature and max tokens reach the upstream call."""
+    deepseek_client = MagicMock()
+    deepseek_client.chat_completion = AsyncMock(return_value={
+        "choices": [{"message": {"content": "Soles."}}],
+        "usage": {"prompt_tokens": 8, "completion_tokens": 2}
+    })
+    chat_service = make_service(deepseek_client)
+    
+    result = await chat_service.send_message(
+        "What currency does Peru use?", model="deepseek-reasoner", temperature=1.2, max_tokens=50
+    )
+    
+    kwargs = deepseek_client.chat_completion.await_args.kwargs
+    assert (kwargs["model"], kwargs["temperature"], kwargs["max_tokens"]) == ("deepseek-reasoner", 1.2, 50)
+    assert result["route"] == "short_factual"
+    assert chat_service.model_router.stats()["by_model"]["deepseek-reasoner"]["completion_tokens"] == 2
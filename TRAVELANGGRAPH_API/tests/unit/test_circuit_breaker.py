@@ -0,0 +1,87 @@
+"""
+Unit tests for circuit breaker.
+"""
+
+import time
+import pytest
+import httpx
+from clients.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from clients.deepseek_client import DeepSeekClient
+
+def trip(breaker: CircuitBreaker) -> None:
+    """Record enough failures to open the breaker."""
+    for _ in range(breaker.min_requests):
+        breaker.before_call()
+        breaker.record(failed=True)
+
+def test_breaker_opens_on_error_rate():
+    """Test that the breaker opens once the failure rate crosses the threshold."""
+    breaker = CircuitBreaker(min_requests=4, error_rate_threshold=0.5)
+    breaker.record(failed=False)
+    breaker.record(failed=False)
+    breaker.record(failed=True)
+    assert breaker.state == CLOSED
+    
+    breaker.record(failed=True)
+    assert breaker.state == OPEN
+
+def test_open_breaker_fails_fast():
+    """Test that calls are rejected in well under a millisecond while open."""
+    breaker = CircuitBreaker(min_requests=2, open_seconds=60)
+    trip(breaker)
+    
+    start = time.perf_counter()
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call()
+    
+    assert time.perf_counter() - start < 0.001
+    assert int(exc_info.value.retry_after_header) >= 59
+    assert breaker.stats()["rejected"] == 1
+
+def test_half_open_probe_closes_or_reopens():
+    """Test that a half-open probe decides the next state."""
+    breaker = CircuitBreaker(min_requests=2, open_seconds=0)
+    trip(breaker)
+    assert breaker.state == HALF_OPEN
+    
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+    breaker.record(failed=True)
+    assert breaker._state == OPEN
+    
+    assert breaker.state == HALF_OPEN
+    breaker.before_call()
+    breaker.record(failed=False)
+    assert breaker.state == CLOSED
+
+def test_slow_calls_open_breaker():
+    """Test that a window of slow successes opens the breaker."""
+    breaker = CircuitBreaker(min_requests=3, slow_call_seconds=1.0, slow_rate_threshold=0.6)
+    for _ in range(3):
+        breaker.record(failed=False, latency=2.0)
+    
+    assert breaker.state == OPEN
+
+@pytest.mark.asyncio
+async def test_client_reports_open_breaker_and_skips_upstream(monkeypatch):
+    """Test that an open breaker short-circuits the client and shows in health."""
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test-key")
+    calls = 0
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Hi"}}]})
+    
+    client = DeepSeekClient(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    trip(client.breaker)
+    
+    with pytest.raises(CircuitOpenError):
+        await client.chat_completion([{"role": "user", "content": "Hi"}])
+    
+    health = client.health_check()
+    assert calls == 0
+    assert health["status"] == "unhealthy"
+    assert health["circuit_breaker"]["state"] == OPEN
+    await client.http_client.aclose()
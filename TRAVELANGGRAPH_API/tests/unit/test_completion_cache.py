@@ -0,0 +1,107 @@
+"""
+Unit tests for completion cache.
+"""
+
+import threading
+import time
+import pytest
+from services.completion_cache import CompletionCache, LRUCache, SQLiteCache, make_cache_key
+
+MESSAGES = [
+    {"role": "system", "content": "You are a travel assistant."},
+    {"role": "user", "content": "Best time to visit Lisbon?"}
+]
+
+def test_cache_key_is_canonical():
+    """Test that equivalent requests share a key and different ones do not."""
+    reordered = [{"content": m["content"], "role": m["role"]} for m in MESSAGES]
+    
+    assert make_cache_key("deepseek-chat", MESSAGES, 0, 1000) == make_cache_key("deepseek-chat", reordered, 0.0, 1000)
+    assert make_cache_key("deepseek-chat", MESSAGES, 0, 1000) != make_cache_key("deepseek-chat", MESSAGES, 0, 500)
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test that the LRU tier respects its size bound."""
+    cache = LRUCache(max_entries=2)
+    cache.set("a", {"ai_response": "A"})
+    cache.set("b", {"ai_response": "B"})
+    cache.get("a")
+    cache.set("c", {"ai_response": "C"})
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == {"ai_response": "A"}
+    assert cache.stats()["evictions"] == 1
+
+def test_lru_cache_expires_entries():
+    """Test that entries past their TTL are treated as misses."""
+    cache = LRUCache(ttl_seconds=0.01)
+    cache.set("a", {"ai_response": "A"})
+    time.sleep(0.02)
+    
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+    assert len(cache) == 0
+
+def test_sqlite_cache_survives_restart(tmp_path):
+    """Test that the SQLite tier keeps entries across instances."""
+    path = str(tmp_path / "cache.db")
+    first = SQLiteCache(path)
+    first.set("a", {"ai_response": "A"})
+    first.close()
+    
+    assert SQLiteCache(path).get("a") == {"ai_response": "A"}
+
+def test_sqlite_cache_evicts_least_recently_used_and_sweeps_expired(tmp_path):
+    """Test that the SQLite tier respects its size bound and removes expired entries without reading them."""
+    cache = SQLiteCache(str(tmp_path / "cache.db"), max_entries=2)
+    cache.set("a", {"ai_response": "A"})
+    cache.set("b", {"ai_response": "B"})
+    cache.get("a")
+    cache.set("c", {"ai_response": "C"})
+    
+    assert cache.get("b") is None
+    assert cache.get("a") == {"ai_response": "A"}
+    assert cache.stats()["evictions"] == 1
+    
+    # An entry inserted already expired is swept by its own insert
+    cache.ttl_seconds = -1
+    cache.set("d", {"ai_response": "D"})
+    assert len(cache) == 2
+    assert cache.stats()["evictions"] == 2
+
+def test_completion_cache_only_caches_deterministic_requests():
+    """Test that non-zero temperatures bypass the cache by default."""
+    cache = CompletionCache(tiers=[LRUCache()])
+    
+    assert cache.should_cache(0.0)
+    assert not cache.should_cache(0.7)
+    assert CompletionCache(tiers=[LRUCache()], cache_all_temperatures=True).should_cache(0.7)
+
+def test_completion_cache_backfills_faster_tier(tmp_path):
+    """Test that a hit in the disk tier populates the memory tier."""
+    memory, disk = LRUCache(), SQLiteCache(str(tmp_path / "cache.db"))
+    disk.set("a", {"ai_response": "A"})
+    cache = CompletionCache(tiers=[memory, disk])
+    
+    assert cache.get("a") == {"ai_response": "A"}
+    assert memory.get("a") == {"ai_response": "A"}
+
+@pytest.mark.asyncio
+async def test_completion_cache_calls_blocking_tiers_off_the_event_loop(tmp_path):
+    """Test that async lookups and inserts run the SQLite tier in a worker thread and the memory tier inline."""
+    calling_threads = []
+    
+    class RecordingSQLiteCache(SQLiteCache):
+        def get(self, key):
+            calling_threads.append(threading.get_ident())
+            return super().get(key)
+    
+    memory, disk = LRUCache(), RecordingSQLiteCache(str(tmp_path / "cache.db"))
+    cache = CompletionCache(tiers=[memory, disk])
+    
+    assert await cache.aget("a") is None
+    await cache.aset("a", {"ai_response": "A"})
+    memory.clear()
+    
+    assert await cache.aget("a") == {"ai_response": "A"}
+    assert memory.get("a") == {"ai_response": "A"}
+    assert calling_threads and threading.get_ident() not in calling_threads
@@ -0,0 +1,69 @@
+"""
+Unit tests for adaptive concurrency limiter.
+"""
+
+import asyncio
+import pytest
+import httpx
+from clients.concurrency_limiter import AdaptiveConcurrencyLimiter, UpstreamOverloadedError
+
+@pytest.mark.asyncio
+async def test_requests_beyond_limit_wait_in_queue():
+    """Test that a request over the limit waits until a slot frees up."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_queue=1)
+    await limiter.acquire()
+    
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.queue_depth == 1
+    
+    limiter.release()
+    await waiter
+    assert limiter.in_flight == 1
+    assert limiter.queue_depth == 0
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_immediately():
+    """Test that requests are shed with a retry hint when the queue is full."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_queue=1)
+    await limiter.acquire()
+    queued = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    
+    with pytest.raises(UpstreamOverloadedError) as exc_info:
+        await limiter.acquire()
+    
+    assert int(exc_info.value.retry_after_header) >= 1
+    assert limiter.stats()["rejected"] == 1
+    queued.cancel()
+
+@pytest.mark.asyncio
+async def test_queue_deadline_expires():
+    """Test that a queued request gives up at its deadline."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=1)
+    await limiter.acquire()
+    
+    with pytest.raises(UpstreamOverloadedError):
+        await limiter.acquire(timeout=0.01)
+    
+    assert limiter.queue_depth == 0
+    assert limiter.stats()["timed_out"] == 1
+
+@pytest.mark.asyncio
+async def test_limit_grows_on_fast_success_and_shrinks_on_overload():
+    """Test additive increase and multiplicative decrease of the limit."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=10, latency_target_seconds=1.0)
+    
+    for _ in range(20):
+        async with limiter.slot():
+            pass
+    assert limiter.limit == 11
+    
+    request = httpx.Request("POST", "http://deepseek.test/chat/completions")
+    overload = httpx.HTTPStatusError("429", request=request, response=httpx.Response(429, request=request))
+    with pytest.raises(httpx.HTTPStatusError):
+        async with limiter.slot():
+            raise overload
+    
+    assert limiter.limit == 10
+    assert limiter.in_flight == 0
@@ -0,0 +1,70 @@
+"""
+Unit tests for context window management.
+"""
+
+import pytest
+from services.context_window import ContextWindowManager, estimate_message_tokens, estimate_tokens
+
+def conversation(turns: int) -> list:
+    """Build a long conversation with a system prompt."""
+    messages = [{"role": "system", "content": "You are a travel assistant."}]
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"Question {i} about Lisbon " + "details " * 40})
+        messages.append({"role": "assistant", "content": f"Answer {i} about Lisbon " + "advice " * 40})
+    return messages
+
+def test_estimate_tokens_tracks_text_length():
+    """Test that the estimate grows with words and long words."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Hi!") == 2
+    assert estimate_tokens("internationalization") == 5
+
+@pytest.mark.asyncio
+async def test_short_history_is_untouched():
+    """Test that history within the budget is sent as is."""
+    manager = ContextWindowManager(max_prompt_tokens=10000)
+    messages = conversation(2)
+    
+    fitted, stats = await manager.fit(messages)
+    
+    assert fitted == messages
+    assert stats["dropped_messages"] == 0
+
+@pytest.mark.asyncio
+async def test_long_history_keeps_system_prompt_and_recent_turns():
+    """Test that sliding-window truncation fits the budget."""
+    manager = ContextWindowManager(max_prompt_tokens=300, keep_recent_messages=2)
+    messages = conversation(20)
+    
+    fitted, stats = await manager.fit(messages)
+    
+    assert fitted[0] == messages[0]
+    assert fitted[-2:] == messages[-2:]
+    assert estimate_message_tokens(fitted) <= 300
+    assert stats["dropped_messages"] > 0
+    assert manager.stats()["tokens_saved"] == stats["original_tokens"] - stats["prompt_tokens"]
+
+@pytest.mark.asyncio
+async def test_rolling_summary_is_cached_per_conversation():
+    """Test that dropped turns are summarized once and reused until stale."""
+    calls = []
+    
+    async def summarizer(messages, previous_summary):
+        calls.append((len(messages), previous_summary))
+        return f"summary {len(calls)}"
+    
+    manager = ContextWindowManager(
+        max_prompt_tokens=300, keep_recent_messages=2, summarizer=summarizer, summary_refresh_messages=4
+    )
+    messages = conversation(20)
+    
+    fitted, stats = await manager.fit(messages, conversation_key="session-1")
+    await manager.fit(messages + [{"role": "user", "content": "One more?"}], conversation_key="session-1")
+    
+    assert stats["summarized"]
+    assert fitted[1]["content"].endswith("summary 1")
+    assert len(calls) == 1
+    
+    await manager.fit(conversation(24), conversation_key="session-1")
+    assert len(calls) == 2
+    assert calls[1][1] == "summary 1"
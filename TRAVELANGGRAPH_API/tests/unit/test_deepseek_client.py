@@ -0,0 +1,77 @@
+"""
+Unit tests for DeepSeek client.
+"""
+
+import json
+import pytest
+import httpx
+from clients.deepseek_client import DeepSeekClient
+
+def completion_response(request: httpx.Request) -> httpx.Response:
+    """Return a minimal DeepSeek chat completion."""
+    return httpx.Response(200, json={
+        "choices": [{"message": {"role": "assistant", "content": "Hi!"}}],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7}
+    })
+
+@pytest.fixture
+def api_key(monkeypatch):
+    """Provide a DeepSeek API key for client construction."""
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test-key")
+    monkeypatch.setenv("DEEPSEEK_API_BASE_URL", "http://deepseek.test")
+
+@pytest.mark.asyncio
+async def test_chat_completion_reuses_pooled_client(api_key):
+    """Test that consecutive requests share one HTTP client."""
+    client = DeepSeekClient()
+    client._http_client = httpx.AsyncClient(transport=httpx.MockTransport(completion_response))
+    pooled = client.http_client
+    
+    await client.chat_completion([{"role": "user", "content": "Hello"}])
+    await client.chat_completion([{"role": "user", "content": "Hello again"}])
+    
+    assert client.http_client is pooled
+    await client.aclose()
+    assert pooled.is_closed
+
+@pytest.mark.asyncio
+async def test_injected_http_client_is_not_closed(api_key):
+    """Test that a caller-provided HTTP client stays open after aclose."""
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(completion_response))
+    client = DeepSeekClient(http_client=http_client)
+    
+    reply = await client.simple_chat("Hello")
+    await client.aclose()
+    
+    assert reply == "Hi!"
+    assert not http_client.is_closed
+    await http_client.aclose()
+
+def test_health_check_reports_connection_pool(api_key):
+    """Test that health check includes connection pool details."""
+    health = DeepSeekClient().health_check()
+    
+    assert health["status"] == "healthy"
+    assert "connection_pool" in health
+    assert health["connection_pool"]["open"] is False
+
+def streamed_response(request: httpx.Request) -> httpx.Response:
+    """Return a DeepSeek SSE stream with two content deltas."""
+    chunks = [
+        {"choices": [{"delta": {"role": "assistant", "content": ""}}]},
+        {"choices": [{"delta": {"content": "Hel"}}]},
+        {"choices": [{"delta": {"content": "lo"}}], "usage": {"total_tokens": 7}},
+    ]
+    body = "".join(f"data: {json.dumps(chunk)}\n\n" for chunk in chunks) + "data: [DONE]\n\n"
+    return httpx.Response(200, content=body.encode(), headers={"content-type": "text/event-stream"})
+
+@pytest.mark.asyncio
+async def test_stream_chat_completion_parses_sse_chunks(api_key):
+    """Test that streamed SSE lines are parsed into chunks until [DONE]."""
+    client = DeepSeekClient(http_client=httpx.AsyncClient(transport=httpx.MockTransport(streamed_response)))
+    
+    chunks = [chunk async for chunk in client.stream_chat_completion([{"role": "user", "content": "Hi"}])]
+    
+    assert len(chunks) == 3
+    assert chunks[1]["choices"][0]["delta"]["content"] == "Hel"
+    await client.http_client.aclose()
@@ -55,3 +55,39 @@ def test_health_endpoints_return_json(client: TestClient):
     
     assert health_response.headers["content-type"] == "application/json"
     assert ping_response.headers["content-type"] == "application/json"
+
+def test_system_health_endpoint_returns_snapshot(client: TestClient):
+    """Test that system health endpoint returns sampled stats."""
+    response = client.get("/health/system")
+    
+    assert response.status_code == 200
+    
+    data = response.json()
+    assert data["status"] in ("healthy", "degraded")
+    assert "cpu_percent" in data["system"]
+    assert "memory_percent" in data["system"]
+    assert data["process"]["pid"] > 0
+    assert data["sampled_at"] is not None
+
+def test_readiness_flips_after_startup(app_instance, monkeypatch):
+    """Test that the readiness probe answers 503 until the lifespan startup has finished."""
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test-key")
+    app_instance.state.ready = False
+    assert TestClient(app_instance).get("/health/ready").status_code == 503
+    
+    with TestClient(app_instance) as client:
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+        assert "background_tasks" in response.json()["startup"]["steps_ms"]
+    
+    assert app_instance.state.ready is False
+
+def test_not_ready_without_chat_service(app_instance, monkeypatch):
+    """Test that startup without an API key leaves the readiness probe at 503."""
+    monkeypatch.delenv("DEEPSEEK_API_KEY", raising=False)
+    
+    with TestClient(app_instance) as client:
+        response = client.get("/health/ready")
+        assert response.status_code == 503
+        assert response.json()["chat_service"] is False
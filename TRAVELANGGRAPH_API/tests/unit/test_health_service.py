@@ -0,0 +1,35 @@
+"""
+Unit tests for health service.
+"""
+
+import asyncio
+import time
+import pytest
+from services.health_service import HealthSampler
+
+def test_snapshot_is_served_without_sampling_delay():
+    """Test that reading a snapshot does not block on psutil."""
+    sampler = HealthSampler()
+    sampler.sample()
+    
+    start = time.perf_counter()
+    for _ in range(1000):
+        sampler.snapshot()
+    elapsed = time.perf_counter() - start
+    
+    assert elapsed < 0.05
+
+@pytest.mark.asyncio
+async def test_background_sampler_refreshes_snapshot():
+    """Test that the background task publishes new snapshots."""
+    sampler = HealthSampler(interval_seconds=0.01)
+    sampler.start()
+    await asyncio.sleep(0.05)
+    first = sampler.snapshot()["sampled_at"]
+    await asyncio.sleep(0.05)
+    
+    assert sampler.running
+    assert sampler.snapshot()["sampled_at"] > first
+    
+    await sampler.stop()
+    assert not sampler.running
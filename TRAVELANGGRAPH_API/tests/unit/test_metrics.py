@@ -0,0 +1,76 @@
+"""
+Unit tests for metrics.
+"""
+
+import json
+from fastapi.testclient import TestClient
+from metrics import HTTP_REQUESTS, MetricsRegistry, clear_multiproc_dir, merge_snapshots, render_snapshot
+
+def test_histogram_renders_cumulative_buckets():
+    """Test that histogram buckets are cumulative with a matching count and sum."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "/chat")
+    
+    text = registry.render()
+    
+    assert 'latency_seconds_bucket{route="/chat",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/chat",le="1.0"} 3' in text
+    assert 'latency_seconds_bucket{route="/chat",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{route="/chat"} 4' in text
+    assert 'latency_seconds_sum{route="/chat"} 6.05' in text
+    assert "# TYPE latency_seconds histogram" in text
+
+def test_worker_snapshots_are_summed():
+    """Test that snapshots from several workers merge into one series per label set."""
+    workers = []
+    for hits in (2, 3):
+        registry = MetricsRegistry()
+        counter = registry.counter("hits_total", "Hits", ("result",))
+        counter.inc("hit", amount=hits)
+        registry.histogram("latency_seconds", "Latency", buckets=(1.0,)).observe(0.5)
+        workers.append(registry.snapshot())
+    
+    text = render_snapshot(merge_snapshots(workers))
+    
+    assert 'hits_total{result="hit"} 5' in text
+    assert 'latency_seconds_count 2' in text
+
+def test_multiproc_dir_aggregates_worker_files(tmp_path):
+    """Test that a scrape sums every worker's snapshot file in the shared directory."""
+    other_worker = MetricsRegistry()
+    other_worker.counter("hits_total", "Hits").inc(amount=4)
+    (tmp_path / "1.json").write_text(json.dumps(other_worker.snapshot()))
+    
+    registry = MetricsRegistry(multiproc_dir=str(tmp_path))
+    registry.counter("hits_total", "Hits").inc()
+    
+    assert "hits_total 5" in registry.render()
+
+def test_clearing_multiproc_dir_drops_stale_workers(tmp_path):
+    """Test that snapshots from an earlier run are removed before workers start."""
+    stale_worker = MetricsRegistry()
+    stale_worker.counter("hits_total", "Hits").inc(amount=4)
+    (tmp_path / "1.json").write_text(json.dumps(stale_worker.snapshot()))
+    (tmp_path / "2.json.tmp").write_text("{")
+    (tmp_path / "notes.txt").write_text("kept")
+    
+    assert clear_multiproc_dir(str(tmp_path)) == 2
+    
+    registry = MetricsRegistry(multiproc_dir=str(tmp_path))
+    registry.counter("hits_total", "Hits").inc()
+    assert "hits_total 1" in registry.render()
+    assert (tmp_path / "notes.txt").exists()
+
+def test_metrics_endpoint_counts_requests_by_route_template(client: TestClient):
+    """Test that the middleware labels requests by route and the endpoint exposes them."""
+    before = HTTP_REQUESTS.value("GET", "/health/ping", "200")
+    client.get("/health/ping")
+    
+    response = client.get("/metrics")
+    
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert HTTP_REQUESTS.value("GET", "/health/ping", "200") == before + 1
+    assert 'http_request_duration_seconds_count{method="GET",route="/health/ping",status="200"}' in response.text
@@ -0,0 +1,49 @@
+"""
+Unit tests for model routing.
+"""
+
+import pytest
+from services.model_router import DEFAULT_ROUTES, ModelRouter
+
+def test_classify_routes_by_request_shape():
+    """Test that itineraries, short questions and long chats take different routes."""
+    router = ModelRouter()
+    
+    assert router.classify([{"role": "user", "content": "Plan a 5-day itinerary for Kyoto"}]) == "itinerary"
+    assert router.classify([{"role": "user", "content": "What currency does Peru use?"}]) == "short_factual"
+    assert router.classify([
+        {"role": "user", "content": "Hi"},
+        {"role": "assistant", "content": "Hello!"},
+        {"role": "user", "content": "What currency does Peru use?"}
+    ]) == "default"
+
+def test_resolve_lets_caller_parameters_override_route():
+    """Test that explicit parameters win over the route's defaults."""
+    router = ModelRouter()
+    messages = [{"role": "user", "content": "What currency does Peru use?"}]
+    
+    assert router.resolve(messages) == {"route": "short_factual", **DEFAULT_ROUTES["short_factual"]}
+    assert router.resolve(messages, route="itinerary", temperature=0.2) == {
+        "route": "itinerary",
+        "model": "deepseek-chat",
+        "temperature": 0.2,
+        "max_tokens": 3000
+    }
+
+def test_resolve_rejects_unknown_route():
+    """Test that naming an unconfigured route fails."""
+    with pytest.raises(ValueError):
+        ModelRouter().resolve([{"role": "user", "content": "Hi"}], route="premium")
+
+def test_record_accounts_latency_and_tokens_per_route_and_model():
+    """Test that per-route and per-model totals are kept."""
+    router = ModelRouter()
+    router.record("itinerary", "deepseek-chat", 2.0, {"prompt_tokens": 100, "completion_tokens": 900})
+    router.record("short_factual", "deepseek-chat", 0.5, error=True)
+    
+    stats = router.stats()
+    
+    assert stats["by_route"]["itinerary"]["completion_tokens"] == 900
+    assert stats["by_route"]["short_factual"]["errors"] == 1
+    assert stats["by_model"]["deepseek-chat"]["requests"] == 2
+    assert stats["by_model"]["deepseek-chat"]["avg_latency_seconds"] == 1.25
@@ -0,0 +1,129 @@
+"""
+Unit tests for the places index and reference-data answers.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from services.chat_service import ChatService
+from services.completion_cache import CompletionCache
+from services.place_answers import PlaceAnswerer
+from services.place_index import DEFAULT_DATA_PATH, PlaceIndex
+
+@pytest.fixture(scope="module")
+def places():
+    """The bundled places dataset."""
+    return PlaceIndex.from_csv(DEFAULT_DATA_PATH)
+
+def test_autocomplete_ranks_codes_and_name_starts_first(places):
+    """Test that an exact code beats name prefixes, which beat matches inside a name."""
+    names = [place["name"] for place in places.autocomplete("lis", limit=3)]
+    
+    assert names == ["Lisbon Humberto Delgado Airport", "Lisbon", "Budapest Ferenc Liszt International Airport"]
+    assert [place["code"] for place in places.autocomplete("Sá Carn")] == ["OPO"]
+    assert [place["kind"] for place in places.autocomplete("port", kinds=["airport"])] == ["airport"]
+
+def test_heavy_prefix_after_a_shorter_key():
+    """Test that a prefix is still marked heavy when a key equal to a shorter prefix sorts first."""
+    entries = [("ab", 0, True)] + [(f"abc{i:04d}", i + 1, True) for i in range(300)]
+    
+    heavy = dict(PlaceIndex._heavy_prefixes(entries, [0] * 301))
+    
+    assert {"a", "ab", "abc", "abc0"} <= set(heavy)
+
+def test_heavy_prefix_ranking_matches_a_full_scan():
+    """Test that precomputed rankings for common prefixes give the same results as ranking every key."""
+    rows = [
+        {"kind": "airport" if i % 3 == 0 else "city", "code": f"A{i:02d}" if i % 3 == 0 else "",
+         "name": f"Sa{i % 7} Town {i}", "city": f"Sa{i % 7} Town {i}", "country_code": "PT",
+         "latitude": 40.0, "longitude": -8.0, "population": (i * 7919) % 1000}
+        for i in range(600)
+    ]
+    index = PlaceIndex.from_rows(rows)
+    
+    assert len(index.heavy_prefixes) > 0
+    for prefix, kinds in (("s", None), ("sa", None), ("sa3", ["airport"]), ("sa", ["city"])):
+        lo, hi = index._key_range(prefix)
+        encoded = prefix.encode()
+        matches = {}
+        for position in range(lo, hi):
+            index._add_match(matches, position, encoded, frozenset(["airport", "city"].index(kind) for kind in kinds) if kinds else None)
+        expected = sorted(matches, key=lambda i: (matches[i], index.population[i], -i), reverse=True)[:10]
+        
+        assert [place["name"] for place in index.autocomplete(prefix, kinds=kinds)] == [index.place(i)["name"] for i in expected]
+
+def test_lookup_by_code(places):
+    """Test that airport and country codes resolve, case-insensitively."""
+    assert places.lookup("lis")["name"] == "Lisbon Humberto Delgado Airport"
+    assert places.lookup("PT", kind="country")["name"] == "Portugal"
+    assert places.lookup("XXX") is None
+
+def test_nearby_returns_places_within_radius_nearest_first(places):
+    """Test that radius queries filter by great-circle distance and sort by it."""
+    results = places.nearby(41.15, -8.61, 60, kinds=["city"])
+    
+    assert [place["name"] for place in results] == ["Porto", "Guimaraes", "Braga", "Aveiro"]
+    assert all(place["distance_km"] <= 60 for place in results)
+
+def test_nearby_crosses_the_antimeridian():
+    """Test that grid cells on both sides of longitude 180 are searched."""
+    index = PlaceIndex.from_rows([
+        {"kind": "city", "name": "East", "country_code": "FJ", "latitude": -17.0, "longitude": 179.9},
+        {"kind": "city", "name": "West", "country_code": "FJ", "latitude": -17.0, "longitude": -179.9}
+    ])
+    
+    assert [place["name"] for place in index.nearby(-17.0, 179.95, 50)] == ["East", "West"]
+
+def test_snapshot_round_trip(places, tmp_path):
+    """Test that a memory-mapped snapshot answers queries like the CSV-built index."""
+    path = str(tmp_path / "places.bin")
+    places.save_snapshot(path)
+    
+    snapshot = PlaceIndex.load_snapshot(path)
+    
+    assert snapshot.stats()["memory_mapped"]
+    assert len(snapshot) == len(places)
+    assert snapshot.autocomplete("new y") == places.autocomplete("new y")
+    assert snapshot.nearby(35.0, 135.7, 80) == places.nearby(35.0, 135.7, 80)
+    
+    (tmp_path / "bad.bin").write_bytes(b"not a snapshot")
+    with pytest.raises(ValueError):
+        PlaceIndex.load_snapshot(str(tmp_path / "bad.bin"))
+
+def test_answerer_answers_reference_questions(places):
+    """Test that pure lookups are answered and other questions are left to the model."""
+    answerer = PlaceAnswerer(places, nearby_radius_km=60)
+    
+    assert answerer.answer("Which airport is LIS?") == "LIS is Lisbon Humberto Delgado Airport in Lisbon, Portugal."
+    assert answerer.answer("cities near Porto").startswith("Cities within 60 km of Porto: Guimaraes (41.9 km), Braga")
+    assert answerer.answer("Airport code for Tokyo?").startswith("Tokyo, Japan is served by HND")
+    assert answerer.answer("What should I eat in Porto?") is None
+    assert answerer.answer("Which airport is QQQ?") is None
+    assert answerer.ground("Cheapest way from LIS to OPO?") == (
+        "Reference data: LIS = Lisbon Humberto Delgado Airport (LIS) in Lisbon, Portugal; "
+        "OPO = Porto Francisco Sa Carneiro Airport (OPO) in Porto, Portugal."
+    )
+
+@pytest.mark.asyncio
+async def test_chat_service_answers_locally_and_grounds_the_rest(places):
+    """Test that reference questions skip the model and codes are grounded for it."""
+    deepseek_client = MagicMock()
+    deepseek_client.chat_completion = AsyncMock(return_value={
+        "choices": [{"message": {"content": "Take the train."}}],
+        "usage": {"total_tokens": 12}
+    })
+    chat_service = ChatService(
+        deepseek_client=deepseek_client,
+        cache=CompletionCache(tiers=[]),
+        place_answers=PlaceAnswerer(places)
+    )
+    
+    answered = await chat_service.send_message("Which airport is OPO?")
+    grounded = await chat_service.send_message("Best way from OPO to the city?", system_prompt="Be brief.")
+    
+    assert answered["route"] == "places"
+    assert answered["ai_response"].startswith("OPO is Porto Francisco Sa Carneiro Airport")
+    assert deepseek_client.chat_completion.await_count == 1
+    assert grounded["ai_response"] == "Take the train."
+    sent = deepseek_client.chat_completion.await_args.kwargs["messages"]
+    assert [m["role"] for m in sent] == ["system", "system", "user"]
+    assert sent[1]["content"].startswith("Reference data: OPO = ")
@@ -0,0 +1,27 @@
+"""
+Unit tests for places controller.
+"""
+
+from fastapi.testclient import TestClient
+
+def test_autocomplete_endpoint(client: TestClient):
+    """Test that autocomplete returns ranked places filtered by kind."""
+    response = client.get("/places/autocomplete", params={"q": "tok", "kind": "airport", "limit": 2})
+    
+    assert response.status_code == 200
+    assert [place["code"] for place in response.json()["results"]] == ["HND", "NRT"]
+
+def test_nearby_endpoint(client: TestClient):
+    """Test that nearby returns places with distances."""
+    response = client.get("/places/nearby", params={"lat": 38.72, "lon": -9.14, "radius_km": 20, "kind": "airport"})
+    
+    assert response.status_code == 200
+    assert response.json()["results"][0]["code"] == "LIS"
+    assert response.json()["results"][0]["distance_km"] < 10
+    assert client.get("/places/nearby", params={"lat": 100, "lon": 0}).status_code == 422
+
+def test_lookup_endpoint(client: TestClient):
+    """Test code lookups and the 404 for unknown codes."""
+    assert client.get("/places/LIS").json()["city"] == "Lisbon"
+    assert client.get("/places/ZZZ").status_code == 404
+    assert client.get("/places/status").json()["by_kind"]["airport"] > 0
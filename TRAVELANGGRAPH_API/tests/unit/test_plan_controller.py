@@ -0,0 +1,59 @@
+"""
+Unit tests for plan controller.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock
+from dependencies import get_chat_service
+from services.chat_service import ChatService
+from services.completion_cache import CompletionCache
+
+@pytest.fixture
+def deepseek_client(app_instance):
+    """Serve a real chat service backed by a mocked DeepSeek client."""
+    deepseek_client = MagicMock()
+    deepseek_client.chat_completion = AsyncMock(return_value={
+        "choices": [{"message": {"content": "Stay in Chiado."}}],
+        "usage": {"total_tokens": 20}
+    })
+    chat_service = ChatService(deepseek_client=deepseek_client, cache=CompletionCache(tiers=[]))
+    app_instance.dependency_overrides[get_chat_service] = lambda: chat_service
+    yield deepseek_client
+    app_instance.dependency_overrides.pop(get_chat_service, None)
+
+def test_plan_runs_every_step(deepseek_client, client: TestClient):
+    """Test that a plan returns each step's output and feeds them into the itinerary."""
+    response = client.post("/plan", json={
+        "destination": "Lisbon", "origin": "Berlin", "start_date": "2026-05-01", "days": 4
+    })
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "completed"
+    assert body["plan"]["trip"] == {
+        "days": 4, "nights": 3, "start_date": "2026-05-01", "end_date": "2026-05-04", "month": "May"
+    }
+    assert body["plan"]["itinerary"] == "Stay in Chiado."
+    assert deepseek_client.chat_completion.await_count == 4
+    
+    itinerary_prompt = deepseek_client.chat_completion.await_args_list[-1].kwargs["messages"][-1]["content"]
+    assert "Flights:\nStay in Chiado." in itinerary_prompt
+    assert client.get(f"/plan/{body['run_id']}").json()["status"] == "completed"
+
+def test_failed_plan_can_be_resumed(deepseek_client, client: TestClient):
+    """Test that a failed step returns the run ID and resuming completes the plan."""
+    reply = {"choices": [{"message": {"content": "Fly direct."}}], "usage": {}}
+    deepseek_client.chat_completion.side_effect = [reply, reply, RuntimeError("upstream down"), reply, reply]
+    
+    failed = client.post("/plan", json={"destination": "Kyoto", "days": 2})
+    
+    assert failed.status_code == 502
+    run_id = failed.json()["detail"]["run_id"]
+    
+    resumed = client.post(f"/plan/{run_id}/resume")
+    
+    assert resumed.status_code == 200
+    assert resumed.json()["status"] == "completed"
+    assert [step["source"] for step in resumed.json()["steps"].values()].count("checkpoint") == 3
+    assert client.post("/plan/missing/resume").status_code == 404
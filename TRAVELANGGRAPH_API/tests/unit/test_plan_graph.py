@@ -0,0 +1,94 @@
+"""
+Unit tests for planning graph execution.
+"""
+
+import asyncio
+import time
+import pytest
+from services.completion_cache import LRUCache
+from services.plan_graph import GraphNode, NodeFailedError, PlanGraph
+
+def sleeper(seconds: float, calls: list, name: str):
+    """A step that sleeps and records that it ran."""
+    async def step(inputs, upstream):
+        calls.append(name)
+        await asyncio.sleep(seconds)
+        return f"{name}:{inputs.get('city')}:{sorted(upstream)}"
+    return step
+
+def test_graph_rejects_unknown_steps_and_cycles():
+    """Test that invalid graphs are rejected when built."""
+    noop = lambda inputs, upstream: None
+    
+    with pytest.raises(ValueError, match="unknown step"):
+        PlanGraph([GraphNode("a", noop, depends_on=("missing",))])
+    with pytest.raises(ValueError, match="cycle"):
+        PlanGraph([GraphNode("a", noop, depends_on=("b",)), GraphNode("b", noop, depends_on=("a",))])
+
+@pytest.mark.asyncio
+async def test_independent_branches_run_concurrently():
+    """Test that siblings overlap and dependents see their upstream outputs."""
+    calls = []
+    graph = PlanGraph([
+        GraphNode("trip", lambda inputs, upstream: {"days": 3}),
+        GraphNode("flights", sleeper(0.05, calls, "flights"), depends_on=("trip",)),
+        GraphNode("hotels", sleeper(0.05, calls, "hotels"), depends_on=("trip",)),
+        GraphNode("itinerary", sleeper(0, calls, "itinerary"), depends_on=("flights", "hotels"))
+    ])
+    
+    start = time.perf_counter()
+    run = await graph.run({"city": "Lisbon"})
+    
+    assert time.perf_counter() - start < 0.09
+    assert run["status"] == "completed"
+    assert run["outputs"]["itinerary"] == "itinerary:Lisbon:['flights', 'hotels']"
+    assert calls[-1] == "itinerary"
+
+@pytest.mark.asyncio
+async def test_memoized_steps_rerun_only_when_their_inputs_change():
+    """Test that steps reading unchanged inputs reuse their earlier outputs."""
+    calls = []
+    graph = PlanGraph([
+        GraphNode("flights", sleeper(0, calls, "flights"), input_keys=("city",)),
+        GraphNode("research", sleeper(0, calls, "research"), input_keys=("city", "interests"))
+    ], memo=LRUCache())
+    
+    await graph.run({"city": "Lisbon", "interests": ["food"]})
+    run = await graph.run({"city": "Lisbon", "interests": ["museums"]})
+    
+    assert calls == ["flights", "research", "research"]
+    assert run["nodes"]["flights"]["source"] == "memoized"
+    assert run["nodes"]["research"]["source"] == "executed"
+
+@pytest.mark.asyncio
+async def test_failed_run_resumes_from_completed_steps():
+    """Test that resuming a failed run re-runs only the steps that did not complete."""
+    calls = []
+    attempts = []
+    
+    async def flaky(inputs, upstream):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("upstream down")
+        return "hotels"
+    
+    graph = PlanGraph([
+        GraphNode("flights", sleeper(0.01, calls, "flights")),
+        GraphNode("hotels", flaky),
+        GraphNode("itinerary", sleeper(0, calls, "itinerary"), depends_on=("flights", "hotels"))
+    ])
+    
+    with pytest.raises(NodeFailedError) as failed:
+        await graph.run({"city": "Lisbon"})
+    checkpoint = graph.get_run(failed.value.run_id)
+    assert failed.value.node == "hotels"
+    assert checkpoint["status"] == "failed"
+    assert list(checkpoint["outputs"]) == ["flights"]
+    
+    run = await graph.resume(failed.value.run_id)
+    
+    assert run["status"] == "completed"
+    assert calls == ["flights", "itinerary"]
+    assert run["nodes"]["flights"]["source"] == "checkpoint"
+    with pytest.raises(KeyError):
+        await graph.resume("missing")
@@ -0,0 +1,79 @@
+"""
+Unit tests for prompt templates.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from serialization import dumps, dumps_spliced
+from services.chat_service import ChatService
+from services.completion_cache import CompletionCache
+from services.prompt_templates import PromptLibrary, PromptTemplate
+
+def test_render_keeps_a_shared_canonical_prefix_ahead_of_variable_content():
+    """Test that renders start with the same prefix objects, with notes just before the user turn."""
+    template = PromptTemplate("guide", system="You are a guide.  \r\n", context=["Prices are in EUR."])
+    history = [{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello"}]
+    
+    first = template.render("Where to eat?", history=history, notes=["Reference data: LIS = Lisbon"])
+    second = template.render("Where to stay?")
+    
+    assert [m["content"] for m in first] == [
+        "You are a guide.", "Prices are in EUR.", "Hi", "Hello", "Reference data: LIS = Lisbon", "Where to eat?"
+    ]
+    assert first[0] is second[0] and first[1] is second[1]
+    assert first.template == "guide"
+
+def test_render_formats_the_user_turn():
+    """Test that the user format string is filled from variables and missing fields are reported."""
+    template = PromptTemplate("trip", system="Plan trips.", user="Plan {days} days in {destination}.")
+    
+    assert template.render(days=3, destination="Porto")[-1]["content"] == "Plan 3 days in Porto."
+    with pytest.raises(KeyError, match="destination"):
+        template.render(days=3)
+
+def test_spliced_encoding_matches_plain_encoding():
+    """Test that reusing the pre-encoded prefix gives the same request bytes, and falls back when it was replaced."""
+    template = PromptTemplate("guide", system="Olá, you are a \"guide\".")
+    messages = template.render("Where?", notes=["Note"])
+    payload = {"model": "deepseek-chat", "messages": messages, "temperature": 0.0, "max_tokens": 100, "stream": False}
+    
+    assert dumps_spliced(payload, "messages") == dumps(payload, sort_keys=True)
+    
+    messages[0] = {"role": "system", "content": "Other."}
+    
+    assert dumps_spliced(payload, "messages") == dumps(payload, sort_keys=True)
+
+def test_library_matches_registered_templates_and_normalizes_conversations():
+    """Test that known system prompts map to their template and leading system messages are normalized."""
+    library = PromptLibrary([PromptTemplate("planner", system="Plan trips.")])
+    
+    adopted = library.adopt([{"role": "system", "content": "Plan trips.\n"}, {"role": "user", "content": "Porto"}])
+    
+    assert library.for_system_prompt(" Plan trips. ").name == "planner"
+    assert library.for_system_prompt("Be brief.").name == "custom"
+    assert library.for_system_prompt(None).name == "chat"
+    assert adopted.template == "planner"
+    assert adopted[0] is library.get("planner").prefix[0]
+    assert adopted[1] == {"role": "user", "content": "Porto"}
+
+@pytest.mark.asyncio
+async def test_chat_service_tracks_prompt_cache_tokens_per_template():
+    """Test that upstream prompt cache hit and miss tokens are counted per template."""
+    deepseek_client = MagicMock()
+    deepseek_client.chat_completion = AsyncMock(side_effect=[
+        {"choices": [{"message": {"content": "A"}}], "usage": {"prompt_cache_hit_tokens": 0, "prompt_cache_miss_tokens": 40}},
+        {"choices": [{"message": {"content": "B"}}], "usage": {"prompt_cache_hit_tokens": 30, "prompt_cache_miss_tokens": 10}}
+    ])
+    library = PromptLibrary([PromptTemplate("guide", system="You are a guide.")])
+    chat_service = ChatService(deepseek_client=deepseek_client, cache=CompletionCache(tiers=[]), prompts=library)
+    
+    await chat_service.send_message("Where to eat in Porto?", system_prompt="You are a guide.")
+    await chat_service.chat_with_context([
+        {"role": "system", "content": "You are a guide."},
+        {"role": "user", "content": "Where to stay in Porto?"}
+    ])
+    
+    usage = chat_service.get_service_status()["prompts"]["usage"]["guide"]
+    assert usage == {"requests": 2, "prompt_cache_hit_tokens": 30, "prompt_cache_miss_tokens": 50, "hit_rate": 0.375}
+    sent = [call.kwargs["messages"] for call in deepseek_client.chat_completion.await_args_list]
+    assert sent[0][0] is sent[1][0]
@@ -0,0 +1,126 @@
+"""
+Unit tests for the chat provider pool.
+"""
+
+import asyncio
+import pytest
+import httpx
+from clients.provider import ChatProvider
+from clients.provider_pool import ProviderPool
+
+REQUEST = httpx.Request("POST", "http://provider.test/chat/completions")
+MESSAGES = [{"role": "user", "content": "Hi"}]
+
+class FakeProvider(ChatProvider):
+    """Provider that answers after a fixed delay or raises a given error."""
+    
+    def __init__(self, name: str, delay: float = 0.0, status_code: int = 200):
+        self.name = name
+        self.delay = delay
+        self.status_code = status_code
+        self.calls = 0
+    
+    async def chat_completion(self, messages, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.status_code != 200:
+            response = httpx.Response(self.status_code, request=REQUEST)
+            raise httpx.HTTPStatusError(str(self.status_code), request=REQUEST, response=response)
+        return {"choices": [{"message": {"content": self.name}}]}
+    
+    async def stream_chat_completion(self, messages, **kwargs):
+        self.calls += 1
+        response = await self.chat_completion(messages)
+        yield {"choices": [{"delta": {"content": response["choices"][0]["message"]["content"]}}]}
+    
+    def health_check(self):
+        return {"status": "healthy", "name": self.name}
+
+def reply(response) -> str:
+    """Get the reply text of a completion."""
+    return response["choices"][0]["message"]["content"]
+
+@pytest.mark.asyncio
+async def test_requests_prefer_the_lowest_latency_provider():
+    """Test that EWMA latency steers requests to the faster provider."""
+    slow, fast = FakeProvider("slow", delay=0.05), FakeProvider("fast", delay=0.001)
+    pool = ProviderPool([slow, fast])
+    
+    for _ in range(2):
+        await pool.chat_completion(MESSAGES)
+    slow.calls = fast.calls = 0
+    for _ in range(5):
+        assert reply(await pool.chat_completion(MESSAGES)) == "fast"
+    
+    assert (slow.calls, fast.calls) == (0, 5)
+    assert [p.name for p in pool.ranked()] == ["fast", "slow"]
+
+@pytest.mark.asyncio
+async def test_upstream_failures_fail_over_and_are_penalized():
+    """Test that a 503 fails over to the next provider and demotes the failing one."""
+    failing, healthy = FakeProvider("failing", status_code=503), FakeProvider("healthy", delay=0.01)
+    pool = ProviderPool([failing, healthy])
+    
+    assert reply(await pool.chat_completion(MESSAGES)) == "healthy"
+    assert reply(await pool.chat_completion(MESSAGES)) == "healthy"
+    
+    assert failing.calls == 1
+    assert pool.health_check()["failovers"] == 1
+    assert pool.ranked()[0] is healthy
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_fail_over():
+    """Test that a 400 is raised without trying another provider."""
+    rejecting, healthy = FakeProvider("rejecting", status_code=400), FakeProvider("healthy")
+    pool = ProviderPool([rejecting, healthy])
+    
+    with pytest.raises(httpx.HTTPStatusError):
+        await pool.chat_completion(MESSAGES)
+    
+    assert healthy.calls == 0
+
+@pytest.mark.asyncio
+async def test_last_error_is_raised_when_every_provider_fails():
+    """Test that the pool surfaces the last upstream error once all providers fail."""
+    pool = ProviderPool([FakeProvider("a", status_code=503), FakeProvider("b", status_code=502)])
+    
+    with pytest.raises(httpx.HTTPStatusError) as exc_info:
+        await pool.chat_completion(MESSAGES)
+    
+    assert exc_info.value.response.status_code == 502
+
+@pytest.mark.asyncio
+async def test_hedged_request_takes_the_first_response():
+    """Test that a slow primary is hedged to the next provider after the hedge delay."""
+    stalled, backup = FakeProvider("stalled", delay=1.0), FakeProvider("backup", delay=0.01)
+    pool = ProviderPool([stalled, backup], hedge=True, hedge_initial_delay_seconds=0.02)
+    
+    start = asyncio.get_running_loop().time()
+    response = await pool.chat_completion(MESSAGES)
+    
+    assert reply(response) == "backup"
+    assert asyncio.get_running_loop().time() - start < 0.5
+    assert pool.health_check()["hedging"]["sent"] == 1
+    assert pool.health_check()["hedging"]["won"] == 1
+
+def test_hedge_delay_tracks_latency_percentile():
+    """Test that the hedge delay is the configured percentile once enough samples exist."""
+    provider = FakeProvider("a")
+    pool = ProviderPool([provider], hedge_percentile=95, hedge_min_samples=20, hedge_initial_delay_seconds=2.0)
+    
+    for latency in range(10):
+        pool._record(provider, latency / 100)
+    assert pool.hedge_delay() == 2.0
+    
+    for latency in range(10, 100):
+        pool._record(provider, latency / 100)
+    assert pool.hedge_delay() == 0.95
+
+@pytest.mark.asyncio
+async def test_stream_fails_over_before_first_chunk():
+    """Test that a stream that fails before any chunk moves to the next provider."""
+    pool = ProviderPool([FakeProvider("failing", status_code=503), FakeProvider("healthy")])
+    
+    chunks = [chunk async for chunk in pool.stream_chat_completion(MESSAGES)]
+    
+    assert chunks == [{"choices": [{"delta": {"content": "healthy"}}]}]
@@ -0,0 +1,194 @@
+"""
+Unit tests for per-client rate limiting.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock
+from dependencies import get_chat_service
+from rate_limit import ADMITTED, REQUEST_LIMITED, TOKEN_LIMITED, ClientQuota, RateLimiter, admit_buckets, charge_bucket
+from services.chat_service import ChatService
+from services.completion_cache import CompletionCache
+
+KEYS = {
+    "key-alpha": {"name": "alpha", "requests_per_second": 1, "burst": 2, "tokens_per_minute": 60},
+    "key-beta": {"name": "beta"}
+}
+
+@pytest.fixture
+def limiter(app_instance):
+    """Install a rate limiter with two configured clients on the app."""
+    limiter = RateLimiter(default_limits=(1.0, 1.0, 0.0), keys=KEYS)
+    app_instance.state.rate_limiter = limiter
+    yield limiter
+    del app_instance.state.rate_limiter
+
+@pytest.fixture
+def deepseek_client(app_instance):
+    """Serve a real chat service backed by a mocked DeepSeek client reporting 10 tokens per call."""
+    deepseek_client = MagicMock()
+    deepseek_client.chat_completion = AsyncMock(return_value={
+        "choices": [{"message": {"content": "Take the tram."}}],
+        "usage": {"prompt_tokens": 8, "completion_tokens": 2, "total_tokens": 10}
+    })
+    chat_service = ChatService(deepseek_client=deepseek_client, cache=CompletionCache(tiers=[]))
+    app_instance.dependency_overrides[get_chat_service] = lambda: chat_service
+    yield deepseek_client
+    app_instance.dependency_overrides.pop(get_chat_service, None)
+
+def ask(client: TestClient, api_key: str = None, message: str = "How do I get to Belem?"):
+    """Send a simple chat message, with an API key if given."""
+    headers = {"X-API-Key": api_key} if api_key else {}
+    return client.post("/chat/simple", json={"message": message}, headers=headers)
+
+def test_buckets_refill_and_report_retry_after():
+    """Test that an empty request bucket rejects with the time until the next request and refills."""
+    quota = ClientQuota("alpha", "alpha", requests_per_second=2, burst=1, tokens_per_minute=60)
+    requests, tokens = [1.0, 0.0], [60.0, 0.0]
+    
+    assert admit_buckets(requests, tokens, 0.0, quota)[0] == ADMITTED
+    status, retry_after, _, _ = admit_buckets(requests, tokens, 0.1, quota)
+    assert status == REQUEST_LIMITED
+    assert retry_after == pytest.approx(0.4)
+    assert admit_buckets(requests, tokens, 0.5, quota)[0] == ADMITTED
+    
+    # Usage is charged afterwards and may leave the token bucket in debt
+    assert charge_bucket(tokens, 0.5, quota, 90) == pytest.approx(-30)
+    status, retry_after, _, _ = admit_buckets(requests, tokens, 10.0, quota)
+    assert status == TOKEN_LIMITED
+    assert retry_after == pytest.approx(21.5)
+
+def test_exhausted_requests_get_429_with_retry_after(limiter, deepseek_client, client: TestClient):
+    """Test that requests beyond the burst are rejected before reaching the endpoint."""
+    first = ask(client, "key-alpha")
+    assert first.status_code == 200
+    assert first.headers["x-ratelimit-remaining-requests"] == "1"
+    assert first.headers["x-ratelimit-remaining-tokens"] == "60"
+    assert ask(client, "key-alpha").status_code == 200
+    
+    response = ask(client, "key-alpha")
+    
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert response.json()["detail"]["limit"] == "requests"
+    assert deepseek_client.chat_completion.await_count == 2
+    assert limiter.usage("alpha") == {"requests": 2, "rejected": 1, "tokens": 20}
+    # Other clients have their own buckets
+    assert ask(client, "key-beta").status_code == 200
+
+def test_only_limited_paths_are_checked(limiter, deepseek_client, client: TestClient):
+    """Test that paths are matched by segment and status and health routes are never limited."""
+    assert limiter.applies("POST", "/chat")
+    assert limiter.applies("POST", "/chat/simple")
+    assert limiter.applies("GET", "/plan/run-1")
+    assert not limiter.applies("POST", "/chatty")
+    assert not limiter.applies("OPTIONS", "/chat/simple")
+    
+    for path in ("/chat/health", "/chat/status", "/plan/status", "/health"):
+        for _ in range(3):
+            response = client.get(path, headers={"X-API-Key": "key-alpha"})
+            assert response.status_code == 200
+            assert "x-ratelimit-remaining-requests" not in response.headers
+
+def test_unknown_or_missing_keys(limiter, deepseek_client, client: TestClient):
+    """Test that missing and unlisted keys share the anonymous quota, and are both refused when keys are required."""
+    assert ask(client, "key-gamma").status_code == 200
+    assert ask(client).status_code == 429
+    
+    limiter.require_key = True
+    for api_key in ("key-gamma", None):
+        response = ask(client, api_key)
+        assert response.status_code == 401
+        assert response.json()["detail"]["error"] == "invalid_api_key"
+
+@pytest.mark.asyncio
+async def test_unconfigured_keys_share_the_anonymous_quota():
+    """Test that sending a fresh key per request does not get a fresh bucket unless per-key buckets are enabled."""
+    limiter = RateLimiter(default_limits=(1.0, 2.0, 0.0))
+    admissions = [await limiter.admit(limiter.identify(f"random-{i}")) for i in range(10)]
+    assert sum(admission.allowed for admission in admissions) == 2
+    assert limiter.identify("random-0") is limiter.anonymous
+    
+    limiter.per_key_buckets = True
+    assert limiter.identify("random-0").label == "unregistered"
+    assert limiter.identify("random-0").client_id != limiter.identify("random-1").client_id
+
+def test_token_usage_is_charged_to_the_caller(limiter, deepseek_client, client: TestClient):
+    """Test that upstream token usage drains the caller's token bucket until requests are refused."""
+    limiter.keys["key-alpha"].requests_per_second = 100
+    deepseek_client.chat_completion.return_value = {
+        "choices": [{"message": {"content": "Take the tram."}}],
+        "usage": {"prompt_tokens": 90, "completion_tokens": 10, "total_tokens": 100}
+    }
+    assert ask(client, "key-alpha").status_code == 200
+    
+    quota = client.get("/quota", headers={"X-API-Key": "key-alpha"}).json()
+    assert quota["client"] == "alpha"
+    assert quota["tokens_remaining"] < 0
+    assert quota["usage"] == {"requests": 1, "rejected": 0, "tokens": 100}
+    
+    response = ask(client, "key-alpha", "And back?")
+    assert response.status_code == 429
+    assert response.json()["detail"]["limit"] == "tokens"
+    assert int(response.headers["retry-after"]) >= 40
+    assert deepseek_client.chat_completion.await_count == 1
+    status = client.get("/quota/status").json()
+    assert status["usage"]["tokens"] == 100
+    assert "alpha" not in str(status)
+
+def test_streamed_usage_is_charged_to_the_caller(limiter, deepseek_client, client: TestClient):
+    """Test that streams are charged their reported usage, or an estimate when the provider reports none."""
+    limiter.keys["key-alpha"].requests_per_second = 100
+    reported = {}
+    
+    async def stream_chat_completion(**kwargs):
+        yield {"choices": [{"delta": {"content": "Take the tram."}}]}
+        if reported:
+            yield {"choices": [], "usage": reported}
+    
+    deepseek_client.stream_chat_completion = stream_chat_completion
+    headers = {"X-API-Key": "key-alpha"}
+    
+    response = client.post("/chat/simple/stream", json={"message": "How do I get to Belem?"}, headers=headers)
+    assert "event: done" in response.text
+    estimated = client.get("/quota", headers=headers).json()
+    assert 0 < estimated["usage"]["tokens"] < 60
+    assert estimated["tokens_remaining"] < 60
+    
+    reported.update({"prompt_tokens": 90, "completion_tokens": 10, "total_tokens": 100})
+    client.post("/chat/simple/stream", json={"message": "And back?"}, headers=headers)
+    quota = client.get("/quota", headers=headers).json()
+    assert quota["usage"]["tokens"] == estimated["usage"]["tokens"] + 100
+    assert quota["tokens_remaining"] < 0
+
+def test_batch_items_count_as_requests(limiter, deepseek_client, client: TestClient):
+    """Test that a batch takes one request per item and is refused when the burst cannot cover it."""
+    headers = {"X-API-Key": "key-alpha"}
+    batch = {"requests": [{"message": "Porto"}, {"message": "Lisbon"}, {"message": "Faro"}]}
+    
+    response = client.post("/chat/batch", json=batch, headers=headers)
+    
+    assert response.status_code == 429
+    assert response.json()["detail"]["limit"] == "requests"
+    assert int(response.headers["retry-after"]) >= 1
+    assert deepseek_client.chat_completion.await_count == 0
+    
+    limiter.keys["key-beta"].burst = 3
+    assert client.post("/chat/batch", json=batch, headers={"X-API-Key": "key-beta"}).status_code == 200
+    assert limiter.usage("beta")["requests"] == 3
+    assert deepseek_client.chat_completion.await_count == 3
+
+def test_store_errors_let_requests_through(limiter, deepseek_client, client: TestClient):
+    """Test that the limiter fails open when its store is unavailable."""
+    limiter.store.admit = AsyncMock(side_effect=ConnectionError("store down"))
+    
+    for _ in range(3):
+        assert ask(client, "key-alpha").status_code == 200
+
+def test_quota_reports_disabled_limiter(app_instance, client: TestClient):
+    """Test that /quota says so when rate limiting is off."""
+    app_instance.state.rate_limiter = None
+    try:
+        assert client.get("/quota").json() == {"enabled": False}
+    finally:
+        del app_instance.state.rate_limiter
@@ -0,0 +1,86 @@
+"""
+Unit tests for retry policy.
+"""
+
+import pytest
+import httpx
+from clients.deepseek_client import DeepSeekClient
+from clients.retry_policy import RetryBudget, RetryPolicy, parse_retry_after
+
+REQUEST = httpx.Request("POST", "http://deepseek.test/chat/completions")
+
+def status_error(status_code: int, headers: dict = None) -> httpx.HTTPStatusError:
+    """Build an HTTPStatusError for a given upstream status."""
+    response = httpx.Response(status_code, headers=headers, request=REQUEST)
+    return httpx.HTTPStatusError(str(status_code), request=REQUEST, response=response)
+
+def test_only_transient_failures_are_retryable():
+    """Test that retries are limited to failures the upstream did not process."""
+    assert RetryPolicy.is_retryable(status_error(429))
+    assert RetryPolicy.is_retryable(status_error(503))
+    assert RetryPolicy.is_retryable(httpx.ConnectError("reset", request=REQUEST))
+    assert not RetryPolicy.is_retryable(status_error(400))
+    assert not RetryPolicy.is_retryable(httpx.ReadTimeout("slow", request=REQUEST))
+
+def test_backoff_uses_full_jitter_within_cap():
+    """Test that backoff delays stay within the exponential cap."""
+    policy = RetryPolicy(base_delay_seconds=0.5, max_delay_seconds=2.0)
+    
+    for attempt, cap in ((1, 0.5), (2, 1.0), (3, 2.0), (6, 2.0)):
+        assert all(0 <= policy.backoff(attempt) <= cap for _ in range(100))
+
+def test_retry_after_header_is_honored():
+    """Test that an upstream Retry-After replaces the backoff delay."""
+    policy = RetryPolicy(max_retry_after_seconds=5.0)
+    
+    assert parse_retry_after(httpx.Response(429, headers={"Retry-After": "2"})) == 2.0
+    assert policy.next_delay(1, status_error(429, {"Retry-After": "2"})) == 2.0
+    assert policy.next_delay(1, status_error(429, {"Retry-After": "60"})) is None
+
+def test_retry_budget_limits_retries():
+    """Test that an empty shared budget stops further retries."""
+    policy = RetryPolicy(max_attempts=5, budget=RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=2))
+    
+    assert policy.next_delay(1, status_error(503)) is not None
+    assert policy.next_delay(1, status_error(503)) is not None
+    assert policy.next_delay(1, status_error(503)) is None
+    assert policy.budget.exhausted == 1
+
+@pytest.mark.asyncio
+async def test_client_retries_transient_failures(monkeypatch):
+    """Test that the client retries a 503 and succeeds on the next attempt."""
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test-key")
+    statuses = [503, 200]
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = statuses.pop(0)
+        if status != 200:
+            return httpx.Response(status, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Recovered"}}]})
+    
+    client = DeepSeekClient(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    
+    response = await client.chat_completion([{"role": "user", "content": "Hi"}])
+    
+    assert response["choices"][0]["message"]["content"] == "Recovered"
+    assert client.retry_policy.stats()["retries"] == 1
+    await client.http_client.aclose()
+
+@pytest.mark.asyncio
+async def test_client_does_not_retry_client_errors(monkeypatch):
+    """Test that a 400 fails after a single attempt."""
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test-key")
+    calls = 0
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(400, json={"error": "bad request"})
+    
+    client = DeepSeekClient(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.chat_completion([{"role": "user", "content": "Hi"}])
+    
+    assert calls == 1
+    await client.http_client.aclose()
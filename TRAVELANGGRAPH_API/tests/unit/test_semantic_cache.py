@@ -0,0 +1,102 @@
+"""
+Unit tests for semantic cache.
+"""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+pytest.importorskip("numpy")
+
+from services.chat_service import ChatService
+from services.completion_cache import CompletionCache
+from services.semantic_cache import SemanticCache, guard_terms, namespace_key, normalize_prompt
+
+NAMESPACE = namespace_key("deepseek-chat", None, 1000)
+
+def test_normalize_prompt_expands_month_abbreviations():
+    """Test that prompts are lowercased, stripped of punctuation and month abbreviations expanded."""
+    assert normalize_prompt("Kyoto in Nov?") == "kyoto in november"
+    assert guard_terms("3 days in Kyoto in Nov") == ("3", "november")
+
+def test_reworded_prompt_hits():
+    """Test that a reworded prompt is served the cached value."""
+    cache = SemanticCache()
+    cache.set(NAMESPACE, "What are the best things to do in Lisbon?", {"ai_response": "Trams."})
+    
+    match = cache.get(NAMESPACE, "what are the best things to do in lisbon")
+    
+    assert match is not None
+    assert match[0] == {"ai_response": "Trams."}
+    assert match[1] >= cache.threshold
+    assert cache.get(NAMESPACE, "Cheap street food in Bangkok") is None
+
+def test_different_numbers_or_months_miss():
+    """Test that prompts differing only in numbers or months do not share an answer."""
+    cache = SemanticCache(threshold=0.5)
+    cache.set(NAMESPACE, "Plan 3 days in Kyoto in November", {"ai_response": "Three days."})
+    
+    assert cache.get(NAMESPACE, "Plan 4 days in Kyoto in November") is None
+    assert cache.get(NAMESPACE, "Plan 3 days in Kyoto in December") is None
+    assert cache.get(NAMESPACE, "Plan 3 days in Kyoto in Nov") is not None
+
+def test_namespaces_are_separate():
+    """Test that a prompt cached under one system prompt is not served under another."""
+    cache = SemanticCache()
+    cache.set(NAMESPACE, "Best beaches in Portugal", {"ai_response": "Algarve."})
+    
+    assert cache.get(namespace_key("deepseek-chat", "Answer in French.", 1000), "Best beaches in Portugal") is None
+    assert cache.get(namespace_key("deepseek-reasoner", None, 1000), "Best beaches in Portugal") is None
+
+def test_full_namespace_evicts_least_recently_used():
+    """Test that a full namespace replaces its least recently used entry."""
+    now = [0.0]
+    cache = SemanticCache(max_entries=2, initial_capacity=1, clock=lambda: now[0])
+    cache.set(NAMESPACE, "Museums in Madrid", {"ai_response": "Prado."})
+    now[0] = 1.0
+    cache.set(NAMESPACE, "Hiking near Zurich", {"ai_response": "Uetliberg."})
+    now[0] = 2.0
+    cache.get(NAMESPACE, "Museums in Madrid")
+    cache.set(NAMESPACE, "Nightlife in Berlin", {"ai_response": "Kreuzberg."})
+    
+    assert len(cache) == 2
+    assert cache.get(NAMESPACE, "Hiking near Zurich") is None
+    assert cache.get(NAMESPACE, "Museums in Madrid") is not None
+    assert cache.stats()["evictions"] == 1
+
+def test_expired_entries_miss():
+    """Test that entries past their TTL are treated as misses."""
+    now = [0.0]
+    cache = SemanticCache(ttl_seconds=10, clock=lambda: now[0])
+    cache.set(NAMESPACE, "Museums in Madrid", {"ai_response": "Prado."})
+    now[0] = 11.0
+    
+    assert cache.get(NAMESPACE, "Museums in Madrid") is None
+
+def test_get_many_matches_each_prompt():
+    """Test that a batched lookup returns one result per prompt, in order."""
+    cache = SemanticCache()
+    cache.set_many(NAMESPACE, ["Museums in Madrid", "Hiking near Zurich"], [{"ai_response": "Prado."}, {"ai_response": "Uetliberg."}])
+    
+    results = cache.get_many(NAMESPACE, ["hiking near zurich", "Opera in Vienna", "museums in Madrid!"])
+    
+    assert [result and result[0]["ai_response"] for result in results] == ["Uetliberg.", None, "Prado."]
+
+@pytest.mark.asyncio
+async def test_chat_service_serves_reworded_prompt_from_semantic_cache():
+    """Test that send_message answers a reworded prompt without calling the upstream."""
+    deepseek_client = MagicMock()
+    deepseek_client.chat_completion = AsyncMock(return_value={
+        "choices": [{"message": {"content": "Spring or autumn."}}],
+        "usage": {"total_tokens": 12}
+    })
+    cache = CompletionCache(tiers=[], semantic=SemanticCache())
+    chat_service = ChatService(deepseek_client=deepseek_client, cache=cache)
+    
+    first = await chat_service.send_message("When is the best time to visit Lisbon?", temperature=0)
+    second = await chat_service.send_message("when is the best time to visit lisbon", temperature=0)
+    
+    assert deepseek_client.chat_completion.await_count == 1
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["ai_response"] == "Spring or autumn."
+    assert chat_service.get_service_status()["cache"]["semantic"]["hits"] == 1
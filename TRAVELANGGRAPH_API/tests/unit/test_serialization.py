@@ -0,0 +1,44 @@
+"""
+Unit tests for JSON serialization.
+"""
+
+from datetime import datetime
+import json
+import serialization
+from controllers.chat_controller import CHAT_RESPONSE_FIELDS, ChatResponse
+from serialization import dumps, loads, pick
+
+def test_dumps_is_compact_canonical_and_handles_datetimes_and_models():
+    """Test that both encoders produce the same compact JSON for response values."""
+    value = {"b": 1, "a": [ChatResponse(status="success", timestamp="t")], "at": datetime(2024, 1, 2, 3, 4, 5)}
+    
+    encoded = dumps(value, sort_keys=True)
+    
+    assert encoded.startswith(b'{"a":[{') and b'"status":"success"' in encoded
+    assert loads(encoded)["at"] == "2024-01-02T03:04:05"
+    assert json.loads(encoded) == loads(encoded)
+
+def test_stdlib_fallback_matches_orjson(monkeypatch):
+    """Test that the fallback without orjson encodes the same bytes."""
+    value = {"messages": [{"role": "user", "content": "Olá, Lisboa"}], "temperature": 0.5}
+    fast = dumps(value, sort_keys=True)
+    
+    monkeypatch.setattr(serialization, "orjson", None)
+    
+    assert dumps(value, sort_keys=True) == fast
+    assert loads(fast) == value
+
+def test_picked_fields_match_the_response_model():
+    """Test that picking fields from a service result gives the model's JSON shape."""
+    result = {
+        "status": "success",
+        "ai_response": "Hi",
+        "timestamp": "2024-01-01T00:00:00",
+        "conversation_history": [{"role": "user", "content": "Hello"}],
+        "usage": {"total_tokens": 3}
+    }
+    
+    body = pick(result, CHAT_RESPONSE_FIELDS)
+    
+    assert body == ChatResponse(**result).model_dump()
+    assert "conversation_history" not in body
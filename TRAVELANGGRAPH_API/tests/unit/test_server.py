@@ -0,0 +1,31 @@
+"""
+Unit tests for the production server entry point.
+"""
+
+import importlib.util
+import pytest
+from travelanggraph_api import server
+
+def test_auto_workers_uses_available_cores():
+    """Test that `auto` resolves to at least one worker and integers pass through."""
+    assert server.resolve_workers("auto") >= 1
+    assert server.resolve_workers("3") == 3
+    
+    with pytest.raises(ValueError):
+        server.resolve_workers("0")
+
+def test_options_prefer_uvloop_and_httptools_and_read_tuning(monkeypatch):
+    """Test that the fast loop and parser are chosen when installed and tuning comes from settings."""
+    monkeypatch.setattr(server.settings, "SERVER_KEEPALIVE_SECONDS", 90)
+    monkeypatch.setattr(server.settings, "SERVER_LIMIT_CONCURRENCY", 0)
+    
+    options = server.server_options(workers=4)
+    
+    assert options["workers"] == 4
+    assert options["timeout_keep_alive"] == 90
+    assert options["limit_concurrency"] is None
+    assert options["timeout_graceful_shutdown"] == server.settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS
+    if importlib.util.find_spec("uvloop") is not None:
+        assert options["loop"] == "uvloop"
+    if importlib.util.find_spec("httptools") is not None:
+        assert options["http"] == "httptools"
@@ -0,0 +1,56 @@
+"""
+Unit tests for session controller.
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, MagicMock
+from dependencies import get_chat_service
+from services.chat_service import ChatService
+from services.completion_cache import CompletionCache
+from services.session_store import InMemorySessionStore
+
+@pytest.fixture
+def deepseek_client(app_instance):
+    """Serve a real chat service backed by a mocked DeepSeek client."""
+    deepseek_client = MagicMock()
+    deepseek_client.chat_completion = AsyncMock(return_value={
+        "choices": [{"message": {"content": "Try the Alfama district."}}],
+        "usage": {"total_tokens": 20}
+    })
+    chat_service = ChatService(
+        deepseek_client=deepseek_client,
+        cache=CompletionCache(tiers=[]),
+        session_store=InMemorySessionStore()
+    )
+    app_instance.dependency_overrides[get_chat_service] = lambda: chat_service
+    yield deepseek_client
+    app_instance.dependency_overrides.pop(get_chat_service, None)
+
+def test_session_messages_send_only_the_new_turn(deepseek_client, client: TestClient):
+    """Test that the server keeps history and returns only the delta."""
+    created = client.post("/chat/sessions", json={"system_prompt": "You are a travel assistant."})
+    assert created.status_code == 201
+    session_id = created.json()["session_id"]
+    
+    first = client.post(f"/chat/sessions/{session_id}/messages", json={"message": "Where to stay in Lisbon?"})
+    second = client.post(f"/chat/sessions/{session_id}/messages", json={"message": "And to eat?"})
+    
+    assert first.status_code == 200
+    assert second.json()["history_length"] == 4
+    assert second.json()["ai_response"] == "Try the Alfama district."
+    assert "conversation_history" not in second.json()
+    
+    sent = deepseek_client.chat_completion.await_args.kwargs["messages"]
+    assert [m["role"] for m in sent] == ["system", "user", "assistant", "user"]
+    assert sent[-1]["content"] == "And to eat?"
+    
+    history = client.get(f"/chat/sessions/{session_id}").json()["messages"]
+    assert len(history) == 4
+
+def test_unknown_session_returns_404(deepseek_client, client: TestClient):
+    """Test that messages to a missing session are rejected."""
+    response = client.post("/chat/sessions/missing/messages", json={"message": "Hi"})
+    
+    assert response.status_code == 404
+    assert client.delete("/chat/sessions/missing").status_code == 404
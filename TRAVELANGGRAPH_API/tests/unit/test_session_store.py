@@ -0,0 +1,74 @@
+"""
+Unit tests for conversation session stores.
+"""
+
+import pytest
+from services.session_store import InMemorySessionStore, SQLiteSessionStore
+
+def test_memory_store_appends_history():
+    """Test that appended turns are kept in order."""
+    store = InMemorySessionStore()
+    session = store.create(system_prompt="You are a travel assistant.")
+    store.append(session["session_id"], [
+        {"role": "user", "content": "Lisbon?"},
+        {"role": "assistant", "content": "Yes."}
+    ])
+    
+    stored = store.get(session["session_id"])
+    assert stored["system_prompt"] == "You are a travel assistant."
+    assert [m["content"] for m in stored["messages"]] == ["Lisbon?", "Yes."]
+
+def test_memory_store_evicts_least_recently_used():
+    """Test that the store respects its session bound."""
+    store = InMemorySessionStore(max_sessions=2)
+    first = store.create()
+    second = store.create()
+    store.get(first["session_id"])
+    store.create()
+    
+    assert store.get(second["session_id"]) is None
+    assert store.get(first["session_id"]) is not None
+    assert store.stats()["evictions"] == 1
+
+def test_memory_store_expires_idle_sessions():
+    """Test that sessions idle past their TTL are dropped."""
+    store = InMemorySessionStore(ttl_seconds=-1)
+    session = store.create()
+    
+    assert store.get(session["session_id"]) is None
+
+def test_sqlite_store_survives_restart(tmp_path):
+    """Test that the SQLite store keeps sessions across instances."""
+    path = str(tmp_path / "sessions.db")
+    first = SQLiteSessionStore(path)
+    session = first.create(messages=[{"role": "user", "content": "Porto?"}])
+    first.append(session["session_id"], [{"role": "assistant", "content": "Lovely."}])
+    first.close()
+    
+    stored = SQLiteSessionStore(path).get(session["session_id"])
+    assert [m["content"] for m in stored["messages"]] == ["Porto?", "Lovely."]
+
+def test_sqlite_store_evicts_least_recently_used_and_sweeps_expired(tmp_path):
+    """Test that the SQLite store respects its session bound and removes idle sessions without reading them."""
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"), max_sessions=2)
+    first = store.create()
+    second = store.create()
+    store.get(first["session_id"])
+    store.create()
+    
+    assert store.get(second["session_id"]) is None
+    assert store.get(first["session_id"]) is not None
+    assert store.stats()["sessions"] == 2
+    
+    store.ttl_seconds = -1
+    store.create()
+    assert store.stats()["sessions"] == 0
+    assert store.stats()["evictions"] == 4
+
+def test_sqlite_store_rejects_unknown_session(tmp_path):
+    """Test that appending to a missing session raises KeyError."""
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    
+    with pytest.raises(KeyError):
+        store.append("missing", [{"role": "user", "content": "Hi"}])
+    assert store.delete("missing") is False
@@ -0,0 +1,88 @@
+"""
+Unit tests for single-flight request coalescing.
+"""
+
+import asyncio
+import pytest
+import httpx
+from clients.deepseek_client import DeepSeekClient
+from clients.single_flight import SingleFlight
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_requests_hit_upstream_once(monkeypatch):
+    """Test that N identical concurrent completions share one upstream call."""
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test-key")
+    upstream_hits = 0
+    
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal upstream_hits
+        upstream_hits += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Lisbon"}}]})
+    
+    client = DeepSeekClient(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    messages = [{"role": "user", "content": "Top sights in Lisbon?"}]
+    
+    results = await asyncio.gather(*(client.chat_completion(messages) for _ in range(50)))
+    
+    assert upstream_hits == 1
+    assert all(r["choices"][0]["message"]["content"] == "Lisbon" for r in results)
+    assert client.health_check()["coalescing"]["collapsed_calls"] == 49
+    await client.http_client.aclose()
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_every_waiter():
+    """Test that a failed shared call raises in every caller."""
+    single_flight = SingleFlight()
+    
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+    
+    results = await asyncio.gather(
+        *(single_flight.do("key", fail) for _ in range(5)),
+        return_exceptions=True
+    )
+    
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert single_flight.in_flight == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    """Test that one waiter cancelling leaves the others to finish."""
+    single_flight = SingleFlight()
+    
+    async def slow():
+        await asyncio.sleep(0.05)
+        return "done"
+    
+    first = asyncio.ensure_future(single_flight.do("key", slow))
+    second = asyncio.ensure_future(single_flight.do("key", slow))
+    await asyncio.sleep(0)
+    first.cancel()
+    
+    assert await second == "done"
+    assert first.cancelled()
+
+@pytest.mark.asyncio
+async def test_shared_call_cancelled_when_all_waiters_leave():
+    """Test that the upstream call is cancelled once nobody is waiting."""
+    single_flight = SingleFlight()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+    
+    async def slow():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+    
+    waiter = asyncio.ensure_future(single_flight.do("key", slow))
+    await started.wait()
+    waiter.cancel()
+    
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    await asyncio.sleep(0)
+    assert single_flight.in_flight == 0
@@ -0,0 +1,40 @@
+"""
+Unit tests for cold start time.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+# Import plus startup in a fresh interpreter; generous so slow CI machines pass
+COLD_START_BUDGET_SECONDS = 3.0
+
+COLD_START = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+import dependencies
+from travelanggraph_api.main import app
+lazy = [name for name in ("uvicorn", "psutil") if name in sys.modules]
+asyncio.run(dependencies.startup(app))
+elapsed = time.perf_counter() - start
+asyncio.run(dependencies.shutdown(app))
+print(json.dumps({"elapsed": elapsed, "eagerly_imported": lazy}))
+"""
+
+def test_cold_start_within_budget():
+    """Test that importing the app and running startup stays within the cold-start budget."""
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_START],
+        capture_output=True,
+        text=True,
+        cwd=root,
+        env={**os.environ, "DEEPSEEK_API_KEY": "test-key"},
+        timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    
+    assert report["eagerly_imported"] == []
+    assert report["elapsed"] < COLD_START_BUDGET_SECONDS
@@ -0,0 +1,82 @@
+"""
+Unit tests for request tracing.
+"""
+
+import pytest
+import httpx
+from fastapi.testclient import TestClient
+import tracing
+from clients.deepseek_client import DeepSeekClient
+from dependencies import get_chat_service
+from services.chat_service import ChatService
+from services.completion_cache import CompletionCache
+from tracing import InMemorySpanExporter, end_trace, parse_traceparent, span, start_trace
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+TRACEPARENT = f"00-{TRACE_ID}-00f067aa0ba902b7-01"
+
+@pytest.fixture
+def traced_upstream(app_instance, monkeypatch):
+    """Serve a real chat service whose DeepSeek client posts to a mock transport."""
+    monkeypatch.setenv("DEEPSEEK_API_KEY", "test-key")
+    exporter = InMemorySpanExporter()
+    monkeypatch.setattr(tracing, "span_exporter", exporter)
+    upstream_headers = []
+    
+    def handler(request: httpx.Request) -> httpx.Response:
+        upstream_headers.append(request.headers)
+        return httpx.Response(200, json={"choices": [{"message": {"content": "Lisbon"}}]})
+    
+    client = DeepSeekClient(http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    chat_service = ChatService(deepseek_client=client, cache=CompletionCache(tiers=[]))
+    app_instance.dependency_overrides[get_chat_service] = lambda: chat_service
+    yield exporter, upstream_headers
+    app_instance.dependency_overrides.pop(get_chat_service, None)
+
+def test_traceparent_parsing():
+    """Test that only well-formed, non-zero traceparents are accepted."""
+    assert parse_traceparent(TRACEPARENT) == {"trace_id": TRACE_ID, "parent_id": "00f067aa0ba902b7"}
+    assert parse_traceparent(f"00-{'0' * 32}-00f067aa0ba902b7-01") is None
+    assert parse_traceparent("garbage") is None
+    assert parse_traceparent(None) is None
+
+def test_spans_nest_and_are_noops_outside_a_trace():
+    """Test that spans record their parent and do nothing without a trace."""
+    with span("untraced") as untraced:
+        assert untraced is None
+    
+    trace = start_trace()
+    with span("root") as root:
+        with span("child") as child:
+            pass
+    end_trace()
+    
+    assert child.parent_id == root.span_id
+    assert [s.name for s in trace.spans] == ["root", "child"]
+    assert root.duration >= child.duration
+
+def test_context_chat_is_traced_end_to_end(traced_upstream, client: TestClient):
+    """Test that a traced request continues the caller's trace through to the upstream call."""
+    exporter, upstream_headers = traced_upstream
+    
+    response = client.post(
+        "/chat/context",
+        json={"messages": [{"role": "user", "content": "Where to go?"}]},
+        headers={"traceparent": TRACEPARENT, "X-Request-ID": "req-42"}
+    )
+    
+    assert response.status_code == 200
+    assert response.headers["x-request-id"] == "req-42"
+    assert response.headers["traceparent"].startswith(f"00-{TRACE_ID}-")
+    timing = response.headers["server-timing"]
+    for name in ("request.parse", "context_window.fit", "chat_service.complete", "upstream.attempt", "total"):
+        assert f"{name};dur=" in timing
+    
+    assert upstream_headers[0]["x-request-id"] == "req-42"
+    assert upstream_headers[0]["traceparent"].startswith(f"00-{TRACE_ID}-")
+    
+    spans = exporter.traces[-1]["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    by_name = {s["name"]: s for s in spans}
+    assert by_name["POST /chat/context"]["parentSpanId"] == "00f067aa0ba902b7"
+    assert by_name["upstream.attempt"]["parentSpanId"] == by_name["chat_service.complete"]["spanId"]
+    assert all(s["traceId"] == TRACE_ID for s in spans)
@@ -0,0 +1,349 @@
+"""
+Lightweight request tracing for TravelLangGraph API.
+Nested spans with monotonic timings, W3C traceparent propagation and OTLP-style export.
+"""
+
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+class Span:
+    """A timed operation within a trace."""
+    
+    __slots__ = ("trace", "name", "span_id", "parent_id", "start", "end", "attributes", "error")
+    
+    def __init__(self, trace: "Trace", name: str, parent_id: Optional[str], start: float, attributes: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.start = start
+        self.end: Optional[float] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+    
+    @property
+    def duration(self) -> float:
+        """Duration in seconds, up to now while the span is open."""
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+    
+    def to_otlp(self) -> Dict[str, Any]:
+        """Convert to an OTLP/JSON span."""
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 2 if self is self.trace.spans[0] else 1,
+            "startTimeUnixNano": str(self.trace.unix_nanos(self.start)),
+            "endTimeUnixNano": str(self.trace.unix_nanos(self.end if self.end is not None else self.start)),
+            "attributes": [
+                {"key": key, "value": {"stringValue": str(value)}} for key, value in self.attributes.items()
+            ],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1}
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+class Trace:
+    """
+    Spans recorded for one request.
+    
+    Span times come from the monotonic clock and are converted to wall-clock
+    time for export using one reading taken when the trace starts.
+    """
+    
+    def __init__(self, trace_id: Optional[str] = None, remote_parent_id: Optional[str] = None, request_id: Optional[str] = None):
+        self.trace_id = trace_id or os.urandom(16).hex()
+        self.remote_parent_id = remote_parent_id
+        self.request_id = request_id or self.trace_id
+        self.spans: List[Span] = []
+        self._start = time.perf_counter()
+        self._start_unix_nanos = time.time_ns()
+    
+    def unix_nanos(self, monotonic: float) -> int:
+        """Convert a `time.perf_counter` reading to Unix nanoseconds."""
+        return self._start_unix_nanos + int((monotonic - self._start) * 1e9)
+    
+    def server_timing(self) -> str:
+        """
+        Build a `Server-Timing` header value from the finished spans.
+        
+        Durations of spans with the same name are summed; the root span is
+        reported as `total`, measured up to now if it is still open.
+        """
+        if not self.spans:
+            return ""
+        durations: Dict[str, float] = {}
+        for span in self.spans[1:]:
+            if span.end is not None:
+                durations[span.name] = durations.get(span.name, 0.0) + span.duration
+        entries = [f"{name};dur={duration * 1000:.2f}" for name, duration in durations.items()]
+        entries.append(f"total;dur={self.spans[0].duration * 1000:.2f}")
+        return ", ".join(entries)
+    
+    def to_otlp(self) -> Dict[str, Any]:
+        """Convert the finished spans to an OTLP/JSON `resourceSpans` document."""
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "travelanggraph-api"}}]},
+                "scopeSpans": [{
+                    "scope": {"name": "travelanggraph.tracing"},
+                    "spans": [span.to_otlp() for span in self.spans if span.end is not None]
+                }]
+            }]
+        }
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+def parse_traceparent(header: Optional[str]) -> Optional[Dict[str, str]]:
+    """Parse a W3C `traceparent` header into `trace_id` and `parent_id`, or None if invalid."""
+    match = _TRACEPARENT.match(header.strip().lower()) if header else None
+    if match is None or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    return {"trace_id": match.group(1), "parent_id": match.group(2)}
+
+def current_trace() -> Optional[Trace]:
+    """Get the trace of the request being handled, if any."""
+    return _current_trace.get()
+
+def start_trace(traceparent: Optional[str] = None, request_id: Optional[str] = None) -> Trace:
+    """
+    Start a trace for the current task, continuing an incoming `traceparent`.
+    
+    Args:
+        traceparent: Incoming W3C `traceparent` header
+        request_id: Incoming request ID; the trace ID is used when omitted
+            or malformed
+    
+    Returns:
+        The new trace
+    """
+    parent = parse_traceparent(traceparent)
+    trace = Trace(
+        trace_id=parent["trace_id"] if parent else None,
+        remote_parent_id=parent["parent_id"] if parent else None,
+        request_id=request_id if request_id and _REQUEST_ID.match(request_id) else None
+    )
+    _current_trace.set(trace)
+    _current_span.set(None)
+    return trace
+
+def end_trace() -> None:
+    """Detach the current task from its trace."""
+    _current_trace.set(None)
+    _current_span.set(None)
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Time the enclosed block as a child of the current span.
+    
+    Does nothing outside a trace. The span records an error status if the
+    block raises.
+    
+    Args:
+        name: Span name, e.g. `chat_service.complete`
+        **attributes: Span attributes
+    
+    Yields:
+        The open span, or None outside a trace
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+    
+    parent = _current_span.get()
+    current = Span(trace, name, parent.span_id if parent else trace.remote_parent_id, time.perf_counter(), attributes)
+    trace.spans.append(current)
+    _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = repr(e)
+        raise
+    finally:
+        current.end = time.perf_counter()
+        # Restore by value: generators may resume in a different context
+        _current_span.set(parent)
+
+def record_span(name: str, start: float, end: Optional[float] = None, **attributes: Any) -> Optional[Span]:
+    """
+    Record an already finished operation as a child of the current span.
+    
+    Args:
+        name: Span name
+        start: `time.perf_counter` reading when the operation began
+        end: `time.perf_counter` reading when it ended; now when omitted
+        **attributes: Span attributes
+    
+    Returns:
+        The recorded span, or None outside a trace
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+    parent = _current_span.get()
+    recorded = Span(trace, name, parent.span_id if parent else trace.remote_parent_id, start, attributes)
+    recorded.end = end if end is not None else time.perf_counter()
+    trace.spans.append(recorded)
+    return recorded
+
+def record_since_request_start(name: str, **attributes: Any) -> Optional[Span]:
+    """
+    Record the time from the start of the request until now as a span.
+    
+    Endpoints call this on entry to capture body parsing, validation and
+    dependency resolution, which happen before any handler code runs.
+    """
+    trace = _current_trace.get()
+    if trace is None or not trace.spans:
+        return None
+    return record_span(name, trace.spans[0].start, **attributes)
+
+def propagation_headers() -> Dict[str, str]:
+    """Headers carrying the current trace and request ID to an upstream call."""
+    trace = _current_trace.get()
+    if trace is None:
+        return {}
+    current = _current_span.get()
+    parent_id = current.span_id if current else os.urandom(8).hex()
+    return {"traceparent": f"00-{trace.trace_id}-{parent_id}-01", "X-Request-ID": trace.request_id}
+
+class HttpcoreSpans:
+    """
+    httpx `trace` extension callback that turns connection events into spans.
+    
+    Time from sending until the first connection event is recorded as
+    `upstream.pool_wait`; each started/complete event pair becomes a span,
+    e.g. `http11.receive_response_headers` for the upstream's time to first byte.
+    """
+    
+    def __init__(self):
+        self._sent_at = time.perf_counter()
+        self._started: Dict[str, float] = {}
+        self._first_event = True
+    
+    def mark_sent(self) -> None:
+        """Mark the moment the request is handed to the client."""
+        self._sent_at = time.perf_counter()
+    
+    async def __call__(self, event_name: str, info: Dict[str, Any]) -> None:
+        now = time.perf_counter()
+        if self._first_event:
+            self._first_event = False
+            record_span("upstream.pool_wait", self._sent_at, now)
+        
+        name, _, phase = event_name.rpartition(".")
+        if phase == "started":
+            self._started[name] = now
+        elif phase in ("complete", "failed") and name in self._started:
+            recorded = record_span(name, self._started.pop(name), now)
+            if recorded is not None and phase == "failed":
+                recorded.error = repr(info.get("exception"))
+
+class InMemorySpanExporter:
+    """Keep the most recent traces in memory as OTLP/JSON documents."""
+    
+    blocking = False
+    
+    def __init__(self, max_traces: int = 1000):
+        self.traces: Deque[Dict[str, Any]] = deque(maxlen=max_traces)
+    
+    def export(self, trace: Trace) -> None:
+        """Store one finished trace."""
+        self.traces.append(trace.to_otlp())
+
+class FileSpanExporter:
+    """Append traces to a file as OTLP/JSON lines, one `resourceSpans` document per request."""
+    
+    blocking = True
+    
+    def __init__(self, path: str):
+        self.path = path
+    
+    def export(self, trace: Trace) -> None:
+        """Append one finished trace."""
+        with open(self.path, "a") as f:
+            f.write(json.dumps(trace.to_otlp(), separators=(",", ":")) + "\n")
+
+def build_span_exporter():
+    """Build the span exporter named by `TRACING_EXPORTER`: `memory`, `file` or `none`."""
+    if settings.TRACING_EXPORTER == "file":
+        return FileSpanExporter(settings.TRACING_FILE_PATH)
+    if settings.TRACING_EXPORTER == "memory":
+        return InMemorySpanExporter(settings.TRACING_MEMORY_MAX_TRACES)
+    return None
+
+# Shared exporter for finished request traces
+span_exporter = build_span_exporter()
+
+class TracingMiddleware:
+    """
+    ASGI middleware that traces each HTTP request.
+    
+    Continues an incoming `traceparent` and `X-Request-ID`, or starts new
+    ones, and opens a root span around the request. The response carries
+    `X-Request-ID`, `traceparent` and a `Server-Timing` header with the spans
+    finished before the response started; streamed bodies finish later and
+    are only in the exported trace.
+    """
+    
+    def __init__(self, app, exclude_paths: tuple = ("/metrics",)):
+        self.app = app
+        self.exclude_paths = exclude_paths
+    
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"] in self.exclude_paths:
+            await self.app(scope, receive, send)
+            return
+        
+        headers = {key.decode("latin-1"): value.decode("latin-1") for key, value in scope["headers"]}
+        trace = start_trace(headers.get("traceparent"), headers.get("x-request-id"))
+        
+        try:
+            with span(f"{scope['method']} {scope['path']}", method=scope["method"], path=scope["path"]) as root:
+                async def send_with_trace(message) -> None:
+                    if message["type"] == "http.response.start":
+                        root.attributes["status"] = message["status"]
+                        message = {**message, "headers": list(message.get("headers", [])) + [
+                            (b"x-request-id", trace.request_id.encode("latin-1")),
+                            (b"traceparent", f"00-{trace.trace_id}-{root.span_id}-01".encode("latin-1")),
+                            (b"server-timing", trace.server_timing().encode("latin-1"))
+                        ]}
+                    await send(message)
+                
+                await self.app(scope, receive, send_with_trace)
+        finally:
+            route = scope.get("route")
+            if route is not None:
+                trace.spans[0].name = f"{scope['method']} {route.path}"
+            end_trace()
+            await export_trace(trace)
+
+async def export_trace(trace: Trace) -> None:
+    """Hand a finished trace to the shared exporter, off the event loop for file exports."""
+    if span_exporter is None:
+        return
+    try:
+        if span_exporter.blocking:
+            await asyncio.to_thread(span_exporter.export, trace)
+        else:
+            span_exporter.export(trace)
+    except Exception as e:
+        logger.error(f"Trace export failed: {e}")
@@ -2,15 +2,32 @@
 Main FastAPI application for TravelLangGraph API.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
 from config import settings
+import dependencies
+from metrics import MetricsMiddleware
+from rate_limit import RateLimitMiddleware
+from tracing import TracingMiddleware
+from serialization import FastJSONResponse
 
 # Import controllers
 from controllers.health_controller import router as health_router
 from controllers.hello_controller import router as hello_router
 from controllers.chat_controller import router as chat_router
+from controllers.session_controller import router as session_router
+from controllers.plan_controller import router as plan_router
+from controllers.places_controller import router as places_router
+from controllers.quota_controller import router as quota_router
+from controllers.metrics_controller import router as metrics_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build shared services on startup and release them on shutdown."""
+    await dependencies.startup(app)
+    yield
+    await dependencies.shutdown(app)
 
 # Create FastAPI app
 app = FastAPI(
@@ -19,8 +36,13 @@ app = FastAPI(
     version="0.1.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+# Enforce per-client rate limits inside CORS, so rejections carry CORS headers
+app.add_middleware(RateLimitMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -30,10 +52,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Record request count and latency per route and status
+app.add_middleware(MetricsMiddleware)
+
+# Trace requests and report span timings in a Server-Timing header
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
 # Include routers
 app.include_router(health_router)
 app.include_router(hello_router)
 app.include_router(chat_router)
+app.include_router(session_router)
+app.include_router(plan_router)
+app.include_router(places_router)
+app.include_router(quota_router)
+app.include_router(metrics_router)
 
 @app.get("/")
 async def root():
@@ -42,6 +76,8 @@ async def root():
 
 def main():
     """Main function to run the API server."""
+    import uvicorn
+    
     uvicorn.run(
         "travelanggraph_api.main:app",
         host=settings.API_HOST,
@@ -0,0 +1,114 @@
+"""
+Production server entry point for TravelLangGraph API.
+Runs several uvicorn worker processes with uvloop, httptools and graceful shutdown.
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+from typing import Any, Dict
+import uvicorn
+from config import settings
+from metrics import clear_multiproc_dir
+
+APP = "travelanggraph_api.main:app"
+
+def resolve_workers(value: str) -> int:
+    """
+    Resolve the worker count setting.
+    
+    Args:
+        value: A positive integer, or `auto` for one worker per CPU core
+            available to this process
+    
+    Returns:
+        Number of worker processes
+    
+    Raises:
+        ValueError: If the value is not `auto` or a positive integer
+    """
+    if value == "auto":
+        if hasattr(os, "sched_getaffinity"):
+            return max(1, len(os.sched_getaffinity(0)))
+        return os.cpu_count() or 1
+    workers = int(value)
+    if workers < 1:
+        raise ValueError(f"Worker count must be at least 1: {value}")
+    return workers
+
+def event_loop() -> str:
+    """The uvicorn event loop: uvloop when installed, asyncio otherwise."""
+    if sys.platform != "win32" and importlib.util.find_spec("uvloop") is not None:
+        return "uvloop"
+    return "asyncio"
+
+def http_protocol() -> str:
+    """The uvicorn HTTP/1.1 parser: httptools when installed, h11 otherwise."""
+    return "httptools" if importlib.util.find_spec("httptools") is not None else "h11"
+
+def server_options(workers: int) -> Dict[str, Any]:
+    """
+    Build `uvicorn.run` keyword arguments from settings.
+    
+    On SIGTERM each worker stops accepting connections, closes idle
+    keep-alive connections and lets in-flight requests, including SSE
+    streams, finish for up to `SERVER_GRACEFUL_SHUTDOWN_SECONDS` before
+    cancelling them. Upstream connection pools are closed after that.
+    
+    Args:
+        workers: Number of worker processes
+    
+    Returns:
+        Keyword arguments for `uvicorn.run`
+    """
+    return {
+        "host": settings.API_HOST,
+        "port": settings.API_PORT,
+        "workers": workers,
+        "loop": event_loop(),
+        "http": http_protocol(),
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEPALIVE_SECONDS,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        "limit_concurrency": settings.SERVER_LIMIT_CONCURRENCY or None,
+        "access_log": settings.SERVER_ACCESS_LOG,
+        "log_level": "info"
+    }
+
+def warmup() -> None:
+    """
+    Import the application once before starting workers.
+    
+    Import and configuration errors then stop the server before any worker
+    starts, and the bytecode cache is written once rather than by every
+    worker at the same time. Workers are spawned rather than forked, so each
+    one still imports the app and builds its own connection pools, caches
+    and background tasks in the lifespan startup.
+    """
+    importlib.import_module(APP.partition(":")[0])
+
+def main() -> None:
+    """Run the API with one worker process per CPU core, or `API_WORKERS`."""
+    parser = argparse.ArgumentParser(description="Run the TravelLangGraph API with several worker processes.")
+    parser.add_argument("--workers", default=settings.API_WORKERS, help="Worker count or 'auto'")
+    parser.add_argument("--host", default=settings.API_HOST)
+    parser.add_argument("--port", type=int, default=settings.API_PORT)
+    args = parser.parse_args()
+    
+    options = server_options(resolve_workers(str(args.workers)))
+    options.update(host=args.host, port=args.port)
+    if options["workers"] > 1 and not settings.METRICS_MULTIPROC_DIR:
+        print("WARNING: METRICS_MULTIPROC_DIR is not set. /metrics will only report the worker that serves it.")
+    if settings.METRICS_MULTIPROC_DIR:
+        # Drop snapshots of workers from earlier runs before any worker writes one
+        removed = clear_multiproc_dir(settings.METRICS_MULTIPROC_DIR)
+        if removed:
+            print(f"Removed {removed} stale metrics snapshots from {settings.METRICS_MULTIPROC_DIR}")
+    
+    warmup()
+    print(f"Starting {options['workers']} workers (loop={options['loop']}, http={options['http']})")
+    uvicorn.run(APP, **options)
+
+if __name__ == "__main__":
+    main()